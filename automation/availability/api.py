@@ -20,18 +20,21 @@ async def fetch_available_slots(
     *,
     reference_date: Optional[date] = None,
     current_time: Optional[datetime] = None,
+    network_slots: Optional[Dict[str, List[str]]] = None,
 ) -> Dict[str, List[str]]:
-    """Return a mapping of ISO date strings to available time slots."""
+    """Return a mapping of ISO date strings to available time slots.
+
+    ``network_slots`` are slots already captured from the scheduling API (see
+    :mod:`automation.availability.network_extraction`); when provided the DOM
+    is not inspected at all.
+    """
 
     t('automation.availability.api.fetch_available_slots')
 
-    frame = page.main_frame
-    text_content = await extract_page_text_content(frame)
-    available_days = get_available_days(text_content)
-    time_buttons = await extract_time_buttons(frame)
-
-    grouped = group_times_by_order_logic(time_buttons, available_days)
-    dated = convert_day_labels_to_dates(grouped, reference_date=reference_date)
+    if network_slots is not None:
+        dated = {day: list(times) for day, times in network_slots.items() if times}
+    else:
+        dated = await extract_slots_from_dom(page, reference_date=reference_date)
 
     if not dated:
         return {}
@@ -43,3 +46,21 @@ async def fetch_available_slots(
         )
 
     return dated
+
+
+async def extract_slots_from_dom(
+    page: Page,
+    *,
+    reference_date: Optional[date] = None,
+) -> Dict[str, List[str]]:
+    """Infer dated slots from the rendered calendar text and button order."""
+
+    t('automation.availability.api.extract_slots_from_dom')
+
+    frame = page.main_frame
+    text_content = await extract_page_text_content(frame)
+    available_days = get_available_days(text_content)
+    time_buttons = await extract_time_buttons(frame)
+
+    grouped = group_times_by_order_logic(time_buttons, available_days)
+    return convert_day_labels_to_dates(grouped, reference_date=reference_date)
@@ -10,8 +10,12 @@ from typing import Dict, List, Optional, Tuple
 
 from playwright.async_api import Page
 
-from infrastructure.constants import COURT_CONFIG, NO_AVAILABILITY_PATTERNS
+from infrastructure.constants import NO_AVAILABILITY_PATTERNS
+from infrastructure.court_topology import get_court_topology
 from .api import fetch_available_slots
+from .network_extraction import AvailabilityResponseListener
+from .snapshot_cache import AvailabilitySnapshotCache, get_availability_cache
+from .time_utils import filter_future_times_for_today
 from infrastructure.settings import get_settings
 from pathlib import Path
 
@@ -21,12 +25,18 @@ logger = logging.getLogger(__name__)
 class AvailabilityChecker:
     """Fetch and format court availability using Playwright pages."""
 
-    def __init__(self, browser_pool) -> None:
+    def __init__(
+        self,
+        browser_pool,
+        *,
+        cache: Optional[AvailabilitySnapshotCache] = None,
+        use_cache: bool = True,
+    ) -> None:
         t('automation.availability.checker.AvailabilityChecker.__init__')
         self.browser_pool = browser_pool
-        self._reference_date: Optional[date] = None
-        self._current_time: Optional[datetime] = None
+        self.cache = (cache or get_availability_cache()) if use_cache else None
         settings = get_settings()
+        self._network_extraction = settings.availability_network_extraction
         self._save_screenshots = settings.save_availability_screenshots
         self._screenshot_dir = Path(settings.data_directory) / "screenshots" / "availability"
 
@@ -56,22 +66,29 @@ class AvailabilityChecker:
         current_time: Optional[datetime] = None,
     ) -> Dict[int, Dict[str, List[str]]]:
         t('automation.availability.checker.AvailabilityChecker.check_availability')
-        self._reference_date = reference_date
-        self._current_time = current_time
-
-        targets = court_numbers or list(COURT_CONFIG.keys())
-        valid_courts = [c for c in targets if c in COURT_CONFIG]
+        topology = get_court_topology()
+        targets = court_numbers or topology.numbers
+        valid_courts = [c for c in targets if c in topology]
         if len(valid_courts) < len(targets):
             invalid = sorted(set(targets) - set(valid_courts))
             logger.warning("Invalid court numbers requested: %s", invalid)
 
-        semaphore = asyncio.Semaphore(max_concurrent)
-        tasks = [self._check_with_semaphore(court, semaphore, timeout_per_court) for court in valid_courts]
-        try:
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-        finally:
-            self._reference_date = None
-            self._current_time = None
+        # ``max_concurrent`` bounds page loads per Acuity host, not overall.
+        semaphores = {
+            host: asyncio.Semaphore(max_concurrent)
+            for host in topology.courts_by_host(valid_courts)
+        }
+        tasks = [
+            self._check_with_semaphore(
+                court,
+                semaphores[topology.host_for(court)],
+                timeout_per_court,
+                reference_date=reference_date,
+                current_time=current_time,
+            )
+            for court in valid_courts
+        ]
+        results = await asyncio.gather(*tasks, return_exceptions=True)
 
         availability: Dict[int, Dict[str, List[str]]] = {}
         for court_num, result in zip(valid_courts, results):
@@ -88,18 +105,51 @@ class AvailabilityChecker:
         court_num: int,
         semaphore: asyncio.Semaphore,
         timeout: float,
+        *,
+        reference_date: Optional[date] = None,
+        current_time: Optional[datetime] = None,
     ) -> Dict[str, List[str]]:
         t('automation.availability.checker.AvailabilityChecker._check_with_semaphore')
-        async with semaphore:
-            try:
-                return await asyncio.wait_for(self.check_single_court(court_num), timeout=timeout)
-            except asyncio.TimeoutError as exc:
-                logger.error("Court %s check timed out after %.1fs", court_num, timeout)
-                return {"error": str(exc)}
-
-    async def check_single_court(self, court_num: int) -> Dict[str, List[str]]:
+
+        async def load() -> Dict[str, List[str]]:
+            t('automation.availability.checker.AvailabilityChecker._check_with_semaphore.load')
+            async with semaphore:
+                return await asyncio.wait_for(
+                    self.check_single_court(
+                        court_num,
+                        reference_date=reference_date,
+                        current_time=current_time,
+                    ),
+                    timeout=timeout,
+                )
+
+        try:
+            # Snapshots are keyed by court only, so explicit reference dates
+            # (used by tests and backfills) always read the page directly.
+            if self.cache is None or reference_date is not None:
+                return await load()
+            slots = await self.cache.get(court_num, load)
+        except asyncio.TimeoutError as exc:
+            logger.error("Court %s check timed out after %.1fs", court_num, timeout)
+            return {"error": str(exc)}
+
+        # A shared snapshot may predate ``current_time``; drop slots that passed.
+        today_key = date.today().strftime("%Y-%m-%d")
+        if today_key in slots:
+            slots[today_key] = filter_future_times_for_today(
+                slots[today_key], current_time=current_time
+            )
+        return slots
+
+    async def check_single_court(
+        self,
+        court_num: int,
+        *,
+        reference_date: Optional[date] = None,
+        current_time: Optional[datetime] = None,
+    ) -> Dict[str, List[str]]:
         t('automation.availability.checker.AvailabilityChecker.check_single_court')
-        if court_num not in COURT_CONFIG:
+        if court_num not in get_court_topology():
             raise ValueError(f"Invalid court number: {court_num}")
 
         pages = getattr(self.browser_pool, "pages", {})
@@ -109,20 +159,34 @@ class AvailabilityChecker:
 
         logger.info("Checking Court %s availability", court_num)
 
+        # Imported here: automation.browser imports this package through its pools.
+        from automation.browser.refresh_control import get_refresh_controller
+
+        listener = AvailabilityResponseListener(page) if self._network_extraction else None
         try:
-            await page.reload(wait_until="domcontentloaded")
-            await asyncio.sleep(1)
+            if listener:
+                listener.attach()
+            await get_refresh_controller().reload(page, court_num, wait_until="domcontentloaded")
+            # The scheduling API payload usually lands well inside the settle
+            # delay the DOM path needs, so stop waiting as soon as it does.
+            network_slots = await listener.collect(timeout=1.0) if listener else None
+            if network_slots is None:
+                if listener:
+                    logger.debug("Court %s: no availability payload seen; using DOM", court_num)
+                else:
+                    await asyncio.sleep(1)
 
             if self._save_screenshots:
                 await self._capture_screenshot(page, court_num)
 
-            if await self._has_no_availability_message(page):
+            if network_slots is None and await self._has_no_availability_message(page):
                 return {}
 
             parsed = await fetch_available_slots(
                 page,
-                reference_date=self._reference_date,
-                current_time=self._current_time,
+                reference_date=reference_date,
+                current_time=current_time,
+                network_slots=network_slots,
             )
             if not parsed:
                 logger.warning("Court %s: No times returned by parser", court_num)
@@ -138,6 +202,9 @@ class AvailabilityChecker:
         except Exception as exc:  # pragma: no cover - defensive guard
             logger.error("Court %s availability check failed: %s", court_num, exc, exc_info=True)
             raise
+        finally:
+            if listener:
+                listener.detach()
 
     async def _capture_screenshot(self, page: Page, court_num: int) -> None:
         t('automation.availability.checker.AvailabilityChecker._capture_screenshot')
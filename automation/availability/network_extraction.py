@@ -0,0 +1,154 @@
+"""Availability extraction from the Acuity scheduling API responses.
+
+The calendar widget renders its time buttons from an XHR to
+``/api/scheduling/v1/availability/times`` whose JSON maps ISO dates to slot
+entries, e.g. ``{"2025-08-12": [{"time": "2025-08-12T07:00:00-0600",
+"slotsAvailable": 1}]}``. :class:`AvailabilityResponseListener` captures those
+responses through ``page.on("response")`` so the checker gets exact
+date-to-time mappings instead of inferring days from DOM order. Callers fall
+back to the DOM path whenever no payload is observed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import re
+from typing import Any, Dict, List, Optional, Set
+
+from tracking import t
+
+AVAILABILITY_URL_MARKERS = ('/availability/times',)
+
+_DATE_KEY = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+_SLOT_TIMESTAMP = re.compile(r'(\d{4}-\d{2}-\d{2})[T ](\d{2}):(\d{2})')
+
+logger = logging.getLogger(__name__)
+
+
+def is_availability_response(url: str) -> bool:
+    """Return True when ``url`` is an Acuity availability-times endpoint."""
+
+    t('automation.availability.network_extraction.is_availability_response')
+    return any(marker in (url or '') for marker in AVAILABILITY_URL_MARKERS)
+
+
+def parse_availability_payload(payload: Any) -> Dict[str, List[str]]:
+    """Convert an availability-times payload into ``{iso_date: [HH:MM, ...]}``.
+
+    Accepts the date-keyed mapping the widget consumes as well as a flat list
+    of slot entries. Entries reporting ``slotsAvailable: 0`` are skipped; the
+    date always comes from the slot timestamp itself, in the calendar's local
+    time.
+    """
+
+    t('automation.availability.network_extraction.parse_availability_payload')
+    if isinstance(payload, dict):
+        entries: List[Any] = []
+        for key, value in payload.items():
+            if _DATE_KEY.match(str(key)) and isinstance(value, list):
+                entries.extend(value)
+    elif isinstance(payload, list):
+        entries = payload
+    else:
+        return {}
+
+    slots: Dict[str, Set[str]] = {}
+    for entry in entries:
+        if isinstance(entry, dict):
+            if entry.get('slotsAvailable', 1) in (0, '0'):
+                continue
+            raw = entry.get('time') or entry.get('datetime')
+        else:
+            raw = entry
+        match = _SLOT_TIMESTAMP.search(str(raw or ''))
+        if not match:
+            continue
+        day, hour, minute = match.groups()
+        slots.setdefault(day, set()).add(f"{hour}:{minute}")
+
+    return {day: sorted(times) for day, times in sorted(slots.items())}
+
+
+class AvailabilityResponseListener:
+    """Collect availability payloads a page receives while it (re)loads."""
+
+    def __init__(self, page: Any) -> None:
+        t('automation.availability.network_extraction.AvailabilityResponseListener.__init__')
+        self._page = page
+        self._slots: Dict[str, Set[str]] = {}
+        self._pending: Set[asyncio.Task] = set()
+        self._seen = asyncio.Event()
+        self._attached = False
+        self.payloads = 0
+
+    def attach(self) -> 'AvailabilityResponseListener':
+        t('automation.availability.network_extraction.AvailabilityResponseListener.attach')
+        if not self._attached:
+            self._page.on('response', self._on_response)
+            self._attached = True
+        return self
+
+    def detach(self) -> None:
+        t('automation.availability.network_extraction.AvailabilityResponseListener.detach')
+        if self._attached:
+            self._page.remove_listener('response', self._on_response)
+            self._attached = False
+        for task in self._pending:
+            task.cancel()
+        self._pending.clear()
+
+    async def __aenter__(self) -> 'AvailabilityResponseListener':
+        t('automation.availability.network_extraction.AvailabilityResponseListener.__aenter__')
+        return self.attach()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        t('automation.availability.network_extraction.AvailabilityResponseListener.__aexit__')
+        self.detach()
+
+    async def collect(self, timeout: float = 1.0) -> Optional[Dict[str, List[str]]]:
+        """Wait up to ``timeout`` for a payload and return the merged slots.
+
+        Returns ``None`` when nothing was captured, so callers can fall back to
+        DOM extraction; an empty dict means the API reported no availability.
+        """
+
+        t('automation.availability.network_extraction.AvailabilityResponseListener.collect')
+        if not self._seen.is_set() and not self._pending:
+            try:
+                await asyncio.wait_for(self._seen.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+        if self._pending:
+            await asyncio.wait(list(self._pending), timeout=timeout)
+        if not self.payloads:
+            return None
+        return {day: sorted(times) for day, times in sorted(self._slots.items())}
+
+    def _on_response(self, response: Any) -> None:
+        t('automation.availability.network_extraction.AvailabilityResponseListener._on_response')
+        if not is_availability_response(getattr(response, 'url', '')):
+            return
+        task = asyncio.ensure_future(self._consume(response))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _consume(self, response: Any) -> None:
+        t('automation.availability.network_extraction.AvailabilityResponseListener._consume')
+        try:
+            payload = await response.json()
+        except Exception as exc:  # pragma: no cover - body unavailable after navigation
+            logger.debug("Could not read availability payload from %s: %s", response.url, exc)
+            return
+        for day, times in parse_availability_payload(payload).items():
+            self._slots.setdefault(day, set()).update(times)
+        self.payloads += 1
+        self._seen.set()
+
+
+__all__ = [
+    'AVAILABILITY_URL_MARKERS',
+    'AvailabilityResponseListener',
+    'is_availability_response',
+    'parse_availability_payload',
+]
@@ -0,0 +1,162 @@
+"""Process-wide per-court availability cache.
+
+Every :class:`~automation.availability.checker.AvailabilityChecker` shares one
+:class:`AvailabilitySnapshotCache`, so availability scraped for one Telegram
+user is reused by everyone else for ``ttl`` seconds. Past the TTL an entry is
+still served for ``stale_seconds`` while a single background reload refreshes
+it (stale-while-revalidate). Concurrent misses for the same court are
+coalesced onto one in-flight reload (single-flight), so a burst of calendar
+requests triggers one page reload per court rather than one per user.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from tracking import t
+
+from infrastructure.settings import get_settings
+
+CourtSlots = Dict[str, List[str]]
+Loader = Callable[[], Awaitable[CourtSlots]]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CourtSnapshot:
+    """Availability for one court and the monotonic time it was fetched."""
+
+    slots: CourtSlots
+    fetched_at: float
+
+
+class AvailabilitySnapshotCache:
+    """TTL cache of per-court availability with single-flight reloads."""
+
+    def __init__(
+        self,
+        *,
+        ttl: float,
+        stale_seconds: float = 0.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        t('automation.availability.snapshot_cache.AvailabilitySnapshotCache.__init__')
+        self.ttl = max(float(ttl), 0.0)
+        self.stale_seconds = max(float(stale_seconds), 0.0)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._snapshots: Dict[int, CourtSnapshot] = {}
+        self._inflight: Dict[int, asyncio.Task] = {}
+        self.stats: Dict[str, int] = {
+            'hits': 0,
+            'stale_hits': 0,
+            'misses': 0,
+            'coalesced': 0,
+            'reloads': 0,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        t('automation.availability.snapshot_cache.AvailabilitySnapshotCache.enabled')
+        return self.ttl > 0
+
+    async def get(self, court: int, loader: Loader) -> CourtSlots:
+        """Return availability for ``court``, calling ``loader`` only when needed.
+
+        Errors raised by ``loader`` reach every coalesced caller and are never
+        cached.
+        """
+
+        t('automation.availability.snapshot_cache.AvailabilitySnapshotCache.get')
+        if not self.enabled:
+            return await loader()
+
+        now = self._clock()
+        with self._lock:
+            snapshot = self._snapshots.get(court)
+            age = now - snapshot.fetched_at if snapshot else None
+            if snapshot is not None and age <= self.ttl:
+                self.stats['hits'] += 1
+                return copy.deepcopy(snapshot.slots)
+            if snapshot is not None and age <= self.ttl + self.stale_seconds:
+                self.stats['stale_hits'] += 1
+                self._start_reload_locked(court, loader)
+                return copy.deepcopy(snapshot.slots)
+            task = self._inflight.get(court)
+            if task is not None and task.get_loop() is asyncio.get_running_loop():
+                self.stats['coalesced'] += 1
+            else:
+                self.stats['misses'] += 1
+                task = self._start_reload_locked(court, loader)
+
+        return copy.deepcopy(await asyncio.shield(task))
+
+    def invalidate(self, court: Optional[int] = None) -> None:
+        """Drop the snapshot for ``court`` (or every court)."""
+
+        t('automation.availability.snapshot_cache.AvailabilitySnapshotCache.invalidate')
+        with self._lock:
+            if court is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(court, None)
+
+    def _start_reload_locked(self, court: int, loader: Loader) -> asyncio.Task:
+        t('automation.availability.snapshot_cache.AvailabilitySnapshotCache._start_reload_locked')
+        task = self._inflight.get(court)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            return task
+        self.stats['reloads'] += 1
+        task = asyncio.ensure_future(self._reload(court, loader))
+        # Background revalidations may have no awaiting caller.
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self._inflight[court] = task
+        return task
+
+    async def _reload(self, court: int, loader: Loader) -> CourtSlots:
+        t('automation.availability.snapshot_cache.AvailabilitySnapshotCache._reload')
+        try:
+            slots = await loader()
+        except BaseException as exc:
+            with self._lock:
+                stale = court in self._snapshots
+            if stale and not isinstance(exc, asyncio.CancelledError):
+                logger.warning("Background availability refresh failed for court %s: %s", court, exc)
+            raise
+        else:
+            with self._lock:
+                self._snapshots[court] = CourtSnapshot(slots=slots, fetched_at=self._clock())
+            return slots
+        finally:
+            with self._lock:
+                if self._inflight.get(court) is asyncio.current_task():
+                    del self._inflight[court]
+
+
+_CACHE_LOCK = threading.Lock()
+_CACHE: Optional[AvailabilitySnapshotCache] = None
+
+
+def get_availability_cache() -> AvailabilitySnapshotCache:
+    """Return the shared cache, sized from ``AVAILABILITY_CACHE_*`` settings."""
+
+    t('automation.availability.snapshot_cache.get_availability_cache')
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            settings = get_settings()
+            _CACHE = AvailabilitySnapshotCache(
+                ttl=settings.availability_cache_ttl,
+                stale_seconds=settings.availability_cache_stale_seconds,
+            )
+        return _CACHE
+
+
+__all__ = ['AvailabilitySnapshotCache', 'CourtSnapshot', 'get_availability_cache']
@@ -14,7 +14,9 @@ from playwright.async_api import Browser, BrowserContext, Page
 from automation.browser.pool import health as pool_health
 from automation.browser.pool import tasks as pool_tasks
 from automation.browser.pool.manager import BrowserPoolManager
-from infrastructure.constants import COURT_CONFIG
+from automation.browser.pool.modes import get_launch_profile
+from infrastructure.court_topology import get_court_topology
+from infrastructure.settings import get_settings
 
 PRODUCTION_MODE = os.getenv("PRODUCTION_MODE", "false").lower() == "true"
 logger = logging.getLogger(__name__)
@@ -67,14 +69,12 @@ class AsyncBrowserPool:
         """Return direct court URLs from centralized configuration."""
 
         t("automation.browser.async_browser_pool.AsyncBrowserPool.DIRECT_COURT_URLS")
-        return {
-            court_num: config["direct_url"]
-            for court_num, config in COURT_CONFIG.items()
-        }
+        return get_court_topology().direct_urls()
 
-    def __init__(self, courts: Optional[List[int]] = None) -> None:
+    def __init__(self, courts: Optional[List[int]] = None, mode: Optional[str] = None) -> None:
         t("automation.browser.async_browser_pool.AsyncBrowserPool.__init__")
-        self.courts = courts or [1, 2, 3]
+        self.courts = courts or get_court_topology().numbers
+        self.mode = get_launch_profile(mode or get_settings().browser_pool_mode).mode
         self.pages: Dict[int, Page] = {}
         self.contexts: Dict[int, BrowserContext] = {}
         self.lock = asyncio.Lock()
@@ -82,6 +82,9 @@ class AsyncBrowserPool:
         self.playwright = None
         self.critical_operation_in_progress = False
         self.is_partially_ready = False
+        # Filled by start(): cold/warm kind, courts, and time-to-ready figures
+        self.start_requested_at: Optional[float] = None
+        self.startup_report: Dict[str, Any] = {}
         self.production_mode = PRODUCTION_MODE
         self.manager = BrowserPoolManager(self, log=logger)
 
@@ -97,6 +100,31 @@ class AsyncBrowserPool:
         t("automation.browser.async_browser_pool.AsyncBrowserPool.enable_natural_navigation")
         self.manager.enable_natural_navigation(enabled)
 
+    def enable_resource_blocking(self, enabled: bool = True) -> None:
+        """Abort images, fonts, trackers and third-party scripts on court pages.
+
+        Applies to contexts created after the call (pool start and page
+        recovery), so enable it before :meth:`start`.
+        """
+        t("automation.browser.async_browser_pool.AsyncBrowserPool.enable_resource_blocking")
+        self.manager.enable_resource_blocking(enabled)
+
+    def enable_hot_standby(self, enabled: bool = True) -> None:
+        """Keep a warm spare context per court for instant page replacement.
+
+        Enable before :meth:`start`; see ``automation.browser.pool.standby``.
+        """
+        t("automation.browser.async_browser_pool.AsyncBrowserPool.enable_hot_standby")
+        self.manager.enable_hot_standby(enabled)
+
+    def enable_fast_start(self, enabled: bool = True, profiles_dir: Optional[str] = None) -> None:
+        """Keep a persistent Chromium profile per court so restarts start warm.
+
+        Enable before :meth:`start`; see ``automation.browser.pool.profiles``.
+        """
+        t("automation.browser.async_browser_pool.AsyncBrowserPool.enable_fast_start")
+        self.manager.enable_fast_start(enabled, profiles_dir)
+
     start = _manager_delegate(
         "start_pool",
         "automation.browser.async_browser_pool.AsyncBrowserPool.start",
@@ -148,7 +176,13 @@ class AsyncBrowserPool:
     refresh_browser_pages = _manager_delegate(
         "refresh_browser_pages",
         "automation.browser.async_browser_pool.AsyncBrowserPool.refresh_browser_pages",
-        "Refresh all initialized court pages.",
+        "Refresh all initialized court pages, or only the given ``courts``.",
+    )
+
+    promote_standby = _manager_delegate(
+        "promote_standby",
+        "automation.browser.async_browser_pool.AsyncBrowserPool.promote_standby",
+        "Swap in a court's hot-standby context; False when none is ready.",
     )
 
     set_critical_operation = _manager_delegate(
@@ -199,6 +233,13 @@ class AsyncBrowserPool:
         is_async=False,
     )
 
+    get_memory_stats = _health_delegate(
+        "get_memory_stats",
+        "automation.browser.async_browser_pool.AsyncBrowserPool.get_memory_stats",
+        "Report per-context JS heap usage and the Chromium process RSS.",
+        is_async=True,
+    )
+
     get_available_courts = _health_delegate(
         "get_available_courts",
         "automation.browser.async_browser_pool.AsyncBrowserPool.get_available_courts",
@@ -9,6 +9,7 @@ import time
 from typing import Dict, Optional
 
 from automation.browser.pool.manager import BrowserPoolManager
+from automation.browser.pool.modes import browser_process_rss_mb, sample_context_memory
 
 logger = logging.getLogger(__name__)
 
@@ -27,11 +28,28 @@ async def wait_until_ready(pool, timeout: float = 30) -> bool:
     start_time = time.time()
     while time.time() - start_time < timeout:
         if is_ready(pool):
+            _record_time_to_ready(pool)
             return True
         await asyncio.sleep(0.5)
     return False
 
 
+def _record_time_to_ready(pool) -> None:
+    """Log and store how long after ``start()`` the pool first became usable."""
+
+    t('automation.browser.pool.health._record_time_to_ready')
+    started = getattr(pool, 'start_requested_at', None)
+    report = getattr(pool, 'startup_report', None)
+    if started is None or report is None or 'time_to_ready_s' in report:
+        return
+    report['time_to_ready_s'] = time.monotonic() - started
+    logger.info(
+        "Browser pool ready %.2fs after start (%s start)",
+        report['time_to_ready_s'],
+        report.get('kind', 'unknown'),
+    )
+
+
 def get_initialization_error(pool) -> Optional[str]:
     """Return initialization error details if the pool is not ready."""
 
@@ -45,6 +63,7 @@ def get_stats(pool) -> Dict[str, object]:
     """Gather basic statistics about the browser pool."""
 
     t('automation.browser.pool.health.get_stats')
+    route_stats = getattr(getattr(pool, 'manager', None), 'route_stats', {})
     return {
         'browser_count': len(pool.pages),
         'browsers_created': len(pool.pages),
@@ -65,6 +84,25 @@ def get_stats(pool) -> Dict[str, object]:
             for court in pool.pages.keys()
         },
         'available_courts': list(pool.pages.keys()),
+        'blocked_requests': {court: stats.blocked for court, stats in route_stats.items()},
+        'startup': dict(getattr(pool, 'startup_report', None) or {}),
+    }
+
+
+async def get_memory_stats(pool) -> Dict[str, object]:
+    """Sample per-context memory and the Chromium process RSS."""
+
+    t('automation.browser.pool.health.get_memory_stats')
+    contexts: Dict[int, Dict[str, object]] = {}
+    for court, page in list(pool.pages.items()):
+        try:
+            contexts[court] = await sample_context_memory(page)
+        except Exception as exc:
+            contexts[court] = {'error': str(exc)}
+    return {
+        'mode': getattr(pool, 'mode', None),
+        'contexts': contexts,
+        'browser_rss_mb': browser_process_rss_mb(),
     }
 
 
@@ -107,6 +145,9 @@ async def get_page(pool, court_num: int):
             return page
         except Exception as exc:
             logger.warning("Court %s page connection is dead: %s. Recreating...", court_num, exc)
+            standby = getattr(getattr(pool, 'manager', None), 'standby', None)
+            if standby and standby.promote(court_num, reason="dead page"):
+                return pool.pages.get(court_num)
             await _close_page_and_context(pool, court_num)
             try:
                 manager = BrowserPoolManager(pool, log=logger)
@@ -7,13 +7,24 @@ import asyncio
 import logging
 import os
 import random
+import time
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional
 
 from playwright.async_api import async_playwright
 
+from automation.browser.pool.modes import get_launch_profile
+from automation.browser.pool.profiles import PersistentProfiles
+from automation.browser.pool.standby import HotStandby
+from automation.browser.resource_blocking import (
+    DEFAULT_RESOURCE_PROFILE,
+    ResourceBlockingProfile,
+    RouteStats,
+)
 from automation.executors.flows.human_behaviors import HumanLikeActions
 from infrastructure.constants import BrowserPoolConfig, BrowserTimeouts
+from infrastructure.court_topology import get_court_topology
+from infrastructure.settings import get_settings
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +44,17 @@ class BrowserPoolManager:
         self.logger = log or logger
         # Default to False for backward compatibility - must be explicitly enabled
         self.use_natural_navigation = False
+        self.resource_profile: Optional[ResourceBlockingProfile] = (
+            DEFAULT_RESOURCE_PROFILE if get_settings().browser_resource_blocking else None
+        )
+        self.route_stats: Dict[int, RouteStats] = {}
+        self.page_opened_at: Dict[int, float] = {}
+        settings = get_settings()
+        self.fast_start = settings.browser_fast_start
+        self.profiles_root = Path(settings.browser_user_data_dir)
+        self.standby: Optional[HotStandby] = None
+        if settings.browser_hot_standby:
+            self.enable_hot_standby()
 
     def enable_natural_navigation(self, enabled: bool = True) -> None:
         """Enable or disable natural navigation for anti-bot evasion.
@@ -48,6 +70,63 @@ class BrowserPoolManager:
         else:
             self.logger.info("Natural navigation disabled - using direct court page navigation")
 
+    def enable_resource_blocking(
+        self,
+        enabled: bool = True,
+        profile: Optional[ResourceBlockingProfile] = None,
+    ) -> None:
+        """Enable or disable request filtering for court contexts created from now on.
+
+        Args:
+            enabled: True to abort non-essential resources and trackers
+            profile: Custom profile; defaults to ``DEFAULT_RESOURCE_PROFILE``
+        """
+        t('automation.browser.pool.manager.BrowserPoolManager.enable_resource_blocking')
+        self.resource_profile = (profile or DEFAULT_RESOURCE_PROFILE) if enabled else None
+        self.logger.info("Resource blocking %s", "enabled" if enabled else "disabled")
+
+    def enable_hot_standby(self, enabled: bool = True) -> None:
+        """Keep a warm spare context per court to swap in when a page degrades.
+
+        Spares are warmed after :meth:`start_pool` and after every refresh
+        cycle; each one costs a second browser context per court.
+        """
+        t('automation.browser.pool.manager.BrowserPoolManager.enable_hot_standby')
+        if enabled and self.fast_start:
+            # A persistent profile can only be open once, so a court cannot have a spare
+            self.logger.warning("Hot standby is not available with persistent profiles (fast start)")
+            return
+        if enabled and self.standby is None:
+            self.standby = HotStandby(
+                self,
+                max_age_seconds=get_settings().browser_page_max_age_seconds,
+                log=self.logger,
+            )
+        elif not enabled:
+            self.standby = None
+        self.logger.info("Hot standby contexts %s", "enabled" if enabled else "disabled")
+
+    def enable_fast_start(self, enabled: bool = True, root: Optional[Path | str] = None) -> None:
+        """Run each court in a persistent profile so restarts reuse cookies and cache.
+
+        Must be called before :meth:`start_pool`; disables hot standby.
+        """
+        t('automation.browser.pool.manager.BrowserPoolManager.enable_fast_start')
+        self.fast_start = enabled
+        if root is not None:
+            self.profiles_root = Path(root)
+        if enabled:
+            self.standby = None
+        self.logger.info(
+            "Fast start %s (profiles in %s)", "enabled" if enabled else "disabled", self.profiles_root
+        )
+
+    async def promote_standby(self, court: int, reason: str = "recovery") -> bool:
+        """Swap in the court's hot-standby context; False when none is ready."""
+
+        t('automation.browser.pool.manager.BrowserPoolManager.promote_standby')
+        return bool(self.standby and self.standby.promote(court, reason=reason))
+
     @staticmethod
     def _get_storage_state_path(court: int) -> Path:
         """Get path to saved browser state for a court."""
@@ -92,38 +171,64 @@ class BrowserPoolManager:
         """Initialize Playwright, launch Chromium, and prepare court pages."""
 
         t("automation.browser.pool.manager.BrowserPoolManager.start_pool")
+        started = time.monotonic()
         try:
             self.logger.info("Starting Playwright...")
             self.pool.playwright = await async_playwright().start()
 
-            self.logger.info("Launching Chromium browser...")
-            self.pool.browser = await self.pool.playwright.chromium.launch(
-                headless=False,
-                args=[
-                    "--no-sandbox",
-                    "--disable-dev-shm-usage",
-                    "--disable-blink-features=AutomationControlled",
-                    "--disable-infobars",
-                    "--window-size=1920,1080",
-                    "--start-maximized",
-                ],
-            )
+            launch_profile = get_launch_profile(getattr(self.pool, "mode", None))
+            if self.fast_start:
+                self.logger.info(
+                    "Using persistent court profiles in %s (%s mode)",
+                    self.profiles_root,
+                    launch_profile.mode,
+                )
+                self.pool.browser = PersistentProfiles(
+                    self.pool.playwright.chromium,
+                    self.profiles_root,
+                    launch_profile.launch_kwargs(),
+                )
+                warm = [c for c in self.pool.courts if self.pool.browser.is_warm(c)]
+            else:
+                self.logger.info("Launching Chromium browser (%s mode)...", launch_profile.mode)
+                self.pool.browser = await self.pool.playwright.chromium.launch(
+                    **launch_profile.launch_kwargs()
+                )
+                warm = []
+            cold = [c for c in self.pool.courts if c not in warm]
+            self.pool.start_requested_at = started
+            self.pool.startup_report = {
+                "kind": "warm" if not cold else "cold" if not warm else "mixed",
+                "warm_courts": warm,
+                "cold_courts": cold,
+            }
 
             self.logger.info(
                 "Initializing browser pool with parallel navigation and retry"
             )
+            # Bound concurrent page loads per Acuity host so a large topology
+            # does not open every court against the same club at once.
+            per_host = get_settings().browser_max_pages_per_host
+            ordered: list[int] = []
             tasks = []
-            for index, court in enumerate(self.pool.courts):
-                delay = index * 1.5
-                tasks.append(
-                    self.create_and_navigate_court_page_with_stagger(court, delay)
-                )
+            for courts in get_court_topology().courts_by_host(self.pool.courts).values():
+                semaphore = asyncio.Semaphore(per_host)
+                # Warm profiles only need validating, so they go first with no
+                # stagger; cold courts keep the staggered start.
+                cold_position = 0
+                for court in sorted(courts, key=lambda c: c in cold):
+                    delay = 0.0
+                    if court in cold:
+                        delay = (cold_position % per_host) * 1.5
+                        cold_position += 1
+                    ordered.append(court)
+                    tasks.append(self._start_court_page(court, delay, semaphore))
 
             results = await asyncio.gather(*tasks, return_exceptions=True)
 
             successful_courts = 0
             failed_courts: list[int] = []
-            for court, result in zip(self.pool.courts, results):
+            for court, result in zip(ordered, results):
                 if isinstance(result, Exception):
                     self.logger.error(
                         "❌ Court %s failed to initialize: %s", court, result
@@ -154,10 +259,31 @@ class BrowserPoolManager:
                 )
 
             self.pool.is_partially_ready = successful_courts < len(self.pool.courts)
+            self.pool.startup_report["all_courts_ready_s"] = time.monotonic() - started
+            self.logger.info(
+                "Browser pool %s start: all courts ready in %.2fs (warm %s, cold %s)",
+                self.pool.startup_report["kind"],
+                self.pool.startup_report["all_courts_ready_s"],
+                warm,
+                cold,
+            )
+            if self.standby:
+                self.standby.replenish(list(self.pool.pages))
         except Exception:
             await self.cleanup_on_failure()
             raise
 
+    async def _start_court_page(
+        self, court: int, initial_delay: float, semaphore: asyncio.Semaphore
+    ):
+        """Create one court page while holding its host's page-load slot."""
+
+        t("automation.browser.pool.manager.BrowserPoolManager._start_court_page")
+        async with semaphore:
+            return await self.create_and_navigate_court_page_with_stagger(
+                court, initial_delay
+            )
+
     async def create_and_navigate_court_page_with_stagger(
         self, court: int, initial_delay: float
     ):
@@ -212,6 +338,45 @@ class BrowserPoolManager:
         t(
             "automation.browser.pool.manager.BrowserPoolManager.create_and_navigate_court_page_safe"
         )
+        try:
+            context, page, route_stats = await self.open_court_context(court)
+        except Exception as exc:
+            await self._cleanup_failed_page(court)
+            raise exc
+        self.install_court_page(court, context, page, route_stats)
+        return True
+
+    def install_court_page(
+        self,
+        court: int,
+        context,
+        page,
+        route_stats: Optional[RouteStats] = None,
+        *,
+        opened_at: Optional[float] = None,
+    ) -> None:
+        """Make ``page`` the live page for ``court`` (a synchronous pointer swap)."""
+
+        t("automation.browser.pool.manager.BrowserPoolManager.install_court_page")
+        self.pool.pages[court] = page
+        self.pool.contexts[court] = context
+        self.page_opened_at[court] = time.monotonic() if opened_at is None else opened_at
+        if route_stats is not None:
+            self.route_stats[court] = route_stats
+
+    async def open_court_context(self, court: int):
+        """Create a navigated, warmed-up context + page for ``court`` without installing it.
+
+        Returns ``(context, page, route_stats)``; the context is closed again
+        if navigation fails.
+        """
+
+        t("automation.browser.pool.manager.BrowserPoolManager.open_court_context")
+        context = None
+        route_stats: Optional[RouteStats] = None
+        persistent = isinstance(self.pool.browser, PersistentProfiles)
+        # A reused profile is already a returning user with a primed cache
+        returning = persistent and self.pool.browser.is_warm(court)
         try:
             # Check for saved browser state (returning user simulation)
             context_kwargs = {
@@ -226,13 +391,19 @@ class BrowserPoolManager:
             }
 
             # Load saved state if exists (makes browser appear as returning user)
-            if self._has_saved_state(court):
+            if not persistent and self._has_saved_state(court):
                 state_path = str(self._get_storage_state_path(court))
                 context_kwargs["storage_state"] = state_path
                 self.logger.info("Court %s: Loading saved browser state (returning user)", court)
 
-            context = await self.pool.browser.new_context(**context_kwargs)
-            page = await context.new_page()
+            if persistent:
+                context = await self.pool.browser.open_context(court, **context_kwargs)
+            else:
+                context = await self.pool.browser.new_context(**context_kwargs)
+            if self.resource_profile is not None:
+                route_stats = await self.resource_profile.apply(context)
+            # Persistent contexts open with a blank tab; reuse it
+            page = context.pages[0] if persistent and context.pages else await context.new_page()
 
             # Enhanced stealth script for comprehensive bot detection evasion
             await page.add_init_script(
@@ -428,22 +599,20 @@ class BrowserPoolManager:
             """
             )
 
-            self.pool.pages[court] = page
-            self.pool.contexts[court] = context
-
             if court in self.pool.DIRECT_COURT_URLS:
                 court_url = self.pool.DIRECT_COURT_URLS[court]
 
                 # Natural navigation: Visit main site first for anti-bot evasion
-                if self.use_natural_navigation:
+                if self.use_natural_navigation and not returning:
                     if not self.pool.production_mode:
                         self.logger.info(
                             "Court %s: Natural navigation - visiting main site first", court
                         )
 
                     # Step 1: Visit main site
+                    topology_court = get_court_topology().get(court)
                     await page.goto(
-                        MAIN_SITE_URL,
+                        topology_court.base_url if topology_court else MAIN_SITE_URL,
                         wait_until="networkidle",
                         timeout=BrowserTimeouts.SLOW_NAVIGATION,
                     )
@@ -498,24 +667,30 @@ class BrowserPoolManager:
                         court,
                     )
 
-                warmup_delay = getattr(self.pool, "WARMUP_DELAY", 10.0)
+                warmup_delay = 0.0 if returning else getattr(self.pool, "WARMUP_DELAY", 10.0)
                 self.logger.info(
                     "Court %s: Warming up browser for %ss", court, warmup_delay
                 )
                 await asyncio.sleep(warmup_delay)
                 self.logger.info("Court %s: Browser warm-up completed", court)
 
-                # Save browser state for future sessions (returning user simulation)
-                await self._save_context_state(context, court)
+                # Save browser state for future sessions (returning user simulation);
+                # persistent profiles keep it themselves
+                if not persistent:
+                    await self._save_context_state(context, court)
             else:
                 self.logger.warning(
                     "Court %s: No direct URL available for pre-navigation", court
                 )
 
-            return True
-        except Exception as exc:
-            await self._cleanup_failed_page(court)
-            raise exc
+            return context, page, route_stats
+        except Exception:
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception:
+                    pass
+            raise
 
     async def cleanup_on_failure(self) -> None:
         """Clean up resources when startup fails."""
@@ -530,6 +705,8 @@ class BrowserPoolManager:
         t('automation.browser.pool.manager.BrowserPoolManager._cleanup_failed_page')
 
         if court is not None:
+            self.route_stats.pop(court, None)
+            self.page_opened_at.pop(court, None)
             page = self.pool.pages.pop(court, None)
             if page:
                 try:
@@ -556,6 +733,8 @@ class BrowserPoolManager:
                     pass
             self.pool.pages.clear()
             self.pool.contexts.clear()
+            self.route_stats.clear()
+            self.page_opened_at.clear()
 
             if self.pool.browser:
                 try:
@@ -579,8 +758,10 @@ class BrowserPoolManager:
             self.pool.critical_operation_in_progress = in_progress
             self.logger.info("Critical operation flag set to: %s", in_progress)
 
-    async def refresh_browser_pages(self) -> Dict[int, bool]:
-        """Refresh all initialized court pages to prevent staleness."""
+    async def refresh_browser_pages(
+        self, courts: Optional[Iterable[int]] = None
+    ) -> Dict[int, bool]:
+        """Refresh initialized court pages (all, or only ``courts``) to prevent staleness."""
 
         t("automation.browser.pool.manager.BrowserPoolManager.refresh_browser_pages")
         refresh_results: Dict[int, bool] = {}
@@ -590,8 +771,14 @@ class BrowserPoolManager:
             self.logger.warning("No browser pages to refresh")
             return refresh_results
 
-        for court in self.pool.courts:
+        targets = self.pool.courts if courts is None else list(courts)
+        for court in targets:
             page = self.pool.pages.get(court)
+            if self.standby and (not page or self.standby.is_stale(court)):
+                reason = "page aged out" if page else "page missing"
+                if self.standby.promote(court, reason=reason):
+                    refresh_results[court] = True
+                    continue
             if not page:
                 self.logger.warning("Court %s has no page to refresh", court)
                 refresh_results[court] = False
@@ -610,7 +797,12 @@ class BrowserPoolManager:
                 refresh_results[court] = True
             except Exception as exc:
                 self.logger.error("❌ Failed to refresh Court %s: %s", court, exc)
-                refresh_results[court] = False
+                refresh_results[court] = bool(
+                    self.standby and self.standby.promote(court, reason="refresh failed")
+                )
+
+        if self.standby:
+            self.standby.replenish(targets)
 
         successful = sum(1 for success in refresh_results.values() if success)
         self.logger.info(
@@ -650,6 +842,9 @@ class BrowserPoolManager:
                     "✅ Critical operations completed, proceeding with shutdown"
                 )
 
+        if self.standby:
+            await self.standby.close()
+
         page_errors = []
         for court, page in self.pool.pages.items():
             try:
@@ -682,6 +877,8 @@ class BrowserPoolManager:
 
         self.pool.pages.clear()
         self.pool.contexts.clear()
+        self.route_stats.clear()
+        self.page_opened_at.clear()
         self.logger.info("✅ Page and context dictionaries cleared")
 
         if self.pool.browser:
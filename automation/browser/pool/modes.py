@@ -0,0 +1,130 @@
+"""Launch profiles and memory sampling for the async browser pool.
+
+Every mode runs a single Chromium process with one ``BrowserContext`` per
+court; the mode only changes how that process is launched. ``headed`` is the
+historical maximised window. ``headless`` drops the window, GPU compositing
+and background services, which is what bounds RSS on small hosts. Select it
+with ``BROWSER_POOL_MODE=headless`` or ``AsyncBrowserPool(mode="headless")``.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+
+from tracking import t
+
+POOL_MODE_HEADED = 'headed'
+POOL_MODE_HEADLESS = 'headless'
+
+_COMMON_ARGS: Tuple[str, ...] = (
+    '--no-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-blink-features=AutomationControlled',
+    '--window-size=1920,1080',
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class PoolLaunchProfile:
+    """Arguments for ``chromium.launch`` in a given pool mode."""
+
+    mode: str
+    headless: bool
+    args: Tuple[str, ...]
+
+    def launch_kwargs(self) -> Dict[str, Any]:
+        t('automation.browser.pool.modes.PoolLaunchProfile.launch_kwargs')
+        return {'headless': self.headless, 'args': list(self.args)}
+
+
+POOL_LAUNCH_PROFILES: Dict[str, PoolLaunchProfile] = {
+    POOL_MODE_HEADED: PoolLaunchProfile(
+        mode=POOL_MODE_HEADED,
+        headless=False,
+        args=_COMMON_ARGS + ('--disable-infobars', '--start-maximized'),
+    ),
+    POOL_MODE_HEADLESS: PoolLaunchProfile(
+        mode=POOL_MODE_HEADLESS,
+        headless=True,
+        args=_COMMON_ARGS + (
+            '--disable-gpu',
+            '--disable-extensions',
+            '--disable-background-networking',
+            '--disable-component-update',
+            '--disable-default-apps',
+            '--disable-sync',
+            '--metrics-recording-only',
+            '--mute-audio',
+            '--no-first-run',
+        ),
+    ),
+}
+
+
+def get_launch_profile(mode: Optional[str]) -> PoolLaunchProfile:
+    """Return the launch profile for ``mode``, defaulting to ``headed``."""
+
+    t('automation.browser.pool.modes.get_launch_profile')
+    normalized = (mode or POOL_MODE_HEADED).strip().lower()
+    profile = POOL_LAUNCH_PROFILES.get(normalized)
+    if profile is None:
+        logger.warning("Unknown browser pool mode %r; using %s", mode, POOL_MODE_HEADED)
+        profile = POOL_LAUNCH_PROFILES[POOL_MODE_HEADED]
+    return profile
+
+
+async def sample_context_memory(page: Any) -> Dict[str, float]:
+    """Return JS heap and DOM counters for ``page`` through a CDP session."""
+
+    t('automation.browser.pool.modes.sample_context_memory')
+    session = await page.context.new_cdp_session(page)
+    try:
+        await session.send('Performance.enable')
+        response = await session.send('Performance.getMetrics')
+    finally:
+        await session.detach()
+    metrics = {item['name']: item['value'] for item in response.get('metrics', [])}
+    return {
+        'js_heap_used_mb': round(metrics.get('JSHeapUsedSize', 0.0) / 1_048_576, 2),
+        'js_heap_total_mb': round(metrics.get('JSHeapTotalSize', 0.0) / 1_048_576, 2),
+        'dom_nodes': int(metrics.get('Nodes', 0)),
+        'documents': int(metrics.get('Documents', 0)),
+    }
+
+
+def browser_process_rss_mb() -> Optional[float]:
+    """Return the summed RSS of Chromium processes spawned by this process.
+
+    Returns ``None`` when ``psutil`` is unavailable.
+    """
+
+    t('automation.browser.pool.modes.browser_process_rss_mb')
+    try:
+        import psutil  # type: ignore
+    except ImportError:
+        return None
+
+    total = 0
+    for child in psutil.Process().children(recursive=True):
+        try:
+            name = child.name().lower()
+            if 'chrom' in name or 'headless_shell' in name:
+                total += child.memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return round(total / 1_048_576, 1)
+
+
+__all__ = [
+    'POOL_LAUNCH_PROFILES',
+    'POOL_MODE_HEADED',
+    'POOL_MODE_HEADLESS',
+    'PoolLaunchProfile',
+    'browser_process_rss_mb',
+    'get_launch_profile',
+    'sample_context_memory',
+]
@@ -0,0 +1,86 @@
+"""Persistent per-court Chromium profiles for fast pool restarts.
+
+In fast-start mode (``BROWSER_FAST_START``), each court runs in its own
+``launch_persistent_context`` with a user-data directory under
+``BROWSER_USER_DATA_DIR``. Cookies, local storage and the HTTP cache then
+survive restarts. A court whose profile already exists is a warm start: the
+pool validates its page in parallel and skips the staggered, returning-user
+warm-up that a cold court needs.
+
+:class:`PersistentProfiles` stands in for ``pool.browser``, so readiness
+checks, recovery and shutdown keep working unchanged.
+"""
+
+from __future__ import annotations
+from tracking import t
+
+import logging
+from pathlib import Path
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class PersistentProfiles:
+    """One persistent Chromium context per court, addressed like a ``Browser``."""
+
+    def __init__(self, chromium: Any, root: Path | str, launch_kwargs: Dict[str, Any]) -> None:
+        t('automation.browser.pool.profiles.PersistentProfiles.__init__')
+        self.chromium = chromium
+        self.root = Path(root)
+        self.launch_kwargs = dict(launch_kwargs)
+        self.contexts: Dict[int, Any] = {}
+        self._closed = False
+
+    def profile_dir(self, court: int) -> Path:
+        t('automation.browser.pool.profiles.PersistentProfiles.profile_dir')
+        return self.root / f"court_{court}"
+
+    def is_warm(self, court: int) -> bool:
+        """Return True when ``court`` has a profile from a previous run."""
+
+        t('automation.browser.pool.profiles.PersistentProfiles.is_warm')
+        directory = self.profile_dir(court)
+        return directory.is_dir() and any(directory.iterdir())
+
+    async def open_context(self, court: int, **context_kwargs: Any) -> Any:
+        """Launch the persistent context for ``court``, replacing any open one.
+
+        Chromium locks a profile directory, so the court's previous context
+        is closed first.
+        """
+
+        t('automation.browser.pool.profiles.PersistentProfiles.open_context')
+        previous = self.contexts.pop(court, None)
+        if previous is not None:
+            try:
+                await previous.close()
+            except Exception:
+                pass
+
+        # The profile itself carries cookies and storage
+        context_kwargs.pop('storage_state', None)
+        directory = self.profile_dir(court)
+        directory.mkdir(parents=True, exist_ok=True)
+        context = await self.chromium.launch_persistent_context(
+            str(directory), **self.launch_kwargs, **context_kwargs
+        )
+        self.contexts[court] = context
+        return context
+
+    def is_connected(self) -> bool:
+        t('automation.browser.pool.profiles.PersistentProfiles.is_connected')
+        return not self._closed
+
+    async def close(self) -> None:
+        t('automation.browser.pool.profiles.PersistentProfiles.close')
+        self._closed = True
+        for court, context in list(self.contexts.items()):
+            try:
+                await context.close()
+            except Exception as exc:
+                logger.debug("Court %s: error closing persistent context: %s", court, exc)
+        self.contexts.clear()
+
+
+__all__ = ['PersistentProfiles']
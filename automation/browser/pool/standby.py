@@ -0,0 +1,168 @@
+"""Hot-standby court contexts for the async browser pool.
+
+With ``BROWSER_HOT_STANDBY`` enabled, every court keeps a spare context in
+the shared Chromium, already navigated to the court calendar and warmed up.
+When the live page dies, fails to refresh, or gets older than
+``BROWSER_PAGE_MAX_AGE_SECONDS``, :meth:`HotStandby.promote` swaps the spare
+in. The swap is a synchronous dictionary update, so no other coroutine ever
+sees a court without a page. The old context is closed in the background
+and a new spare warms up behind it.
+"""
+
+from __future__ import annotations
+from tracking import t
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from automation.browser.resource_blocking import RouteStats
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StandbyContext:
+    """A spare, navigated context waiting to replace a court's live page."""
+
+    court: int
+    context: Any
+    page: Any
+    route_stats: Optional[RouteStats]
+    opened_at: float
+
+    def is_alive(self) -> bool:
+        t('automation.browser.pool.standby.StandbyContext.is_alive')
+        try:
+            return not self.page.is_closed()
+        except Exception:
+            return False
+
+
+async def _close_quietly(page: Any, context: Any) -> None:
+    """Close a retired page and context, ignoring already-dead targets."""
+
+    t('automation.browser.pool.standby._close_quietly')
+    for target in (page, context):
+        if target is None:
+            continue
+        try:
+            await target.close()
+        except Exception:
+            pass
+
+
+class HotStandby:
+    """Keep one warm spare context per court and swap it in on demand."""
+
+    def __init__(self, manager, *, max_age_seconds: float, log: logging.Logger | None = None) -> None:
+        t('automation.browser.pool.standby.HotStandby.__init__')
+        self.manager = manager
+        self.max_age_seconds = max_age_seconds
+        self.logger = log or logger
+        self.spares: Dict[int, StandbyContext] = {}
+        self.promotions = 0
+        self._warming: Dict[int, asyncio.Task] = {}
+        self._draining: Set[asyncio.Task] = set()
+
+    def has_spare(self, court: int) -> bool:
+        t('automation.browser.pool.standby.HotStandby.has_spare')
+        spare = self.spares.get(court)
+        return bool(spare and spare.is_alive())
+
+    def is_stale(self, court: int) -> bool:
+        """Return True when the live page for ``court`` is past its maximum age."""
+
+        t('automation.browser.pool.standby.HotStandby.is_stale')
+        opened_at = self.manager.page_opened_at.get(court)
+        return opened_at is not None and time.monotonic() - opened_at > self.max_age_seconds
+
+    def replenish(self, courts: Iterable[int]) -> List[asyncio.Task]:
+        """Start warming a spare for each court whose spare is missing, dead or aged.
+
+        An aged spare stays in place until its replacement is ready.
+        """
+
+        t('automation.browser.pool.standby.HotStandby.replenish')
+        now = time.monotonic()
+        started: List[asyncio.Task] = []
+        for court in courts:
+            if court in self._warming:
+                continue
+            spare = self.spares.get(court)
+            if spare is not None and spare.is_alive() and now - spare.opened_at <= self.max_age_seconds:
+                continue
+            task = asyncio.create_task(self._warm(court), name=f"standby-court-{court}")
+            self._warming[court] = task
+            started.append(task)
+        return started
+
+    async def _warm(self, court: int) -> bool:
+        t('automation.browser.pool.standby.HotStandby._warm')
+        try:
+            context, page, route_stats = await self.manager.open_court_context(court)
+        except Exception as exc:
+            self.logger.warning("Court %s: hot standby warm-up failed: %s", court, exc)
+            return False
+        finally:
+            self._warming.pop(court, None)
+
+        previous = self.spares.get(court)
+        self.spares[court] = StandbyContext(court, context, page, route_stats, time.monotonic())
+        if previous is not None:
+            self._drain(previous.page, previous.context)
+        self.logger.info("Court %s: hot standby context ready", court)
+        return True
+
+    def promote(self, court: int, *, reason: str) -> bool:
+        """Swap the spare in as the live page for ``court``; False when none is ready."""
+
+        t('automation.browser.pool.standby.HotStandby.promote')
+        spare = self.spares.pop(court, None)
+        if spare is None or not spare.is_alive():
+            if spare is not None:
+                self._drain(spare.page, spare.context)
+            return False
+
+        pool = self.manager.pool
+        old_page, old_context = pool.pages.get(court), pool.contexts.get(court)
+        self.manager.install_court_page(
+            court, spare.context, spare.page, spare.route_stats, opened_at=spare.opened_at
+        )
+        self.promotions += 1
+        self.logger.info("Court %s: promoted hot standby context (%s)", court, reason)
+
+        self._drain(old_page, old_context)
+        self.replenish([court])
+        return True
+
+    def _drain(self, page: Any, context: Any) -> None:
+        """Close a retired page/context in the background."""
+
+        t('automation.browser.pool.standby.HotStandby._drain')
+        if page is None and context is None:
+            return
+        task = asyncio.create_task(_close_quietly(page, context))
+        self._draining.add(task)
+        task.add_done_callback(self._draining.discard)
+
+    async def close(self) -> None:
+        """Cancel warm-ups and close every spare and draining context."""
+
+        t('automation.browser.pool.standby.HotStandby.close')
+        warming = list(self._warming.values())
+        for task in warming:
+            task.cancel()
+        await asyncio.gather(*warming, return_exceptions=True)
+        self._warming.clear()
+
+        for spare in self.spares.values():
+            self._drain(spare.page, spare.context)
+        self.spares.clear()
+        if self._draining:
+            await asyncio.gather(*list(self._draining), return_exceptions=True)
+
+
+__all__ = ['HotStandby', 'StandbyContext']
@@ -73,8 +73,8 @@ async def is_slot_available(pool, court_number: int, time_slot: str, target_date
                 'court': court_number,
             }
 
-        from infrastructure.constants import COURT_CONFIG
-        court_entry = COURT_CONFIG.get(court_number)
+        from infrastructure.court_topology import get_court_topology
+        court_entry = get_court_topology().get(court_number)
         if not court_entry:
             return {
                 'available': False,
@@ -83,9 +83,9 @@ async def is_slot_available(pool, court_number: int, time_slot: str, target_date
                 'court': court_number,
             }
 
-        court_url = court_entry['direct_url']
+        court_url = court_entry.full_url
         date_str = target_date.strftime("%Y-%m-%d")
-        appointment_type_id = court_url.split('/appointment/')[1].split('/')[0]
+        appointment_type_id = court_entry.appointment_id
         direct_url = (
             f"{court_url}/datetime/{date_str}T{time_slot}:00-06:00"
             f"?appointmentTypeIds[]={appointment_type_id}"
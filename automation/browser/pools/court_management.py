@@ -7,7 +7,8 @@ import logging
 from dataclasses import dataclass
 from typing import Dict, Iterable, List, Optional
 
-from infrastructure.constants import COURT_CONFIG, BrowserTimeouts
+from infrastructure.constants import BrowserTimeouts
+from infrastructure.court_topology import get_court_topology
 
 
 @dataclass
@@ -50,6 +51,13 @@ class CourtPoolManager:
         self._browser_to_court[browser_id] = court
         self._court_to_browser[court] = browser_id
 
+    def release_browser(self, browser_id: str) -> Optional[int]:
+        t('automation.browser.pools.court_management.CourtPoolManager.release_browser')
+        court = self._browser_to_court.pop(browser_id, None)
+        if court is not None and self._court_to_browser.get(court) == browser_id:
+            self._court_to_browser.pop(court)
+        return court
+
     def get_browser_for_court(self, court: int) -> Optional[str]:
         t('automation.browser.pools.court_management.CourtPoolManager.get_browser_for_court')
         return self._court_to_browser.get(court)
@@ -113,8 +121,8 @@ class BrowserCourtSwitcher:
 
     async def switch_court(self, page, current_court: int, target_court: int, browser_id: str) -> Dict[str, object]:
         t('automation.browser.pools.court_management.BrowserCourtSwitcher.switch_court')
-        target = COURT_CONFIG.get(target_court, {})
-        url = target.get("direct_url")
+        target = get_court_topology().get(target_court)
+        url = target.direct_url if target else None
         if not url:
             return {"success": False, "error": f"No direct URL configured for court {target_court}"}
         try:
@@ -126,7 +134,7 @@ class BrowserCourtSwitcher:
 
     async def verify_browser_health(self, page, court: int) -> Dict[str, object]:
         t('automation.browser.pools.court_management.BrowserCourtSwitcher.verify_browser_health')
-        expected = COURT_CONFIG.get(court, {}).get("direct_url")
+        expected = get_court_topology().direct_urls().get(court)
         try:
             current_url = page.url
         except Exception as exc:  # pragma: no cover - defensive logging
@@ -10,15 +10,15 @@ import time
 import logging
 import queue
 import asyncio
-from typing import Optional, Dict, List, Tuple, Any
-from dataclasses import dataclass
+from typing import Optional, Dict, List, Set, Tuple, Any
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Frame, Playwright
 
 from infrastructure.constants import (
     BOOKING_URL, DEFAULT_BROWSER_POOL_SIZE, MAX_BROWSER_AGE_MINUTES,
     MAX_BROWSER_USES, BROWSER_HEALTH_CHECK_INTERVAL, SCHEDULING_IFRAME_URL_PATTERN,
-    court_number_to_index, AVAILABLE_COURT_NUMBERS, DEFAULT_COURT_PREFERENCES,
+    court_number_to_index, DEFAULT_COURT_PREFERENCES,
     FAST_POLL_INTERVAL, DEFAULT_WAIT_INTERVAL, RESERVATION_RETRY_DELAY,
     MAX_SINGLE_COURT_CHECK_TIME, MAX_NAVIGATION_WAIT_TIME, TARGET_AVAILABILITY_CHECK_TIME
 )
@@ -43,6 +43,10 @@ class SpecializedBrowser:
     last_used: datetime = None
     use_count: int = 0
     id: str = None
+    # Serialises Playwright work on this browser (booking, refresh, health check, close)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock, repr=False, compare=False)
+    # Set once the browser is taken out of the pool; new work must skip it
+    retiring: bool = False
     
     def __post_init__(self):
         t('automation.browser.pools.specialized.SpecializedBrowser.__post_init__')
@@ -89,7 +93,10 @@ class SpecializedBrowserPool:
         
         # Browser storage - now by ID, not court
         self.browsers: Dict[str, SpecializedBrowser] = {}  # browser_id -> browser
-        self.lock = threading.Lock()
+        # Guards membership of self.browsers and court assignments only. It is
+        # never held across Playwright calls; each browser has its own lock.
+        self.lock = asyncio.Lock()
+        self._courts_in_flight: Set[int] = set()  # courts with a browser being created
         
         from .court_management import CourtPoolManager, BrowserCourtSwitcher
         # Primary courts drive assignment order; fallback ensures coverage when a court fails
@@ -203,18 +210,20 @@ class SpecializedBrowserPool:
         self.running = False
         
         # Close all browsers
-        with self.lock:
-            for browser_id, browser in self.browsers.items():
-                try:
-                    if browser.page and not browser.page.is_closed():
-                        await browser.page.close()
-                    if browser.context:
-                        await browser.context.close()
-                    if browser.browser:
-                        await browser.browser.close()
-                except Exception as e:
-                    self.logger.debug(f"Error closing browser {browser_id}: {e}")
+        async with self.lock:
+            browsers = list(self.browsers.items())
             self.browsers.clear()
+        for browser_id, browser in browsers:
+            browser.retiring = True
+            try:
+                if browser.page and not browser.page.is_closed():
+                    await browser.page.close()
+                if browser.context:
+                    await browser.context.close()
+                if browser.browser:
+                    await browser.browser.close()
+            except Exception as e:
+                self.logger.debug(f"Error closing browser {browser_id}: {e}")
         
         # Reset court manager
         self.court_manager.reset()
@@ -237,8 +246,7 @@ class SpecializedBrowserPool:
     def get_browser_count(self) -> int:
         """Get the number of active browsers in the pool"""
         t('automation.browser.pools.specialized.SpecializedBrowserPool.get_browser_count')
-        with self.lock:
-            return len(self.browsers)
+        return len(self.browsers)
     
     async def wait_until_ready(self, timeout: float = 30) -> bool:
         """
@@ -283,9 +291,7 @@ class SpecializedBrowserPool:
                     try:
                         browser = await self._create_and_position_browser(court_num)
                         if browser:
-                            with self.lock:
-                                self.browsers[browser.id] = browser
-                                self.court_manager.assign_browser_to_court(browser.id, court_num)
+                            await self._register_browser(browser, court_num)
                             self.logger.info(f"✓ Browser {browser.id} ready on court {court_num}")
                         else:
                             self.logger.error(f"✗ Failed to create browser for court {court_num}")
@@ -302,9 +308,7 @@ class SpecializedBrowserPool:
                 for i, browser in enumerate(results):
                     court_num = courts_to_init[i]
                     if isinstance(browser, SpecializedBrowser):
-                        with self.lock:
-                            self.browsers[browser.id] = browser
-                            self.court_manager.assign_browser_to_court(browser.id, court_num)
+                        await self._register_browser(browser, court_num)
                         self.logger.info(f"✓ Browser {browser.id} ready on court {court_num}")
                     else:
                         self.logger.error(f"✗ Failed to create browser for court {court_num}: {browser}")
@@ -538,17 +542,19 @@ class SpecializedBrowserPool:
         # Try booking on each court in order
         for court_num in court_order:
             browser_id = self.court_manager.get_browser_for_court(court_num)
+            browser = self.browsers.get(browser_id) if browser_id else None
             
-            if not browser_id or browser_id not in self.browsers:
+            if browser is None or browser.retiring:
                 self.logger.debug(f"No browser available for court {court_num}")
                 continue
             
-            browser = self.browsers[browser_id]
-            
-            # Attempt booking on this court
-            success, message = await self._attempt_booking_on_court(
-                browser, target_time, user_info
-            )
+            # Attempt booking on this court; recycling waits for the browser lock
+            async with browser.lock:
+                if browser.retiring:
+                    continue
+                success, message = await self._attempt_booking_on_court(
+                    browser, target_time, user_info
+                )
             
             results['court_attempts'][court_num] = {
                 'success': success,
@@ -712,28 +718,30 @@ class SpecializedBrowserPool:
                 
                 # Get browser
                 browser = self.browsers.get(browser_id)
-                if not browser:
+                if not browser or browser.retiring:
                     return
                 
                 # Switch court
-                switch_result = await self.court_switcher.switch_court(
-                    browser.page, 
-                    booked_court, 
-                    next_court,
-                    browser_id
-                )
+                async with browser.lock:
+                    switch_result = await self.court_switcher.switch_court(
+                        browser.page, 
+                        booked_court, 
+                        next_court,
+                        browser_id
+                    )
                 
-                if switch_result['success']:
+                if switch_result['success'] and not browser.retiring:
                     # Update browser's court assignment
                     browser.court_number = next_court
                     browser.court_index = next_court - 1
                     browser.is_positioned = True
                     
                     # Update manager
-                    self.court_manager.assign_browser_to_court(browser_id, next_court)
+                    async with self.lock:
+                        self.court_manager.assign_browser_to_court(browser_id, next_court)
                     
                     self.logger.info(f"Browser {browser_id} successfully reassigned to court {next_court}")
-                else:
+                elif not switch_result['success']:
                     self.logger.error(f"Failed to reassign browser {browser_id}: {switch_result['error']}")
                     
         except Exception as e:
@@ -766,30 +774,33 @@ class SpecializedBrowserPool:
                 # Check browser health
                 browsers_to_recycle = []
                 
-                with self.lock: # Lock is for self.browsers, not Playwright operations
-                    for browser_id, browser in list(self.browsers.items()):
-                        # Check if browser needs recycling
-                        age = datetime.now() - browser.created_at
+                async with self.lock:
+                    candidates = list(self.browsers.items())
+                
+                for browser_id, browser in candidates:
+                    # Check if browser needs recycling
+                    age = datetime.now() - browser.created_at
+                    
+                    if (not browser.is_healthy or 
+                        browser.use_count >= self.max_uses or
+                        age > self.max_age):
                         
-                        if (not browser.is_healthy or 
-                            browser.use_count >= self.max_uses or
-                            age > self.max_age):
-                            
-                            browsers_to_recycle.append((browser_id, browser))
-                            
-                        # Check positioning periodically
-                        elif age > timedelta(minutes=15):
-                            court = self.court_manager.get_court_for_browser(browser_id)
-                            if court:
+                        browsers_to_recycle.append(browser_id)
+                        
+                    # Check positioning periodically, but never probe a page mid-booking
+                    elif age > timedelta(minutes=15) and not browser.lock.locked():
+                        court = self.court_manager.get_court_for_browser(browser_id)
+                        if court:
+                            async with browser.lock:
                                 health_check = await self.court_switcher.verify_browser_health(
                                     browser.page, court
                                 )
-                                if not health_check['positioned']:
-                                    self.logger.warning(f"Browser {browser_id} lost positioning on court {court}")
-                                    browsers_to_recycle.append((browser_id, browser))
+                            if not health_check['positioned']:
+                                self.logger.warning(f"Browser {browser_id} lost positioning on court {court}")
+                                browsers_to_recycle.append(browser_id)
                 
                 # Recycle unhealthy browsers
-                for browser_id, browser in browsers_to_recycle:
+                for browser_id in browsers_to_recycle:
                     self.logger.info(f"Recycling browser {browser_id}")
                     await self._recycle_browser(browser_id)
                 
@@ -799,29 +810,63 @@ class SpecializedBrowserPool:
             except Exception as e:
                 self.logger.error(f"Maintenance error: {e}")
     
+    async def _register_browser(self, browser: SpecializedBrowser, court_number: int):
+        """Add a positioned browser to the pool and assign it to its court"""
+        t('automation.browser.pools.specialized.SpecializedBrowserPool._register_browser')
+        async with self.lock:
+            self.browsers[browser.id] = browser
+            self.court_manager.assign_browser_to_court(browser.id, court_number)
+    
+    async def _retire_browser(self, browser_id: str) -> Optional[Tuple[SpecializedBrowser, Optional[int]]]:
+        """Take a browser out of the pool so no new work is routed to it"""
+        t('automation.browser.pools.specialized.SpecializedBrowserPool._retire_browser')
+        async with self.lock:
+            browser = self.browsers.pop(browser_id, None)
+            if browser is None:
+                return None
+            browser.retiring = True
+            court = self.court_manager.get_court_for_browser(browser_id)
+            self.court_manager.release_browser(browser_id)
+            return browser, court
+    
+    async def _provision_court(self, court: int) -> Optional[SpecializedBrowser]:
+        """Create a browser for an uncovered court if the pool has capacity"""
+        t('automation.browser.pools.specialized.SpecializedBrowserPool._provision_court')
+        async with self.lock:
+            covered = court in self._courts_in_flight or any(
+                self.court_manager.get_court_for_browser(bid) == court for bid in self.browsers
+            )
+            if covered or len(self.browsers) + len(self._courts_in_flight) >= self.max_browsers:
+                return None
+            # Reserve the slot so concurrent repairs do not launch a second browser
+            self._courts_in_flight.add(court)
+        
+        try:
+            self.logger.info(f"Creating browser for uncovered court {court}")
+            browser = await self._create_and_position_browser(court)
+            if browser:
+                await self._register_browser(browser, court)
+            return browser
+        finally:
+            self._courts_in_flight.discard(court)
+    
     async def _recycle_browser(self, browser_id: str):
         """Recycle a specific browser"""
         t('automation.browser.pools.specialized.SpecializedBrowserPool._recycle_browser')
         try:
-            with self.lock:
-                browser = self.browsers.get(browser_id)
-                if not browser:
-                    return
-                
-                court = self.court_manager.get_court_for_browser(browser_id)
-                
-                # Close old browser
+            retired = await self._retire_browser(browser_id)
+            if retired is None:
+                return
+            browser, court = retired
+            self.stats['browsers_recycled'] += 1
+            
+            # Close old browser once any in-flight booking on it has finished
+            async with browser.lock:
                 await self._close_browser(browser)
-                del self.browsers[browser_id]
-                self.stats['browsers_recycled'] += 1
             
             # Create replacement if needed
-            if court and len(self.browsers) < self.max_browsers:
-                new_browser = await self._create_and_position_browser(court)
-                if new_browser:
-                    with self.lock:
-                        self.browsers[new_browser.id] = new_browser
-                        self.court_manager.assign_browser_to_court(new_browser.id, court)
+            if court:
+                await self._provision_court(court)
                         
         except Exception as e:
             self.logger.error(f"Error recycling browser: {e}")
@@ -830,25 +875,9 @@ class SpecializedBrowserPool:
         """Ensure we have browsers on primary courts"""
         t('automation.browser.pools.specialized.SpecializedBrowserPool._ensure_browser_coverage')
         try:
-            current_browser_count = len(self.browsers)
-            
-            if current_browser_count < self.max_browsers:
-                # Check which courts need browsers
-                courts_with_browsers = set(
-                    self.court_manager.get_court_for_browser(bid) 
-                    for bid in self.browsers.keys()
-                )
-                
-                # Prioritize primary courts
-                for court in self.courts_needed[:self.max_browsers]:
-                    if court not in courts_with_browsers and current_browser_count < self.max_browsers:
-                        self.logger.info(f"Creating browser for uncovered court {court}")
-                        browser = await self._create_and_position_browser(court)
-                        if browser:
-                            with self.lock:
-                                self.browsers[browser.id] = browser
-                                self.court_manager.assign_browser_to_court(browser.id, court)
-                            current_browser_count += 1
+            # Prioritize primary courts; _provision_court skips covered courts and full pools
+            for court in self.courts_needed[:self.max_browsers]:
+                await self._provision_court(court)
                             
         except Exception as e:
             self.logger.error(f"Error ensuring browser coverage: {e}")
@@ -866,10 +895,12 @@ class SpecializedBrowserPool:
         
         self.logger.info("🔄 Starting browser page refresh cycle")
         
-        with self.lock:
+        async with self.lock:
             browsers_to_refresh = list(self.browsers.items())
         
         for browser_id, browser in browsers_to_refresh:
+            if browser.retiring:
+                continue
             try:
                 court = self.court_manager.get_court_for_browser(browser_id)
                 age_minutes = (datetime.now() - browser.created_at).total_seconds() / 60
@@ -881,7 +912,8 @@ class SpecializedBrowserPool:
                     age_minutes,
                 )
 
-                await browser.page.reload(wait_until='domcontentloaded', timeout=MAX_NAVIGATION_WAIT_TIME)
+                async with browser.lock:
+                    await browser.page.reload(wait_until='domcontentloaded', timeout=MAX_NAVIGATION_WAIT_TIME)
 
                 browser.is_healthy = True
                 browser.use_count = 0
@@ -892,8 +924,7 @@ class SpecializedBrowserPool:
                 self.logger.error(f"❌ Failed to refresh browser {browser_id}: {e}")
                 refresh_results[browser_id] = False
                 # Mark browser as unhealthy
-                if browser_id in self.browsers:
-                    self.browsers[browser_id].is_healthy = False
+                browser.is_healthy = False
         
         successful_refreshes = sum(1 for success in refresh_results.values() if success)
         total_browsers = len(refresh_results)
@@ -905,27 +936,28 @@ class SpecializedBrowserPool:
     def get_stats(self) -> Dict:
         """Get pool statistics"""
         t('automation.browser.pools.specialized.SpecializedBrowserPool.get_stats')
-        with self.lock:
-            # Get court manager status
-            court_summary = self.court_manager.get_status_summary()
-            
-            # Get browser details
-            browser_details = {}
-            for browser_id, browser in self.browsers.items():
-                court = self.court_manager.get_court_for_browser(browser_id)
-                browser_details[browser_id] = {
-                    'court': court,
-                    'healthy': browser.is_healthy,
-                    'positioned': browser.is_positioned,
-                    'uses': browser.use_count,
-                    'age_minutes': (datetime.now() - browser.created_at).total_seconds() / 60
-                }
-            
-            return {
-                **self.stats,
-                'browser_count': len(self.browsers),
-                'max_browsers': self.max_browsers,
-                'court_assignments': court_summary['assignments'],
-                'browser_details': browser_details,
-                'available_courts': court_summary['available_courts']
+        # Synchronous snapshot: nothing here awaits, so it cannot interleave with
+        # pool mutations on the event loop and needs no lock
+        court_summary = self.court_manager.get_status_summary()
+        
+        # Get browser details
+        browser_details = {}
+        for browser_id, browser in self.browsers.items():
+            court = self.court_manager.get_court_for_browser(browser_id)
+            browser_details[browser_id] = {
+                'court': court,
+                'healthy': browser.is_healthy,
+                'positioned': browser.is_positioned,
+                'uses': browser.use_count,
+                'busy': browser.lock.locked(),
+                'age_minutes': (datetime.now() - browser.created_at).total_seconds() / 60
             }
+        
+        return {
+            **self.stats,
+            'browser_count': len(self.browsers),
+            'max_browsers': self.max_browsers,
+            'court_assignments': court_summary['assignments'],
+            'browser_details': browser_details,
+            'available_courts': court_summary['available_courts']
+        }
@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import TYPE_CHECKING, Optional
+import inspect
+from typing import TYPE_CHECKING, List, Optional, Tuple
 
 from tracking import t
 
@@ -30,6 +31,29 @@ class RecoveryContext:
         self.error_context = error_context
 
 
+async def promote_standby_pages(browser_pool, courts, logger) -> Tuple[List[int], List[int]]:
+    """Swap hot-standby contexts in for ``courts``; return ``(promoted, remaining)``.
+
+    Pools without hot standby (or courts without a ready spare) land in
+    ``remaining`` and go through the strategy's relaunch path.
+    """
+    t('automation.browser.recovery.strategies.base.promote_standby_pages')
+    promote = getattr(browser_pool, "promote_standby", None)
+    if not inspect.iscoroutinefunction(promote):
+        return [], list(courts)
+
+    promoted: List[int] = []
+    remaining: List[int] = []
+    for court in courts:
+        if await promote(court, "recovery"):
+            promoted.append(court)
+        else:
+            remaining.append(court)
+    if promoted:
+        logger.info("♻️ Promoted hot standby contexts for courts %s", promoted)
+    return promoted, remaining
+
+
 class RecoveryStrategyExecutor(ABC):
     """Interface for executing a recovery strategy."""
 
@@ -7,7 +7,11 @@ from datetime import datetime
 
 from tracking import t
 
-from automation.browser.recovery.strategies.base import RecoveryContext, RecoveryStrategyExecutor
+from automation.browser.recovery.strategies.base import (
+    RecoveryContext,
+    RecoveryStrategyExecutor,
+    promote_standby_pages,
+)
 from automation.browser.recovery.types import RecoveryAttempt, RecoveryResult, RecoveryStrategy
 
 
@@ -29,6 +33,24 @@ class FullRestartRecovery(RecoveryStrategyExecutor):
         )
 
         try:
+            # Spares live in the same Chromium, so they only help while it is connected
+            browser = browser_pool.browser
+            if browser is not None and browser.is_connected():
+                promoted, remaining = await promote_standby_pages(
+                    browser_pool, list(browser_pool.courts), logger
+                )
+                if promoted and not remaining:
+                    attempt.success = True
+                    attempt.duration_seconds = (datetime.now() - start_time).total_seconds()
+                    return RecoveryResult(
+                        success=True,
+                        strategy_used=self.strategy,
+                        courts_recovered=promoted,
+                        courts_failed=[],
+                        message="Swapped in hot standby for every court; restart skipped",
+                        attempts=[attempt],
+                    )
+
             logger.warning("🔄 Performing full browser pool restart")
 
             original_courts = browser_pool.courts.copy()
@@ -6,7 +6,11 @@ from datetime import datetime
 
 from tracking import t
 
-from automation.browser.recovery.strategies.base import RecoveryContext, RecoveryStrategyExecutor
+from automation.browser.recovery.strategies.base import (
+    RecoveryContext,
+    RecoveryStrategyExecutor,
+    promote_standby_pages,
+)
 from automation.browser.recovery.types import RecoveryAttempt, RecoveryResult, RecoveryStrategy
 
 
@@ -33,6 +37,19 @@ class IndividualCourtRecovery(RecoveryStrategyExecutor):
         try:
             logger.info("🔧 Recovering individual court: %s", court_number)
 
+            promoted, _ = await promote_standby_pages(browser_pool, [court_number], logger)
+            if promoted:
+                attempt.success = True
+                attempt.duration_seconds = (datetime.now() - start_time).total_seconds()
+                return RecoveryResult(
+                    success=True,
+                    strategy_used=self.strategy,
+                    courts_recovered=[court_number],
+                    courts_failed=[],
+                    message=f"Swapped in hot standby for court {court_number}",
+                    attempts=[attempt],
+                )
+
             if court_number in browser_pool.pages:
                 try:
                     await browser_pool.pages[court_number].close()
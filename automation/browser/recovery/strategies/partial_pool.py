@@ -7,7 +7,11 @@ from datetime import datetime
 
 from tracking import t
 
-from automation.browser.recovery.strategies.base import RecoveryContext, RecoveryStrategyExecutor
+from automation.browser.recovery.strategies.base import (
+    RecoveryContext,
+    RecoveryStrategyExecutor,
+    promote_standby_pages,
+)
 from automation.browser.recovery.types import RecoveryAttempt, RecoveryResult, RecoveryStrategy
 
 
@@ -30,13 +34,16 @@ class PartialPoolRecovery(RecoveryStrategyExecutor):
             success=False,
         )
 
-        courts_recovered = []
         courts_failed = []
 
         try:
             logger.info("🔧 Recovering partial pool: courts %s", court_numbers)
 
-            for court_number in court_numbers:
+            courts_recovered, to_relaunch = await promote_standby_pages(
+                browser_pool, court_numbers, logger
+            )
+
+            for court_number in to_relaunch:
                 page = browser_pool.pages.pop(court_number, None)
                 if page:
                     try:
@@ -52,7 +59,7 @@ class PartialPoolRecovery(RecoveryStrategyExecutor):
                         pass
 
             tasks = []
-            for index, court_number in enumerate(court_numbers):
+            for index, court_number in enumerate(to_relaunch):
                 delay = index * 1.5
                 tasks.append(
                     browser_pool._create_and_navigate_court_page_with_stagger(court_number, delay)
@@ -60,7 +67,7 @@ class PartialPoolRecovery(RecoveryStrategyExecutor):
 
             results = await asyncio.gather(*tasks, return_exceptions=True)
 
-            for court_number, result in zip(court_numbers, results):
+            for court_number, result in zip(to_relaunch, results):
                 if isinstance(result, Exception):
                     logger.error("Failed to recover court %s: %s", court_number, result)
                     courts_failed.append(court_number)
@@ -0,0 +1,276 @@
+"""Adaptive refresh pacing shared by every page that polls the booking site.
+
+Refresh loops in the flows and the availability checker used to sleep a
+fixed interval between reloads. They ignored how fast the site answered and
+never noticed it starting to push back. :class:`RefreshRateController`
+paces every reload through one process-wide state:
+
+* **per court**: a page is not reloaded again until its host's interval has
+  elapsed since its previous reload started. The interval is never shorter
+  than ``LATENCY_FACTOR`` times the smoothed reload latency.
+* **per host**: the interval grows and shrinks like TCP congestion control
+  (AIMD). A throttling status (429/5xx), a failed reload or a very slow
+  reload multiplies it; each healthy reload subtracts a small step back
+  towards ``REFRESH_MIN_INTERVAL``. A bot-detection signal ("uso irregular")
+  multiplies it further and pauses the host for a cooldown.
+* **globally**: a cell-rate budget of ``REFRESH_GLOBAL_RATE`` reloads per
+  second across all pages, with a small burst allowance.
+
+A reload reserves its start time under a thread lock and then sleeps outside
+it, so concurrent pages queue fairly without holding a lock across awaits.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from tracking import t
+
+from infrastructure.settings import get_settings
+
+MAX_INTERVAL = 8.0
+GLOBAL_BURST = 3
+LATENCY_FACTOR = 1.5
+LATENCY_SMOOTHING = 0.3
+SLOW_RELOAD_SECONDS = 4.0
+BACKOFF_FACTOR = 2.0
+DECREASE_STEP = 0.05
+DETECTION_FACTOR = 4.0
+DETECTION_COOLDOWN = 20.0
+THROTTLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+logger = logging.getLogger(__name__)
+
+
+def host_of(page: Any) -> str:
+    """Return the host a page is on, or ``''`` when its URL is unavailable."""
+
+    t('automation.browser.refresh_control.host_of')
+    try:
+        return urlparse(page.url).netloc
+    except Exception:
+        return ''
+
+
+@dataclass
+class HostPacing:
+    """Adaptive refresh state for one booking host."""
+
+    interval: float
+    latency: Optional[float] = None
+    cooldown_until: float = 0.0
+    reloads: int = 0
+    throttled: int = 0
+    detections: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        t('automation.browser.refresh_control.HostPacing.as_dict')
+        return {
+            'interval': round(self.interval, 3),
+            'latency': None if self.latency is None else round(self.latency, 3),
+            'reloads': self.reloads,
+            'throttled': self.throttled,
+            'detections': self.detections,
+        }
+
+
+class RefreshRateController:
+    """Pace page reloads per court, per host and across the whole process."""
+
+    def __init__(
+        self,
+        *,
+        min_interval: float = 0.3,
+        max_interval: float = MAX_INTERVAL,
+        global_rate: float = 6.0,
+        burst: int = GLOBAL_BURST,
+        monotonic: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+    ) -> None:
+        t('automation.browser.refresh_control.RefreshRateController.__init__')
+        self.min_interval = max(0.0, min_interval)
+        self.max_interval = max(self.min_interval, max_interval)
+        self._emission = 1.0 / global_rate if global_rate > 0 else 0.0
+        self._tolerance = self._emission * max(0, burst - 1)
+        self._tat = 0.0
+        self._monotonic = monotonic
+        self._sleep = sleep
+        self._hosts: Dict[str, HostPacing] = {}
+        self._last_start: Dict[Tuple[str, int], float] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Pacing
+    # ------------------------------------------------------------------
+    def _host_locked(self, host: str) -> HostPacing:
+        t('automation.browser.refresh_control.RefreshRateController._host_locked')
+        state = self._hosts.get(host)
+        if state is None:
+            state = self._hosts[host] = HostPacing(interval=self.min_interval)
+        return state
+
+    def interval_for(self, host: str, floor: float = 0.0) -> float:
+        """Return the current spacing between reloads of one page on ``host``."""
+
+        t('automation.browser.refresh_control.RefreshRateController.interval_for')
+        with self._lock:
+            return self._interval_locked(self._host_locked(host), floor)
+
+    def _interval_locked(self, state: HostPacing, floor: float) -> float:
+        t('automation.browser.refresh_control.RefreshRateController._interval_locked')
+        interval = max(self.min_interval, floor, state.interval)
+        if state.latency is not None:
+            interval = max(interval, state.latency * LATENCY_FACTOR)
+        return min(self.max_interval, interval)
+
+    async def acquire(self, host: str, court: int, *, floor: float = 0.0, jitter: float = 0.0) -> float:
+        """Wait until ``court``'s page on ``host`` may reload; return the seconds waited.
+
+        ``floor`` is the caller's own minimum spacing, and ``jitter`` adds up
+        to that many random seconds.
+        """
+
+        t('automation.browser.refresh_control.RefreshRateController.acquire')
+        with self._lock:
+            now = self._monotonic()
+            state = self._host_locked(host)
+            start = max(now, state.cooldown_until)
+            previous = self._last_start.get((host, court))
+            if previous is not None:
+                start = max(start, previous + self._interval_locked(state, floor))
+            if jitter > 0:
+                start += random.uniform(0.0, jitter)
+            if self._emission:
+                start = max(start, self._tat - self._tolerance)
+                self._tat = max(self._tat, start) + self._emission
+            self._last_start[(host, court)] = start
+        delay = start - now
+        if delay > 0:
+            await self._sleep(delay)
+        return max(0.0, delay)
+
+    # ------------------------------------------------------------------
+    # Feedback
+    # ------------------------------------------------------------------
+    def record(self, host: str, latency: float, status: Optional[int] = None, *, failed: bool = False) -> None:
+        """Feed one reload's latency and HTTP status back into the host's interval."""
+
+        t('automation.browser.refresh_control.RefreshRateController.record')
+        with self._lock:
+            state = self._host_locked(host)
+            state.reloads += 1
+            if state.latency is None:
+                state.latency = latency
+            else:
+                state.latency += LATENCY_SMOOTHING * (latency - state.latency)
+
+            pushed_back = failed or status in THROTTLE_STATUSES or latency >= SLOW_RELOAD_SECONDS
+            if pushed_back:
+                state.throttled += 1
+                state.interval = min(self.max_interval, max(state.interval, self.min_interval) * BACKOFF_FACTOR)
+            else:
+                state.interval = max(self.min_interval, state.interval - DECREASE_STEP)
+            interval = state.interval
+        if pushed_back:
+            logger.warning(
+                "Refresh back-pressure from %s (status %s, %.2fs%s): interval now %.2fs",
+                host or 'unknown host',
+                status,
+                latency,
+                ', failed' if failed else '',
+                interval,
+            )
+
+    def report_detection(self, host: str) -> None:
+        """Back off hard after the site flags automated use."""
+
+        t('automation.browser.refresh_control.RefreshRateController.report_detection')
+        with self._lock:
+            state = self._host_locked(host)
+            state.detections += 1
+            state.interval = min(self.max_interval, max(state.interval, self.min_interval) * DETECTION_FACTOR)
+            state.cooldown_until = max(state.cooldown_until, self._monotonic() + DETECTION_COOLDOWN)
+            interval = state.interval
+        logger.warning(
+            "Bot detection reported on %s: pausing refreshes %.0fs, interval now %.2fs",
+            host or 'unknown host',
+            DETECTION_COOLDOWN,
+            interval,
+        )
+
+    async def reload(
+        self,
+        page: Any,
+        court: int,
+        *,
+        clock: Any = None,
+        floor: float = 0.0,
+        jitter: float = 0.0,
+        **kwargs: Any,
+    ) -> Any:
+        """Reload ``page`` once its pacing allows, through ``clock`` when given."""
+
+        t('automation.browser.refresh_control.RefreshRateController.reload')
+        host = host_of(page)
+        await self.acquire(host, court, floor=floor, jitter=jitter)
+        started = self._monotonic()
+        try:
+            if clock is not None:
+                response = await clock.reload(page, **kwargs)
+            else:
+                response = await page.reload(**kwargs)
+        except Exception:
+            self.record(host, self._monotonic() - started, failed=True)
+            raise
+        self.record(host, self._monotonic() - started, getattr(response, 'status', None))
+        return response
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        t('automation.browser.refresh_control.RefreshRateController.stats')
+        with self._lock:
+            return {host: state.as_dict() for host, state in self._hosts.items()}
+
+
+_LOCK = threading.Lock()
+_CONTROLLER: Optional[RefreshRateController] = None
+
+
+def get_refresh_controller() -> RefreshRateController:
+    """Return the process-wide controller configured from settings."""
+
+    t('automation.browser.refresh_control.get_refresh_controller')
+    global _CONTROLLER
+    with _LOCK:
+        if _CONTROLLER is None:
+            settings = get_settings()
+            _CONTROLLER = RefreshRateController(
+                min_interval=settings.refresh_min_interval,
+                global_rate=settings.refresh_global_rate,
+            )
+        return _CONTROLLER
+
+
+def set_refresh_controller(controller: Optional[RefreshRateController]) -> Optional[RefreshRateController]:
+    """Install ``controller`` process-wide (``None`` rebuilds on next use); return the previous one."""
+
+    t('automation.browser.refresh_control.set_refresh_controller')
+    global _CONTROLLER
+    with _LOCK:
+        previous, _CONTROLLER = _CONTROLLER, controller
+        return previous
+
+
+__all__ = [
+    'HostPacing',
+    'RefreshRateController',
+    'get_refresh_controller',
+    'host_of',
+    'set_refresh_controller',
+]
@@ -0,0 +1,138 @@
+"""Opt-in request filtering for court pool browser contexts.
+
+A :class:`ResourceBlockingProfile` installs a ``context.route`` handler that
+aborts requests the calendar does not need to render ``button.time-selection``:
+known analytics/tracker hosts, plus images, media, fonts and scripts served by
+third parties. Documents, stylesheets, XHRs and every asset from the Acuity
+scheduling hosts pass through untouched, as do the reCAPTCHA and Stripe hosts
+the booking form depends on (see the CORS note in ``pool/manager.py``), so
+captcha challenge images still load.
+
+Enable it with ``BROWSER_RESOURCE_BLOCKING=true`` or
+``AsyncBrowserPool.enable_resource_blocking()``.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, FrozenSet
+from urllib.parse import urlsplit
+
+from tracking import t
+
+logger = logging.getLogger(__name__)
+
+BLOCKED_RESOURCE_TYPES: FrozenSet[str] = frozenset({'image', 'media', 'font'})
+
+TRACKER_DOMAINS: FrozenSet[str] = frozenset({
+    'google-analytics.com',
+    'googletagmanager.com',
+    'googleadservices.com',
+    'doubleclick.net',
+    'facebook.net',
+    'facebook.com',
+    'hotjar.com',
+    'clarity.ms',
+    'bing.com',
+    'segment.io',
+    'segment.com',
+    'mixpanel.com',
+    'fullstory.com',
+    'intercom.io',
+    'nr-data.net',
+    'newrelic.com',
+})
+
+# Hosts whose assets the calendar or booking form needs; never blocked.
+ESSENTIAL_DOMAINS: FrozenSet[str] = frozenset({
+    'as.me',
+    'acuityscheduling.com',
+    'squarespace.com',
+    'sqspcdn.com',
+    'google.com',
+    'gstatic.com',
+    'recaptcha.net',
+    'stripe.com',
+    'stripe.network',
+})
+
+
+def _host_matches(host: str, domains: FrozenSet[str]) -> bool:
+    """Return True when ``host`` equals or is a subdomain of any ``domains`` entry."""
+
+    t('automation.browser.resource_blocking._host_matches')
+    while host:
+        if host in domains:
+            return True
+        _, _, host = host.partition('.')
+    return False
+
+
+@dataclass
+class RouteStats:
+    """Per-context counters of aborted and forwarded requests."""
+
+    blocked: int = 0
+    allowed: int = 0
+    blocked_by_type: Dict[str, int] = field(default_factory=dict)
+
+
+@dataclass(frozen=True)
+class ResourceBlockingProfile:
+    """Decide which requests a court page may skip and apply that to contexts."""
+
+    blocked_resource_types: FrozenSet[str] = BLOCKED_RESOURCE_TYPES
+    tracker_domains: FrozenSet[str] = TRACKER_DOMAINS
+    essential_domains: FrozenSet[str] = ESSENTIAL_DOMAINS
+    block_third_party_scripts: bool = True
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        """Return True when a request for ``url`` of ``resource_type`` can be aborted."""
+
+        t('automation.browser.resource_blocking.ResourceBlockingProfile.should_block')
+        parts = urlsplit(url or '')
+        if parts.scheme not in ('http', 'https'):
+            return False
+        host = (parts.hostname or '').lower()
+        if _host_matches(host, self.tracker_domains):
+            return True
+        if _host_matches(host, self.essential_domains):
+            return False
+        if resource_type in self.blocked_resource_types:
+            return True
+        return resource_type == 'script' and self.block_third_party_scripts
+
+    async def apply(self, context: Any) -> RouteStats:
+        """Install the filter on every page of ``context`` and return its counters."""
+
+        t('automation.browser.resource_blocking.ResourceBlockingProfile.apply')
+        stats = RouteStats()
+
+        async def handle(route: Any) -> None:
+            t('automation.browser.resource_blocking.ResourceBlockingProfile.apply.handle')
+            request = route.request
+            resource_type = request.resource_type
+            if self.should_block(request.url, resource_type):
+                stats.blocked += 1
+                stats.blocked_by_type[resource_type] = stats.blocked_by_type.get(resource_type, 0) + 1
+                await route.abort('blockedbyclient')
+            else:
+                stats.allowed += 1
+                await route.continue_()
+
+        await context.route('**/*', handle)
+        return stats
+
+
+DEFAULT_RESOURCE_PROFILE = ResourceBlockingProfile()
+
+
+__all__ = [
+    'BLOCKED_RESOURCE_TYPES',
+    'DEFAULT_RESOURCE_PROFILE',
+    'ESSENTIAL_DOMAINS',
+    'ResourceBlockingProfile',
+    'RouteStats',
+    'TRACKER_DOMAINS',
+]
@@ -7,14 +7,15 @@ from dataclasses import dataclass, field
 from typing import Iterable, List, Optional
 
 from infrastructure.settings import get_settings
-from infrastructure.constants import AVAILABLE_COURT_NUMBERS, BrowserTimeouts
+from infrastructure.constants import BrowserTimeouts
+from infrastructure.court_topology import get_court_topology
 
 
 @dataclass(frozen=True)
 class BrowserSettings:
     """Configuration values controlling the shared browser pool."""
 
-    courts: List[int] = field(default_factory=lambda: list(AVAILABLE_COURT_NUMBERS))
+    courts: List[int] = field(default_factory=lambda: get_court_topology().numbers)
     headless: bool = False
     warmup_delay: float = 1.5
     navigation_timeout_ms: int = BrowserTimeouts.NORMAL_NAVIGATION
@@ -41,7 +42,7 @@ def load_browser_settings() -> BrowserSettings:
 
     return BrowserSettings(
         headless=app_settings.production_mode,
-        courts=list(AVAILABLE_COURT_NUMBERS),
+        courts=get_court_topology().numbers,
         warmup_delay=1.5,
         navigation_timeout_ms=BrowserTimeouts.NORMAL_NAVIGATION,
         partial_init_allowed=True,
@@ -13,6 +13,7 @@ from playwright.async_api import Page
 from automation.shared.booking_contracts import BookingRequest
 
 from .core import AsyncExecutorConfig, DEFAULT_EXECUTOR_CONFIG, ExecutionResult
+from .racing import RACE_LOST_MESSAGE, CommitGuard
 from .flows.fast_flow import execute_fast_flow
 from .flows.natural_flow import execute_natural_flow
 
@@ -39,6 +40,8 @@ class BookingFlowExecutor:
         target_date: datetime,
         time_slot: str,
         user_info: Dict[str, str],
+        *,
+        commit_guard: Optional[CommitGuard] = None,
     ) -> ExecutionResult:
         t('automation.executors.booking.BookingFlowExecutor.execute_booking')
         if not self.browser_pool:
@@ -52,7 +55,9 @@ class BookingFlowExecutor:
                     error_message=f"Could not get page for court {court_number}",
                     court_number=court_number,
                 )
-            return await self._execute_booking_internal(page, court_number, target_date, time_slot, user_info)
+            return await self._execute_booking_internal(
+                page, court_number, target_date, time_slot, user_info, commit_guard=commit_guard
+            )
         except Exception as exc:  # pragma: no cover - defensive guard
             self.logger.error("Booking execution error: %s", exc)
             return ExecutionResult(success=False, error_message=str(exc), court_number=court_number)
@@ -88,14 +93,20 @@ class BookingFlowExecutor:
         target_date: datetime,
         time_slot: str,
         user_info: Dict[str, str],
+        *,
+        commit_guard: Optional[CommitGuard] = None,
     ) -> ExecutionResult:
         t('automation.executors.booking.BookingFlowExecutor._execute_booking_internal')
         self.logger.info("Starting booking (%s mode): Court %s at %s on %s", self.mode, court_number, time_slot, target_date)
 
         if self.mode == "fast":
-            return await self._execute_fast(page, court_number, target_date, time_slot, user_info)
+            return await self._execute_fast(
+                page, court_number, target_date, time_slot, user_info, commit_guard=commit_guard
+            )
 
-        return await self._execute_natural(page, court_number, target_date, time_slot, user_info)
+        return await self._execute_natural(
+            page, court_number, target_date, time_slot, user_info, commit_guard=commit_guard
+        )
 
     async def _execute_natural(
         self,
@@ -104,6 +115,8 @@ class BookingFlowExecutor:
         target_date: datetime,
         time_slot: str,
         user_info: Dict[str, str],
+        *,
+        commit_guard: Optional[CommitGuard] = None,
     ) -> ExecutionResult:
         t('automation.executors.booking.BookingFlowExecutor._execute_natural')
         delay_min, delay_max = self.initial_delay_range
@@ -115,6 +128,7 @@ class BookingFlowExecutor:
             user_info,
             logger=self.logger,
             initial_delay_range=(delay_min, delay_max),
+            commit_guard=commit_guard,
         )
 
     async def _execute_fast(
@@ -124,6 +138,8 @@ class BookingFlowExecutor:
         target_date: datetime,
         time_slot: str,
         user_info: Dict[str, str],
+        *,
+        commit_guard: Optional[CommitGuard] = None,
     ) -> ExecutionResult:
         t('automation.executors.booking.BookingFlowExecutor._execute_fast')
         return await execute_fast_flow(
@@ -133,6 +149,7 @@ class BookingFlowExecutor:
             time_slot,
             user_info,
             logger=self.logger,
+            commit_guard=commit_guard,
         )
 
 
@@ -169,63 +186,103 @@ class AsyncBookingExecutor:
         time_slot: str,
         user_info: Dict[str, str],
         target_date: datetime,
-        max_concurrent: int = 3,
+        max_concurrent: Optional[int] = None,
     ) -> Dict[str, Any]:
+        """Race one reservation across ``court_numbers``; the first confirmed court wins.
+
+        The courts share a :class:`CommitGuard`, so only one of them submits at
+        a time and none submits after a booking is confirmed. Once a court wins,
+        the sibling attempts are cancelled before they reach the submit click.
+        A submit with an uncertain outcome also ends the race; that court is
+        reported as ``uncertain_court`` rather than as a success.
+        ``max_concurrent`` defaults to every court passed in; courts beyond an
+        explicit limit are logged and left out of the race.
+        """
+
         t('automation.executors.booking.AsyncBookingExecutor.execute_parallel_booking')
         self.logger.info("Starting parallel booking for courts %s at %s", court_numbers, time_slot)
 
-        tasks: List[Tuple[int, asyncio.Task]] = []
-        for court_number in court_numbers[:max_concurrent]:
+        limit = len(court_numbers) if max_concurrent is None else max_concurrent
+        racing_courts = court_numbers[:limit]
+        if len(racing_courts) < len(court_numbers):
+            self.logger.warning(
+                "Racing only courts %s; dropped %s over the limit of %s",
+                racing_courts,
+                court_numbers[limit:],
+                limit,
+            )
+
+        guard = CommitGuard()
+        task_courts: Dict[asyncio.Task, int] = {}
+        for court_number in racing_courts:
             task = asyncio.create_task(
-                self.execute_booking(court_number, time_slot, user_info, target_date),
+                self.execute_booking(
+                    court_number, time_slot, user_info, target_date, commit_guard=guard
+                ),
                 name=f"court_{court_number}_booking",
             )
-            tasks.append((court_number, task))
+            task_courts[task] = court_number
 
         results: Dict[int, ExecutionResult] = {}
         successful_court: Optional[int] = None
-
-        try:
-            for court_number, task in tasks:
+        pending = set(task_courts)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.TIMEOUTS["total_execution"]
+
+        while pending and successful_court is None and guard.winner not in results:
+            done, pending = await asyncio.wait(
+                pending,
+                timeout=max(0.0, deadline - loop.time()),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+            if not done:
+                break
+            for task in done:
+                court_number = task_courts[task]
                 try:
-                    result = await asyncio.wait_for(task, timeout=self.TIMEOUTS["total_execution"])
-                    results[court_number] = result
-
-                    if result.success and not successful_court:
-                        successful_court = court_number
-                        self.logger.info("✅ Successfully booked Court %s!", court_number)
-                        for other_court, other_task in tasks:
-                            if other_court != court_number and not other_task.done():
-                                other_task.cancel()
-                        break
-                except asyncio.TimeoutError:
-                    self.logger.error("Court %s booking timed out", court_number)
-                    results[court_number] = ExecutionResult(
-                        success=False,
-                        error_message="Booking timed out",
-                        court_attempted=court_number,
-                        court_number=court_number,
-                    )
+                    result = task.result()
                 except Exception as exc:  # pragma: no cover - defensive guard
                     self.logger.error("Court %s booking failed: %s", court_number, exc)
-                    results[court_number] = ExecutionResult(
+                    result = ExecutionResult(
                         success=False,
                         error_message=str(exc),
                         court_attempted=court_number,
                         court_number=court_number,
                     )
+                results[court_number] = result
+                if result.success and successful_court is None:
+                    successful_court = court_number
+                    self.logger.info("✅ Successfully booked Court %s!", court_number)
+
+        uncertain_court = guard.winner if guard.uncertain else None
+        if uncertain_court is not None:
+            self.logger.warning(
+                "Court %s submitted without a clear outcome; stopping the race to avoid a double booking",
+                uncertain_court,
+            )
 
-            remaining_tasks = [task for _, task in tasks if not task.done()]
-            if remaining_tasks:
-                await asyncio.gather(*remaining_tasks, return_exceptions=True)
-        finally:
-            pass
+        if pending:
+            # A decided guard means no sibling is mid-submit, so cancelling is safe.
+            message = RACE_LOST_MESSAGE if guard.decided else "Booking timed out"
+            for task in pending:
+                task.cancel()
+                court_number = task_courts[task]
+                if not guard.decided:
+                    self.logger.error("Court %s booking timed out", court_number)
+                results[court_number] = ExecutionResult(
+                    success=False,
+                    error_message=message,
+                    court_attempted=court_number,
+                    court_number=court_number,
+                )
+            await asyncio.gather(*pending, return_exceptions=True)
 
         return {
             "success": successful_court is not None,
             "successful_court": successful_court,
+            "uncertain_court": uncertain_court,
             "results": results,
-            "courts_attempted": court_numbers,
+            "courts_attempted": racing_courts,
         }
 
     async def execute_booking(
@@ -234,6 +291,8 @@ class AsyncBookingExecutor:
         time_slot: str,
         user_info: Dict[str, str],
         target_date: datetime | date,
+        *,
+        commit_guard: Optional[CommitGuard] = None,
     ) -> ExecutionResult:
         t('automation.executors.booking.AsyncBookingExecutor.execute_booking')
         if not self.browser_pool:
@@ -246,6 +305,7 @@ class AsyncBookingExecutor:
                 normalized_target,
                 time_slot,
                 user_info,
+                commit_guard=commit_guard,
             )
         except Exception as exc:  # pragma: no cover - defensive guard
             self.logger.error("Booking failed for court %s: %s", court_number, exc)
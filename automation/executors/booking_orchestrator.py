@@ -9,9 +9,13 @@ import threading
 from typing import List, Dict, Set, Optional, Any, Tuple
 from datetime import datetime, timedelta
 import logging
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from enum import Enum
 from .priority_manager import PriorityManager, PriorityUser
+from .release_clock import ReleaseClock, get_release_clock
+from .release_timing import ReleaseEstimate, ReleaseTimingModel, get_release_timing_model
+from infrastructure.court_topology import get_court_topology
+from infrastructure.settings import get_settings
 from users.manager import UserTier
 
 
@@ -34,6 +38,7 @@ class BookingAttempt:
     browser_id: Optional[str] = None
     attempt_time: Optional[datetime] = None
     result: Optional[Dict] = None
+    race_courts: List[int] = field(default_factory=list)
 
 
 class DynamicBookingOrchestrator:
@@ -41,30 +46,44 @@ class DynamicBookingOrchestrator:
     Orchestrates booking attempts across multiple browsers with dynamic fallbacks
     
     Strategy:
-    1. Use 3 browsers with staggered refresh (0s, 2s, 4s delays)
+    1. Use one browser per configured court with staggered refresh (0s, 2s, 4s delays)
     2. Assign primary targets to browsers
     3. If booking fails, dynamically reassign to available courts
     4. Track successes/failures in real-time to avoid conflicts
+    5. Racing mode: courts left idle after step 2 are raced in parallel by
+       the highest-priority attempts that would otherwise fall back to them
     """
     
-    def __init__(self):
+    def __init__(
+        self,
+        release_clock: Optional[ReleaseClock] = None,
+        racing: Optional[bool] = None,
+        courts: Optional[List[int]] = None,
+        release_model: Optional[ReleaseTimingModel] = None,
+    ):
         t('automation.executors.booking_orchestrator.DynamicBookingOrchestrator.__init__')
         self.logger = logging.getLogger('BookingOrchestrator')
         self.lock = threading.Lock()
+        self.release_clock = release_clock or get_release_clock()
+        self.release_model = release_model or get_release_timing_model()
+        self.racing_enabled = get_settings().booking_race_courts if racing is None else racing
+        # One browser page per court; the court list comes from the topology config
+        self.courts: List[int] = list(courts or get_court_topology().numbers)
         
         # Priority manager for user sorting
         self.priority_manager = PriorityManager()
         
         # Log initialization
-        self.logger.info("""BOOKING ORCHESTRATOR INITIALIZED
+        self.logger.info(f"""BOOKING ORCHESTRATOR INITIALIZED
         Priority system: Two-tier FCFS (Admin > VIP > Regular)
-        Browser strategies: 3 browsers with staggered refresh
+        Courts: {self.courts}
+        Browser strategies: one browser per court with staggered refresh
         Fallback support: Dynamic court reassignment enabled
         """)
         
         # Track booking status
         self.active_attempts: Dict[str, BookingAttempt] = {}  # reservation_id -> attempt
-        self.court_status: Dict[int, str] = {}  # court -> 'available'/'attempting'/'booked'
+        self.court_status: Dict[int, str] = self._fresh_court_status()  # court -> 'available'/'attempting'/'booked'
         self.successful_bookings: Set[str] = set()  # reservation_ids that succeeded
         self.bumped_users: Dict[str, str] = {}  # user_id -> vip_id who bumped them
         
@@ -84,7 +103,9 @@ class DynamicBookingOrchestrator:
         ]
         
         # Precision refresh timing based on monitoring data
-        # Slots appear 1.4s before the hour, refresh takes ~1s
+        # Slots appear 1.4s before the hour (local clock), refresh takes ~1s.
+        # Offsets learned by the release timing model take precedence; without
+        # them a calibrated release clock replaces 'slot_appears_at'.
         self.precision_refresh_config = {
             'slot_appears_at': -1.4,     # Slots appear 1.4s before hour
             'refresh_duration': 1.0,     # Refresh takes ~1 second
@@ -94,7 +115,8 @@ class DynamicBookingOrchestrator:
             'position_by': 10,           # Be on calendar by -10s
         }
         
-        # Legacy smart refresh config (kept for compatibility)
+        # Smart refresh windows in seconds relative to the release instant
+        # (negative = before). Learned release offsets move the critical window.
         self.smart_refresh_config = {
             'navigation_time': 11,       # Worst-case navigation time
             'pre_window_start': -15,     # Start monitoring 15s before (to account for navigation)
@@ -131,7 +153,7 @@ class DynamicBookingOrchestrator:
             """)
             
             # Reset court status
-            self.court_status = {1: 'available', 2: 'available', 3: 'available'}
+            self.court_status = self._fresh_court_status()
             
             # Convert reservations to PriorityUser objects
             priority_users = []
@@ -168,7 +190,7 @@ class DynamicBookingOrchestrator:
             
             # Use priority manager to allocate users
             confirmed_users, waitlisted_users = self.priority_manager.allocate_to_browsers(
-                priority_users, num_browsers=3
+                priority_users, num_browsers=len(self.courts)
             )
             
             # Log allocation results
@@ -196,9 +218,9 @@ class DynamicBookingOrchestrator:
                         assigned_courts.add(court)
                         break
                 
-                if not primary_court and len(assigned_courts) < 3:
+                if not primary_court and len(assigned_courts) < len(self.courts):
                     # Assign any available court
-                    for court in [1, 2, 3]:
+                    for court in self.courts:
                         if court not in assigned_courts:
                             primary_court = court
                             assigned_courts.add(court)
@@ -207,9 +229,14 @@ class DynamicBookingOrchestrator:
                 if primary_court:
                     # Create fallback list (other courts in preference order)
                     fallback_courts = [c for c in user.court_preferences if c != primary_court]
-                    # Add any remaining courts
-                    for court in [1, 2, 3]:
-                        if court not in fallback_courts and court != primary_court:
+                    # Add any remaining courts at the same club
+                    club = self._club_of(primary_court)
+                    for court in self.courts:
+                        if (
+                            court not in fallback_courts
+                            and court != primary_court
+                            and self._club_of(court) == club
+                        ):
                             fallback_courts.append(court)
                     
                     attempt = BookingAttempt(
@@ -228,6 +255,9 @@ class DynamicBookingOrchestrator:
                     Fallbacks: {fallback_courts}
                     """)
             
+            if self.racing_enabled:
+                self._assign_race_courts(attempts, assigned_courts)
+
             # Distribute attempts across browsers
             browser_assignments = [
                 self._create_assignment(attempt, position=i)
@@ -247,6 +277,36 @@ class DynamicBookingOrchestrator:
             self._log_plan(plan)
             return plan
 
+    def _fresh_court_status(self) -> Dict[int, str]:
+        t('automation.executors.booking_orchestrator.DynamicBookingOrchestrator._fresh_court_status')
+        return {court: 'available' for court in self.courts}
+
+    def _club_of(self, court: int) -> Optional[str]:
+        t('automation.executors.booking_orchestrator.DynamicBookingOrchestrator._club_of')
+        definition = get_court_topology().get(court)
+        return definition.club if definition else None
+
+    def _assign_race_courts(self, attempts: List[BookingAttempt], assigned_courts: Set[int]) -> None:
+        """Hand idle courts to attempts in priority order as parallel race courts."""
+        t('automation.executors.booking_orchestrator.DynamicBookingOrchestrator._assign_race_courts')
+        spare = [court for court in self.courts if court not in assigned_courts]
+        for attempt in attempts:
+            if not spare:
+                break
+            attempt.race_courts = [court for court in attempt.fallback_courts if court in spare]
+            if not attempt.race_courts:
+                continue
+            for court in attempt.race_courts:
+                spare.remove(court)
+                self.court_status[court] = 'attempting'
+            attempt.fallback_courts = [
+                court for court in attempt.fallback_courts if court not in attempt.race_courts
+            ]
+            self.logger.info(
+                f"Racing reservation {attempt.reservation_id} on Court {attempt.target_court} "
+                f"plus idle courts {attempt.race_courts}"
+            )
+
     def _create_assignment(self, attempt: BookingAttempt, position: int = 0) -> Dict[str, Any]:
         """Build a browser assignment for the provided attempt."""
         t('automation.executors.booking_orchestrator.DynamicBookingOrchestrator._create_assignment')
@@ -262,10 +322,16 @@ class DynamicBookingOrchestrator:
         }
 
     def handle_booking_result(self, reservation_id: str, success: bool, 
-                            court_booked: Optional[int] = None) -> Optional[Dict]:
+                            court_booked: Optional[int] = None,
+                            allow_fallback: bool = True) -> Optional[Dict]:
         """
         Handle booking result and determine if fallback is needed
         
+        Args:
+            allow_fallback: False when the failed attempt may still have
+                booked (e.g. a raced submit with an unknown outcome), so no
+                fallback court is tried for it
+        
         Returns:
             Fallback plan if needed, None otherwise
         """
@@ -279,6 +345,7 @@ class DynamicBookingOrchestrator:
                 # Mark as successful
                 attempt.status = BookingStatus.SUCCESS
                 self.successful_bookings.add(reservation_id)
+                self._release_race_courts(attempt, keep=court_booked)
                 if court_booked:
                     self.court_status[court_booked] = 'booked'
                     
@@ -302,6 +369,15 @@ class DynamicBookingOrchestrator:
                 # Mark current court as still available (failed to book)
                 if attempt.target_court in self.court_status:
                     self.court_status[attempt.target_court] = 'available'
+                self._release_race_courts(attempt)
+                
+                if not allow_fallback:
+                    attempt.status = BookingStatus.FAILED
+                    self.logger.warning(f"""FALLBACK SKIPPED
+                    Reservation ID: {reservation_id}
+                    Outcome of the last submit is unknown; not retrying another court
+                    """)
+                    return None
                 
                 # Find next available court from fallbacks
                 fallback_court = None
@@ -345,6 +421,16 @@ class DynamicBookingOrchestrator:
                     """)
                     return None
     
+    def _release_race_courts(self, attempt: BookingAttempt, keep: Optional[int] = None) -> None:
+        """Free the courts an attempt raced on (except ``keep``); they are never retried for it."""
+        t('automation.executors.booking_orchestrator.DynamicBookingOrchestrator._release_race_courts')
+        if not attempt.race_courts:
+            return
+        for court in [attempt.target_court, *attempt.race_courts]:
+            if court != keep and self.court_status.get(court) == 'attempting':
+                self.court_status[court] = 'available'
+        attempt.race_courts = []
+
     def get_dynamic_court_assignment(self, reservation_id: str) -> Optional[int]:
         """Get current court assignment for a reservation"""
         t('automation.executors.booking_orchestrator.DynamicBookingOrchestrator.get_dynamic_court_assignment')
@@ -383,7 +469,7 @@ class DynamicBookingOrchestrator:
             # Use priority manager to handle VIP bump
             all_users = current_confirmed + current_waitlist + [vip_user]
             bump_result = self.priority_manager.handle_vip_bump(
-                vip_user, all_users, num_browsers=3
+                vip_user, all_users, num_browsers=len(self.courts)
             )
             
             # Track who got bumped
@@ -424,19 +510,32 @@ class DynamicBookingOrchestrator:
             
             return summary
     
-    def get_precision_refresh_moment(self, target_time: datetime) -> datetime:
+    def get_precision_refresh_moment(self, target_time: datetime, court: Optional[int] = None) -> datetime:
         """
         Calculate the exact moment to execute a single refresh
-        Based on monitoring: slots appear 1.4s before the hour
+        Uses the release offset learned for this court, weekday and hour when
+        there is one; otherwise slots open on the hour by the server's clock,
+        and until the release clock has measured the offset, fall back to the
+        observed 1.4s lead
         
         Returns:
-            datetime: The precise moment to refresh
+            datetime: The precise local moment to refresh
         """
         t('automation.executors.booking_orchestrator.DynamicBookingOrchestrator.get_precision_refresh_moment')
         config = self.precision_refresh_config
         
         # Calculate when slot will appear
-        slot_appears = target_time + timedelta(seconds=config['slot_appears_at'])
+        estimate = self.release_model.estimate(target_time, court)
+        if estimate is not None:
+            slot_appears = target_time + timedelta(seconds=estimate.offset)
+            self.logger.info(
+                f"  Learned release offset {estimate.offset:+.2f}s "
+                f"({estimate.scope}, {estimate.samples} samples)"
+            )
+        elif self.release_clock.calibrated:
+            slot_appears = self.release_clock.to_local(target_time)
+        else:
+            slot_appears = target_time + timedelta(seconds=config['slot_appears_at'])
         
         # Calculate when to start refresh (slot_appears - refresh_duration - margin)
         refresh_moment = slot_appears - timedelta(
@@ -472,48 +571,78 @@ class DynamicBookingOrchestrator:
             
         return False
     
-    def get_smart_refresh_interval(self, target_time: datetime, current_time: datetime) -> float:
+    def get_smart_refresh_interval(
+        self, target_time: datetime, current_time: datetime, court: Optional[int] = None
+    ) -> float:
         """
         Calculate optimal refresh interval based on proximity to target time
-        Based on monitoring data: slots appear 1-2 seconds BEFORE the hour
+        The critical window follows the learned release distribution when
+        available; otherwise slots appear 1-2 seconds BEFORE the hour
         
         Returns:
             Refresh interval in seconds
         """
         t('automation.executors.booking_orchestrator.DynamicBookingOrchestrator.get_smart_refresh_interval')
-        seconds_until_target = (target_time - current_time).total_seconds()
-        config = self.smart_refresh_config
+        # Negative before the release instant, positive after it
+        seconds_from_target = (current_time - target_time).total_seconds()
+        config = self.get_refresh_windows(target_time, court)
+        intervals = config['intervals']
         
         # Before the window - normal refresh
-        if seconds_until_target > config['pre_window_start']:
-            return config['intervals']['normal']
+        if seconds_from_target < config['pre_window_start']:
+            return intervals['normal']
         
-        # Pre-rapid phase (-5s to -3s)
-        elif config['pre_window_start'] <= seconds_until_target < config['rapid_check_start']:
-            return config['intervals']['pre_rapid']
+        # Pre-rapid phase (-15s to -3s)
+        elif seconds_from_target < config['rapid_check_start']:
+            return intervals['pre_rapid']
         
         # Rapid phase (-3s to -2s)
-        elif config['rapid_check_start'] <= seconds_until_target < config['critical_start']:
-            return config['intervals']['rapid']
+        elif seconds_from_target < config['critical_start']:
+            return intervals['rapid']
         
         # CRITICAL WINDOW (-2s to +2s) - Maximum speed!
-        elif config['critical_start'] <= seconds_until_target <= config['critical_end']:
-            return config['intervals']['critical']
+        elif seconds_from_target <= config['critical_end']:
+            return intervals['critical']
         
         # Post-window slowdown (+2s to +5s)
-        elif config['critical_end'] < seconds_until_target <= config['post_window_end']:
-            return config['intervals']['rapid']
+        elif seconds_from_target <= config['post_window_end']:
+            return intervals['rapid']
         
         # After the window - back to normal
         else:
-            return config['intervals']['normal']
+            return intervals['normal']
+    
+    def get_refresh_windows(self, target_time: datetime, court: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Return the smart refresh windows for a release, centred on learned offsets
+        
+        The critical window spans the early/late release quantiles plus a
+        half-second margin; the rapid phases keep their width around it.
+        """
+        t('automation.executors.booking_orchestrator.DynamicBookingOrchestrator.get_refresh_windows')
+        config = dict(self.smart_refresh_config)
+        estimate: Optional[ReleaseEstimate] = self.release_model.estimate(target_time, court)
+        if estimate is None:
+            return config
+        
+        critical_start = estimate.early - 0.5
+        critical_end = estimate.late + 0.5
+        rapid_check_start = critical_start - (config['critical_start'] - config['rapid_check_start'])
+        config.update(
+            critical_start=critical_start,
+            critical_end=critical_end,
+            rapid_check_start=rapid_check_start,
+            pre_window_start=min(config['pre_window_start'], rapid_check_start),
+            post_window_end=critical_end + (config['post_window_end'] - config['critical_end']),
+        )
+        return config
     
     def reset(self):
         """Reset orchestrator state"""
         t('automation.executors.booking_orchestrator.DynamicBookingOrchestrator.reset')
         with self.lock:
             self.active_attempts.clear()
-            self.court_status = {1: 'available', 2: 'available', 3: 'available'}
+            self.court_status = self._fresh_court_status()
             self.successful_bookings.clear()
     
     def _log_plan(self, plan: Dict):
@@ -529,10 +658,11 @@ class DynamicBookingOrchestrator:
             browser = assignment['browser']
             
             if i < plan['initial_attempts']:
+                racing = f", racing: {attempt.race_courts}" if attempt.race_courts else ""
                 self.logger.info(
                     f"  {browser['id']} (delay {browser['delay']}s): "
                     f"User {attempt.user_id} → Court {attempt.target_court} "
-                    f"(fallbacks: {attempt.fallback_courts})"
+                    f"(fallbacks: {attempt.fallback_courts}{racing})"
                 )
             else:
                 self.logger.info(
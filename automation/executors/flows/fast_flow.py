@@ -13,7 +13,12 @@ from typing import Any, Dict, Optional
 from playwright.async_api import Page
 
 from automation.availability import DateTimeHelpers
+from automation.browser.refresh_control import get_refresh_controller
 from automation.executors.core import ExecutionResult
+from automation.executors.racing import RACE_LOST_MESSAGE, CommitGuard
+from automation.executors.release_clock import get_release_clock
+from automation.executors.release_timing import expected_release_window
+from automation.forms.submission import DEFAULT_OUTCOME_TIMEOUT, PhaseTimer, SubmissionWatcher
 
 from .helpers import confirmation_result
 
@@ -55,14 +60,14 @@ async def take_screenshot_if_dev(
 
 
 async def fast_fill(element, text: str) -> None:
-    """Fill an input rapidly for the fast flow."""
+    """Fill an input rapidly for the fast flow.
+
+    ``fill`` clears the field and waits for actionability itself, so no
+    pauses are needed between the focus click and the value.
+    """
     t('automation.executors.flows.fast_flow.fast_fill')
     await element.click()
-    await asyncio.sleep(0.05)
-    await element.fill("")
-    await asyncio.sleep(0.05)
     await element.fill(text)
-    await asyncio.sleep(0.1)
 
 
 async def minimal_mouse_movement(page: Page) -> None:
@@ -74,6 +79,15 @@ async def minimal_mouse_movement(page: Page) -> None:
     await asyncio.sleep(0.1)
 
 
+async def wait_for_time_grid(page: Page, timeout: float) -> None:
+    """Give a reloaded page up to ``timeout`` seconds to render its time buttons."""
+    t('automation.executors.flows.fast_flow.wait_for_time_grid')
+    try:
+        await page.wait_for_selector("button.time-selection", timeout=int(timeout * 1000))
+    except Exception:  # pragma: no cover - no slots rendered yet
+        pass
+
+
 async def find_time_slot_with_refresh(
     page: Page,
     time_slot: str,
@@ -85,13 +99,20 @@ async def find_time_slot_with_refresh(
 ) -> Optional[Any]:
     """Find a time slot, refreshing when necessary until available."""
     t('automation.executors.flows.fast_flow.find_time_slot_with_refresh')
+    clock = get_release_clock()
+    refresher = get_refresh_controller()
     if target_datetime:
         booking_window_opens = target_datetime - timedelta(hours=48)
-        current_time = datetime.now(target_datetime.tzinfo)
+        # Clicks still wait for the official window; the learned release
+        # offset only decides when the pre-window refresh burst starts.
+        window = expected_release_window(booking_window_opens, court_number, clock=clock)
+        burst_starts = min(window[0], booking_window_opens) if window else booking_window_opens
+        current_time = clock.now(target_datetime.tzinfo)
         pre_window_attempts = 0
         while current_time < booking_window_opens:
             time_until_window = (booking_window_opens - current_time).total_seconds()
-            if time_until_window <= 30:
+            time_until_burst = (burst_starts - current_time).total_seconds()
+            if time_until_burst <= 30:
                 log.info(
                     "Court %s: PRE-WINDOW PHASE - Attempt #%s (%.1fs until official window)",
                     court_number,
@@ -104,7 +125,7 @@ async def find_time_slot_with_refresh(
                     button = await page.query_selector(f'button.time-selection:has(p:text("{time_slot}"))')
                     if button and await button.is_visible() and await button.is_enabled():
                         log.info("Court %s: Time slot appeared early; waiting for window", court_number)
-                        await asyncio.sleep(max(0, time_until_window))
+                        await clock.wait_until(booking_window_opens)
                         if await button.is_visible() and await button.is_enabled():
                             log.info("Court %s: Window open, clicking now", court_number)
                             return button
@@ -115,25 +136,34 @@ async def find_time_slot_with_refresh(
                     try:
                         button = await page.query_selector(f'button:has-text("{time_format}")')
                         if button and await button.is_visible() and await button.is_enabled():
-                            await asyncio.sleep(max(0, time_until_window))
+                            await clock.wait_until(booking_window_opens)
                             if await button.is_visible() and await button.is_enabled():
                                 return button
                     except Exception:  # pragma: no cover
                         pass
 
                 try:
-                    await page.reload(wait_until="domcontentloaded")
-                    await asyncio.sleep(0.5)
+                    await refresher.reload(
+                        page, court_number, clock=clock, floor=0.5, wait_until="domcontentloaded"
+                    )
+                    await wait_for_time_grid(page, 0.5)
                 except Exception as exc:
                     log.debug("Pre-window refresh error: %s", exc)
-                    await asyncio.sleep(0.5)
             else:
                 log.info("Court %s: Waiting... Opens in %.0fs", court_number, time_until_window)
-                await asyncio.sleep(min(5.0, time_until_window - 30))
-
-            current_time = datetime.now(target_datetime.tzinfo)
-
-        log.info("Court %s: Booking window officially open", court_number)
+                await asyncio.sleep(min(5.0, time_until_burst - 30))
+
+            current_time = clock.now(target_datetime.tzinfo)
+
+        clock_stats = clock.stats()
+        log.info(
+            "Court %s: Booking window officially open "
+            "(server offset %+.3fs, jitter %.3fs, %s samples)",
+            court_number,
+            clock_stats["offset"],
+            clock_stats["jitter"],
+            clock_stats["samples"],
+        )
 
     attempt = 0
     time_formats = [time_slot, time_slot.replace(":00", "")]
@@ -159,10 +189,12 @@ async def find_time_slot_with_refresh(
                 pass
 
         try:
-            await page.reload(wait_until="domcontentloaded")
+            await refresher.reload(
+                page, court_number, clock=clock, floor=refresh_delay, wait_until="domcontentloaded"
+            )
+            await wait_for_time_grid(page, refresh_delay)
         except Exception as exc:
             log.debug("Refresh attempt error: %s", exc)
-        await asyncio.sleep(refresh_delay)
 
     return None
 
@@ -213,9 +245,43 @@ async def execute_fast_flow(
     user_info: Dict[str, str],
     *,
     logger: logging.Logger,
+    commit_guard: Optional[CommitGuard] = None,
 ) -> ExecutionResult:
     """Execute the fast booking flow and return the result."""
     t('automation.executors.flows.fast_flow.execute_fast_flow')
+    timer = PhaseTimer()
+    result: Optional[ExecutionResult] = None
+    try:
+        result = await _run_fast_flow(
+            page,
+            court_number,
+            target_date,
+            time_slot,
+            user_info,
+            timer,
+            logger=logger,
+            commit_guard=commit_guard,
+        )
+        return result
+    finally:
+        if commit_guard is not None:
+            commit_guard.settle(court_number, bool(result and result.success))
+        if timer.phases:
+            logger.info("Court %s: fast flow timings: %s", court_number, timer.summary())
+
+
+async def _run_fast_flow(
+    page: Page,
+    court_number: int,
+    target_date: datetime,
+    time_slot: str,
+    user_info: Dict[str, str],
+    timer: PhaseTimer,
+    *,
+    logger: logging.Logger,
+    commit_guard: Optional[CommitGuard] = None,
+) -> ExecutionResult:
+    t('automation.executors.flows.fast_flow._run_fast_flow')
     await minimal_mouse_movement(page)
 
     target_date_str = target_date.strftime("%Y-%m-%d") if hasattr(target_date, "strftime") else str(target_date)
@@ -225,15 +291,16 @@ async def execute_fast_flow(
     except Exception:  # pragma: no cover - defensive guard against malformed data
         target_datetime = None
 
-    time_button = await find_time_slot_with_refresh(
-        page,
-        time_slot,
-        court_number,
-        max_attempts=5,
-        refresh_delay=0.6,
-        log=logger,
-        target_datetime=target_datetime,
-    )
+    with timer.phase("slot_visible"):
+        time_button = await find_time_slot_with_refresh(
+            page,
+            time_slot,
+            court_number,
+            max_attempts=5,
+            refresh_delay=0.6,
+            log=logger,
+            target_datetime=target_datetime,
+        )
     if not time_button:
         return ExecutionResult(
             success=False,
@@ -241,25 +308,63 @@ async def execute_fast_flow(
             court_number=court_number,
         )
 
-    await time_button.click()
-    await asyncio.sleep(apply_speed(0.3))
+    # fill_form waits for the form itself, so no pause after the click.
+    with timer.phase("click"):
+        await time_button.click()
 
-    await fill_form(page, user_info, logger=logger)
+    with timer.phase("fill"):
+        await fill_form(page, user_info, logger=logger)
 
-    submit_button = await page.query_selector('button:has-text("Confirmar")')
-    if submit_button:
-        await submit_button.click()
+    if commit_guard is not None and not await commit_guard.acquire(court_number):
+        logger.info(
+            "Court %s: court %s already booked this reservation - not submitting",
+            court_number,
+            commit_guard.winner,
+        )
+        return ExecutionResult(
+            success=False,
+            error_message=RACE_LOST_MESSAGE,
+            court_number=court_number,
+            court_attempted=court_number,
+        )
 
-    await asyncio.sleep(apply_speed(1.0))
-    return await confirmation_result(
-        page,
+    async with SubmissionWatcher(page) as watcher:
+        with timer.phase("submit"):
+            submit_button = await page.query_selector('button:has-text("Confirmar")')
+            if submit_button is None:
+                # Nothing was clicked, so there is no outcome to wait for; the
+                # unsubmitted guard passes straight to the next racing court.
+                logger.error("Court %s: submit button not found", court_number)
+                return ExecutionResult(
+                    success=False,
+                    error_message="Submit button not found",
+                    court_number=court_number,
+                )
+            if commit_guard is not None:
+                commit_guard.mark_submitted(court_number)
+            await submit_button.click()
+
+        with timer.phase("outcome"):
+            signal = await watcher.wait(DEFAULT_OUTCOME_TIMEOUT)
+    if commit_guard is not None:
+        commit_guard.record_outcome(court_number, signal.kind)
+    logger.info(
+        "Court %s: submission outcome %s (booking POST status: %s)",
         court_number,
-        time_slot,
-        user_info,
-        logger=logger,
-        success_log="Booking confirmed for Court %s",
+        signal.kind,
+        signal.status,
     )
 
+    with timer.phase("confirm"):
+        return await confirmation_result(
+            page,
+            court_number,
+            time_slot,
+            user_info,
+            logger=logger,
+            success_log="Booking confirmed for Court %s",
+        )
+
 
 __all__ = [
     "EXPERIENCED_SPEED_MULTIPLIER",
@@ -9,12 +9,13 @@ from typing import Dict, Optional
 
 from playwright.async_api import Page
 
+from automation.browser.refresh_control import get_refresh_controller, host_of
 from automation.executors.core import ExecutionResult
 from datetime import date, datetime, time
 from pathlib import Path
 from urllib.parse import quote, urlencode
 
-from infrastructure.constants import COURT_CONFIG
+from infrastructure.court_topology import get_court_topology
 
 
 def safe_sleep(seconds: float) -> None:
@@ -71,8 +72,8 @@ def build_direct_slot_url(
 ) -> str:
     """Construct the canonical Acuity URL for a specific court/time slot."""
 
-    config = COURT_CONFIG.get(court_number)
-    if not config:
+    court = get_court_topology().get(court_number)
+    if not court:
         raise ValueError(f"No court configuration available for court {court_number}")
 
     slot_datetime = _resolve_slot_datetime(target_date, time_slot)
@@ -80,8 +81,8 @@ def build_direct_slot_url(
     iso_component = f"{slot_datetime.strftime('%Y-%m-%dT%H:%M:%S')}{tz_offset}"
     encoded_datetime = quote(iso_component, safe="-T")
 
-    query = urlencode({"appointmentTypeIds[]": config["appointment_id"]})
-    return f"{config['full_url']}/datetime/{encoded_datetime}?{query}"
+    query = urlencode({"appointmentTypeIds[]": court.appointment_id})
+    return f"{court.full_url}/datetime/{encoded_datetime}?{query}"
 
 
 async def confirmation_result(
@@ -276,6 +277,7 @@ async def confirmation_result(
         message = "Irregular usage warning encountered"
         if logger:
             logger.warning("Court %s triggered irregular usage warning", court_number)
+        get_refresh_controller().report_detection(host_of(page))
         return ExecutionResult(
             success=False,
             error_message=message,
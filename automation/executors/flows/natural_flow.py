@@ -3,7 +3,6 @@
 from __future__ import annotations
 from tracking import t
 
-import asyncio
 import logging
 import random
 from datetime import date, datetime, timedelta
@@ -11,11 +10,23 @@ from typing import Dict, Tuple, Optional, Union
 
 from playwright.async_api import Page
 
+from automation.browser.refresh_control import get_refresh_controller
 from automation.executors.core import ExecutionResult
+from automation.executors.racing import RACE_LOST_MESSAGE, CommitGuard
+from automation.executors.release_clock import get_release_clock
+from automation.executors.release_timing import expected_release_window
 from automation.debug import get_logger
-
+from automation.forms.submission import (
+    DEFAULT_OUTCOME_TIMEOUT,
+    PhaseTimer,
+    SubmissionSignal,
+    SubmissionWatcher,
+)
+
+from .fast_flow import fill_form as fast_fill_form
 from .helpers import build_direct_slot_url, confirmation_result
 from .human_behaviors import HumanLikeActions
+from .prearm import PreArmedSlot, get_prearm_registry
 
 WORKING_SPEED_MULTIPLIER = 1.5  # Conservative speed to avoid detection
 _VALIDATION_SLEEP = (0.3, 0.6)  # More natural validation pauses
@@ -24,19 +35,28 @@ _FIELD_LINGER = (0.5, 0.9)      # Natural field review time
 _REFRESH_DELAY = (0.35, 0.65)
 _MAX_REFRESH_WITHOUT_TARGET = 15
 _POST_SLOT_GRACE_SECONDS = 6
-_TARGET_POLL_INTERVAL = (0.25, 0.45)
 _MAX_POST_TARGET_REFRESHES = 5
 _QUEUE_RELEASE_OFFSET = timedelta(hours=48)
+_PREARMED_FORM_TIMEOUT_MS = 4000
 
 
 class NaturalFlowSteps:
     """Encapsulates the human-like steps used by the natural booking flow."""
 
-    def __init__(self, page: Page, logger: logging.Logger) -> None:
+    def __init__(
+        self,
+        page: Page,
+        logger: logging.Logger,
+        *,
+        commit_guard: Optional[CommitGuard] = None,
+    ) -> None:
         t("automation.executors.flows.natural_flow.NaturalFlowSteps.__init__")
         self.page = page
         self.logger = logger
+        self.commit_guard = commit_guard
         self.actions = HumanLikeActions(page, speed_multiplier=WORKING_SPEED_MULTIPLIER)
+        self.clock = get_release_clock()
+        self.refresher = get_refresh_controller()
         self.debug_logger = get_logger()
         self.debug_logger.attach_listeners(page)
 
@@ -103,20 +123,26 @@ class NaturalFlowSteps:
                 return button
         return None
 
-    async def submit(self) -> None:
+    async def submit(self, court_number: Optional[int] = None) -> bool:
+        """Click the submit button with natural pacing; ``False`` when it is missing."""
+
         t("automation.executors.flows.natural_flow.NaturalFlowSteps.submit")
         submit_button = await self.page.query_selector('button:has-text("Confirmar")')
         if not submit_button:
             submit_button = await self.page.query_selector('button:has-text("Confirm")')
-        if submit_button:
-            # Natural pause before submission - review the form
-            await self.actions.reading_pause(duration_range=(1.0, 2.0))  # Review form before submit
-            await self.actions.click_with_hesitation(
-                submit_button,
-                hesitation_prob=0.5,              # Natural hesitation
-                correction_count_range=(0, 1)     # Occasional corrections
-            )
-            await self.actions.pause(1.0, 1.5)  # Wait for page to respond
+        if not submit_button:
+            return False
+        # Natural pause before submission - review the form
+        await self.actions.reading_pause(duration_range=(1.0, 2.0))  # Review form before submit
+        if self.commit_guard is not None and court_number is not None:
+            self.commit_guard.mark_submitted(court_number)
+        await self.actions.click_with_hesitation(
+            submit_button,
+            hesitation_prob=0.5,              # Natural hesitation
+            correction_count_range=(0, 1)     # Occasional corrections
+        )
+        await self.actions.pause(1.0, 1.5)  # Wait for page to respond
+        return True
 
     async def execute(
         self,
@@ -128,33 +154,81 @@ class NaturalFlowSteps:
         initial_delay_range: Tuple[float, float],
     ) -> ExecutionResult:
         t("automation.executors.flows.natural_flow.NaturalFlowSteps.execute")
-        delay_min, delay_max = initial_delay_range
-        delay = random.uniform(delay_min, delay_max)
-        self.logger.info("Initial natural delay (%.1f seconds)...", delay)
-        await self.actions.pause(delay, delay)
-
-        # Natural page interaction (natural scroll + reading)
-        self.logger.info("Performing natural page interaction (scroll + reading)...")
-        await self.debug_logger.capture_state(self.page, "01_initial_page_load")
-
-        await self.actions.scroll_naturally(
-            scroll_count_range=(2, 3),      # Natural scrolling to review page
-            scroll_amount_range=(150, 350), # Natural scroll amounts
-            scroll_back_prob=0.2            # Sometimes scroll back to review
-        )
-        await self.actions.reading_pause(duration_range=(1.5, 3.0))  # Read the page content
+        timer = PhaseTimer()
+        armed = get_prearm_registry().take(court_number, target_date, time_slot, self.page)
+        path = "pre-armed" if armed else "standard"
+        result: Optional[ExecutionResult] = None
+        try:
+            if armed:
+                result = await self._execute_prearmed(
+                    armed, court_number, target_date, time_slot, user_info, timer
+                )
+            else:
+                result = await self._execute_standard(
+                    court_number,
+                    target_date,
+                    time_slot,
+                    user_info,
+                    timer,
+                    initial_delay_range=initial_delay_range,
+                )
+            return result
+        finally:
+            if self.commit_guard is not None:
+                self.commit_guard.settle(court_number, bool(result and result.success))
+            if timer.phases:
+                self.logger.info(
+                    "Court %s: natural flow timings (%s): %s", court_number, path, timer.summary()
+                )
+                if result is not None:
+                    result.details = {
+                        **(result.details or {}),
+                        "flow_path": path,
+                        "phase_timings": timer.as_dict(),
+                    }
+
+    async def _execute_standard(
+        self,
+        court_number: int,
+        target_date: datetime,
+        time_slot: str,
+        user_info: Dict[str, str],
+        timer: PhaseTimer,
+        *,
+        initial_delay_range: Tuple[float, float],
+    ) -> ExecutionResult:
+        """Browse the calendar, pick the slot and submit with human-like pacing."""
+
+        t("automation.executors.flows.natural_flow.NaturalFlowSteps._execute_standard")
+        with timer.phase("warmup"):
+            delay_min, delay_max = initial_delay_range
+            delay = random.uniform(delay_min, delay_max)
+            self.logger.info("Initial natural delay (%.1f seconds)...", delay)
+            await self.actions.pause(delay, delay)
+
+            # Natural page interaction (natural scroll + reading)
+            self.logger.info("Performing natural page interaction (scroll + reading)...")
+            await self.debug_logger.capture_state(self.page, "01_initial_page_load")
+
+            await self.actions.scroll_naturally(
+                scroll_count_range=(2, 3),      # Natural scrolling to review page
+                scroll_amount_range=(150, 350), # Natural scroll amounts
+                scroll_back_prob=0.2            # Sometimes scroll back to review
+            )
+            await self.actions.reading_pause(duration_range=(1.5, 3.0))  # Read the page content
 
-        await self.move_mouse()
+            await self.move_mouse()
 
         self.logger.info("Looking for %s time slot...", time_slot)
         target_datetime = self._resolve_slot_datetime(target_date, time_slot)
         release_datetime = self._resolve_release_datetime(target_datetime)
-        time_button = await self._wait_for_time_slot(
-            time_slot,
-            court_number,
-            target_datetime=target_datetime,
-            release_datetime=release_datetime,
-        )
+        with timer.phase("slot_visible"):
+            time_button = await self._wait_for_time_slot(
+                time_slot,
+                court_number,
+                target_datetime=target_datetime,
+                release_datetime=release_datetime,
+            )
         if not time_button:
             self.logger.error("Time slot %s not found", time_slot)
             return ExecutionResult(
@@ -163,19 +237,129 @@ class NaturalFlowSteps:
                 court_number=court_number,
             )
 
-        await self.actions.pause(*_VALIDATION_SLEEP)
+        with timer.phase("click"):
+            await self.actions.pause(*_VALIDATION_SLEEP)
 
-        # Click time slot with natural hesitation
-        self.logger.info("Clicking time slot...")
-        await self.debug_logger.capture_state(self.page, "02_before_time_click")
+            # Click time slot with natural hesitation
+            self.logger.info("Clicking time slot...")
+            await self.debug_logger.capture_state(self.page, "02_before_time_click")
 
-        await self._commit_time_selection(time_button)
+            await self._commit_time_selection(time_button)
 
-        form_ready = await self._ensure_booking_form_visible(
-            court_number=court_number,
-            target_date=target_date,
-            time_slot=time_slot,
+        with timer.phase("form_visible"):
+            form_ready = await self._ensure_booking_form_visible(
+                court_number=court_number,
+                target_date=target_date,
+                time_slot=time_slot,
+            )
+        if not form_ready:
+            return ExecutionResult(
+                success=False,
+                error_message="Booking form not found",
+                court_number=court_number,
+            )
+
+        with timer.phase("fill"):
+            await self.fill_user_form(user_info)
+            await self.debug_logger.capture_state(self.page, "04_after_form_fill")
+
+        if not await self._claim_submit(court_number):
+            return self._race_lost(court_number)
+
+        # Attach before the click so a rejection rendered during the natural
+        # post-click pause is still seen by the race guard.
+        async with SubmissionWatcher(self.page) as watcher:
+            with timer.phase("submit"):
+                await self.actions.pause(1.2, 2.0)  # Review form after filling
+                await self.actions.move_mouse_random()
+                self.logger.info("Submitting booking form (natural mode)...")
+                await self.debug_logger.capture_state(self.page, "05_before_submit")
+
+                submitted = await self.submit(court_number)
+                await self.debug_logger.capture_state(self.page, "06_after_submit")
+            if not submitted:
+                return self._submit_missing(court_number)
+
+            with timer.phase("outcome"):
+                signal = await watcher.wait(DEFAULT_OUTCOME_TIMEOUT)
+        self._record_submit_outcome(court_number, signal)
+
+        with timer.phase("confirm"):
+            result = await confirmation_result(
+                self.page,
+                court_number,
+                time_slot,
+                user_info,
+                logger=self.logger,
+                success_log="Booking confirmed for Court %s",
+                failure_log="Booking result uncertain for Court %s",
+            )
+
+        await self.debug_logger.capture_state(self.page, "07_final_result")
+        self.debug_logger.save_logs()
+        self.debug_logger.print_summary()
+
+        return result
+
+    async def _execute_prearmed(
+        self,
+        armed: PreArmedSlot,
+        court_number: int,
+        target_date: datetime,
+        time_slot: str,
+        user_info: Dict[str, str],
+        timer: PhaseTimer,
+    ) -> ExecutionResult:
+        """Reload the parked slot page at release, then fill and submit directly."""
+
+        t("automation.executors.flows.natural_flow.NaturalFlowSteps._execute_prearmed")
+        self.logger.info(
+            "Court %s pre-armed on %s (%s) - skipping calendar browsing",
+            court_number,
+            armed.mode,
+            armed.url,
         )
+        target_datetime = self._resolve_slot_datetime(target_date, time_slot)
+        release_datetime = self._resolve_release_datetime(target_datetime)
+
+        with timer.phase("wait_release"):
+            if release_datetime:
+                window = expected_release_window(release_datetime, court_number, clock=self.clock)
+                wake_at = window[0] if window else release_datetime
+                if self.clock.now(wake_at.tzinfo) < wake_at:
+                    lateness = await self.clock.wait_until(wake_at)
+                    self.logger.debug(
+                        "Woke %.1fms after %s release for pre-armed Court %s",
+                        lateness * 1000,
+                        "learned" if window else "nominal",
+                        court_number,
+                    )
+
+        with timer.phase("refresh"):
+            try:
+                await self.clock.reload(self.page, wait_until="domcontentloaded")
+            except Exception as exc:
+                self.logger.warning("Pre-armed reload failed for Court %s: %s", court_number, exc)
+
+        with timer.phase("form_visible"):
+            form_ready = await self._wait_for_form_once(
+                "03_prearmed_form_loaded", timeout=_PREARMED_FORM_TIMEOUT_MS
+            )
+            if not form_ready:
+                # Parked on the date view, or the slot rendered late: click through.
+                time_button = await self._wait_for_time_slot(
+                    time_slot,
+                    court_number,
+                    target_datetime=target_datetime,
+                    release_datetime=None,
+                )
+                if time_button:
+                    await time_button.click()
+                    form_ready = await self._ensure_booking_form_visible(
+                        court_number=court_number,
+                        target_date=target_date,
+                        time_slot=time_slot,
+                    )
         if not form_ready:
             return ExecutionResult(
                 success=False,
@@ -183,32 +367,83 @@ class NaturalFlowSteps:
                 court_number=court_number,
             )
 
-        await self.fill_user_form(user_info)
-        await self.debug_logger.capture_state(self.page, "04_after_form_fill")
+        with timer.phase("fill"):
+            await fast_fill_form(self.page, user_info, logger=self.logger)
+
+        if not await self._claim_submit(court_number):
+            return self._race_lost(court_number)
+
+        async with SubmissionWatcher(self.page) as watcher:
+            with timer.phase("submit"):
+                submit_button = await self.page.query_selector('button:has-text("Confirmar")')
+                if not submit_button:
+                    submit_button = await self.page.query_selector('button:has-text("Confirm")')
+                if submit_button is None:
+                    return self._submit_missing(court_number)
+                if self.commit_guard is not None:
+                    self.commit_guard.mark_submitted(court_number)
+                await submit_button.click()
+
+            with timer.phase("outcome"):
+                signal = await watcher.wait(DEFAULT_OUTCOME_TIMEOUT)
+        self._record_submit_outcome(court_number, signal)
+
+        with timer.phase("confirm"):
+            return await confirmation_result(
+                self.page,
+                court_number,
+                time_slot,
+                user_info,
+                logger=self.logger,
+                success_log="Booking confirmed for Court %s",
+                failure_log="Booking result uncertain for Court %s",
+            )
 
-        await self.actions.pause(1.2, 2.0)  # Review form after filling
-        await self.actions.move_mouse_random()
-        self.logger.info("Submitting booking form (natural mode)...")
-        await self.debug_logger.capture_state(self.page, "05_before_submit")
+    async def _claim_submit(self, court_number: int) -> bool:
+        """Take the race commit guard before submitting; always True when not racing."""
 
-        await self.submit()
-        await self.debug_logger.capture_state(self.page, "06_after_submit")
+        t("automation.executors.flows.natural_flow.NaturalFlowSteps._claim_submit")
+        if self.commit_guard is None:
+            return True
+        return await self.commit_guard.acquire(court_number)
+
+    def _record_submit_outcome(self, court_number: int, signal: SubmissionSignal) -> None:
+        """Log the submission signal and hand it to the race guard."""
 
-        result = await confirmation_result(
-            self.page,
+        t("automation.executors.flows.natural_flow.NaturalFlowSteps._record_submit_outcome")
+        if self.commit_guard is not None:
+            self.commit_guard.record_outcome(court_number, signal.kind)
+        self.logger.info(
+            "Court %s: submission outcome %s (booking POST status: %s)",
             court_number,
-            time_slot,
-            user_info,
-            logger=self.logger,
-            success_log="Booking confirmed for Court %s",
-            failure_log="Booking result uncertain for Court %s",
+            signal.kind,
+            signal.status,
         )
 
-        await self.debug_logger.capture_state(self.page, "07_final_result")
-        self.debug_logger.save_logs()
-        self.debug_logger.print_summary()
+    def _submit_missing(self, court_number: int) -> ExecutionResult:
+        """Fail without waiting for an outcome; nothing was clicked, so the guard passes on."""
 
-        return result
+        t("automation.executors.flows.natural_flow.NaturalFlowSteps._submit_missing")
+        self.logger.error("Court %s: submit button not found", court_number)
+        return ExecutionResult(
+            success=False,
+            error_message="Submit button not found",
+            court_number=court_number,
+        )
+
+    def _race_lost(self, court_number: int) -> ExecutionResult:
+        t("automation.executors.flows.natural_flow.NaturalFlowSteps._race_lost")
+        self.logger.info(
+            "Court %s: court %s already booked this reservation - not submitting",
+            court_number,
+            self.commit_guard.winner if self.commit_guard else None,
+        )
+        return ExecutionResult(
+            success=False,
+            error_message=RACE_LOST_MESSAGE,
+            court_number=court_number,
+            court_attempted=court_number,
+        )
 
     def _resolve_slot_datetime(
         self,
@@ -241,8 +476,7 @@ class NaturalFlowSteps:
         if not target_datetime:
             return None
 
-        tzinfo = target_datetime.tzinfo
-        now = datetime.now(tzinfo) if tzinfo else datetime.now()
+        now = self.clock.now(target_datetime.tzinfo)
         delta = target_datetime - now
 
         if delta >= (_QUEUE_RELEASE_OFFSET - timedelta(minutes=1)):
@@ -273,11 +507,7 @@ class NaturalFlowSteps:
         button = await self.select_time_button(time_slot)
         if button:
             if target_datetime:
-                now = (
-                    datetime.now(target_datetime.tzinfo)
-                    if target_datetime and target_datetime.tzinfo
-                    else datetime.now()
-                )
+                now = self.clock.now(target_datetime.tzinfo)
                 if now < target_datetime:
                     self.logger.info(
                         "Time slot %s became visible %.2fs before target for Court %s - booking immediately",
@@ -295,26 +525,31 @@ class NaturalFlowSteps:
                 self.logger.info("Time slot %s already visible for Court %s - booking immediately", time_slot, court_number)
             return button
 
-        wait_point = release_datetime or target_datetime
-        tzinfo = wait_point.tzinfo if isinstance(wait_point, datetime) else None
-        now = datetime.now(tzinfo) if tzinfo else datetime.now()
-        if wait_point and now < wait_point:
-            wait_seconds = (wait_point - now).total_seconds()
+        # Learned release offsets move the wake-up and bound the refresh burst.
+        window = (
+            expected_release_window(release_datetime, court_number, clock=self.clock)
+            if release_datetime
+            else None
+        )
+        burst_until = window[1] if window else None
+        wait_point = window[0] if window else (release_datetime or target_datetime)
+        if wait_point and self.clock.now(wait_point.tzinfo) < wait_point:
+            wait_seconds = (wait_point - self.clock.now(wait_point.tzinfo)).total_seconds()
+            clock_stats = self.clock.stats()
             self.logger.info(
-                "Arrived %.2fs before %s for Court %s - waiting before slot scan",
+                "Arrived %.2fs before %s for Court %s - waiting before slot scan "
+                "(server offset %+.3fs, jitter %.3fs, %s samples)",
                 wait_seconds,
                 "release" if release_datetime else "target",
                 court_number,
+                clock_stats["offset"],
+                clock_stats["jitter"],
+                clock_stats["samples"],
+            )
+            lateness = await self.clock.wait_until(wait_point)
+            self.logger.debug(
+                "Woke %.1fms after %s for Court %s", lateness * 1000, wait_point, court_number
             )
-
-            while now < wait_point:
-                remaining = max((wait_point - now).total_seconds(), 0)
-                sleep_for = min(
-                    _TARGET_POLL_INTERVAL[1],
-                    max(_TARGET_POLL_INTERVAL[0], remaining),
-                )
-                await asyncio.sleep(sleep_for)
-                now = datetime.now(tzinfo) if tzinfo else datetime.now()
 
         max_refreshes = (
             _MAX_POST_TARGET_REFRESHES
@@ -334,11 +569,7 @@ class NaturalFlowSteps:
                     )
                 return button
 
-            now = (
-                datetime.now(target_datetime.tzinfo)
-                if target_datetime and target_datetime.tzinfo
-                else datetime.now()
-            )
+            now = self.clock.now(target_datetime.tzinfo if target_datetime else None)
 
             if refresh_count >= max_refreshes:
                 break
@@ -354,12 +585,17 @@ class NaturalFlowSteps:
                 court_number,
                 refresh_count,
             )
-            await self._refresh_time_grid(refresh_count)
+            burst = burst_until is not None and self.clock.now(burst_until.tzinfo) <= burst_until
+            await self._refresh_time_grid(refresh_count, court_number, burst=burst)
 
         return None
 
-    async def _refresh_time_grid(self, attempt: int) -> None:
-        """Reload the time grid and wait naturally between refreshes."""
+    async def _refresh_time_grid(self, attempt: int, court_number: int, *, burst: bool = False) -> None:
+        """Reload the time grid at the paced rate and wait naturally afterwards.
+
+        Inside the learned release window (``burst``) the natural pause is
+        skipped, so reloads run as fast as the refresh controller allows.
+        """
 
         t("automation.executors.flows.natural_flow.NaturalFlowSteps._refresh_time_grid")
         try:
@@ -370,10 +606,17 @@ class NaturalFlowSteps:
             pass
 
         try:
-            await self.page.reload(wait_until="domcontentloaded")
+            await self.refresher.reload(
+                self.page,
+                court_number,
+                clock=self.clock,
+                floor=_REFRESH_DELAY[0],
+                wait_until="domcontentloaded",
+            )
         except Exception as exc:
             self.logger.debug("Refresh attempt %s failed: %s", attempt, exc)
-        await self.actions.pause(*_REFRESH_DELAY)
+        if not burst:
+            await self.actions.pause(*_REFRESH_DELAY)
 
     async def _commit_time_selection(self, button) -> None:
         """Click a time button with human-like hesitation."""
@@ -429,7 +672,7 @@ class NaturalFlowSteps:
 
         self.logger.info("Reloading page to retry time selection for %s", time_slot)
         try:
-            await self.page.reload(wait_until="domcontentloaded")
+            await self.clock.reload(self.page, wait_until="domcontentloaded")
         except Exception as exc:
             self.logger.warning("Page reload failed during booking-form recovery: %s", exc)
             return False
@@ -505,11 +748,12 @@ async def execute_natural_flow(
     *,
     logger: logging.Logger,
     initial_delay_range: Tuple[float, float],
+    commit_guard: Optional[CommitGuard] = None,
 ) -> ExecutionResult:
     """Execute the natural booking flow and return the result."""
 
     t("automation.executors.flows.natural_flow.execute_natural_flow")
-    steps = NaturalFlowSteps(page, logger)
+    steps = NaturalFlowSteps(page, logger, commit_guard=commit_guard)
     return await steps.execute(
         court_number,
         target_date,
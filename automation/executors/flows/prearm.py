@@ -0,0 +1,194 @@
+"""Pre-arming court pages on the target slot ahead of the booking window.
+
+Seconds before a queued reservation executes, the scheduler parks each court
+page it will use on the direct slot URL (``build_direct_slot_url``) and
+records a :class:`PreArmedSlot` in the process-wide :class:`PreArmRegistry`.
+When :class:`~automation.executors.flows.natural_flow.NaturalFlowSteps` later
+runs for that court and slot, it takes the arm and skips calendar browsing:
+at release it reloads the parked page, which renders the booking form
+directly (or the date view, whose slot button is then clicked), fills it and
+submits.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional, Union
+
+from tracking import t
+
+from .helpers import build_direct_slot_url
+
+FORM_FIELD_SELECTOR = 'input[name="client.firstName"]'
+PREARM_NAVIGATION_TIMEOUT_MS = 15000
+
+logger = logging.getLogger(__name__)
+
+
+def _date_key(value: Union[date, datetime, str]) -> str:
+    t('automation.executors.flows.prearm._date_key')
+    if isinstance(value, datetime):
+        return value.date().isoformat()
+    if isinstance(value, date):
+        return value.isoformat()
+    return str(value)[:10]
+
+
+@dataclass
+class PreArmedSlot:
+    """A court page parked on a slot, ready for the release-time reload."""
+
+    court: int
+    target_date: str
+    time_slot: str
+    url: str
+    mode: str
+    form_ready: bool
+    armed_at: float = field(default_factory=time.monotonic)
+    navigation_ms: float = 0.0
+
+    def matches(self, court: int, target_date: Union[date, datetime, str], time_slot: str) -> bool:
+        t('automation.executors.flows.prearm.PreArmedSlot.matches')
+        return (
+            self.court == court
+            and self.target_date == _date_key(target_date)
+            and self.time_slot == time_slot
+        )
+
+
+class PreArmRegistry:
+    """Thread-safe map of court -> the slot its page is parked on."""
+
+    def __init__(self) -> None:
+        t('automation.executors.flows.prearm.PreArmRegistry.__init__')
+        self._lock = threading.Lock()
+        self._slots: Dict[int, PreArmedSlot] = {}
+
+    def arm(self, slot: PreArmedSlot) -> None:
+        t('automation.executors.flows.prearm.PreArmRegistry.arm')
+        with self._lock:
+            self._slots[slot.court] = slot
+
+    def is_armed(self, court: int, target_date: Union[date, datetime, str], time_slot: str) -> bool:
+        t('automation.executors.flows.prearm.PreArmRegistry.is_armed')
+        with self._lock:
+            slot = self._slots.get(court)
+            return slot is not None and slot.matches(court, target_date, time_slot)
+
+    def armed_courts(self, target_date: Union[date, datetime, str], time_slot: str) -> List[int]:
+        t('automation.executors.flows.prearm.PreArmRegistry.armed_courts')
+        with self._lock:
+            return sorted(
+                court for court, slot in self._slots.items()
+                if slot.matches(court, target_date, time_slot)
+            )
+
+    def take(
+        self,
+        court: int,
+        target_date: Union[date, datetime, str],
+        time_slot: str,
+        page: Any = None,
+    ) -> Optional[PreArmedSlot]:
+        """Consume the arm for ``court`` if it matches the slot and the page stayed parked."""
+
+        t('automation.executors.flows.prearm.PreArmRegistry.take')
+        with self._lock:
+            slot = self._slots.pop(court, None)
+        if slot is None or not slot.matches(court, target_date, time_slot):
+            return None
+        if page is not None and getattr(page, 'url', slot.url) != slot.url:
+            logger.info(
+                "Court %s left its pre-armed slot page (%s); using the standard flow",
+                court,
+                getattr(page, 'url', ''),
+            )
+            return None
+        return slot
+
+    def discard(self, court: Optional[int] = None) -> None:
+        t('automation.executors.flows.prearm.PreArmRegistry.discard')
+        with self._lock:
+            if court is None:
+                self._slots.clear()
+            else:
+                self._slots.pop(court, None)
+
+
+async def prearm_slot_page(
+    page: Any,
+    court: int,
+    target_date: Union[date, datetime],
+    time_slot: str,
+    *,
+    registry: Optional[PreArmRegistry] = None,
+    log: Optional[logging.Logger] = None,
+) -> Optional[PreArmedSlot]:
+    """Park ``page`` on the direct slot URL and register it; ``None`` on failure."""
+
+    t('automation.executors.flows.prearm.prearm_slot_page')
+    log = log or logger
+    registry = registry or get_prearm_registry()
+    try:
+        url = build_direct_slot_url(court, target_date, time_slot)
+    except ValueError as exc:
+        log.warning("Court %s: cannot pre-arm %s %s: %s", court, target_date, time_slot, exc)
+        return None
+
+    start = time.perf_counter()
+    try:
+        await page.goto(url, wait_until='domcontentloaded', timeout=PREARM_NAVIGATION_TIMEOUT_MS)
+        form_ready = await page.query_selector(FORM_FIELD_SELECTOR) is not None
+    except Exception as exc:
+        log.warning("Court %s: pre-arm navigation failed: %s", court, exc)
+        registry.discard(court)
+        return None
+
+    landed = getattr(page, 'url', url)
+    slot = PreArmedSlot(
+        court=court,
+        target_date=_date_key(target_date),
+        time_slot=time_slot,
+        url=landed,
+        mode='direct_slot' if '/datetime/' in landed else 'date_view',
+        form_ready=form_ready,
+        navigation_ms=(time.perf_counter() - start) * 1000,
+    )
+    registry.arm(slot)
+    log.info(
+        "Court %s: pre-armed %s %s on %s (form ready: %s, %.0fms)",
+        court,
+        slot.target_date,
+        time_slot,
+        slot.mode,
+        form_ready,
+        slot.navigation_ms,
+    )
+    return slot
+
+
+_REGISTRY_LOCK = threading.Lock()
+_REGISTRY: Optional[PreArmRegistry] = None
+
+
+def get_prearm_registry() -> PreArmRegistry:
+    """Return the process-wide pre-arm registry."""
+
+    t('automation.executors.flows.prearm.get_prearm_registry')
+    global _REGISTRY
+    with _REGISTRY_LOCK:
+        if _REGISTRY is None:
+            _REGISTRY = PreArmRegistry()
+        return _REGISTRY
+
+
+__all__ = [
+    'PreArmRegistry',
+    'PreArmedSlot',
+    'get_prearm_registry',
+    'prearm_slot_page',
+]
@@ -0,0 +1,93 @@
+"""Commit guard for racing one reservation across several courts.
+
+When a reservation is raced, every court page runs the booking flow up to
+the submit click in parallel. Before clicking, a flow must
+:meth:`CommitGuard.acquire` the guard. Only one court holds it at a time, and
+once a court has confirmed a booking every later ``acquire`` returns
+``False``. The losing flows then stop without submitting, so a single
+reservation can never be booked twice. A flow that holds the guard reports
+its outcome with :meth:`CommitGuard.settle`.
+
+The guard only passes to the next court when the holder never clicked
+submit (:meth:`CommitGuard.mark_submitted`) or the submit was definitely
+rejected (:meth:`CommitGuard.record_outcome` with a ``rejected`` or
+``error`` signal). Any other failure after a click, such as an outcome
+timeout or a missing confirmation text, may still be a booking Acuity
+accepted. It decides the race for the holder so no sibling books the
+slot a second time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Optional
+
+from tracking import t
+
+RACE_LOST_MESSAGE = "Another court already won the race"
+REJECTION_SIGNALS = frozenset({'rejected', 'error'})
+
+
+class CommitGuard:
+    """Serialise submit clicks across courts racing for one reservation."""
+
+    def __init__(self) -> None:
+        t('automation.executors.racing.CommitGuard.__init__')
+        self._lock = asyncio.Lock()
+        self.holder: Optional[int] = None
+        self.winner: Optional[int] = None
+        self.uncertain = False
+        self._submitted = False
+        self._rejected = False
+
+    @property
+    def decided(self) -> bool:
+        t('automation.executors.racing.CommitGuard.decided')
+        return self.winner is not None
+
+    async def acquire(self, court: int) -> bool:
+        """Wait for the submit right; ``False`` once another court has won."""
+
+        t('automation.executors.racing.CommitGuard.acquire')
+        if self.decided:
+            return False
+        await self._lock.acquire()
+        if self.decided:
+            self._lock.release()
+            return False
+        self.holder = court
+        return True
+
+    def mark_submitted(self, court: int) -> None:
+        """Note that the holder is about to click submit; call it before the click."""
+
+        t('automation.executors.racing.CommitGuard.mark_submitted')
+        if self.holder == court:
+            self._submitted = True
+
+    def record_outcome(self, court: int, signal_kind: Optional[str]) -> None:
+        """Note the holder's submission signal; only rejections let the guard pass on."""
+
+        t('automation.executors.racing.CommitGuard.record_outcome')
+        if self.holder == court and signal_kind in REJECTION_SIGNALS:
+            self._rejected = True
+
+    def settle(self, court: int, success: bool) -> None:
+        """Record the holder's outcome and release the guard; no-op for non-holders.
+
+        A failure after a submit click that was not definitely rejected
+        still decides the race, with :attr:`uncertain` set.
+        """
+
+        t('automation.executors.racing.CommitGuard.settle')
+        if self.holder != court:
+            return
+        if success or (self._submitted and not self._rejected):
+            self.winner = court
+            self.uncertain = not success
+        self.holder = None
+        self._submitted = self._rejected = False
+        self._lock.release()
+
+
+__all__ = ['CommitGuard', 'RACE_LOST_MESSAGE', 'REJECTION_SIGNALS']
@@ -0,0 +1,257 @@
+"""Server-calibrated clock used to time refreshes around slot releases.
+
+The booking site releases slots on its own clock, which can differ from the
+local one by more than a second. :class:`ReleaseClock` estimates the
+server-minus-local offset from the HTTP ``Date`` header of page reloads, the
+same way NTP bounds an offset from request/response timestamps:
+
+* a response stamped ``D`` (whole seconds) that was requested at local time
+  ``sent`` and received at ``received`` implies
+  ``D - received <= offset < D + 1 - sent``;
+* intersecting those intervals across reloads narrows the estimate well below
+  the header's one-second resolution.
+
+Local time is derived from ``time.monotonic`` anchored once to the wall
+clock, so NTP steps on the host cannot move a pending :meth:`wait_until`.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta, tzinfo
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from tracking import t
+
+DATE_HEADER_RESOLUTION = 1.0
+DEFAULT_MAX_SAMPLES = 32
+_RECHECK_INTERVAL = 1.0
+
+
+@dataclass(frozen=True)
+class ClockSample:
+    """Offset bounds implied by a single timed response."""
+
+    low: float
+    high: float
+    delay: float
+
+    @property
+    def midpoint(self) -> float:
+        t('automation.executors.release_clock.ClockSample.midpoint')
+        return (self.low + self.high) / 2
+
+
+class ReleaseClock:
+    """Estimate server time and sleep until server-side instants."""
+
+    def __init__(
+        self,
+        *,
+        max_samples: int = DEFAULT_MAX_SAMPLES,
+        wall: Callable[[], float] = time.time,
+        monotonic: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        t('automation.executors.release_clock.ReleaseClock.__init__')
+        self._monotonic = monotonic
+        self._sleep = sleep
+        self._anchor = wall() - monotonic()
+        self._samples: Deque[ClockSample] = deque(maxlen=max(int(max_samples), 1))
+        self._lock = threading.Lock()
+        self._estimate: Tuple[float, float] = (0.0, math.inf)
+        self.logger = logger or logging.getLogger('ReleaseClock')
+
+    # ------------------------------------------------------------------
+    # Calibration
+    # ------------------------------------------------------------------
+    def local_timestamp(self) -> float:
+        """Return local epoch seconds derived from the monotonic clock."""
+
+        t('automation.executors.release_clock.ReleaseClock.local_timestamp')
+        return self._anchor + self._monotonic()
+
+    def add_sample(
+        self,
+        server_timestamp: float,
+        sent: float,
+        received: float,
+        *,
+        resolution: float = 0.0,
+    ) -> ClockSample:
+        """Record a server timestamp observed between local ``sent`` and ``received``.
+
+        ``resolution`` is the granularity of ``server_timestamp``; HTTP ``Date``
+        headers truncate to whole seconds.
+        """
+
+        t('automation.executors.release_clock.ReleaseClock.add_sample')
+        if received < sent:
+            sent, received = received, sent
+        sample = ClockSample(
+            low=server_timestamp - received,
+            high=server_timestamp + resolution - sent,
+            delay=received - sent,
+        )
+        with self._lock:
+            self._samples.append(sample)
+            self._estimate = self._intersect_locked()
+        return sample
+
+    def observe_response(self, response: Any, sent: float, received: float) -> Optional[ClockSample]:
+        """Record the ``Date`` header of ``response`` if it carries one."""
+
+        t('automation.executors.release_clock.ReleaseClock.observe_response')
+        headers = getattr(response, 'headers', None) or {}
+        raw = headers.get('date') or headers.get('Date')
+        if not raw:
+            return None
+        try:
+            server_time = parsedate_to_datetime(raw)
+        except (TypeError, ValueError):
+            return None
+        return self.add_sample(
+            server_time.timestamp(), sent, received, resolution=DATE_HEADER_RESOLUTION,
+        )
+
+    async def reload(self, page: Any, **kwargs: Any) -> Any:
+        """Reload ``page`` and calibrate from the response it returns."""
+
+        t('automation.executors.release_clock.ReleaseClock.reload')
+        sent = self.local_timestamp()
+        response = await page.reload(**kwargs)
+        received = self.local_timestamp()
+        if response is not None:
+            self.observe_response(response, sent, received)
+        return response
+
+    def reset(self) -> None:
+        """Forget every sample and fall back to the local clock."""
+
+        t('automation.executors.release_clock.ReleaseClock.reset')
+        with self._lock:
+            self._samples.clear()
+            self._estimate = (0.0, math.inf)
+
+    def _intersect_locked(self) -> Tuple[float, float]:
+        """Intersect the newest samples; returns ``(offset, half_width)``.
+
+        Walking newest-first and stopping at the first disjoint interval drops
+        stale samples after a clock step instead of reporting an empty set.
+        """
+
+        t('automation.executors.release_clock.ReleaseClock._intersect_locked')
+        low, high = -math.inf, math.inf
+        for sample in reversed(self._samples):
+            new_low, new_high = max(low, sample.low), min(high, sample.high)
+            if new_low > new_high:
+                break
+            low, high = new_low, new_high
+        return (low + high) / 2, (high - low) / 2
+
+    # ------------------------------------------------------------------
+    # Reading the clock
+    # ------------------------------------------------------------------
+    @property
+    def calibrated(self) -> bool:
+        t('automation.executors.release_clock.ReleaseClock.calibrated')
+        with self._lock:
+            return bool(self._samples)
+
+    @property
+    def offset(self) -> float:
+        """Estimated server minus local time in seconds (0 when uncalibrated)."""
+
+        t('automation.executors.release_clock.ReleaseClock.offset')
+        with self._lock:
+            return self._estimate[0] if self._samples else 0.0
+
+    @property
+    def jitter(self) -> float:
+        """RMS difference between successive per-sample offsets, NTP style."""
+
+        t('automation.executors.release_clock.ReleaseClock.jitter')
+        with self._lock:
+            midpoints = [sample.midpoint for sample in self._samples]
+        if len(midpoints) < 2:
+            return 0.0
+        squares = [(b - a) ** 2 for a, b in zip(midpoints, midpoints[1:])]
+        return math.sqrt(sum(squares) / len(squares))
+
+    def stats(self) -> Dict[str, float]:
+        """Return the current offset, uncertainty, jitter and delay figures."""
+
+        t('automation.executors.release_clock.ReleaseClock.stats')
+        with self._lock:
+            samples = list(self._samples)
+            offset, half_width = self._estimate
+        return {
+            'samples': len(samples),
+            'offset': offset if samples else 0.0,
+            'uncertainty': half_width if samples else math.inf,
+            'jitter': self.jitter,
+            'min_delay': min((s.delay for s in samples), default=0.0),
+            'last_delay': samples[-1].delay if samples else 0.0,
+        }
+
+    def server_timestamp(self) -> float:
+        """Return the estimated server epoch seconds."""
+
+        t('automation.executors.release_clock.ReleaseClock.server_timestamp')
+        return self.local_timestamp() + self.offset
+
+    def now(self, tz: Optional[tzinfo] = None) -> datetime:
+        """Return estimated server time; naive local time when ``tz`` is None."""
+
+        t('automation.executors.release_clock.ReleaseClock.now')
+        return datetime.fromtimestamp(self.server_timestamp(), tz)
+
+    def to_local(self, server_time: datetime) -> datetime:
+        """Translate a server-side instant into the matching local instant."""
+
+        t('automation.executors.release_clock.ReleaseClock.to_local')
+        return server_time - timedelta(seconds=self.offset)
+
+    async def wait_until(self, server_time: datetime) -> float:
+        """Sleep until ``server_time`` on the server clock.
+
+        The remaining time is recomputed at least every second so samples
+        gathered meanwhile (e.g. by other courts' reloads) are honoured.
+        Returns how late the wake-up was, in seconds (0 if already past).
+        """
+
+        t('automation.executors.release_clock.ReleaseClock.wait_until')
+        target = server_time.timestamp()
+        remaining = target - self.server_timestamp()
+        if remaining <= 0:
+            return 0.0
+        while remaining > 0:
+            await self._sleep(min(remaining, _RECHECK_INTERVAL))
+            remaining = target - self.server_timestamp()
+        return -remaining
+
+
+_CLOCK_LOCK = threading.Lock()
+_CLOCK: Optional[ReleaseClock] = None
+
+
+def get_release_clock() -> ReleaseClock:
+    """Return the process-wide clock shared by every booking flow."""
+
+    t('automation.executors.release_clock.get_release_clock')
+    global _CLOCK
+    with _CLOCK_LOCK:
+        if _CLOCK is None:
+            _CLOCK = ReleaseClock()
+        return _CLOCK
+
+
+__all__ = ['ClockSample', 'ReleaseClock', 'get_release_clock']
@@ -0,0 +1,286 @@
+"""Learned slot-release timing, built from availability polling.
+
+Slots are released ``RESERVATION_BOOKING_WINDOW_HOURS`` before they start,
+nominally on the hour. In practice they appear a little earlier or later,
+and the lead varies by court and time of day. :class:`ReleaseTimingModel`
+records when each release was actually seen and turns those observations
+into an offset from the nominal release instant.
+
+The poller only sees a slot appear between two fetches. The slot was absent
+from the previous fetch and present in the current one, so each observation
+is an interval ``[low, high]`` of offsets in seconds, on the local clock.
+Observations that are too coarse or too far from the nominal release are
+dropped; the latter are usually cancellations, not releases.
+
+Samples are grouped by court, release weekday and release hour, and written
+to ``RELEASE_TIMING_FILE`` as compact JSON. :meth:`ReleaseTimingModel.estimate`
+returns a :class:`ReleaseEstimate` for the narrowest bucket with enough
+samples. It widens the bucket step by step: court+weekday+hour, then
+weekday+hour, then hour, then everything. The estimate gives the median
+midpoint plus early/late quantiles of the interval bounds.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Any, Dict, List, Optional, Tuple
+
+from tracking import t
+
+from infrastructure.settings import get_settings
+
+MAX_SAMPLES_PER_BUCKET = 64
+MIN_SAMPLES = 3
+MAX_RELEASE_OFFSET = 120.0
+MAX_OBSERVATION_WIDTH = 10.0
+EARLY_QUANTILE = 0.1
+LATE_QUANTILE = 0.9
+
+Interval = Tuple[float, float]
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ReleaseEstimate:
+    """Fitted release offsets in seconds relative to the nominal release instant."""
+
+    offset: float
+    early: float
+    late: float
+    samples: int
+    scope: str
+
+
+def _bucket_key(court: int, weekday: int, hour: int) -> str:
+    t('automation.executors.release_timing._bucket_key')
+    return f"{court}|{weekday}|{hour}"
+
+
+def _quantile(values: List[float], fraction: float) -> float:
+    t('automation.executors.release_timing._quantile')
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class ReleaseTimingModel:
+    """Record observed release instants and estimate when slots appear."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        *,
+        window_hours: Optional[float] = None,
+        min_samples: int = MIN_SAMPLES,
+        max_samples: int = MAX_SAMPLES_PER_BUCKET,
+        max_offset: float = MAX_RELEASE_OFFSET,
+        max_width: float = MAX_OBSERVATION_WIDTH,
+    ) -> None:
+        t('automation.executors.release_timing.ReleaseTimingModel.__init__')
+        settings = get_settings()
+        self.path = Path(path) if path else None
+        self.window = timedelta(
+            hours=settings.reservation_booking_window_hours if window_hours is None else window_hours
+        )
+        self.min_samples = max(1, int(min_samples))
+        self.max_samples = max(1, int(max_samples))
+        self.max_offset = max_offset
+        self.max_width = max_width
+        self._buckets: Dict[str, List[Interval]] = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    # ------------------------------------------------------------------
+    # Observations
+    # ------------------------------------------------------------------
+    def nominal_release(self, slot_start: datetime) -> datetime:
+        t('automation.executors.release_timing.ReleaseTimingModel.nominal_release')
+        return slot_start - self.window
+
+    def observe(
+        self,
+        court: int,
+        slot_start: datetime,
+        *,
+        absent_at: float,
+        present_at: float,
+    ) -> Optional[Interval]:
+        """Record that ``slot_start`` was absent at ``absent_at`` and present at ``present_at``.
+
+        Both instants are epoch seconds. Returns the stored offset interval,
+        or ``None`` when the observation cannot be a release.
+        """
+
+        t('automation.executors.release_timing.ReleaseTimingModel.observe')
+        if present_at - absent_at > self.max_width or present_at < absent_at:
+            return None
+        release = self.nominal_release(slot_start)
+        release_ts = release.timestamp()
+        low, high = absent_at - release_ts, present_at - release_ts
+        if high < -self.max_offset or low > self.max_offset:
+            return None
+
+        interval = (round(low, 3), round(high, 3))
+        key = _bucket_key(court, release.weekday(), release.hour)
+        with self._lock:
+            samples = self._buckets.setdefault(key, [])
+            samples.append(interval)
+            del samples[:-self.max_samples]
+            self._save_locked()
+        logger.info(
+            "Court %s: slot %s released between %+.2fs and %+.2fs of nominal",
+            court,
+            slot_start.isoformat(),
+            low,
+            high,
+        )
+        return interval
+
+    # ------------------------------------------------------------------
+    # Estimates
+    # ------------------------------------------------------------------
+    def estimate(self, release_at: datetime, court: Optional[int] = None) -> Optional[ReleaseEstimate]:
+        """Return the fitted offset for a release at ``release_at``, or ``None`` without data."""
+
+        t('automation.executors.release_timing.ReleaseTimingModel.estimate')
+        weekday, hour = release_at.weekday(), release_at.hour
+        scopes = (
+            ('court+weekday+hour', lambda c, w, h: c == court and w == weekday and h == hour),
+            ('weekday+hour', lambda c, w, h: w == weekday and h == hour),
+            ('hour', lambda c, w, h: h == hour),
+            ('all', lambda c, w, h: True),
+        )
+        with self._lock:
+            buckets = [(self._parse_key(key), list(samples)) for key, samples in self._buckets.items()]
+
+        for scope, matches in scopes:
+            if scope == 'court+weekday+hour' and court is None:
+                continue
+            intervals = [
+                interval for (c, w, h), samples in buckets if matches(c, w, h) for interval in samples
+            ]
+            if len(intervals) >= self.min_samples:
+                return ReleaseEstimate(
+                    offset=round(_quantile([(lo + hi) / 2 for lo, hi in intervals], 0.5), 3),
+                    early=round(_quantile([lo for lo, _ in intervals], EARLY_QUANTILE), 3),
+                    late=round(_quantile([hi for _, hi in intervals], LATE_QUANTILE), 3),
+                    samples=len(intervals),
+                    scope=scope,
+                )
+        return None
+
+    def sample_count(self) -> int:
+        t('automation.executors.release_timing.ReleaseTimingModel.sample_count')
+        with self._lock:
+            return sum(len(samples) for samples in self._buckets.values())
+
+    @staticmethod
+    def _parse_key(key: str) -> Tuple[int, int, int]:
+        t('automation.executors.release_timing.ReleaseTimingModel._parse_key')
+        court, weekday, hour = (int(part) for part in key.split('|'))
+        return court, weekday, hour
+
+    # ------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------
+    def _load(self) -> None:
+        t('automation.executors.release_timing.ReleaseTimingModel._load')
+        if self.path is None or not self.path.exists():
+            return
+        try:
+            payload = json.loads(self.path.read_text(encoding='utf-8'))
+            self._buckets = {
+                key: [(float(lo), float(hi)) for lo, hi in samples][-self.max_samples:]
+                for key, samples in payload.get('buckets', {}).items()
+            }
+            for key in self._buckets:
+                self._parse_key(key)
+        except (OSError, ValueError, TypeError) as exc:
+            logger.warning("Ignoring unreadable release timing store %s: %s", self.path, exc)
+            self._buckets = {}
+
+    def _save_locked(self) -> None:
+        t('automation.executors.release_timing.ReleaseTimingModel._save_locked')
+        if self.path is None:
+            return
+        payload = {'version': 1, 'buckets': self._buckets}
+        tmp_path: Optional[Path] = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with NamedTemporaryFile(
+                'w', encoding='utf-8', dir=self.path.parent, delete=False,
+                prefix=self.path.name, suffix='.tmp',
+            ) as handle:
+                tmp_path = Path(handle.name)
+                json.dump(payload, handle, separators=(',', ':'))
+            os.replace(tmp_path, self.path)
+        except OSError as exc:
+            logger.warning("Could not write release timing store %s: %s", self.path, exc)
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
+
+
+_MODEL_LOCK = threading.Lock()
+_MODEL: Optional[ReleaseTimingModel] = None
+
+
+def get_release_timing_model() -> ReleaseTimingModel:
+    """Return the process-wide model backed by ``RELEASE_TIMING_FILE``."""
+
+    t('automation.executors.release_timing.get_release_timing_model')
+    global _MODEL
+    with _MODEL_LOCK:
+        if _MODEL is None:
+            _MODEL = ReleaseTimingModel(get_settings().release_timing_file)
+        return _MODEL
+
+
+def set_release_timing_model(model: Optional[ReleaseTimingModel]) -> Optional[ReleaseTimingModel]:
+    """Install ``model`` process-wide (``None`` reloads on next use); return the previous one."""
+
+    t('automation.executors.release_timing.set_release_timing_model')
+    global _MODEL
+    with _MODEL_LOCK:
+        previous, _MODEL = _MODEL, model
+        return previous
+
+
+def expected_release_window(
+    release_at: datetime,
+    court: Optional[int] = None,
+    *,
+    clock: Any = None,
+    model: Optional[ReleaseTimingModel] = None,
+) -> Optional[Tuple[datetime, datetime]]:
+    """Return the learned ``(early, late)`` instants for a nominal release, or ``None``.
+
+    Offsets are learned on the local clock. With a release ``clock`` the
+    bounds are shifted by its server offset, so they can be passed straight
+    to :meth:`~automation.executors.release_clock.ReleaseClock.wait_until`.
+    """
+
+    t('automation.executors.release_timing.expected_release_window')
+    estimate = (model or get_release_timing_model()).estimate(release_at, court)
+    if estimate is None:
+        return None
+    shift = getattr(clock, 'offset', 0.0) if clock is not None else 0.0
+    return (
+        release_at + timedelta(seconds=estimate.early + shift),
+        release_at + timedelta(seconds=estimate.late + shift),
+    )
+
+
+__all__ = [
+    'ReleaseEstimate',
+    'ReleaseTimingModel',
+    'expected_release_window',
+    'get_release_timing_model',
+    'set_release_timing_model',
+]
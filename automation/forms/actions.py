@@ -2,17 +2,17 @@
 
 from __future__ import annotations
 
-import asyncio
 import logging
 import time
 from contextlib import asynccontextmanager
-from typing import Any, Dict, Mapping, Tuple
+from typing import Any, Dict, Mapping, Optional, Tuple
 
 from playwright.async_api import Page
 
 from tracking import t
 
 from automation.forms.fields import FORM_SELECTORS, REQUIRED_FIELDS
+from automation.forms.submission import DEFAULT_OUTCOME_TIMEOUT, PhaseTimer, SubmissionWatcher
 from automation.shared.booking_contracts import BookingUser
 
 TRACE_PATH_TEMPLATE = "/mnt/c/Documents/code/python/LVBot/debugging/form_fill_trace_{timestamp}.zip"
@@ -36,6 +36,7 @@ class AcuityFormService:
         self.use_javascript = use_javascript
         self.enable_tracing = enable_tracing
         self.trace_path_template = trace_path_template
+        self.last_timings: Dict[str, float] = {}
 
     # ------------------------------------------------------------------
     # Public API
@@ -169,7 +170,6 @@ class AcuityFormService:
 
             if result.get('success'):
                 self.logger.info("✅ Form submitted using: %s", result.get('buttonText'))
-                await asyncio.sleep(2)
                 return True
 
             self.logger.error("❌ Could not submit form: %s", result.get('error'))
@@ -179,14 +179,25 @@ class AcuityFormService:
             self.logger.error("❌ Error submitting form: %s", exc)
             return False
 
-    async def check_success(self, page: Page) -> Tuple[bool, str]:
-        """Determine if the booking succeeded after submission."""
+    async def check_success(
+        self,
+        page: Page,
+        *,
+        wait_timeout: float = DEFAULT_OUTCOME_TIMEOUT,
+    ) -> Tuple[bool, str]:
+        """Determine if the booking succeeded after submission.
+
+        Waits up to ``wait_timeout`` seconds for the page to show an outcome
+        (confirmation, error or bot notice); pass ``0`` when the caller has
+        already waited on a :class:`SubmissionWatcher`.
+        """
 
         t('automation.forms.actions.AcuityFormService.check_success')
 
         try:
             self.logger.info("🔍 Checking booking success...")
-            await asyncio.sleep(2)
+            if wait_timeout > 0:
+                await SubmissionWatcher(page).wait(wait_timeout)
 
             result = await page.evaluate(
                 r"""
@@ -262,11 +273,40 @@ class AcuityFormService:
             self.logger.error("❌ Error checking booking success: %s", exc)
             return False, f"Error checking booking success: {exc}"
 
-    async def fill_and_submit(self, page: Page, user_info: _UserInfo) -> Tuple[bool, str]:
-        """High-level helper that fills, validates, submits, and checks success."""
+    async def fill_and_submit(
+        self,
+        page: Page,
+        user_info: _UserInfo,
+        *,
+        timer: Optional[PhaseTimer] = None,
+        outcome_timeout: float = DEFAULT_OUTCOME_TIMEOUT,
+    ) -> Tuple[bool, str]:
+        """High-level helper that fills, validates, submits, and checks success.
+
+        Per-phase durations (``fill``, ``validate``, ``submit``, ``outcome``,
+        ``confirm``) are logged and kept in :attr:`last_timings`; pass ``timer``
+        to collect them alongside the caller's own phases.
+        """
 
         t('automation.forms.actions.AcuityFormService.fill_and_submit')
 
+        timer = timer or PhaseTimer()
+        try:
+            return await self._fill_and_submit(page, user_info, timer, outcome_timeout)
+        finally:
+            self.last_timings = timer.as_dict()
+            if timer.phases:
+                self.logger.info("⏱️ Form submission timings: %s", timer.summary())
+
+    async def _fill_and_submit(
+        self,
+        page: Page,
+        user_info: _UserInfo,
+        timer: PhaseTimer,
+        outcome_timeout: float,
+    ) -> Tuple[bool, str]:
+        t('automation.forms.actions.AcuityFormService._fill_and_submit')
+
         user_data = self._ensure_user_data(user_info)
         missing = self.validate(user_data)
         if missing:
@@ -274,16 +314,17 @@ class AcuityFormService:
             self.logger.error("❌ Missing required fields: %s", field_list)
             return False, f"Missing required fields: {field_list}"
 
-        async with self._trace_capture(page):
-            filled_count = await self.fill_form(page, user_data)
+        with timer.phase('fill'):
+            async with self._trace_capture(page):
+                filled_count = await self.fill_form(page, user_data)
 
         if filled_count == 0:
             return False, "❌ Could not fill any form fields"
 
         self.logger.info("✅ Filled %s fields successfully", filled_count)
-        await asyncio.sleep(2)
 
-        has_errors, errors = await self.check_validation(page)
+        with timer.phase('validate'):
+            has_errors, errors = await self.check_validation(page)
         if has_errors:
             self.logger.error("❌ Form has validation errors, cannot submit:")
             for error in errors:
@@ -291,13 +332,30 @@ class AcuityFormService:
             joined = '; '.join(errors)
             return False, f"Form validation failed: {joined}"
 
-        submit_success = await self.submit(page)
-        if not submit_success:
-            return False, "❌ Form submission failed"
+        async with SubmissionWatcher(page) as watcher:
+            with timer.phase('submit'):
+                submit_success = await self.submit(page)
+            if not submit_success:
+                return False, "❌ Form submission failed"
+
+            with timer.phase('outcome'):
+                signal = await watcher.wait(outcome_timeout)
+        self.logger.info(
+            "📨 Submission outcome: %s (booking POST status: %s)",
+            signal.kind,
+            signal.status,
+        )
 
-        success, message = await self.check_success(page)
+        with timer.phase('confirm'):
+            success, message = await self.check_success(page, wait_timeout=0)
+        if not success and signal.kind == 'rejected':
+            message = f"{message} (booking request rejected with HTTP {signal.status})"
         if not success and 'bot_detected' in message:
             self.logger.warning("🚫 Bot detection triggered - sistema bloqueó uso automatizado")
+            # Imported here: automation.browser imports this module through its pools.
+            from automation.browser.refresh_control import get_refresh_controller, host_of
+
+            get_refresh_controller().report_detection(host_of(page))
             return False, "❌ Sistema detectó bot - usar navegador manual para reservar"
 
         return success, message
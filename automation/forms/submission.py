@@ -0,0 +1,214 @@
+"""Event-driven detection of Acuity booking submission outcomes.
+
+Rather than sleeping a fixed interval after clicking *Confirmar*,
+:class:`SubmissionWatcher` is attached before the click and resolves on the
+first decisive signal:
+
+* navigation to a ``/confirmation/`` URL (``framenavigated``),
+* the booking ``POST .../appointments`` response failing (``response``),
+* a DOM mutation that shows a visible error, the bot-detection notice, or the
+  thank-you text (``wait_for_function`` with ``polling="mutation"``).
+
+A successful booking POST is recorded but is not decisive, because the
+confirmation navigation follows it. :class:`PhaseTimer` records how long each
+submission phase took, so booking latency can be attributed per phase. Each
+phase is also emitted as a span of the current booking trace (see
+:mod:`infrastructure.tracing`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, Optional, Set
+
+from tracking import t
+
+from infrastructure.tracing import span
+
+CONFIRMATION_URL_MARKER = '/confirmation/'
+BOOKING_POST_MARKERS = ('/appointments',)
+DEFAULT_OUTCOME_TIMEOUT = 15.0
+
+OUTCOME_SCRIPT = r"""
+() => {
+    const text = document.body ? (document.body.innerText || '') : '';
+    const lower = text.toLowerCase();
+    if (text.includes('uso irregular') || text.includes('Comunícate con el negocio')) {
+        return 'bot_detected';
+    }
+    const errors = Array.from(document.querySelectorAll('.error, .field-error, [class*="error"]'))
+        .filter(el => el.offsetParent !== null && el.textContent.trim());
+    if (errors.length > 0) {
+        return 'error';
+    }
+    if (lower.includes('confirmada') || (lower.includes('gracias') && lower.includes('reserva'))) {
+        return 'confirmed';
+    }
+    return null;
+}
+"""
+
+logger = logging.getLogger(__name__)
+
+
+def is_booking_post(method: str, url: str) -> bool:
+    """Return True when the request is the Acuity appointment creation POST."""
+
+    t('automation.forms.submission.is_booking_post')
+    return method.upper() == 'POST' and any(marker in (url or '') for marker in BOOKING_POST_MARKERS)
+
+
+@dataclass(frozen=True)
+class SubmissionSignal:
+    """First decisive observation after submitting the booking form."""
+
+    kind: str
+    detail: str = ''
+    status: Optional[int] = None
+
+
+class PhaseTimer:
+    """Accumulate wall-clock milliseconds per named phase and emit trace spans."""
+
+    def __init__(self, clock=time.perf_counter) -> None:
+        t('automation.forms.submission.PhaseTimer.__init__')
+        self._clock = clock
+        self.phases: Dict[str, float] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        t('automation.forms.submission.PhaseTimer.phase')
+        start = self._clock()
+        try:
+            with span(name):
+                yield
+        finally:
+            elapsed = (self._clock() - start) * 1000
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+
+    @property
+    def total_ms(self) -> float:
+        t('automation.forms.submission.PhaseTimer.total_ms')
+        return sum(self.phases.values())
+
+    def as_dict(self) -> Dict[str, float]:
+        t('automation.forms.submission.PhaseTimer.as_dict')
+        return {name: round(value, 1) for name, value in self.phases.items()}
+
+    def summary(self) -> str:
+        t('automation.forms.submission.PhaseTimer.summary')
+        parts = [f"{name}={value:.0f}ms" for name, value in self.phases.items()]
+        parts.append(f"total={self.total_ms:.0f}ms")
+        return ' '.join(parts)
+
+
+class SubmissionWatcher:
+    """Resolve on the first navigation, response or DOM signal after submit."""
+
+    def __init__(self, page: Any) -> None:
+        t('automation.forms.submission.SubmissionWatcher.__init__')
+        self._page = page
+        self._decided = asyncio.Event()
+        self._signal: Optional[SubmissionSignal] = None
+        self._attached = False
+        self.booking_status: Optional[int] = None
+
+    def attach(self) -> 'SubmissionWatcher':
+        t('automation.forms.submission.SubmissionWatcher.attach')
+        if not self._attached:
+            self._page.on('response', self._on_response)
+            self._page.on('framenavigated', self._on_navigated)
+            self._attached = True
+        return self
+
+    def detach(self) -> None:
+        t('automation.forms.submission.SubmissionWatcher.detach')
+        if self._attached:
+            self._page.remove_listener('response', self._on_response)
+            self._page.remove_listener('framenavigated', self._on_navigated)
+            self._attached = False
+
+    async def __aenter__(self) -> 'SubmissionWatcher':
+        t('automation.forms.submission.SubmissionWatcher.__aenter__')
+        return self.attach()
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        t('automation.forms.submission.SubmissionWatcher.__aexit__')
+        self.detach()
+
+    async def wait(self, timeout: float = DEFAULT_OUTCOME_TIMEOUT) -> SubmissionSignal:
+        """Return the first decisive signal, or ``kind='timeout'`` after ``timeout``."""
+
+        t('automation.forms.submission.SubmissionWatcher.wait')
+        if self._signal is not None:
+            return self._signal
+
+        waiters: Set[asyncio.Future] = {
+            asyncio.ensure_future(self._decided.wait()),
+            asyncio.ensure_future(self._watch_dom(timeout)),
+        }
+        try:
+            done, _ = await asyncio.wait(waiters, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for waiter in done:
+                if self._signal is None and not waiter.cancelled() and waiter.exception() is None:
+                    kind = waiter.result()
+                    if isinstance(kind, str):
+                        self._signal = SubmissionSignal(kind=kind, detail='dom')
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+            await asyncio.gather(*waiters, return_exceptions=True)
+
+        return self._signal or SubmissionSignal(kind='timeout', status=self.booking_status)
+
+    async def _watch_dom(self, timeout: float) -> Optional[str]:
+        t('automation.forms.submission.SubmissionWatcher._watch_dom')
+        try:
+            handle = await self._page.wait_for_function(
+                OUTCOME_SCRIPT, polling='mutation', timeout=timeout * 1000
+            )
+            return await handle.json_value()
+        except Exception as exc:
+            # Navigation destroys the execution context; the framenavigated
+            # signal covers that case, so keep waiting on the other watchers.
+            logger.debug("DOM outcome watch ended: %s", exc)
+            await asyncio.sleep(timeout)
+            return None
+
+    def _decide(self, signal: SubmissionSignal) -> None:
+        t('automation.forms.submission.SubmissionWatcher._decide')
+        if self._signal is None:
+            self._signal = signal
+            self._decided.set()
+
+    def _on_navigated(self, frame: Any) -> None:
+        t('automation.forms.submission.SubmissionWatcher._on_navigated')
+        url = getattr(frame, 'url', '') or ''
+        if CONFIRMATION_URL_MARKER in url:
+            self._decide(SubmissionSignal(kind='confirmed', detail=url, status=self.booking_status))
+
+    def _on_response(self, response: Any) -> None:
+        t('automation.forms.submission.SubmissionWatcher._on_response')
+        request = getattr(response, 'request', None)
+        method = getattr(request, 'method', '') or ''
+        if not is_booking_post(method, getattr(response, 'url', '')):
+            return
+        self.booking_status = response.status
+        if response.status >= 400:
+            self._decide(SubmissionSignal(kind='rejected', detail=response.url, status=response.status))
+
+
+__all__ = [
+    'BOOKING_POST_MARKERS',
+    'CONFIRMATION_URL_MARKER',
+    'DEFAULT_OUTCOME_TIMEOUT',
+    'OUTCOME_SCRIPT',
+    'PhaseTimer',
+    'SubmissionSignal',
+    'SubmissionWatcher',
+    'is_booking_post',
+]
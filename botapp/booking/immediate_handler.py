@@ -276,16 +276,34 @@ class ImmediateBookingHandler:
                 self.browser_pool,
                 config=AsyncExecutorConfig(natural_flow=True),
             )
-            execution = await async_executor.execute_booking(
-                court_number=booking_request.court_preference.primary,
-                time_slot=booking_request.target_time,
-                user_info=user_info,
-                target_date=booking_request.target_date,
-            )
+            race_courts = list(booking_request.metadata.get('race_courts') or [])
+            metadata = {'executor': 'UnifiedAsyncBookingExecutor', 'flow': 'natural'}
+            if len(race_courts) > 1:
+                self.logger.info("🏁 Racing courts %s for one reservation", race_courts)
+                race = await async_executor.execute_parallel_booking(
+                    race_courts,
+                    booking_request.target_time,
+                    user_info,
+                    booking_request.target_date,
+                )
+                uncertain_court = race.get('uncertain_court')
+                deciding_court = race['successful_court'] or uncertain_court or race_courts[0]
+                execution = race['results'][deciding_court]
+                metadata['race_winner'] = race['successful_court']
+                if uncertain_court is not None:
+                    # The slot may already be ours; a retry elsewhere could double-book it.
+                    metadata['uncertain_court'] = uncertain_court
+            else:
+                execution = await async_executor.execute_booking(
+                    court_number=booking_request.court_preference.primary,
+                    time_slot=booking_request.target_time,
+                    user_info=user_info,
+                    target_date=booking_request.target_date,
+                )
             result = build_booking_result_from_execution(
                 booking_request,
                 execution,
-                metadata={'executor': 'UnifiedAsyncBookingExecutor', 'flow': 'natural'},
+                metadata=metadata,
             )
             if result.success:
                 self.logger.info("✅ Natural flow booking successful")
@@ -10,6 +10,7 @@ from automation.availability import AvailabilityChecker
 from automation.browser.async_browser_pool import AsyncBrowserPool
 from automation.browser.manager import BrowserManager
 from reservations.queue import ReservationQueue, ReservationScheduler, ReservationTracker
+from reservations.queue.queue_registry import get_queue
 from reservations.services import ReservationService
 from users.manager import UserManager
 
@@ -147,7 +148,7 @@ class DependencyContainer:
 
         def factory() -> ReservationQueue:
             t('botapp.bootstrap.container.DependencyContainer.reservation_queue.factory')
-            return ReservationQueue(self.config.paths.queue_file)
+            return get_queue(self.config.paths.queue_file)
 
         return self._resolve('reservation_queue', factory)
 
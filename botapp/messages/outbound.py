@@ -0,0 +1,388 @@
+"""Rate-limited outbound queue for Telegram notifications.
+
+Booking code used to await ``bot.send_message`` inline, one user at a time.
+A burst after a contested slot could then trip Telegram flood control and
+hold the scheduler up. :class:`NotificationDispatcher` takes messages through
+:meth:`~NotificationDispatcher.enqueue`, which never awaits. One background
+task then sends them. Each chat's messages go out in the order they were
+queued, with at most one send in flight per chat. Priority only picks which
+chat is served next: a chat waiting on a booking result goes before chats
+with informational messages, and menu follow-ups come last.
+
+Sends are paced by two token buckets. The per-chat bucket spaces messages to
+one chat by ``NOTIFY_CHAT_INTERVAL`` and allows a short burst. The global
+bucket caps the bot at ``NOTIFY_GLOBAL_RATE`` messages per second. A
+``RetryAfter`` from Telegram pauses every send for the requested time and
+requeues the message. Network errors are retried with backoff. Rejected
+messages, such as a blocked bot or a bad request, are dropped and logged.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import timedelta
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from telegram.error import BadRequest, Forbidden, NetworkError, RetryAfter
+
+from tracking import t
+
+from infrastructure.settings import get_settings
+
+CHAT_BURST = 3
+GLOBAL_BURST = 5
+MAX_ATTEMPTS = 4
+MAX_CONCURRENT_SENDS = 4
+RETRY_BACKOFF_SECONDS = 0.5
+RETRY_PADDING_SECONDS = 0.5
+LATENCY_WINDOW = 500
+
+SendFunc = Callable[[int, str, Optional[str], Any], Awaitable[Any]]
+
+
+class NotificationPriority(IntEnum):
+    """Lower values are sent first."""
+
+    BOOKING = 0
+    INFO = 1
+    MENU = 2
+
+
+@dataclass
+class OutboundMessage:
+    chat_id: int
+    text: str
+    priority: NotificationPriority
+    parse_mode: Optional[str] = None
+    reply_markup: Any = None
+    enqueued_at: float = 0.0
+    not_before: float = 0.0
+    attempts: int = 0
+    on_sent: Optional[Callable[[], None]] = None
+    due: float = 0.0
+    sequence: int = 0
+
+
+@dataclass
+class TokenBucket:
+    """GCRA bucket: ``burst`` sends at once, then one every ``interval`` seconds."""
+
+    interval: float
+    burst: int = 1
+    tat: float = field(default=0.0)
+
+    def available_at(self, now: float) -> float:
+        t('botapp.messages.outbound.TokenBucket.available_at')
+        if self.interval <= 0:
+            return now
+        return max(now, self.tat - (self.burst - 1) * self.interval)
+
+    def take(self, now: float) -> None:
+        t('botapp.messages.outbound.TokenBucket.take')
+        if self.interval > 0:
+            self.tat = max(self.tat, now) + self.interval
+
+
+def _retry_after_seconds(exc: RetryAfter) -> float:
+    t('botapp.messages.outbound._retry_after_seconds')
+    retry_after = getattr(exc, 'retry_after', 1)
+    if isinstance(retry_after, timedelta):
+        return retry_after.total_seconds()
+    return float(retry_after)
+
+
+def _percentile(ordered: List[float], fraction: float) -> float:
+    t('botapp.messages.outbound._percentile')
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class NotificationDispatcher:
+    """Per-chat FIFO queues of outbound messages drained under Telegram's rate limits."""
+
+    def __init__(
+        self,
+        send: SendFunc,
+        *,
+        chat_interval: Optional[float] = None,
+        global_rate: Optional[float] = None,
+        max_attempts: int = MAX_ATTEMPTS,
+        concurrency: int = MAX_CONCURRENT_SENDS,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        t('botapp.messages.outbound.NotificationDispatcher.__init__')
+        settings = get_settings()
+        self.chat_interval = settings.notification_chat_interval if chat_interval is None else chat_interval
+        rate = settings.notification_global_rate if global_rate is None else global_rate
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.max_attempts = max(1, max_attempts)
+        self._send = send
+        self._global = TokenBucket(1.0 / rate if rate > 0 else 0.0, GLOBAL_BURST)
+        self._chats: Dict[int, TokenBucket] = {}
+        self._queues: Dict[int, List[Tuple[float, int, OutboundMessage]]] = {}
+        self._busy_chats: Set[int] = set()
+        self._sequence = itertools.count()
+        self._concurrency = max(1, concurrency)
+        self._senders: Optional[asyncio.Semaphore] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._in_flight: Set[asyncio.Task] = set()
+        self._paused_until = 0.0
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self._counters = {'sent': 0, 'retried': 0, 'dropped': 0, 'flood_waits': 0}
+
+    @property
+    def running(self) -> bool:
+        t('botapp.messages.outbound.NotificationDispatcher.running')
+        return self._task is not None and not self._task.done()
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def enqueue(
+        self,
+        chat_id: int,
+        text: str,
+        *,
+        priority: NotificationPriority = NotificationPriority.INFO,
+        parse_mode: Optional[str] = None,
+        reply_markup: Any = None,
+        delay: float = 0.0,
+        on_sent: Optional[Callable[[], None]] = None,
+    ) -> None:
+        """Queue a message; ``on_sent`` runs once Telegram accepts it."""
+
+        t('botapp.messages.outbound.NotificationDispatcher.enqueue')
+        now = time.monotonic()
+        due = now + max(0.0, delay)
+        self._push(
+            OutboundMessage(
+                chat_id=chat_id,
+                text=text,
+                priority=NotificationPriority(priority),
+                parse_mode=parse_mode,
+                reply_markup=reply_markup,
+                enqueued_at=now,
+                not_before=due,
+                on_sent=on_sent,
+                due=due,
+                sequence=next(self._sequence),
+            )
+        )
+        if not self.running:
+            try:
+                self.start()
+            except RuntimeError:
+                # No running loop yet; the lifecycle starts the dispatcher in post_init.
+                pass
+
+    def start(self) -> None:
+        """Start the drain task on the running loop unless already started."""
+
+        t('botapp.messages.outbound.NotificationDispatcher.start')
+        if self.running:
+            return
+        self._senders = asyncio.Semaphore(self._concurrency)
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run(), name='notification-dispatcher')
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every non-menu message is sent or dropped; False on timeout."""
+
+        t('botapp.messages.outbound.NotificationDispatcher.drain')
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._pending(below=NotificationPriority.MENU) or self._in_flight:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(0.05)
+        return True
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """Drain for up to ``timeout`` seconds, then stop; anything left is dropped."""
+
+        t('botapp.messages.outbound.NotificationDispatcher.stop')
+        if self.running and not await self.drain(timeout):
+            self.logger.warning('Notification queue did not drain within %.0fs', timeout)
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        for pending in list(self._in_flight):
+            pending.cancel()
+        await asyncio.gather(*self._in_flight, return_exceptions=True)
+        leftover = sum(len(queue) for queue in self._queues.values())
+        if leftover:
+            self.logger.warning('Dropping %s unsent notification(s) on shutdown', leftover)
+            self._counters['dropped'] += leftover
+            self._queues.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth by priority, delivery counters and enqueue-to-send latency."""
+
+        t('botapp.messages.outbound.NotificationDispatcher.stats')
+        depth = {priority.name.lower(): 0 for priority in NotificationPriority}
+        for message in self._queued():
+            depth[message.priority.name.lower()] += 1
+        latencies = sorted(self._latencies)
+        return {
+            'depth': sum(depth.values()),
+            'depth_by_priority': depth,
+            'in_flight': len(self._in_flight),
+            **self._counters,
+            'latency_p50': _percentile(latencies, 0.5),
+            'latency_p95': _percentile(latencies, 0.95),
+            'latency_max': latencies[-1] if latencies else 0.0,
+        }
+
+    # ------------------------------------------------------------------
+    # Drain loop
+    # ------------------------------------------------------------------
+    def _push(self, message: OutboundMessage) -> None:
+        """Queue ``message`` on its chat; a retry keeps its original place at the front."""
+
+        t('botapp.messages.outbound.NotificationDispatcher._push')
+        queue = self._queues.setdefault(message.chat_id, [])
+        heapq.heappush(queue, (message.due, message.sequence, message))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _queued(self) -> List[OutboundMessage]:
+        t('botapp.messages.outbound.NotificationDispatcher._queued')
+        return [entry[-1] for queue in self._queues.values() for entry in queue]
+
+    def _pending(self, *, below: NotificationPriority) -> int:
+        t('botapp.messages.outbound.NotificationDispatcher._pending')
+        return sum(1 for message in self._queued() if message.priority < below)
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        t('botapp.messages.outbound.NotificationDispatcher._chat_bucket')
+        bucket = self._chats.get(chat_id)
+        if bucket is None:
+            bucket = self._chats[chat_id] = TokenBucket(self.chat_interval, CHAT_BURST)
+        return bucket
+
+    def _pop_ready(self, now: float) -> Tuple[Optional[OutboundMessage], Optional[float]]:
+        """Pop the head of the most urgent idle chat that can send now.
+
+        A chat ranks by the best priority among its due messages, so a queued
+        booking result pulls the chat forward without overtaking the messages
+        queued before it. Returns the next wake time when no chat is ready;
+        busy chats wake the loop when their send finishes.
+        """
+
+        t('botapp.messages.outbound.NotificationDispatcher._pop_ready')
+        best: Optional[Tuple[Tuple[int, float, int], int]] = None
+        wake_at = None
+        for chat_id, queue in self._queues.items():
+            if chat_id in self._busy_chats:
+                continue
+            due, sequence, head = queue[0]
+            ready_at = max(head.not_before, self._chat_bucket(chat_id).available_at(now))
+            if ready_at > now:
+                wake_at = ready_at if wake_at is None else min(wake_at, ready_at)
+                continue
+            priority = min(entry[-1].priority for entry in queue if entry[0] <= now)
+            rank = (priority, due, sequence)
+            if best is None or rank < best[0]:
+                best = (rank, chat_id)
+        if best is None:
+            return None, wake_at
+
+        chat_id = best[1]
+        queue = self._queues[chat_id]
+        message = heapq.heappop(queue)[-1]
+        if not queue:
+            del self._queues[chat_id]
+        self._busy_chats.add(chat_id)
+        return message, wake_at
+
+    async def _run(self) -> None:
+        t('botapp.messages.outbound.NotificationDispatcher._run')
+        while True:
+            now = time.monotonic()
+            hold = max(self._paused_until, self._global.available_at(now)) - now
+            if hold > 0:
+                await asyncio.sleep(hold)
+                continue
+
+            message, wake_at = self._pop_ready(now)
+            if message is None:
+                self._wakeup.clear()
+                timeout = None if wake_at is None else wake_at - now
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            self._global.take(now)
+            self._chat_bucket(message.chat_id).take(now)
+            await self._senders.acquire()
+            task = asyncio.create_task(self._deliver(message))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _deliver(self, message: OutboundMessage) -> None:
+        t('botapp.messages.outbound.NotificationDispatcher._deliver')
+        message.attempts += 1
+        try:
+            await self._send(message.chat_id, message.text, message.parse_mode, message.reply_markup)
+        except RetryAfter as exc:
+            wait = _retry_after_seconds(exc) + RETRY_PADDING_SECONDS
+            self._counters['flood_waits'] += 1
+            self._paused_until = max(self._paused_until, time.monotonic() + wait)
+            self.logger.warning('Telegram flood control: pausing notifications for %.1fs', wait)
+            self._retry(message, 0.0, exc)
+        except (Forbidden, BadRequest) as exc:
+            self._drop(message, exc)
+        except NetworkError as exc:
+            self._retry(message, RETRY_BACKOFF_SECONDS * 2 ** (message.attempts - 1), exc)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            self._drop(message, exc)
+        else:
+            self._counters['sent'] += 1
+            self._latencies.append(time.monotonic() - message.enqueued_at)
+            if message.on_sent is not None:
+                try:
+                    message.on_sent()
+                except Exception as exc:  # pragma: no cover - defensive guard
+                    self.logger.error('Notification follow-up failed for %s: %s', message.chat_id, exc)
+        finally:
+            self._busy_chats.discard(message.chat_id)
+            self._senders.release()
+            if self._wakeup is not None:
+                self._wakeup.set()
+
+    def _retry(self, message: OutboundMessage, backoff: float, exc: BaseException) -> None:
+        t('botapp.messages.outbound.NotificationDispatcher._retry')
+        if message.attempts >= self.max_attempts:
+            self._drop(message, exc)
+            return
+        self._counters['retried'] += 1
+        message.not_before = time.monotonic() + backoff
+        self._push(message)
+
+    def _drop(self, message: OutboundMessage, exc: BaseException) -> None:
+        t('botapp.messages.outbound.NotificationDispatcher._drop')
+        self._counters['dropped'] += 1
+        self.logger.error(
+            'Dropping notification to %s after %s attempt(s): %s', message.chat_id, message.attempts, exc
+        )
+
+
+__all__ = [
+    'NotificationDispatcher',
+    'NotificationPriority',
+    'OutboundMessage',
+    'TokenBucket',
+]
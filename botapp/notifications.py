@@ -4,12 +4,13 @@ from __future__ import annotations
 
 import asyncio
 from datetime import datetime
-from typing import Any, Dict, Optional, Sequence, Union, NamedTuple
+from typing import Any, Dict, Optional, Sequence, Tuple, Union, NamedTuple
 
 from tracking import t
 
 from automation.shared.booking_contracts import BookingResult
 from botapp.i18n.translator import Translator, create_translator
+from botapp.messages.outbound import NotificationDispatcher, NotificationPriority
 from botapp.ui.telegram_ui import TelegramUI
 from botapp.ui.text_blocks import (
     MarkdownBlockBuilder,
@@ -257,6 +258,7 @@ def _send_notification(
         "message": formatter(result, language=language),
         "parse_mode": "Markdown",
         "reply_markup": reply_markup,
+        "priority": NotificationPriority.BOOKING,
     }
 
 
@@ -325,6 +327,25 @@ def _normalize_notification_payload(message: Union[str, Dict[str, Any]]) -> _Not
     return _NotificationPayload(text=text, parse_mode=parse_mode, reply_markup=reply_markup, preview=preview)
 
 
+def _looks_like_booking_result(text: str) -> bool:
+    t('botapp.notifications._looks_like_booking_result')
+    lower_text = text.lower()
+    return (
+        ("✅" in text and ("reservation" in lower_text or "booked" in lower_text))
+        or ("❌" in text and "reservation" in lower_text)
+        or ("⚠️" in text and "booking" in lower_text)
+    )
+
+
+def _main_menu_follow_up(user_manager, user_id: int) -> Tuple[str, Any]:
+    t('botapp.notifications._main_menu_follow_up')
+    is_admin = user_manager.is_admin(user_id)
+    tier = user_manager.get_user_tier(user_id)
+    tier_badge = TelegramUI.format_user_tier_badge(tier.name)
+    reply_markup = TelegramUI.create_main_menu_keyboard(is_admin=is_admin)
+    return f"🎾 What would you like to do next? {tier_badge}", reply_markup
+
+
 async def deliver_notification_with_menu(
     application,
     user_manager,
@@ -355,33 +376,78 @@ async def deliver_notification_with_menu(
     )
     logger.info("Sent notification to %s: %s", user_id, payload.preview)
 
-    def _looks_like_booking_result(text: str) -> bool:
-        t('botapp.notifications.deliver_notification_with_menu._looks_like_booking_result')
-        lower_text = text.lower()
-        return (
-            ("✅" in text and ("reservation" in lower_text or "booked" in lower_text))
-            or ("❌" in text and "reservation" in lower_text)
-            or ("⚠️" in text and "booking" in lower_text)
-        )
-
     if not _looks_like_booking_result(payload.text):
         return
 
     await asyncio.sleep(max(0, follow_up_delay_seconds))
 
-    is_admin = user_manager.is_admin(user_id)
-    tier = user_manager.get_user_tier(user_id)
-    tier_badge = TelegramUI.format_user_tier_badge(tier.name)
-
-    reply_markup = TelegramUI.create_main_menu_keyboard(is_admin=is_admin)
+    text, reply_markup = _main_menu_follow_up(user_manager, user_id)
     await application.bot.send_message(
         chat_id=user_id,
-        text=f"🎾 What would you like to do next? {tier_badge}",
+        text=text,
         reply_markup=reply_markup,
     )
     logger.info("Sent main menu follow-up to %s", user_id)
 
 
+def queue_notification_with_menu(
+    dispatcher: NotificationDispatcher,
+    user_manager,
+    user_id: int,
+    message: Union[str, Dict[str, Any]],
+    *,
+    logger,
+    priority: Optional[NotificationPriority] = None,
+    follow_up_delay_seconds: int = 7,
+) -> bool:
+    """Queue a notification on ``dispatcher`` without waiting for Telegram.
+
+    ``priority`` defaults to the payload's ``priority`` key, then to
+    ``BOOKING`` for booking results and ``INFO`` for everything else. The
+    main-menu follow-up for a booking result is queued once the result is
+    delivered. Returns False when the payload is empty.
+    """
+
+    t("botapp.notifications.queue_notification_with_menu")
+
+    payload = _normalize_notification_payload(message)
+    if not payload.text:
+        logger.warning("Skipping notification to %s - empty message payload", user_id)
+        return False
+
+    wants_menu = _looks_like_booking_result(payload.text)
+    if priority is None and isinstance(message, dict) and message.get("priority") is not None:
+        priority = NotificationPriority(message["priority"])
+    if priority is None:
+        priority = NotificationPriority.BOOKING if wants_menu else NotificationPriority.INFO
+
+    on_sent = None
+    if wants_menu:
+        def queue_menu_follow_up() -> None:
+            t('botapp.notifications.queue_notification_with_menu.queue_menu_follow_up')
+            text, reply_markup = _main_menu_follow_up(user_manager, user_id)
+            dispatcher.enqueue(
+                user_id,
+                text,
+                priority=NotificationPriority.MENU,
+                reply_markup=reply_markup,
+                delay=max(0, follow_up_delay_seconds),
+            )
+
+        on_sent = queue_menu_follow_up
+
+    dispatcher.enqueue(
+        user_id,
+        payload.text,
+        priority=priority,
+        parse_mode=payload.parse_mode,
+        reply_markup=payload.reply_markup,
+        on_sent=on_sent,
+    )
+    logger.info("Queued notification to %s: %s", user_id, payload.preview)
+    return True
+
+
 __all__ = [
     "NotificationBuilder",
     "format_success_message",
@@ -391,4 +457,5 @@ __all__ = [
     "format_queue_reservation_added",
     "format_duplicate_reservation_message",
     "deliver_notification_with_menu",
+    "queue_notification_with_menu",
 ]
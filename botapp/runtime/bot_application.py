@@ -16,7 +16,8 @@ from botapp.commands import register_core_handlers
 from botapp.config import BotAppConfig, load_bot_config
 from botapp.error_handler import ErrorHandler
 from botapp.i18n import get_user_translator
-from botapp.notifications import deliver_notification_with_menu
+from botapp.messages.outbound import NotificationDispatcher, NotificationPriority
+from botapp.notifications import queue_notification_with_menu
 from botapp.runtime.lifecycle import LifecycleManager
 from botapp.ui.telegram_ui import TelegramUI
 
@@ -48,7 +49,8 @@ class BotApplication:
         self.reservation_queue = dependencies.reservation_queue
         self.scheduler = dependencies.scheduler
         self.callback_handler = dependencies.callback_handler
-        self.lifecycle = LifecycleManager(dependencies, logger=self.logger)
+        self.notifier = NotificationDispatcher(self._send_outbound, logger=self.logger)
+        self.lifecycle = LifecycleManager(dependencies, logger=self.logger, notifier=self.notifier)
         self.application = None
         # Backwards-compatible attributes for legacy callers
         self.queue = self.reservation_queue
@@ -114,19 +116,42 @@ class BotApplication:
         t('botapp.runtime.bot_application.BotApplication._graceful_shutdown')
         await self.lifecycle.graceful_shutdown()
 
-    async def send_notification(self, user_id: int, message: Union[str, Dict[str, Any]]) -> None:
-        """Send a Telegram notification with the standard menu follow-up."""
+    async def send_notification(
+        self,
+        user_id: int,
+        message: Union[str, Dict[str, Any]],
+        *,
+        priority: Optional[NotificationPriority] = None,
+    ) -> None:
+        """Queue a Telegram notification with the standard menu follow-up.
+
+        Returns as soon as the message is queued; the dispatcher delivers it.
+        """
         t('botapp.runtime.bot_application.BotApplication.send_notification')
         try:
-            await deliver_notification_with_menu(
-                getattr(self, 'application', None),
+            queue_notification_with_menu(
+                self.notifier,
                 self.user_manager,
                 user_id,
                 message,
                 logger=self.logger,
+                priority=priority,
             )
         except Exception as exc:  # pragma: no cover - defensive guard
-            self.logger.error("Failed to send notification to %s: %s", user_id, exc)
+            self.logger.error("Failed to queue notification to %s: %s", user_id, exc)
+
+    async def _send_outbound(self, chat_id: int, text: str, parse_mode: Optional[str], reply_markup: Any) -> None:
+        """Deliver one queued notification through the running Telegram application."""
+        t('botapp.runtime.bot_application.BotApplication._send_outbound')
+        application = getattr(self, 'application', None)
+        if not application:
+            raise RuntimeError("No application context for notification")
+        await application.bot.send_message(
+            chat_id=chat_id,
+            text=text,
+            parse_mode=parse_mode,
+            reply_markup=reply_markup,
+        )
 
     async def check_courts_command(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /check_courts command via availability checker."""
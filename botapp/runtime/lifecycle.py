@@ -1,13 +1,15 @@
 """Lifecycle orchestration for the Telegram bot runtime."""
 
 from __future__ import annotations
-from tracking import t
+from tracking import flush as flush_tracking, t
 
 import asyncio
 import logging
 from typing import Optional
 
 from botapp.bootstrap import BotDependencies
+from botapp.messages.outbound import NotificationDispatcher
+from reservations.services.cancellation_pool import set_cancellation_pool
 
 
 class LifecycleManager:
@@ -18,9 +20,11 @@ class LifecycleManager:
         dependencies: BotDependencies,
         *,
         logger: Optional[logging.Logger] = None,
+        notifier: Optional[NotificationDispatcher] = None,
     ) -> None:
         t('botapp.runtime.lifecycle.LifecycleManager.__init__')
         self.dependencies = dependencies
+        self.notifier = notifier
         self.logger = logger or logging.getLogger('LifecycleManager')
         self.application = None
         self.scheduler_task: Optional[asyncio.Task] = None
@@ -40,6 +44,10 @@ class LifecycleManager:
                 exc,
             )
 
+        if self.notifier is not None:
+            self.notifier.start()
+            self.logger.info("Notification dispatcher started")
+
         scheduler = self.dependencies.scheduler
         self.scheduler_task = asyncio.create_task(scheduler.run_async())
         self.logger.info("Reservation scheduler task created in main event loop")
@@ -80,6 +88,13 @@ class LifecycleManager:
             self.logger.info("✅ Reservation scheduler stopped")
             self.scheduler_task = None
 
+        if self.notifier is not None:
+            try:
+                await self.notifier.stop()
+                self.logger.info("✅ Notification queue drained")
+            except Exception as exc:  # pragma: no cover - defensive guard
+                self.logger.error("❌ Error stopping notification dispatcher: %s", exc)
+
         self.logger.info("🔄 Stopping browser pool...")
         try:
             success = await self.dependencies.browser_manager.stop_pool(self.logger)
@@ -90,6 +105,22 @@ class LifecycleManager:
         except Exception as exc:  # pragma: no cover - defensive guard
             self.logger.error("❌ Error during browser pool cleanup: %s", exc)
 
+        try:
+            if self.dependencies.user_manager.flush():
+                self.logger.info("✅ User profiles flushed")
+        except Exception as exc:  # pragma: no cover - defensive guard
+            self.logger.error("❌ Error flushing user profiles: %s", exc)
+
+        cancellation_pool = set_cancellation_pool(None)
+        if cancellation_pool is not None:
+            try:
+                await cancellation_pool.stop()
+            except Exception as exc:  # pragma: no cover - defensive guard
+                self.logger.error("❌ Error stopping cancellation pool: %s", exc)
+
+        flush_tracking()
+        self.logger.info("✅ Function call counts flushed")
+
         self.logger.info("✅ Bot shutdown sequence completed")
         self.application = None
 
@@ -115,11 +146,10 @@ class LifecycleManager:
 
         t('botapp.runtime.lifecycle.LifecycleManager.log_metrics')
         try:
-            user_manager = self.dependencies.user_manager
-            all_users = user_manager.get_all_users()
-            total_users = len(all_users)
-            active_users = len([user for user in all_users.values() if user.get('is_active', False)])
-            admin_users = len([user for user in all_users.values() if user.get('is_admin', False)])
+            user_counts = self.dependencies.user_manager.get_user_counts()
+            total_users = user_counts['total']
+            active_users = user_counts['active']
+            admin_users = user_counts['admin']
 
             queue = self.dependencies.reservation_queue
             try:
@@ -150,6 +180,8 @@ class LifecycleManager:
                 successful = failed = success_rate = 0
                 self.logger.debug("Could not get scheduler metrics: %s", exc)
 
+            notify = self.notifier.stats() if self.notifier is not None else {}
+
             self.logger.info(
                 "=== BOT METRICS REPORT ===\n"
                 f"👥 User Metrics:\n"
@@ -163,6 +195,11 @@ class LifecycleManager:
                 f"   Successful Bookings: {successful}\n"
                 f"   Failed Bookings: {failed}\n"
                 f"   Success Rate: {success_rate:.1f}%\n"
+                f"📨 Notification Metrics:\n"
+                f"   Queue Depth: {notify.get('depth', 0)}\n"
+                f"   Sent / Retried / Dropped: {notify.get('sent', 0)} / "
+                f"{notify.get('retried', 0)} / {notify.get('dropped', 0)}\n"
+                f"   Latency p50 / p95: {notify.get('latency_p50', 0.0):.2f}s / {notify.get('latency_p95', 0.0):.2f}s\n"
                 "=========================="
             )
 
@@ -0,0 +1,245 @@
+"""Court topology: the Acuity calendars the bot can book, loaded from configuration.
+
+By default the topology is the three La Villa courts in
+``constants.COURT_CONFIG``. Setting ``COURT_TOPOLOGY_FILE`` to a JSON file
+replaces it with any number of courts, optionally spread over several clubs
+(Acuity hosts)::
+
+    {"clubs": [
+        {"name": "lavilla", "base_url": "https://clublavilla.as.me",
+         "schedule_id": "7d558012",
+         "courts": [{"number": 1, "appointment_id": "15970897", "calendar_id": "4282490"}]}
+    ]}
+
+A court's ``direct_url`` and ``full_url`` are derived from its club's
+``base_url`` and ``schedule_id`` unless the court entry gives them. Court
+numbers are the keys used by the queue, the orchestrator and the browser
+pool, so they must be unique across clubs.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional
+from urllib.parse import urlparse
+
+from tracking import t
+
+from .constants import ACUITY_EMBED_URL, COURT_CONFIG
+from .settings import get_settings
+
+DEFAULT_CLUB = 'lavilla'
+
+
+@dataclass(frozen=True)
+class CourtDefinition:
+    """One bookable court, i.e. one Acuity appointment type and calendar."""
+
+    number: int
+    appointment_id: str
+    calendar_id: str
+    direct_url: str
+    full_url: str
+    club: str = DEFAULT_CLUB
+
+    @property
+    def host(self) -> str:
+        t('infrastructure.court_topology.CourtDefinition.host')
+        return urlparse(self.direct_url).netloc
+
+    @property
+    def base_url(self) -> str:
+        t('infrastructure.court_topology.CourtDefinition.base_url')
+        parsed = urlparse(self.direct_url)
+        return f"{parsed.scheme}://{parsed.netloc}"
+
+    def as_config(self) -> Dict[str, str]:
+        """Return the entry in the ``COURT_CONFIG`` shape."""
+
+        t('infrastructure.court_topology.CourtDefinition.as_config')
+        return {
+            'appointment_id': self.appointment_id,
+            'calendar_id': self.calendar_id,
+            'direct_url': self.direct_url,
+            'full_url': self.full_url,
+            'club': self.club,
+        }
+
+
+def build_court(
+    number: int,
+    appointment_id: str,
+    calendar_id: str,
+    *,
+    base_url: str,
+    schedule_id: str,
+    club: str = DEFAULT_CLUB,
+    direct_url: Optional[str] = None,
+    full_url: Optional[str] = None,
+) -> CourtDefinition:
+    """Build a court, deriving its URLs from the club's Acuity base URL."""
+
+    t('infrastructure.court_topology.build_court')
+    base = base_url.rstrip('/')
+    return CourtDefinition(
+        number=int(number),
+        appointment_id=str(appointment_id),
+        calendar_id=str(calendar_id),
+        direct_url=direct_url or f"{base}/?appointmentType={appointment_id}",
+        full_url=full_url
+        or f"{base}/schedule/{schedule_id}/appointment/{appointment_id}/calendar/{calendar_id}",
+        club=club,
+    )
+
+
+class CourtTopology:
+    """Ordered, read-only collection of courts keyed by court number."""
+
+    def __init__(self, courts: Iterable[CourtDefinition]) -> None:
+        t('infrastructure.court_topology.CourtTopology.__init__')
+        by_number: Dict[int, CourtDefinition] = {}
+        for court in courts:
+            if court.number in by_number:
+                raise ValueError(f"Duplicate court number {court.number} in court topology")
+            by_number[court.number] = court
+        if not by_number:
+            raise ValueError("Court topology must define at least one court")
+        self._courts = dict(sorted(by_number.items()))
+
+    @classmethod
+    def from_config(
+        cls, config: Mapping[int, Mapping[str, Any]], *, club: str = DEFAULT_CLUB
+    ) -> 'CourtTopology':
+        """Build from a ``COURT_CONFIG``-shaped mapping."""
+
+        t('infrastructure.court_topology.CourtTopology.from_config')
+        return cls(
+            CourtDefinition(
+                number=int(number),
+                appointment_id=str(entry['appointment_id']),
+                calendar_id=str(entry['calendar_id']),
+                direct_url=entry['direct_url'],
+                full_url=entry['full_url'],
+                club=entry.get('club', club),
+            )
+            for number, entry in config.items()
+        )
+
+    @classmethod
+    def from_clubs(cls, clubs: Iterable[Mapping[str, Any]]) -> 'CourtTopology':
+        """Build from the ``{"clubs": [...]}`` JSON layout described above."""
+
+        t('infrastructure.court_topology.CourtTopology.from_clubs')
+        courts: List[CourtDefinition] = []
+        for club in clubs:
+            name = club.get('name', DEFAULT_CLUB)
+            for entry in club.get('courts', []):
+                courts.append(
+                    build_court(
+                        entry['number'],
+                        entry['appointment_id'],
+                        entry['calendar_id'],
+                        base_url=club.get('base_url', ACUITY_EMBED_URL.rsplit('/', 1)[0]),
+                        schedule_id=club.get('schedule_id', ''),
+                        club=name,
+                        direct_url=entry.get('direct_url'),
+                        full_url=entry.get('full_url'),
+                    )
+                )
+        return cls(courts)
+
+    @property
+    def numbers(self) -> List[int]:
+        t('infrastructure.court_topology.CourtTopology.numbers')
+        return list(self._courts)
+
+    def get(self, number: int) -> Optional[CourtDefinition]:
+        t('infrastructure.court_topology.CourtTopology.get')
+        return self._courts.get(number)
+
+    def __contains__(self, number: object) -> bool:
+        t('infrastructure.court_topology.CourtTopology.__contains__')
+        return number in self._courts
+
+    def __iter__(self) -> Iterator[CourtDefinition]:
+        t('infrastructure.court_topology.CourtTopology.__iter__')
+        return iter(self._courts.values())
+
+    def __len__(self) -> int:
+        t('infrastructure.court_topology.CourtTopology.__len__')
+        return len(self._courts)
+
+    def direct_urls(self) -> Dict[int, str]:
+        t('infrastructure.court_topology.CourtTopology.direct_urls')
+        return {number: court.direct_url for number, court in self._courts.items()}
+
+    def host_for(self, number: int) -> str:
+        """Return the Acuity host serving ``number`` (empty for unknown courts)."""
+
+        t('infrastructure.court_topology.CourtTopology.host_for')
+        court = self._courts.get(number)
+        return court.host if court else ''
+
+    def courts_by_host(self, numbers: Optional[Iterable[int]] = None) -> Dict[str, List[int]]:
+        """Group ``numbers`` (default: every court) by Acuity host, keeping order."""
+
+        t('infrastructure.court_topology.CourtTopology.courts_by_host')
+        grouped: Dict[str, List[int]] = {}
+        for number in self.numbers if numbers is None else numbers:
+            grouped.setdefault(self.host_for(number), []).append(number)
+        return grouped
+
+    def as_config(self) -> Dict[int, Dict[str, str]]:
+        t('infrastructure.court_topology.CourtTopology.as_config')
+        return {number: court.as_config() for number, court in self._courts.items()}
+
+
+def load_court_topology(path: Optional[str] = None) -> CourtTopology:
+    """Load the topology from ``path``, or the built-in courts when empty."""
+
+    t('infrastructure.court_topology.load_court_topology')
+    if not path:
+        return CourtTopology.from_config(COURT_CONFIG)
+    payload = json.loads(Path(path).read_text(encoding='utf-8'))
+    if isinstance(payload, Mapping) and 'clubs' in payload:
+        return CourtTopology.from_clubs(payload['clubs'])
+    return CourtTopology.from_config({int(key): value for key, value in payload.items()})
+
+
+_LOCK = threading.Lock()
+_TOPOLOGY: Optional[CourtTopology] = None
+
+
+def get_court_topology() -> CourtTopology:
+    """Return the process-wide topology, loading ``COURT_TOPOLOGY_FILE`` once."""
+
+    t('infrastructure.court_topology.get_court_topology')
+    global _TOPOLOGY
+    with _LOCK:
+        if _TOPOLOGY is None:
+            _TOPOLOGY = load_court_topology(get_settings().court_topology_file)
+        return _TOPOLOGY
+
+
+def set_court_topology(topology: Optional[CourtTopology]) -> Optional[CourtTopology]:
+    """Install ``topology`` process-wide (``None`` reloads on next use); return the previous one."""
+
+    t('infrastructure.court_topology.set_court_topology')
+    global _TOPOLOGY
+    with _LOCK:
+        previous, _TOPOLOGY = _TOPOLOGY, topology
+        return previous
+
+
+__all__ = [
+    'CourtDefinition',
+    'CourtTopology',
+    'DEFAULT_CLUB',
+    'build_court',
+    'get_court_topology',
+    'load_court_topology',
+    'set_court_topology',
+]
@@ -101,47 +101,19 @@ class DatabaseHelpers:
     def get_active_users_count(user_db) -> int:
         """Get count of active users"""
         t('infrastructure.db.DatabaseHelpers.get_active_users_count')
-        all_users = user_db.get_all_users()
-        return sum(1 for user in all_users.values() if user.is_active)
+        return user_db.get_user_counts()['active']
     
     @staticmethod
     def get_pending_users(user_db) -> List[Any]:
-        """Get list of users pending approval"""
+        """Get list of users pending approval, newest first"""
         t('infrastructure.db.DatabaseHelpers.get_pending_users')
-        all_users = user_db.get_all_users()
-        pending = []
-        
-        for user in all_users.values():
-            if not user.is_active and user.phone and user.email:
-                pending.append(user)
-        
-        # Sort by creation date (newest first)
-        pending.sort(key=lambda u: getattr(u, 'created_at', datetime.min), reverse=True)
-        return pending
+        return user_db.get_pending_users()
     
     @staticmethod
     def search_users(user_db, query: str) -> List[Any]:
         """Search users by name, phone, email, or username"""
         t('infrastructure.db.DatabaseHelpers.search_users')
-        query = query.lower().strip()
-        all_users = user_db.get_all_users()
-        results = []
-        
-        for user in all_users.values():
-            # Search in various fields
-            searchable = [
-                str(user.user_id),
-                user.first_name.lower(),
-                user.last_name.lower(),
-                user.phone,
-                user.email.lower(),
-                user.telegram_username.lower() if user.telegram_username else ""
-            ]
-            
-            if any(query in field for field in searchable):
-                results.append(user)
-        
-        return results
+        return user_db.search_users(query)
     
     @staticmethod
     def get_reservation_stats(queue, timezone_str: str = 'America/Guatemala') -> Dict[str, Any]:
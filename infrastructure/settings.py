@@ -46,13 +46,37 @@ class AppSettings:
     browser_pool_size: int
     browser_refresh_interval: int
     low_resource_mode: bool
+    browser_resource_blocking: bool
+    browser_pool_mode: str
+    browser_max_pages_per_host: int
+    court_topology_file: str
+    browser_hot_standby: bool
+    browser_page_max_age_seconds: float
+    browser_fast_start: bool
+    browser_user_data_dir: str
+    refresh_min_interval: float
+    refresh_global_rate: float
+    cancellation_pool_size: int
+    cancellation_idle_seconds: float
+    notification_chat_interval: float
+    notification_global_rate: float
     reservation_check_interval: int
     reservation_max_retry_attempts: int
     reservation_booking_window_hours: int
+    booking_race_courts: bool
+    booking_trace_file: str
+    release_timing_file: str
     queue_file: str
+    queue_journal_enabled: bool
+    queue_journal_compact_threshold: int
+    queue_prearm_seconds: float
     users_file: str
+    users_save_debounce_seconds: float
     data_directory: str
     save_availability_screenshots: bool
+    availability_cache_ttl: float
+    availability_cache_stale_seconds: float
+    availability_network_extraction: bool
 
 
 @dataclass(frozen=True)
@@ -91,17 +115,43 @@ def load_settings(env: Optional[Mapping[str, str]] = None) -> AppSettings:
     browser_pool_size = int(env.get("BROWSER_POOL_SIZE", "3"))
     browser_refresh_interval = int(env.get("BROWSER_REFRESH_INTERVAL", "180"))
     low_resource_mode = _to_bool(env.get("BROWSER_LOW_RESOURCE_MODE", "false"))
+    browser_resource_blocking = _to_bool(env.get("BROWSER_RESOURCE_BLOCKING", "false"))
+    browser_pool_mode = env.get("BROWSER_POOL_MODE", "headed").strip().lower()
+    browser_max_pages_per_host = max(1, int(env.get("BROWSER_MAX_PAGES_PER_HOST", "3")))
+    court_topology_file = env.get("COURT_TOPOLOGY_FILE", "").strip()
+    browser_hot_standby = _to_bool(env.get("BROWSER_HOT_STANDBY", "false"))
+    browser_page_max_age_seconds = float(env.get("BROWSER_PAGE_MAX_AGE_SECONDS", "1800"))
+    browser_fast_start = _to_bool(env.get("BROWSER_FAST_START", "false"))
+    browser_user_data_dir = env.get("BROWSER_USER_DATA_DIR", "browser_states/profiles").strip()
+    refresh_min_interval = max(0.0, float(env.get("REFRESH_MIN_INTERVAL", "0.3")))
+    refresh_global_rate = float(env.get("REFRESH_GLOBAL_RATE", "6"))
+    cancellation_pool_size = max(1, int(env.get("CANCELLATION_POOL_SIZE", "2")))
+    cancellation_idle_seconds = float(env.get("CANCELLATION_IDLE_SECONDS", "300"))
+    notification_chat_interval = float(env.get("NOTIFY_CHAT_INTERVAL", "1.0"))
+    notification_global_rate = float(env.get("NOTIFY_GLOBAL_RATE", "25"))
 
     reservation_check_interval = int(env.get("RESERVATION_CHECK_INTERVAL", "30"))
     reservation_max_retry_attempts = int(env.get("RESERVATION_MAX_RETRY_ATTEMPTS", "3"))
     reservation_booking_window_hours = int(env.get("RESERVATION_BOOKING_WINDOW_HOURS", "48"))
+    booking_race_courts = _to_bool(env.get("BOOKING_RACE_COURTS", "false"))
+    booking_trace_file = env.get("BOOKING_TRACE_FILE", "").strip()
+    release_timing_file = env.get("RELEASE_TIMING_FILE", "data/release_timing.json").strip()
 
     queue_file = env.get("QUEUE_FILE", "data/queue.json")
+    queue_journal_enabled = _to_bool(env.get("QUEUE_JOURNAL_ENABLED", "true"), default=True)
+    queue_journal_compact_threshold = int(env.get("QUEUE_JOURNAL_COMPACT_THRESHOLD", "500"))
+    queue_prearm_seconds = float(env.get("QUEUE_PREARM_SECONDS", "20"))
     users_file = env.get("USERS_FILE", "data/users.json")
+    users_save_debounce_seconds = float(env.get("USERS_SAVE_DEBOUNCE_SECONDS", "1.0"))
     data_directory = env.get("DATA_DIRECTORY", "data")
     save_availability_screenshots = _to_bool(
         env.get("SAVE_AVAILABILITY_SCREENSHOTS", "false")
     )
+    availability_cache_ttl = float(env.get("AVAILABILITY_CACHE_TTL", "20"))
+    availability_cache_stale_seconds = float(env.get("AVAILABILITY_CACHE_STALE_SECONDS", "40"))
+    availability_network_extraction = _to_bool(
+        env.get("AVAILABILITY_NETWORK_EXTRACTION", "true"), default=True
+    )
 
     return AppSettings(
         bot_token=bot_token,
@@ -111,13 +161,37 @@ def load_settings(env: Optional[Mapping[str, str]] = None) -> AppSettings:
         browser_pool_size=browser_pool_size,
         browser_refresh_interval=browser_refresh_interval,
         low_resource_mode=low_resource_mode,
+        browser_resource_blocking=browser_resource_blocking,
+        browser_pool_mode=browser_pool_mode,
+        browser_max_pages_per_host=browser_max_pages_per_host,
+        court_topology_file=court_topology_file,
+        browser_hot_standby=browser_hot_standby,
+        browser_page_max_age_seconds=browser_page_max_age_seconds,
+        browser_fast_start=browser_fast_start,
+        browser_user_data_dir=browser_user_data_dir,
+        refresh_min_interval=refresh_min_interval,
+        refresh_global_rate=refresh_global_rate,
+        cancellation_pool_size=cancellation_pool_size,
+        cancellation_idle_seconds=cancellation_idle_seconds,
+        notification_chat_interval=notification_chat_interval,
+        notification_global_rate=notification_global_rate,
         reservation_check_interval=reservation_check_interval,
         reservation_max_retry_attempts=reservation_max_retry_attempts,
         reservation_booking_window_hours=reservation_booking_window_hours,
+        booking_race_courts=booking_race_courts,
+        booking_trace_file=booking_trace_file,
+        release_timing_file=release_timing_file,
         queue_file=queue_file,
+        queue_journal_enabled=queue_journal_enabled,
+        queue_journal_compact_threshold=queue_journal_compact_threshold,
+        queue_prearm_seconds=queue_prearm_seconds,
         users_file=users_file,
+        users_save_debounce_seconds=users_save_debounce_seconds,
         data_directory=data_directory,
         save_availability_screenshots=save_availability_screenshots,
+        availability_cache_ttl=availability_cache_ttl,
+        availability_cache_stale_seconds=availability_cache_stale_seconds,
+        availability_network_extraction=availability_network_extraction,
     )
 
 
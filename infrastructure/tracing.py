@@ -0,0 +1,348 @@
+"""Per-booking latency traces built from lightweight phase spans.
+
+:func:`booking_trace` opens a trace and stores it in a context variable.
+:func:`span` records a named phase into the current trace and does nothing
+outside one. Tasks created inside a trace inherit it, so flows and form
+services emit spans without any extra plumbing.
+
+Some scheduler stages serve a whole batch (``hydrate``, ``plan``,
+``refresh``). Those run inside a batch trace, and each booking trace opened
+within it starts with a copy of those spans. That makes every booking record
+cover the booking end to end. A batch trace is exported only when no booking
+trace claimed it, as happens on a pre-arm pass.
+
+Finished traces go to the process-wide :class:`TraceExporter`. When
+``BOOKING_TRACE_FILE`` is set, each trace is written there as one JSON line.
+The exporter also keeps a window of recent records in memory, which
+:func:`summarize_traces` turns into per-phase p50/p95 figures.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional
+
+from tracking import t
+
+from .settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Canonical booking phases, in pipeline order; summaries list these first.
+PHASES = (
+    'hydrate',
+    'plan',
+    'prearm',
+    'refresh',
+    'slot_visible',
+    'click',
+    'form_visible',
+    'fill',
+    'submit',
+    'confirm',
+)
+# Records of these stages cover a whole slot, not one booking's end-to-end time.
+BATCH_STAGES = ('batch', 'prearm')
+DEFAULT_WINDOW = 500
+
+_CURRENT: ContextVar[Optional['BookingTrace']] = ContextVar('booking_trace', default=None)
+
+
+@dataclass
+class Span:
+    """One timed phase, offset from the start of its trace."""
+
+    name: str
+    offset_ms: float
+    duration_ms: float
+    error: Optional[str] = None
+    shared: bool = False
+
+    def as_dict(self) -> Dict[str, Any]:
+        t('infrastructure.tracing.Span.as_dict')
+        record: Dict[str, Any] = {
+            'name': self.name,
+            'offset_ms': round(self.offset_ms, 1),
+            'duration_ms': round(self.duration_ms, 1),
+        }
+        if self.error:
+            record['error'] = self.error
+        if self.shared:
+            record['shared'] = True
+        return record
+
+
+class BookingTrace:
+    """Spans recorded for one booking, or for one scheduler batch."""
+
+    def __init__(
+        self,
+        trace_id: str,
+        *,
+        attributes: Optional[Dict[str, Any]] = None,
+        parent: Optional['BookingTrace'] = None,
+        clock=time.perf_counter,
+    ) -> None:
+        t('infrastructure.tracing.BookingTrace.__init__')
+        self.trace_id = str(trace_id)
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.spans: List[Span] = []
+        self.duration_ms: Optional[float] = None
+        self.claimed = False
+        self._clock = clock
+        if parent is None:
+            self.started_at = time.time()
+            self._origin = clock()
+        else:
+            # A booking inside a batch starts when the batch did and carries its stages.
+            self.started_at = parent.started_at
+            self._origin = parent._origin
+            self.attributes = {**parent.attributes, **self.attributes}
+            self.spans = [
+                Span(s.name, s.offset_ms, s.duration_ms, s.error, shared=True) for s in parent.spans
+            ]
+            parent.claimed = True
+
+    def elapsed_ms(self) -> float:
+        t('infrastructure.tracing.BookingTrace.elapsed_ms')
+        return (self._clock() - self._origin) * 1000
+
+    def record(self, name: str, start: float, end: float, error: Optional[str] = None) -> Span:
+        """Add a span measured with this trace's clock."""
+
+        t('infrastructure.tracing.BookingTrace.record')
+        span_ = Span(name, (start - self._origin) * 1000, (end - start) * 1000, error)
+        self.spans.append(span_)
+        return span_
+
+    def phase_totals(self) -> Dict[str, float]:
+        """Return total milliseconds per phase name, in first-seen order."""
+
+        t('infrastructure.tracing.BookingTrace.phase_totals')
+        totals: Dict[str, float] = {}
+        for span_ in self.spans:
+            totals[span_.name] = totals.get(span_.name, 0.0) + span_.duration_ms
+        return totals
+
+    def finish(self) -> None:
+        t('infrastructure.tracing.BookingTrace.finish')
+        if self.duration_ms is None:
+            self.duration_ms = self.elapsed_ms()
+
+    def as_record(self) -> Dict[str, Any]:
+        t('infrastructure.tracing.BookingTrace.as_record')
+        duration = self.duration_ms if self.duration_ms is not None else self.elapsed_ms()
+        return {
+            'trace_id': self.trace_id,
+            'started_at': datetime.fromtimestamp(self.started_at, tz=timezone.utc).isoformat(),
+            'duration_ms': round(duration, 1),
+            'attributes': self.attributes,
+            'phases': {name: round(value, 1) for name, value in self.phase_totals().items()},
+            'spans': [span_.as_dict() for span_ in self.spans],
+        }
+
+
+def current_trace() -> Optional[BookingTrace]:
+    t('infrastructure.tracing.current_trace')
+    return _CURRENT.get()
+
+
+def annotate(**attributes: Any) -> None:
+    """Attach attributes to the current trace, if any."""
+
+    t('infrastructure.tracing.annotate')
+    trace = _CURRENT.get()
+    if trace is not None:
+        trace.attributes.update(attributes)
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time the enclosed block as phase ``name`` of the current trace."""
+
+    t('infrastructure.tracing.span')
+    trace = _CURRENT.get()
+    if trace is None:
+        yield
+        return
+    start = trace._clock()
+    error: Optional[str] = None
+    try:
+        yield
+    except BaseException as exc:
+        error = type(exc).__name__
+        raise
+    finally:
+        trace.record(name, start, trace._clock(), error)
+
+
+@contextmanager
+def booking_trace(
+    trace_id: Any,
+    *,
+    exporter: Optional['TraceExporter'] = None,
+    **attributes: Any,
+) -> Iterator[BookingTrace]:
+    """Make a new trace current for the enclosed block and export it on exit.
+
+    Opened inside another trace, the new trace inherits that trace's spans
+    and the outer trace is no longer exported on its own.
+    """
+
+    t('infrastructure.tracing.booking_trace')
+    trace = BookingTrace(trace_id, attributes=attributes, parent=_CURRENT.get())
+    token = _CURRENT.set(trace)
+    try:
+        yield trace
+    finally:
+        _CURRENT.reset(token)
+        trace.finish()
+        if not trace.claimed:
+            (exporter or get_trace_exporter()).export(trace)
+
+
+class TraceExporter:
+    """Append finished traces to a JSONL file and keep a recent window in memory."""
+
+    def __init__(self, path: Optional[str] = None, *, window: int = DEFAULT_WINDOW) -> None:
+        t('infrastructure.tracing.TraceExporter.__init__')
+        self.path = Path(path) if path else None
+        self.recent: Deque[Dict[str, Any]] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def export(self, trace: BookingTrace) -> Dict[str, Any]:
+        t('infrastructure.tracing.TraceExporter.export')
+        record = trace.as_record()
+        with self._lock:
+            self.recent.append(record)
+            if self.path is not None:
+                try:
+                    self.path.parent.mkdir(parents=True, exist_ok=True)
+                    with self.path.open('a', encoding='utf-8') as handle:
+                        handle.write(json.dumps(record, default=str) + '\n')
+                except OSError as exc:
+                    logger.warning("Could not write booking trace to %s: %s", self.path, exc)
+        return record
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        t('infrastructure.tracing.TraceExporter.summary')
+        with self._lock:
+            records = list(self.recent)
+        return summarize_traces(records)
+
+
+def _percentile(samples: List[float], fraction: float) -> float:
+    t('infrastructure.tracing._percentile')
+    return samples[min(len(samples) - 1, int(len(samples) * fraction))]
+
+
+def summarize_traces(records: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """Return ``{phase: {count, p50_ms, p95_ms}}`` over exported trace records.
+
+    Known phases come first in pipeline order, then any others, then
+    ``total``. Batch-level records count towards their phases, not ``total``.
+    """
+
+    t('infrastructure.tracing.summarize_traces')
+    samples: Dict[str, List[float]] = {}
+    totals: List[float] = []
+    for record in records:
+        for name, value in (record.get('phases') or {}).items():
+            samples.setdefault(name, []).append(float(value))
+        stage = (record.get('attributes') or {}).get('stage')
+        if record.get('duration_ms') is not None and stage not in BATCH_STAGES:
+            totals.append(float(record['duration_ms']))
+
+    ordered = [name for name in PHASES if name in samples]
+    ordered += [name for name in samples if name not in PHASES]
+    summary: Dict[str, Dict[str, float]] = {}
+    for name, values in [(name, samples[name]) for name in ordered] + [('total', totals)]:
+        if not values:
+            continue
+        values.sort()
+        summary[name] = {
+            'count': len(values),
+            'p50_ms': round(_percentile(values, 0.5), 1),
+            'p95_ms': round(_percentile(values, 0.95), 1),
+        }
+    return summary
+
+
+def load_traces(path: str) -> List[Dict[str, Any]]:
+    """Read trace records from a JSONL file, skipping malformed lines."""
+
+    t('infrastructure.tracing.load_traces')
+    records: List[Dict[str, Any]] = []
+    with open(path, encoding='utf-8') as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def format_summary(summary: Dict[str, Dict[str, float]]) -> str:
+    t('infrastructure.tracing.format_summary')
+    if not summary:
+        return "No booking traces recorded yet."
+    lines = [f"{'phase':14} {'n':>5} {'p50 ms':>9} {'p95 ms':>9}"]
+    for name, stats in summary.items():
+        lines.append(
+            f"{name:14} {int(stats['count']):5d} {stats['p50_ms']:9.0f} {stats['p95_ms']:9.0f}"
+        )
+    return '\n'.join(lines)
+
+
+_LOCK = threading.Lock()
+_EXPORTER: Optional[TraceExporter] = None
+
+
+def get_trace_exporter() -> TraceExporter:
+    """Return the process-wide exporter, writing to ``BOOKING_TRACE_FILE`` when set."""
+
+    t('infrastructure.tracing.get_trace_exporter')
+    global _EXPORTER
+    with _LOCK:
+        if _EXPORTER is None:
+            _EXPORTER = TraceExporter(get_settings().booking_trace_file)
+        return _EXPORTER
+
+
+def set_trace_exporter(exporter: Optional[TraceExporter]) -> Optional[TraceExporter]:
+    """Install ``exporter`` process-wide (``None`` rebuilds on next use); return the previous one."""
+
+    t('infrastructure.tracing.set_trace_exporter')
+    global _EXPORTER
+    with _LOCK:
+        previous, _EXPORTER = _EXPORTER, exporter
+        return previous
+
+
+__all__ = [
+    'PHASES',
+    'BookingTrace',
+    'Span',
+    'TraceExporter',
+    'annotate',
+    'booking_trace',
+    'current_trace',
+    'format_summary',
+    'get_trace_exporter',
+    'load_traces',
+    'set_trace_exporter',
+    'span',
+    'summarize_traces',
+]
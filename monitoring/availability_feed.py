@@ -0,0 +1,360 @@
+"""Publish/subscribe layer over :class:`~monitoring.availability_poller.AvailabilityPoller`.
+
+Each subscription names a play date, an inclusive range of slot start
+times, and optionally a set of courts. After every poll the feed turns the
+snapshot's :class:`AvailabilityChange` diffs into :class:`SlotEvent` objects.
+Each event goes only to the subscriptions that cover it. Subscriptions are
+kept in one :class:`IntervalIndex` per date, so matching an event is a
+binary search plus the matching subscriptions. It does not scan every
+watcher.
+
+The feed can also own the polling loop (:meth:`AvailabilityFeed.ensure_polling`).
+The loop runs while anyone is subscribed and stops when the last
+subscription goes. Any number of watchers then cost one fetch per interval,
+where each used to reload the courts on its own.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import itertools
+import logging
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Iterable, List, Optional, Tuple, Union
+
+from tracking import t
+
+from monitoring.availability_poller import AvailabilityPoller, PollSnapshot
+
+OPENED = 'opened'
+CLOSED = 'closed'
+
+SlotCallback = Callable[['SlotEvent'], Any]
+
+
+def minute_of_day(value: str) -> int:
+    """Convert ``HH:MM`` to minutes after midnight."""
+
+    t('monitoring.availability_feed.minute_of_day')
+    hour, minute = value.split(':')[:2]
+    return int(hour) * 60 + int(minute)
+
+
+@dataclass(frozen=True)
+class SlotEvent:
+    """One slot that opened or closed between two polls."""
+
+    court: int
+    date: str
+    time: str
+    kind: str
+    observed_at: datetime
+
+
+@dataclass
+class SlotSubscription:
+    """Interest in slots on ``date`` starting between ``start_time`` and ``end_time`` inclusive."""
+
+    id: int
+    date: str
+    start_time: str
+    end_time: str
+    callback: SlotCallback
+    courts: Optional[FrozenSet[int]] = None
+    kinds: FrozenSet[str] = field(default_factory=lambda: frozenset({OPENED}))
+    once: bool = False
+
+    def accepts(self, event: SlotEvent) -> bool:
+        t('monitoring.availability_feed.SlotSubscription.accepts')
+        return event.kind in self.kinds and (self.courts is None or event.court in self.courts)
+
+
+class IntervalIndex:
+    """Stabbing-query index over closed integer intervals.
+
+    The distinct interval endpoints split the line into elementary
+    segments, and each segment lists the keys covering it. A point lookup
+    is a bisect into the endpoints. The segments are rebuilt lazily on the
+    first lookup after a change. Keys come back in insertion order.
+    """
+
+    def __init__(self) -> None:
+        t('monitoring.availability_feed.IntervalIndex.__init__')
+        self._intervals: Dict[Hashable, Tuple[int, int]] = {}
+        self._bounds: Optional[List[int]] = None
+        self._cover: List[List[Hashable]] = []
+
+    def __len__(self) -> int:
+        t('monitoring.availability_feed.IntervalIndex.__len__')
+        return len(self._intervals)
+
+    def add(self, key: Hashable, low: int, high: int) -> None:
+        t('monitoring.availability_feed.IntervalIndex.add')
+        if high < low:
+            raise ValueError(f"empty interval [{low}, {high}]")
+        self._intervals[key] = (low, high)
+        self._bounds = None
+
+    def remove(self, key: Hashable) -> bool:
+        t('monitoring.availability_feed.IntervalIndex.remove')
+        if self._intervals.pop(key, None) is None:
+            return False
+        self._bounds = None
+        return True
+
+    def stab(self, point: int) -> List[Hashable]:
+        """Return the keys whose interval contains ``point``."""
+
+        t('monitoring.availability_feed.IntervalIndex.stab')
+        if self._bounds is None:
+            self._build()
+        segment = bisect_right(self._bounds, point) - 1
+        if segment < 0 or segment >= len(self._cover):
+            return []
+        return list(self._cover[segment])
+
+    def _build(self) -> None:
+        t('monitoring.availability_feed.IntervalIndex._build')
+        intervals = self._intervals.values()
+        bounds = sorted({low for low, _ in intervals} | {high + 1 for _, high in intervals})
+        cover: List[List[Hashable]] = [[] for _ in bounds]
+        for key, (low, high) in self._intervals.items():
+            for segment in range(bisect_left(bounds, low), bisect_left(bounds, high + 1)):
+                cover[segment].append(key)
+        self._bounds = bounds
+        self._cover = cover
+
+
+class AvailabilityFeed:
+    """Fan availability changes from one poller out to matching subscribers."""
+
+    def __init__(self, poller: AvailabilityPoller, *, logger: Optional[logging.Logger] = None) -> None:
+        t('monitoring.availability_feed.AvailabilityFeed.__init__')
+        self.poller = poller
+        self.logger = logger or logging.getLogger('AvailabilityFeed')
+        self.last_snapshot: Optional[PollSnapshot] = None
+        self._subscriptions: Dict[int, SlotSubscription] = {}
+        self._by_date: Dict[str, IntervalIndex] = {}
+        self._ids = itertools.count(1)
+        self._task: Optional[asyncio.Task] = None
+
+    def __len__(self) -> int:
+        t('monitoring.availability_feed.AvailabilityFeed.__len__')
+        return len(self._subscriptions)
+
+    @property
+    def polling(self) -> bool:
+        """Whether the shared poll loop is running, so :meth:`current` is fresh."""
+
+        t('monitoring.availability_feed.AvailabilityFeed.polling')
+        return self._task is not None and not self._task.done()
+
+    # ------------------------------------------------------------------
+    # Subscriptions
+    # ------------------------------------------------------------------
+    def subscribe(
+        self,
+        callback: SlotCallback,
+        *,
+        play_date: Union[str, date],
+        start_time: str = '00:00',
+        end_time: str = '23:59',
+        courts: Optional[Iterable[int]] = None,
+        kinds: Iterable[str] = (OPENED,),
+        once: bool = False,
+    ) -> SlotSubscription:
+        """Register ``callback`` (sync or async) for matching slot events.
+
+        ``once`` subscriptions are removed after their first delivery.
+        """
+
+        t('monitoring.availability_feed.AvailabilityFeed.subscribe')
+        date_key = play_date if isinstance(play_date, str) else play_date.isoformat()
+        subscription = SlotSubscription(
+            id=next(self._ids),
+            date=date_key,
+            start_time=start_time,
+            end_time=end_time,
+            callback=callback,
+            courts=frozenset(courts) if courts is not None else None,
+            kinds=frozenset(kinds),
+            once=once,
+        )
+        self._by_date.setdefault(date_key, IntervalIndex()).add(
+            subscription.id, minute_of_day(start_time), minute_of_day(end_time)
+        )
+        self._subscriptions[subscription.id] = subscription
+        return subscription
+
+    def unsubscribe(self, subscription: Union[SlotSubscription, int]) -> bool:
+        t('monitoring.availability_feed.AvailabilityFeed.unsubscribe')
+        sub_id = subscription.id if isinstance(subscription, SlotSubscription) else subscription
+        removed = self._subscriptions.pop(sub_id, None)
+        if removed is None:
+            return False
+        index = self._by_date.get(removed.date)
+        if index is not None:
+            index.remove(sub_id)
+            if not len(index):
+                del self._by_date[removed.date]
+        return True
+
+    def prune(self, before: Union[str, date]) -> int:
+        """Drop subscriptions for play dates earlier than ``before``."""
+
+        t('monitoring.availability_feed.AvailabilityFeed.prune')
+        cutoff = before if isinstance(before, str) else before.isoformat()
+        stale = [sub.id for sub in self._subscriptions.values() if sub.date < cutoff]
+        for sub_id in stale:
+            self.unsubscribe(sub_id)
+        return len(stale)
+
+    def matching(self, event: SlotEvent) -> List[SlotSubscription]:
+        """Return the subscriptions ``event`` would be delivered to."""
+
+        t('monitoring.availability_feed.AvailabilityFeed.matching')
+        index = self._by_date.get(event.date)
+        if index is None:
+            return []
+        subscriptions = (self._subscriptions[sub_id] for sub_id in index.stab(minute_of_day(event.time)))
+        return [sub for sub in subscriptions if sub.accepts(event)]
+
+    def current(self, subscription: SlotSubscription) -> List[SlotEvent]:
+        """Slots open in the last poll that ``subscription`` covers, as ``opened`` events."""
+
+        t('monitoring.availability_feed.AvailabilityFeed.current')
+        snapshot = self.last_snapshot
+        if snapshot is None:
+            return []
+        low, high = minute_of_day(subscription.start_time), minute_of_day(subscription.end_time)
+        events = []
+        for court, data in sorted(snapshot.results.items()):
+            if not isinstance(data, dict) or 'error' in data:
+                continue
+            if subscription.courts is not None and court not in subscription.courts:
+                continue
+            for time_str in data.get(subscription.date, []):
+                if low <= minute_of_day(time_str) <= high:
+                    events.append(SlotEvent(court, subscription.date, time_str, OPENED, snapshot.timestamp))
+        return events
+
+    # ------------------------------------------------------------------
+    # Publishing
+    # ------------------------------------------------------------------
+    async def poll(self, *, resync: bool = False) -> PollSnapshot:
+        """Poll once and deliver the resulting events."""
+
+        t('monitoring.availability_feed.AvailabilityFeed.poll')
+        snapshot = await self.poller.poll()
+        await self.publish(snapshot, resync=resync)
+        return snapshot
+
+    async def publish(self, snapshot: PollSnapshot, *, resync: bool = False) -> int:
+        """Deliver ``snapshot``'s events to matching subscribers; return deliveries made.
+
+        With ``resync`` every open slot is published as opened, as after
+        the first poll. Use it when the previous snapshot may be stale.
+        """
+
+        t('monitoring.availability_feed.AvailabilityFeed.publish')
+        self.last_snapshot = snapshot
+        delivered = 0
+        for event in self.events_from(snapshot, full=resync):
+            for subscription in self.matching(event):
+                if subscription.id not in self._subscriptions:
+                    continue  # removed by an earlier callback in this batch
+                if subscription.once:
+                    self.unsubscribe(subscription)
+                await self._deliver(subscription, event)
+                delivered += 1
+        return delivered
+
+    @staticmethod
+    def events_from(snapshot: PollSnapshot, *, full: bool = False) -> List[SlotEvent]:
+        """Flatten a snapshot's per-court changes into slot events.
+
+        The poller reports no changes on its first fetch, so every slot in
+        a snapshot with no previous data counts as opened. ``full`` does
+        the same for any snapshot.
+        """
+
+        t('monitoring.availability_feed.AvailabilityFeed.events_from')
+        events: List[SlotEvent] = []
+        if full or not snapshot.previous:
+            for court, data in sorted(snapshot.results.items()):
+                if isinstance(data, dict) and 'error' not in data:
+                    for date_str, times in sorted(data.items()):
+                        events.extend(
+                            SlotEvent(court, date_str, time_str, OPENED, snapshot.timestamp) for time_str in times
+                        )
+            return events
+
+        for court, change in sorted(snapshot.changes.items()):
+            for kind, slots in ((OPENED, change.added), (CLOSED, change.removed)):
+                for date_str, times in sorted(slots.items()):
+                    events.extend(
+                        SlotEvent(court, date_str, time_str, kind, snapshot.timestamp) for time_str in times
+                    )
+        return events
+
+    async def _deliver(self, subscription: SlotSubscription, event: SlotEvent) -> None:
+        t('monitoring.availability_feed.AvailabilityFeed._deliver')
+        try:
+            result = subscription.callback(event)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as exc:
+            self.logger.error(
+                "Availability subscriber %s failed on court %s %s %s: %s",
+                subscription.id,
+                event.court,
+                event.date,
+                event.time,
+                exc,
+                exc_info=True,
+            )
+
+    # ------------------------------------------------------------------
+    # Shared polling loop
+    # ------------------------------------------------------------------
+    def ensure_polling(self, interval: float) -> None:
+        """Start the shared poll loop unless it is running; it exits when nobody is subscribed."""
+
+        t('monitoring.availability_feed.AvailabilityFeed.ensure_polling')
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._poll_loop(interval), name='availability-feed')
+
+    async def stop(self) -> None:
+        t('monitoring.availability_feed.AvailabilityFeed.stop')
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def _poll_loop(self, interval: float) -> None:
+        t('monitoring.availability_feed.AvailabilityFeed._poll_loop')
+        # The poller's last snapshot may predate this loop, so the first
+        # poll republishes everything that is open.
+        resync = True
+        while self._subscriptions:
+            try:
+                await self.poll(resync=resync)
+                resync = False
+            except Exception as exc:  # pragma: no cover - defensive logging
+                self.logger.error("Availability poll failed: %s", exc, exc_info=True)
+            if not self._subscriptions:
+                break
+            await asyncio.sleep(interval)
+
+
+__all__ = [
+    'AvailabilityFeed',
+    'CLOSED',
+    'IntervalIndex',
+    'OPENED',
+    'SlotEvent',
+    'SlotSubscription',
+]
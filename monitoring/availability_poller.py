@@ -1,4 +1,10 @@
-"""Reusable polling helper for court availability."""
+"""Reusable polling helper for court availability.
+
+Given a :class:`~automation.executors.release_timing.ReleaseTimingModel`, the
+poller also reports every slot that appears between two fetches. The model
+receives the start of the previous fetch and the end of the current one,
+which bound when the slot was released.
+"""
 
 from __future__ import annotations
 from tracking import t
@@ -7,8 +13,12 @@ import copy
 from dataclasses import dataclass, field
 from datetime import datetime
 import logging
+import time
 from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional
 
+from automation.availability.datetime_helpers import DateTimeHelpers
+from infrastructure.settings import get_settings
+
 
 AvailabilityData = Dict[int, Any]
 
@@ -44,11 +54,16 @@ class AvailabilityPoller:
         fetcher: Callable[[], Awaitable[AvailabilityData]],
         *,
         logger,
+        release_model: Optional[Any] = None,
+        wall: Callable[[], float] = time.time,
     ) -> None:
         t('monitoring.availability_poller.AvailabilityPoller.__init__')
         self._fetcher = fetcher
         self._logger = logger or logging.getLogger('AvailabilityPoller')
         self._previous: AvailabilityData = {}
+        self._release_model = release_model
+        self._wall = wall
+        self._previous_fetch_started: Optional[float] = None
 
     @property
     def previous(self) -> AvailabilityData:
@@ -57,7 +72,9 @@ class AvailabilityPoller:
 
     async def poll(self) -> PollSnapshot:
         t('monitoring.availability_poller.AvailabilityPoller.poll')
+        fetch_started = self._wall()
         raw_results = await self._fetcher()
+        fetch_finished = self._wall()
         is_initial = not self._previous
         normalised_results = self._normalise_snapshot(raw_results)
         previous_normalised = self._normalise_snapshot(self._previous)
@@ -83,12 +100,38 @@ class AvailabilityPoller:
             changes=changes,
         )
 
+        if self._release_model is not None and self._previous_fetch_started is not None:
+            self._record_releases(changes, self._previous_fetch_started, fetch_finished)
         self._previous = normalised_results
+        self._previous_fetch_started = fetch_started
         return snapshot
 
     # ------------------------------------------------------------------
     # Internal helpers
     # ------------------------------------------------------------------
+    def _record_releases(
+        self,
+        changes: Mapping[int, AvailabilityChange],
+        absent_at: float,
+        present_at: float,
+    ) -> None:
+        t('monitoring.availability_poller.AvailabilityPoller._record_releases')
+        timezone = get_settings().timezone
+        for court_number, change in changes.items():
+            if change.error:
+                continue
+            for date_str, times in change.added.items():
+                for time_str in times:
+                    slot_start = DateTimeHelpers.parse_reservation_datetime(date_str, time_str, timezone)
+                    if slot_start is None:
+                        continue
+                    try:
+                        self._release_model.observe(
+                            court_number, slot_start, absent_at=absent_at, present_at=present_at
+                        )
+                    except Exception as exc:  # pragma: no cover - learning must not break polling
+                        self._logger.debug("Release timing observation failed: %s", exc)
+
     def _normalise_snapshot(self, snapshot: AvailabilityData) -> AvailabilityData:
         t('monitoring.availability_poller.AvailabilityPoller._normalise_snapshot')
         if not snapshot:
@@ -13,7 +13,9 @@ from tracking import t
 
 from automation.availability import AvailabilityChecker
 from automation.browser.async_browser_pool import AsyncBrowserPool
+from automation.executors.release_timing import get_release_timing_model
 from infrastructure.constants import WEEKDAY_COURT_HOURS, WEEKEND_COURT_HOURS
+from monitoring.availability_feed import AvailabilityFeed, SlotEvent
 from monitoring.availability_poller import AvailabilityPoller
 
 
@@ -29,6 +31,7 @@ class CourtMonitor:
         self.browser_pool: Optional[AsyncBrowserPool] = None
         self.checker: Optional[AvailabilityChecker] = None
         self.poller: Optional[AvailabilityPoller] = None
+        self.feed: Optional[AvailabilityFeed] = None
         self._started = False
 
     async def start(self) -> None:
@@ -38,8 +41,13 @@ class CourtMonitor:
 
         self.browser_pool = AsyncBrowserPool()
         await self.browser_pool.start()
-        self.checker = AvailabilityChecker(self.browser_pool)
-        self.poller = AvailabilityPoller(self.checker.check_availability, logger=self.logger)
+        self.checker = AvailabilityChecker(self.browser_pool, use_cache=False)
+        self.poller = AvailabilityPoller(
+            self.checker.check_availability,
+            logger=self.logger,
+            release_model=get_release_timing_model(),
+        )
+        self.feed = AvailabilityFeed(self.poller, logger=self.logger)
         self._started = True
 
     async def stop(self) -> None:
@@ -47,11 +55,14 @@ class CourtMonitor:
         if not self._started:
             return
 
+        if self.feed is not None:
+            await self.feed.stop()
         if self.browser_pool:
             await self.browser_pool.stop()
         self.browser_pool = None
         self.checker = None
         self.poller = None
+        self.feed = None
         self._started = False
 
     async def monitor_slot(
@@ -62,16 +73,18 @@ class CourtMonitor:
         timeout_seconds: int = 120,
     ) -> Dict[str, object]:
         t('monitoring.court_monitor.CourtMonitor.monitor_slot')
-        """Poll for a specific court/time until timeout or availability."""
+        """Wait for a specific court/time to open, until timeout.
+
+        Concurrent calls share the feed's single poll loop.
+        """
 
         await self.start()
-        if not self.poller:
+        if self.feed is None:
             raise RuntimeError("Monitor not initialised")
 
         target_local = self._to_timezone(target_datetime)
         date_key = target_local.strftime('%Y-%m-%d')
         slot_time = target_local.strftime('%H:%M')
-        deadline = datetime.now(self.timezone) + timedelta(seconds=timeout_seconds)
 
         self.logger.info(
             "Monitoring court %s for %s at %s",
@@ -80,33 +93,52 @@ class CourtMonitor:
             slot_time,
         )
 
-        while datetime.now(self.timezone) < deadline:
-            snapshot = await self.poller.poll()
-            court_data = snapshot.results.get(court_number, {})
-            if isinstance(court_data, dict) and "error" not in court_data:
-                if slot_time in set(court_data.get(date_key, [])):
-                    self.logger.info(
-                        "Slot available for court %s on %s at %s",
-                        court_number,
-                        date_key,
-                        slot_time,
-                    )
-                    return {
-                        'status': 'available',
-                        'court': court_number,
-                        'date': date_key,
-                        'time': slot_time,
-                        'snapshot_time': snapshot.timestamp.isoformat(),
-                    }
-            await asyncio.sleep(self.poll_interval)
+        opened: asyncio.Future = asyncio.get_running_loop().create_future()
+
+        def _on_open(event: SlotEvent) -> None:
+            t('monitoring.court_monitor.CourtMonitor.monitor_slot._on_open')
+            if not opened.done():
+                opened.set_result(event)
+
+        subscription = self.feed.subscribe(
+            _on_open,
+            play_date=date_key,
+            start_time=slot_time,
+            end_time=slot_time,
+            courts=[court_number],
+            once=True,
+        )
+        already_open = self.feed.current(subscription) if self.feed.polling else []
+        try:
+            if already_open:
+                event = already_open[0]
+            else:
+                self.feed.ensure_polling(self.poll_interval)
+                event = await asyncio.wait_for(opened, timeout=timeout_seconds)
+        except asyncio.TimeoutError:
+            self.logger.info(
+                "Timed out waiting for court %s on %s at %s",
+                court_number,
+                date_key,
+                slot_time,
+            )
+            return {'status': 'timeout', 'court': court_number, 'date': date_key, 'time': slot_time}
+        finally:
+            self.feed.unsubscribe(subscription)
 
         self.logger.info(
-            "Timed out waiting for court %s on %s at %s",
+            "Slot available for court %s on %s at %s",
             court_number,
             date_key,
             slot_time,
         )
-        return {'status': 'timeout', 'court': court_number, 'date': date_key, 'time': slot_time}
+        return {
+            'status': 'available',
+            'court': court_number,
+            'date': date_key,
+            'time': slot_time,
+            'snapshot_time': event.observed_at.isoformat(),
+        }
 
     async def monitor_all_day(
         self,
@@ -141,12 +173,15 @@ class CourtMonitor:
                     )
                     await asyncio.sleep(wait_seconds)
 
-                for court in court_numbers:
-                    await self.monitor_slot(
+                # All courts watch through one shared poll loop.
+                await asyncio.gather(*(
+                    self.monitor_slot(
                         court,
                         playing_datetime,
                         timeout_seconds=advance_seconds + 120,
                     )
+                    for court in court_numbers
+                ))
         finally:
             await self.stop()
 
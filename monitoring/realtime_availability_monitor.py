@@ -15,7 +15,8 @@ from playwright.async_api import async_playwright, Page
 
 from automation.availability import AvailabilityChecker
 from automation.browser.async_browser_pool import AsyncBrowserPool
-from infrastructure.constants import COURT_CONFIG
+from automation.executors.release_timing import get_release_timing_model
+from infrastructure.court_topology import get_court_topology
 from monitoring.availability_poller import AvailabilityChange, AvailabilityPoller, PollSnapshot
 
 # ----------------------------------------------------------------------------
@@ -80,8 +81,12 @@ class RealtimeAvailabilityMonitor:
         self.browser_pool = AsyncBrowserPool()
         await self.browser_pool.start()
 
-        self.checker = AvailabilityChecker(self.browser_pool)
-        self.poller = AvailabilityPoller(self.checker.check_availability, logger=logger)
+        self.checker = AvailabilityChecker(self.browser_pool, use_cache=False)
+        self.poller = AvailabilityPoller(
+            self.checker.check_availability,
+            logger=logger,
+            release_model=get_release_timing_model(),
+        )
 
         self.playwright = await async_playwright().start()
         self.browser = await self.playwright.chromium.launch(
@@ -198,7 +203,7 @@ class RealtimeAvailabilityMonitor:
             if not self.monitoring_page:
                 self.monitoring_page = await self.browser.new_page()
 
-            court_url = COURT_CONFIG[court_num]["direct_url"]
+            court_url = get_court_topology().get(court_num).direct_url
             await self.monitoring_page.goto(court_url, wait_until='domcontentloaded')
             await asyncio.sleep(2)
 
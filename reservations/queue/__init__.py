@@ -7,6 +7,7 @@ from importlib import import_module
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:  # pragma: no cover - typing helper
+    from .queue_registry import get_queue
     from .reservation_queue import ReservationQueue, ReservationStatus
     from .reservation_scheduler import ReservationScheduler
     from .reservation_tracker import ReservationTracker
@@ -16,6 +17,7 @@ __all__ = [
     "ReservationStatus",
     "ReservationScheduler",
     "ReservationTracker",
+    "get_queue",
 ]
 
 
@@ -27,6 +29,8 @@ def __getattr__(name: str):
         module = import_module("reservations.queue.reservation_scheduler")
     elif name in {"ReservationTracker"}:
         module = import_module("reservations.queue.reservation_tracker")
+    elif name in {"get_queue"}:
+        module = import_module("reservations.queue.queue_registry")
     else:
         raise AttributeError(name)
     return getattr(module, name)
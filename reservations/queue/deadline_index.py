@@ -0,0 +1,145 @@
+"""Deadline index over queued reservations.
+
+:class:`DeadlineIndex` keeps the parsed ``scheduled_execution`` of every
+reservation that can still run (``pending``/``scheduled``/``attempting``) in a
+min-heap, so the scheduler can ask for the next deadline in O(log n) and the
+pipeline can reuse the parsed datetime instead of calling
+``datetime.fromisoformat`` on every check. Superseded heap entries are
+invalidated lazily and discarded when they surface at the top.
+"""
+
+from __future__ import annotations
+
+import heapq
+from datetime import datetime, tzinfo
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from tracking import t
+
+ACTIVE_STATUSES = frozenset({'pending', 'scheduled', 'attempting'})
+
+
+def parse_scheduled_execution(value: Any) -> Optional[datetime]:
+    """Return ``value`` as a datetime, or ``None`` when it cannot be parsed."""
+
+    t('reservations.queue.deadline_index.parse_scheduled_execution')
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return None
+
+
+class DeadlineIndex:
+    """Min-heap of execution deadlines keyed by reservation id."""
+
+    def __init__(
+        self,
+        records: Iterable[Mapping[str, Any]] = (),
+        *,
+        timezone: Optional[tzinfo] = None,
+    ) -> None:
+        t('reservations.queue.deadline_index.DeadlineIndex.__init__')
+        self._timezone = timezone
+        # id -> (raw scheduled_execution, parsed datetime, heap sort key)
+        self._entries: Dict[str, Tuple[Any, datetime, float]] = {}
+        self._heap: List[Tuple[float, str]] = []
+        for record in records:
+            self.update(record)
+
+    def update(self, record: Mapping[str, Any]) -> None:
+        """Track, move or drop ``record`` according to its status and deadline."""
+
+        t('reservations.queue.deadline_index.DeadlineIndex.update')
+        reservation_id = record.get('id')
+        if reservation_id is None:
+            return
+        if record.get('status') not in ACTIVE_STATUSES:
+            self.discard(reservation_id)
+            return
+
+        raw = record.get('scheduled_execution')
+        current = self._entries.get(reservation_id)
+        if current is not None and current[0] == raw:
+            return
+        parsed = parse_scheduled_execution(raw)
+        if parsed is None:
+            self.discard(reservation_id)
+            return
+
+        key = self._sort_key(parsed)
+        self._entries[reservation_id] = (raw, parsed, key)
+        heapq.heappush(self._heap, (key, reservation_id))
+        if len(self._heap) > 2 * len(self._entries) + 32:
+            self._heap = [(entry[2], rid) for rid, entry in self._entries.items()]
+            heapq.heapify(self._heap)
+
+    def discard(self, reservation_id: str) -> None:
+        """Stop tracking ``reservation_id``; its heap entry is dropped lazily."""
+
+        t('reservations.queue.deadline_index.DeadlineIndex.discard')
+        self._entries.pop(reservation_id, None)
+
+    def get(self, reservation_id: str, raw: Any = None) -> Optional[datetime]:
+        """Return the cached deadline, provided it still matches ``raw``."""
+
+        t('reservations.queue.deadline_index.DeadlineIndex.get')
+        entry = self._entries.get(reservation_id)
+        if entry is None or (raw is not None and entry[0] != raw):
+            return None
+        return entry[1]
+
+    def next_deadline(self, after: Optional[datetime] = None) -> Optional[datetime]:
+        """Return the earliest tracked deadline, or ``None`` when idle.
+
+        With ``after``, return the earliest deadline strictly later than it.
+        The lookup walks only the part of the heap at or before ``after``
+        (plus stale entries), so a few overdue reservations stay cheap.
+        """
+
+        t('reservations.queue.deadline_index.DeadlineIndex.next_deadline')
+        if after is not None:
+            return self._next_after(self._sort_key(after))
+        while self._heap:
+            key, reservation_id = self._heap[0]
+            entry = self._entries.get(reservation_id)
+            if entry is not None and entry[2] == key:
+                return entry[1]
+            heapq.heappop(self._heap)
+        return None
+
+    def _next_after(self, threshold: float) -> Optional[datetime]:
+        t('reservations.queue.deadline_index.DeadlineIndex._next_after')
+        heap = self._heap
+        best: Optional[Tuple[float, datetime]] = None
+        stack = [0] if heap else []
+        while stack:
+            position = stack.pop()
+            key, reservation_id = heap[position]
+            if best is not None and key >= best[0]:
+                continue  # children sort no earlier than their parent
+            entry = self._entries.get(reservation_id)
+            if key > threshold and entry is not None and entry[2] == key:
+                best = (key, entry[1])
+                continue
+            stack.extend(
+                child for child in (2 * position + 1, 2 * position + 2) if child < len(heap)
+            )
+        return best[1] if best is not None else None
+
+    def __len__(self) -> int:
+        t('reservations.queue.deadline_index.DeadlineIndex.__len__')
+        return len(self._entries)
+
+    def _sort_key(self, value: datetime) -> float:
+        t('reservations.queue.deadline_index.DeadlineIndex._sort_key')
+        if value.tzinfo is None and self._timezone is not None:
+            localize = getattr(self._timezone, 'localize', None)
+            value = localize(value) if localize else value.replace(tzinfo=self._timezone)
+        return value.timestamp()
+
+
+__all__ = ['ACTIVE_STATUSES', 'DeadlineIndex', 'parse_scheduled_execution']
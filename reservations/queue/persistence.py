@@ -6,6 +6,7 @@ from tracking import t
 from typing import Dict, Optional
 
 from automation.shared.booking_contracts import BookingResult
+from reservations.queue.queue_registry import get_queue
 from reservations.queue.reservation_queue import ReservationQueue, ReservationStatus
 
 
@@ -15,10 +16,14 @@ def persist_queue_outcome(
     *,
     queue: Optional[ReservationQueue] = None,
 ) -> bool:
-    """Update queue records according to a booking result."""
+    """Update queue records according to a booking result.
+
+    Without an explicit ``queue`` the shared process-wide instance is used, so
+    the update is a single indexed mutation rather than a reload of the file.
+    """
     t('reservations.queue.persistence.persist_queue_outcome')
 
-    queue = queue or ReservationQueue()
+    queue = queue or get_queue()
 
     status = (
         ReservationStatus.SUCCESS.value
@@ -48,7 +53,7 @@ def persist_queue_cancellation(
     """Mark a queued reservation as cancelled with optional metadata."""
     t('reservations.queue.persistence.persist_queue_cancellation')
 
-    queue = queue or ReservationQueue()
+    queue = queue or get_queue()
     updates = metadata or {}
     return queue.update_reservation_status(
         reservation_id,
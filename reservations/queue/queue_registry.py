@@ -0,0 +1,78 @@
+"""Process-wide registry of :class:`ReservationQueue` instances.
+
+Every component that needs the queue (the dependency container, scheduler,
+persistence helpers and reservation service) resolves it through
+:func:`get_queue`, so a given queue file is loaded once per process and all
+writers share the same in-memory records instead of reloading and overwriting
+each other's changes. A queue built elsewhere and injected into
+``ReservationService`` or ``ReservationScheduler`` is claimed with
+:func:`register_queue` for the same reason.
+"""
+
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from infrastructure.settings import get_settings
+from reservations.queue.reservation_queue import ReservationQueue
+from tracking import t
+
+_LOCK = threading.Lock()
+_QUEUES: Dict[Path, ReservationQueue] = {}
+
+
+def _registry_key(file_path: str) -> Path:
+    t('reservations.queue.queue_registry._registry_key')
+    return Path(file_path).expanduser().resolve()
+
+
+def get_queue(file_path: Optional[str] = None) -> ReservationQueue:
+    """Return the shared queue for ``file_path``, creating it on first use.
+
+    ``file_path`` defaults to the configured ``QUEUE_FILE``.
+    """
+
+    t('reservations.queue.queue_registry.get_queue')
+    path = file_path or get_settings().queue_file
+    key = _registry_key(path)
+    with _LOCK:
+        queue = _QUEUES.get(key)
+        if queue is None:
+            queue = ReservationQueue(path)
+            _QUEUES[key] = queue
+        return queue
+
+
+def register_queue(queue: ReservationQueue) -> ReservationQueue:
+    """Make ``queue`` the shared instance for its backing file and return it.
+
+    Registering the same instance again is a no-op. Raises ``ValueError`` when
+    a different queue already owns the file, since two live queues would each
+    journal their own changes into it.
+    """
+
+    t('reservations.queue.queue_registry.register_queue')
+    key = _registry_key(queue.file_path)
+    with _LOCK:
+        registered = _QUEUES.setdefault(key, queue)
+    if registered is not queue:
+        raise ValueError(
+            f"Queue file {key} is already registered to another ReservationQueue; "
+            "resolve it with get_queue() instead of building a second instance"
+        )
+    return registered
+
+
+def reset_queues() -> None:
+    """Forget every registered queue (used by tests and reload tooling)."""
+
+    t('reservations.queue.queue_registry.reset_queues')
+    with _LOCK:
+        for queue in _QUEUES.values():
+            queue.repository.close()
+        _QUEUES.clear()
+
+
+__all__ = ['get_queue', 'register_queue', 'reset_queues']
@@ -8,12 +8,15 @@ from tracking import t
 
 import uuid
 import logging
+import threading
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Mapping, Optional, Union
+from typing import Any, Callable, Dict, List, Mapping, Optional, Union
 from enum import Enum
 
 from reservations.models import ReservationRequest
+from reservations.queue.deadline_index import DeadlineIndex
 from reservations.queue.reservation_repository import ReservationRepository
+from reservations.queue.reservation_store import ReservationStore
 from reservations.queue.reservation_validation import ensure_unique_slot
 from reservations.queue.reservation_transitions import (
     add_to_waitlist as mark_waitlisted,
@@ -23,9 +26,11 @@ from reservations.queue.request_builder import (
     ReservationRequestBuilder,
     DEFAULT_BUILDER,
 )
-from infrastructure.settings import get_test_mode
+from infrastructure.settings import get_settings, get_test_mode
 import pytz
 
+QUEUE_TIMEZONE = pytz.timezone('America/Guatemala')
+
 
 class ReservationStatus(Enum):
     """Reservation status states for enhanced queue management"""
@@ -70,11 +75,13 @@ class ReservationQueue:
     Manages the storage, retrieval, and status updates of reservation requests.
     
     This class provides a persistent queue for managing tennis court reservation requests,
-    storing them in a JSON file and providing methods for queue operations.
+    storing them in a JSON file and providing methods for queue operations. Records
+    live in a :class:`ReservationStore` indexed by id, user, time slot and status,
+    so lookups do not scan the whole queue.
     
     Attributes:
         file_path (str): Path to the JSON file for persistence
-        queue (List[Dict[str, Any]]): In-memory list of reservation dictionaries
+        queue (List[Dict[str, Any]]): Snapshot list of reservation dictionaries
         logger (logging.Logger): Logger instance for this class
     """
     
@@ -83,21 +90,36 @@ class ReservationQueue:
         file_path: str = 'data/queue.json',
         *,
         builder: ReservationRequestBuilder | None = None,
+        journal: Optional[bool] = None,
     ):
         """
         Initialize the ReservationQueue.
 
         Args:
             file_path (str): Path to the JSON file for persistence. Defaults to 'data/queue.json'.
+            journal (Optional[bool]): Persist each mutation as an appended journal record
+                instead of rewriting the whole file. Defaults to ``QUEUE_JOURNAL_ENABLED``.
         """
         t('reservations.queue.reservation_queue.ReservationQueue.__init__')
         self.logger = logging.getLogger('ReservationQueue')
         self._builder = builder or ReservationRequestBuilder()
         self._serializer = QueueRecordSerializer(self._builder)
-        self.repository = ReservationRepository(file_path, logger=self.logger)
+        settings = get_settings()
+        self.repository = ReservationRepository(
+            file_path,
+            logger=self.logger,
+            journal=settings.queue_journal_enabled if journal is None else journal,
+            compact_threshold=settings.queue_journal_compact_threshold,
+        )
         self.file_path = file_path
-        self.queue = self.repository.load()
-        repaired = self._normalise_loaded_entries()
+        loaded = self.repository.load()
+        repaired = self._normalise_loaded_entries(loaded)
+        self._store = ReservationStore(loaded)
+        self._deadlines = DeadlineIndex(loaded, timezone=QUEUE_TIMEZONE)
+        self._deadline_listeners: List[Callable[[], None]] = []
+        # Guards the store and its persistence so concurrent writers sharing this
+        # instance (see ``queue_registry``) cannot interleave partial updates.
+        self._lock = threading.RLock()
         if repaired:
             self.logger.warning(
                 "Normalised %s queued reservations missing identifiers or metadata",
@@ -106,7 +128,7 @@ class ReservationQueue:
             self._save_queue()
         self.logger.info(f"""RESERVATION QUEUE INITIALIZED
         File: {self.file_path}
-        Existing reservations: {len(self.queue)}
+        Existing reservations: {len(self._store)}
         Status breakdown: {self._get_status_counts()}
         """)
     
@@ -150,15 +172,6 @@ class ReservationQueue:
         if (not requested_courts) and payload.get('court_number') is not None:
             requested_courts = [payload.get('court_number')]
 
-        ensure_unique_slot(
-            self.queue,
-            user_id=user_id,
-            target_date=target_date_raw,
-            target_time=target_time_raw,
-            courts=requested_courts,
-            logger=self.logger,
-        )
-
         reservation_id = uuid.uuid4().hex
         reservation = {
             'id': reservation_id,
@@ -166,13 +179,24 @@ class ReservationQueue:
             **payload,
         }
 
-        tz = pytz.timezone('America/Guatemala')
-        scheduled_time = self._compute_scheduled_execution(reservation, tz)
+        scheduled_time = self._compute_scheduled_execution(reservation, QUEUE_TIMEZONE)
         reservation['status'] = ReservationStatus.SCHEDULED.value
         reservation['scheduled_execution'] = scheduled_time.isoformat()
 
-        self.queue.append(reservation)
-        self._save_queue()
+        with self._lock:
+            ensure_unique_slot(
+                self._store.by_user(user_id),
+                user_id=user_id,
+                target_date=target_date_raw,
+                target_time=target_time_raw,
+                courts=requested_courts,
+                logger=self.logger,
+            )
+            self._store.add(reservation)
+            deadline_moved = self._track_deadline(reservation)
+            self._persist_upsert(reservation)
+        if deadline_moved:
+            self._notify_deadline_listeners()
 
         # Log successful addition
         self.logger.info(f"""RESERVATION ADDED SUCCESSFULLY
@@ -180,7 +204,7 @@ class ReservationQueue:
         User ID: {reservation.get('user_id')}
         Status: {reservation['status']}
         Scheduled execution: {scheduled_time}
-        Total queue size: {len(self.queue)}
+        Total queue size: {len(self._store)}
         """)
         return reservation_id
 
@@ -194,23 +218,43 @@ class ReservationQueue:
         """Return reservations as dataclasses."""
         t('reservations.queue.reservation_queue.ReservationQueue.list_reservations')
 
-        return [self._serializer.from_storage(item) for item in self.queue]
+        with self._lock:
+            records = self._store.values()
+        return [self._serializer.from_storage(item) for item in records]
+
+    @property
+    def queue(self) -> List[Dict[str, Any]]:
+        """Return every queued reservation in insertion order."""
+        t('reservations.queue.reservation_queue.ReservationQueue.queue')
 
-    def _normalise_loaded_entries(self) -> int:
+        with self._lock:
+            return self._store.values()
+
+    @queue.setter
+    def queue(self, reservations: List[Dict[str, Any]]) -> None:
+        t('reservations.queue.reservation_queue.ReservationQueue.queue')
+        with self._lock:
+            self._store = ReservationStore(reservations)
+            self._deadlines = DeadlineIndex(reservations, timezone=QUEUE_TIMEZONE)
+        self._notify_deadline_listeners()
+
+    def _normalise_loaded_entries(self, reservations: List[Dict[str, Any]]) -> int:
         """Repair queue entries loaded from disk that may lack required metadata."""
         t('reservations.queue.reservation_queue.ReservationQueue._normalise_loaded_entries')
 
         repaired = 0
-        tz = pytz.timezone('America/Guatemala')
+        tz = QUEUE_TIMEZONE
         now = datetime.now(tz)
         valid_statuses = {status.value for status in ReservationStatus}
+        seen_ids = set()
 
-        for reservation in self.queue:
+        for reservation in reservations:
             modified = False
 
-            if not reservation.get('id'):
+            if not reservation.get('id') or reservation['id'] in seen_ids:
                 reservation['id'] = uuid.uuid4().hex
                 modified = True
+            seen_ids.add(reservation['id'])
 
             target_time = reservation.get('target_time')
             if isinstance(target_time, str) and '_' in target_time:
@@ -309,10 +353,7 @@ class ReservationQueue:
             Optional[Dict[str, Any]]: Reservation dictionary if found, None otherwise
         """
         t('reservations.queue.reservation_queue.ReservationQueue.get_reservation')
-        for reservation in self.queue:
-            if reservation.get('id') == reservation_id:
-                return reservation
-        return None
+        return self._store.get(reservation_id)
     
     def get_user_reservations(self, user_id: int) -> List[Dict[str, Any]]:
         """
@@ -325,10 +366,8 @@ class ReservationQueue:
             List[Dict[str, Any]]: List of reservation dictionaries for the user
         """
         t('reservations.queue.reservation_queue.ReservationQueue.get_user_reservations')
-        user_reservations = [
-            reservation for reservation in self.queue 
-            if reservation.get('user_id') == user_id
-        ]
+        with self._lock:
+            user_reservations = self._store.by_user(user_id)
         
         self.logger.debug(f"Found {len(user_reservations)} reservations for user {user_id}")
         return user_reservations
@@ -341,10 +380,12 @@ class ReservationQueue:
             List[Dict[str, Any]]: List of pending/scheduled reservation dictionaries
         """
         t('reservations.queue.reservation_queue.ReservationQueue.get_pending_reservations')
-        pending_reservations = [
-            reservation for reservation in self.queue 
-            if reservation.get('status') in ['pending', 'scheduled', ReservationStatus.CONFIRMED.value]
-        ]
+        with self._lock:
+            pending_reservations = self._store.by_status(
+                ReservationStatus.PENDING.value,
+                ReservationStatus.SCHEDULED.value,
+                ReservationStatus.CONFIRMED.value,
+            )
         
         self.logger.debug(f"Found {len(pending_reservations)} pending/scheduled reservations")
         return pending_reservations
@@ -361,14 +402,9 @@ class ReservationQueue:
             List of reservations for the specified time slot
         """
         t('reservations.queue.reservation_queue.ReservationQueue.get_reservations_by_time_slot')
-        matching_reservations = []
-        for reservation in self.queue:
-            # Check both 'time' and 'target_time' fields for compatibility
-            res_date = reservation.get('target_date')
-            res_time = reservation.get('time') or reservation.get('target_time')
-            
-            if res_date == target_date and res_time == target_time:
-                matching_reservations.append(reservation)
+        # The slot index honours both 'time' and 'target_time' for compatibility
+        with self._lock:
+            matching_reservations = self._store.by_slot(target_date, target_time)
         
         # Log time slot query
         self.logger.debug(f"""TIME SLOT QUERY
@@ -392,21 +428,28 @@ class ReservationQueue:
             True if successful, False if reservation not found
         """
         t('reservations.queue.reservation_queue.ReservationQueue.add_to_waitlist')
-        for reservation in self.queue:
-            if reservation.get('id') == reservation_id:
+        deadline_moved = False
+        with self._lock:
+            reservation = self._store.get(reservation_id)
+            if reservation is not None:
                 old_status = reservation.get('status')
                 mark_waitlisted(reservation, position)
-                self._save_queue()
-
-                self.logger.info(f"""ADDED TO WAITLIST
-                Reservation ID: {reservation_id}
-                User ID: {reservation.get('user_id')}
-                User Name: {reservation.get('first_name', 'Unknown')}
-                Time Slot: {reservation.get('target_date')} {reservation.get('target_time')}
-                Waitlist Position: {position}
-                Previous Status: {old_status}
-                """)
-                return True
+                self._store.reindex(reservation_id)
+                deadline_moved = self._track_deadline(reservation)
+                self._persist_upsert(reservation)
+        if deadline_moved:
+            self._notify_deadline_listeners()
+
+        if reservation is not None:
+            self.logger.info(f"""ADDED TO WAITLIST
+            Reservation ID: {reservation_id}
+            User ID: {reservation.get('user_id')}
+            User Name: {reservation.get('first_name', 'Unknown')}
+            Time Slot: {reservation.get('target_date')} {reservation.get('target_time')}
+            Waitlist Position: {position}
+            Previous Status: {old_status}
+            """)
+            return True
         
         self.logger.warning(f"Failed to add reservation {reservation_id} to waitlist - not found")
         return False
@@ -423,14 +466,12 @@ class ReservationQueue:
             List of waitlisted reservations sorted by position
         """
         t('reservations.queue.reservation_queue.ReservationQueue.get_waitlist_for_slot')
-        waitlisted = []
-        for reservation in self.queue:
-            res_date = reservation.get('target_date')
-            res_time = reservation.get('time') or reservation.get('target_time')
-            
-            if (res_date == target_date and res_time == target_time and 
-                reservation.get('status') == ReservationStatus.WAITLISTED.value):
-                waitlisted.append(reservation)
+        with self._lock:
+            slot_reservations = self._store.by_slot(target_date, target_time)
+        waitlisted = [
+            reservation for reservation in slot_reservations
+            if reservation.get('status') == ReservationStatus.WAITLISTED.value
+        ]
         
         # Sort by waitlist position
         waitlisted.sort(key=lambda x: x.get('waitlist_position', float('inf')))
@@ -449,21 +490,28 @@ class ReservationQueue:
             bool: True if update was successful, False if reservation not found
         """
         t('reservations.queue.reservation_queue.ReservationQueue.update_reservation_status')
-        for reservation in self.queue:
-            if reservation.get('id') == reservation_id:
+        deadline_moved = False
+        with self._lock:
+            reservation = self._store.get(reservation_id)
+            if reservation is not None:
                 old_status = reservation.get('status')
                 apply_status_update(reservation, new_status, **kwargs)
-                self._save_queue()
-
-                self.logger.info(f"""RESERVATION STATUS UPDATED
-                Reservation ID: {reservation_id}
-                User ID: {reservation.get('user_id')}
-                User Name: {reservation.get('first_name', 'Unknown')}
-                Time Slot: {reservation.get('target_date')} {reservation.get('target_time')}
-                Status Change: {old_status} → {new_status}
-                Additional Updates: {kwargs}
-                """)
-                return True
+                self._store.reindex(reservation_id)
+                deadline_moved = self._track_deadline(reservation)
+                self._persist_upsert(reservation)
+        if deadline_moved:
+            self._notify_deadline_listeners()
+
+        if reservation is not None:
+            self.logger.info(f"""RESERVATION STATUS UPDATED
+            Reservation ID: {reservation_id}
+            User ID: {reservation.get('user_id')}
+            User Name: {reservation.get('first_name', 'Unknown')}
+            Time Slot: {reservation.get('target_date')} {reservation.get('target_time')}
+            Status Change: {old_status} → {new_status}
+            Additional Updates: {kwargs}
+            """)
+            return True
         
         self.logger.warning(f"Reservation {reservation_id} not found for status update")
         return False
@@ -479,15 +527,17 @@ class ReservationQueue:
             bool: True if removed successfully, False if reservation not found
         """
         t('reservations.queue.reservation_queue.ReservationQueue.remove_reservation')
-        for i, reservation in enumerate(self.queue):
-            if reservation.get('id') == reservation_id:
-                removed_reservation = self.queue.pop(i)
-                self._save_queue()
-                
-                self.logger.info(
-                    f"Removed reservation {reservation_id} for user {removed_reservation.get('user_id')}"
-                )
-                return True
+        with self._lock:
+            removed_reservation = self._store.remove(reservation_id)
+            if removed_reservation is not None:
+                self._deadlines.discard(reservation_id)
+                self._persist_removal(reservation_id)
+
+        if removed_reservation is not None:
+            self.logger.info(
+                f"Removed reservation {reservation_id} for user {removed_reservation.get('user_id')}"
+            )
+            return True
         
         self.logger.warning(f"Reservation {reservation_id} not found for removal")
         return False
@@ -504,19 +554,79 @@ class ReservationQueue:
             bool: True if update was successful, False if reservation not found
         """
         t('reservations.queue.reservation_queue.ReservationQueue.update_reservation')
-        for i, reservation in enumerate(self.queue):
-            if reservation.get('id') == reservation_id:
-                # Update the reservation while preserving the ID
+        deadline_moved = False
+        with self._lock:
+            # Update the reservation while preserving the ID
+            updated = reservation_id in self._store
+            if updated:
                 updated_data['id'] = reservation_id
-                self.queue[i] = updated_data
-                self._save_queue()
-                
-                self.logger.info(f"Updated reservation {reservation_id}")
-                return True
+                self._store.replace(reservation_id, updated_data)
+                deadline_moved = self._track_deadline(updated_data)
+                self._persist_upsert(updated_data)
+        if deadline_moved:
+            self._notify_deadline_listeners()
+
+        if updated:
+            self.logger.info(f"Updated reservation {reservation_id}")
+            return True
         
         self.logger.warning(f"Reservation {reservation_id} not found for update")
         return False
     
+    def next_deadline(self, after: Optional[datetime] = None) -> Optional[datetime]:
+        """Return the earliest ``scheduled_execution`` among runnable reservations.
+
+        With ``after``, only deadlines strictly later than it are considered.
+        """
+        t('reservations.queue.reservation_queue.ReservationQueue.next_deadline')
+        with self._lock:
+            return self._deadlines.next_deadline(after)
+
+    def scheduled_execution_for(self, reservation: Mapping[str, Any]) -> Optional[datetime]:
+        """Return the parsed ``scheduled_execution`` cached for ``reservation``."""
+        t('reservations.queue.reservation_queue.ReservationQueue.scheduled_execution_for')
+        with self._lock:
+            return self._deadlines.get(
+                reservation.get('id'), reservation.get('scheduled_execution')
+            )
+
+    def add_deadline_listener(self, callback: Callable[[], None]) -> None:
+        """Call ``callback`` whenever the next deadline may have moved earlier.
+
+        Callbacks run on the mutating thread after the queue lock is released,
+        so they must be cheap and thread-safe.
+        """
+        t('reservations.queue.reservation_queue.ReservationQueue.add_deadline_listener')
+        with self._lock:
+            self._deadline_listeners.append(callback)
+
+    def remove_deadline_listener(self, callback: Callable[[], None]) -> None:
+        """Stop notifying ``callback`` about deadline changes."""
+        t('reservations.queue.reservation_queue.ReservationQueue.remove_deadline_listener')
+        with self._lock:
+            if callback in self._deadline_listeners:
+                self._deadline_listeners.remove(callback)
+
+    def _track_deadline(self, reservation: Dict[str, Any]) -> bool:
+        """Refresh the deadline index; return True if the next deadline moved earlier."""
+        t('reservations.queue.reservation_queue.ReservationQueue._track_deadline')
+        previous = self._deadlines.next_deadline()
+        self._deadlines.update(reservation)
+        current = self._deadlines.next_deadline()
+        if current is None or current is previous:
+            return False
+        return previous is None or self._deadlines.get(reservation.get('id')) is current
+
+    def _notify_deadline_listeners(self) -> None:
+        t('reservations.queue.reservation_queue.ReservationQueue._notify_deadline_listeners')
+        with self._lock:
+            listeners = list(self._deadline_listeners)
+        for callback in listeners:
+            try:
+                callback()
+            except Exception as exc:  # pragma: no cover - defensive guard
+                self.logger.error(f"Deadline listener failed: {exc}")
+
     def _save_queue(self) -> None:
         """
         Internal helper method to save the current queue state to JSON file.
@@ -524,8 +634,25 @@ class ReservationQueue:
         Handles file operation errors gracefully and logs any issues.
         """
         t('reservations.queue.reservation_queue.ReservationQueue._save_queue')
-        self.repository.save(self.queue)
+        with self._lock:
+            self.repository.save(self._store.values())
     
+    def _persist_upsert(self, reservation: Dict[str, Any]) -> None:
+        """Persist a single added or changed reservation."""
+        t('reservations.queue.reservation_queue.ReservationQueue._persist_upsert')
+        if self.repository.journal_enabled:
+            self.repository.record_upsert(reservation)
+        else:
+            self._save_queue()
+
+    def _persist_removal(self, reservation_id: str) -> None:
+        """Persist the removal of a single reservation."""
+        t('reservations.queue.reservation_queue.ReservationQueue._persist_removal')
+        if self.repository.journal_enabled:
+            self.repository.record_removal(reservation_id)
+        else:
+            self._save_queue()
+
     def _load_queue(self) -> List[Dict[str, Any]]:
         """
         Internal helper method to load the queue from JSON file.
@@ -544,6 +671,5 @@ class ReservationQueue:
             Dictionary mapping status to count
         """
         t('reservations.queue.reservation_queue.ReservationQueue._get_status_counts')
-        from collections import Counter
-        status_counts = Counter(r.get('status', 'unknown') for r in self.queue)
-        return dict(status_counts)
+        with self._lock:
+            return self._store.status_counts()
@@ -1,26 +1,196 @@
-"""Persistence helpers for reservation queue storage."""
+"""Persistence helpers for reservation queue storage.
+
+The repository keeps a JSON snapshot (``queue.json``). In journal mode it also
+appends one compact JSON line per mutation to ``queue.json.journal``. Once the
+journal grows past ``compact_threshold`` entries it is rotated to
+``queue.json.journal.compacting``, and a background thread folds that segment
+into a new snapshot. :meth:`ReservationRepository.load` replays snapshot,
+segment and journal in that order, so a crash at any point loses nothing that
+was appended. Snapshots are always written to a temporary file and renamed
+into place, so ``queue.json`` is never torn.
+"""
 
 from __future__ import annotations
 
 import json
+import os
+import threading
 from pathlib import Path
-from typing import Any, Iterable, List
+from tempfile import NamedTemporaryFile
+from typing import Any, Dict, Iterable, List, Optional, TextIO
 
 from tracking import t
 
+_OP_PUT = 'put'
+_OP_DELETE = 'del'
+DEFAULT_COMPACT_THRESHOLD = 500
+
 
 class ReservationRepository:
     """Read/write reservation data to a JSON backing file."""
 
-    def __init__(self, file_path: str, *, logger: Any) -> None:
+    def __init__(
+        self,
+        file_path: str,
+        *,
+        logger: Any,
+        journal: bool = False,
+        compact_threshold: int = DEFAULT_COMPACT_THRESHOLD,
+    ) -> None:
         t('reservations.queue.reservation_repository.ReservationRepository.__init__')
         self._path = Path(file_path)
         self._logger = logger
+        self._journal_enabled = journal
+        self._journal_path = self._path.with_name(self._path.name + '.journal')
+        self._segment_path = self._path.with_name(self._path.name + '.journal.compacting')
+        self._compact_threshold = max(int(compact_threshold), 1)
+        self._lock = threading.RLock()
+        self._journal_handle: Optional[TextIO] = None
+        self._journal_entries = 0
+        self._generation = 0
+        self._compaction: Optional[threading.Thread] = None
+
+    @property
+    def journal_enabled(self) -> bool:
+        t('reservations.queue.reservation_repository.ReservationRepository.journal_enabled')
+        return self._journal_enabled
 
     def load(self) -> List[dict]:
-        """Load reservations from disk, returning an empty list on failure."""
+        """Load reservations from disk, returning an empty list on failure.
+
+        Any journal entries left behind by a previous process are replayed on
+        top of the snapshot and folded into a fresh snapshot before returning.
+        """
 
         t('reservations.queue.reservation_repository.ReservationRepository.load')
+        reservations = self._read_snapshot()
+        leftovers = [
+            path for path in (self._segment_path, self._journal_path) if path.exists()
+        ]
+        if not leftovers:
+            return reservations
+
+        replayed = 0
+        for path in leftovers:
+            replayed += self._replay(path, reservations)
+        self._logger.info(
+            "Replayed %s journal entries from %s",
+            replayed,
+            ', '.join(str(path) for path in leftovers),
+        )
+        self.save(reservations)
+        return reservations
+
+    def save(self, reservations: Iterable[dict]) -> None:
+        """Write a full snapshot atomically and reset the journal."""
+
+        t('reservations.queue.reservation_repository.ReservationRepository.save')
+        with self._lock:
+            try:
+                self._write_snapshot(list(reservations))
+                self._generation += 1
+                self._reset_journal_locked()
+                self._logger.debug(
+                    "Queue saved to %s", self._path,
+                )
+            except Exception as exc:  # pragma: no cover - defensive guard
+                self._logger.error("Failed to save queue to %s: %s", self._path, exc)
+
+    def record_upsert(self, reservation: Dict[str, Any]) -> None:
+        """Journal the latest state of ``reservation``."""
+
+        t('reservations.queue.reservation_repository.ReservationRepository.record_upsert')
+        self._append({'op': _OP_PUT, 'record': reservation})
+
+    def record_removal(self, reservation_id: str) -> None:
+        """Journal the removal of ``reservation_id``."""
+
+        t('reservations.queue.reservation_repository.ReservationRepository.record_removal')
+        self._append({'op': _OP_DELETE, 'id': reservation_id})
+
+    def compact(self, *, background: bool = False) -> None:
+        """Fold the journal into the snapshot.
+
+        The active journal is rotated to a segment first so appends continue
+        while the snapshot is rebuilt from disk.
+        """
+
+        t('reservations.queue.reservation_repository.ReservationRepository.compact')
+        with self._lock:
+            if self._compaction is not None and self._compaction.is_alive():
+                return
+            if not self._segment_path.exists():
+                self._close_journal_locked()
+                if not self._journal_path.exists():
+                    return
+                os.replace(self._journal_path, self._segment_path)
+                self._journal_entries = 0
+            generation = self._generation
+
+            if background:
+                self._compaction = threading.Thread(
+                    target=self._run_compaction,
+                    args=(generation,),
+                    name='queue-journal-compaction',
+                    daemon=True,
+                )
+                self._compaction.start()
+                return
+
+        self._run_compaction(generation)
+
+    def wait_for_compaction(self, timeout: Optional[float] = None) -> None:
+        """Block until an in-flight background compaction finishes."""
+
+        t('reservations.queue.reservation_repository.ReservationRepository.wait_for_compaction')
+        thread = self._compaction
+        if thread is not None:
+            thread.join(timeout)
+
+    def close(self) -> None:
+        """Close the journal file handle."""
+
+        t('reservations.queue.reservation_repository.ReservationRepository.close')
+        with self._lock:
+            self._close_journal_locked()
+
+    def _append(self, entry: Dict[str, Any]) -> None:
+        t('reservations.queue.reservation_repository.ReservationRepository._append')
+        line = json.dumps(entry, ensure_ascii=False, separators=(',', ':'))
+        with self._lock:
+            try:
+                if self._journal_handle is None:
+                    self._path.parent.mkdir(parents=True, exist_ok=True)
+                    self._journal_handle = self._journal_path.open('a', encoding='utf-8')
+                self._journal_handle.write(line + '\n')
+                self._journal_handle.flush()
+                self._journal_entries += 1
+            except Exception as exc:  # pragma: no cover - defensive guard
+                self._logger.error("Failed to append to %s: %s", self._journal_path, exc)
+                return
+            needs_compaction = self._journal_entries >= self._compact_threshold
+        if needs_compaction:
+            self.compact(background=True)
+
+    def _run_compaction(self, generation: int) -> None:
+        t('reservations.queue.reservation_repository.ReservationRepository._run_compaction')
+        try:
+            reservations = self._read_snapshot()
+            replayed = self._replay(self._segment_path, reservations)
+            with self._lock:
+                if generation != self._generation:
+                    # A full save landed meanwhile and already supersedes the segment.
+                    return
+                self._write_snapshot(reservations)
+                self._segment_path.unlink(missing_ok=True)
+            self._logger.debug(
+                "Compacted %s journal entries into %s", replayed, self._path,
+            )
+        except Exception as exc:  # pragma: no cover - defensive guard
+            self._logger.error("Failed to compact journal for %s: %s", self._path, exc)
+
+    def _read_snapshot(self) -> List[dict]:
+        t('reservations.queue.reservation_repository.ReservationRepository._read_snapshot')
         try:
             if self._path.exists():
                 with self._path.open('r', encoding='utf-8') as handle:
@@ -46,16 +216,81 @@ class ReservationRepository:
             self._logger.error("Failed to load queue from %s: %s", self._path, exc)
         return []
 
-    def save(self, reservations: Iterable[dict]) -> None:
-        """Persist reservations to disk, ensuring parent directories exist."""
+    def _replay(self, path: Path, reservations: List[dict]) -> int:
+        """Apply journal entries from ``path`` to ``reservations`` in place."""
 
-        t('reservations.queue.reservation_repository.ReservationRepository.save')
+        t('reservations.queue.reservation_repository.ReservationRepository._replay')
+        positions = {
+            record.get('id'): index
+            for index, record in enumerate(reservations)
+            if isinstance(record, dict)
+        }
+        applied = 0
         try:
-            self._path.parent.mkdir(parents=True, exist_ok=True)
-            with self._path.open('w', encoding='utf-8') as handle:
-                json.dump(list(reservations), handle, indent=2, ensure_ascii=False)
-            self._logger.debug(
-                "Queue saved to %s", self._path,
-            )
-        except Exception as exc:  # pragma: no cover - defensive guard
-            self._logger.error("Failed to save queue to %s: %s", self._path, exc)
+            handle = path.open('r', encoding='utf-8')
+        except FileNotFoundError:
+            return applied
+        with handle:
+            for line_number, line in enumerate(handle, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A crash mid-append can leave one torn trailing line.
+                    self._logger.warning(
+                        "Skipping unreadable journal line %s in %s", line_number, path,
+                    )
+                    continue
+                op = entry.get('op')
+                if op == _OP_PUT and isinstance(entry.get('record'), dict):
+                    record = entry['record']
+                    index = positions.get(record.get('id'))
+                    if index is None:
+                        positions[record.get('id')] = len(reservations)
+                        reservations.append(record)
+                    else:
+                        reservations[index] = record
+                elif op == _OP_DELETE:
+                    index = positions.pop(entry.get('id'), None)
+                    if index is None:
+                        continue
+                    reservations[index] = None
+                else:
+                    continue
+                applied += 1
+
+        reservations[:] = [record for record in reservations if record is not None]
+        return applied
+
+    def _write_snapshot(self, reservations: List[dict]) -> None:
+        t('reservations.queue.reservation_repository.ReservationRepository._write_snapshot')
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path: Optional[Path] = None
+        try:
+            with NamedTemporaryFile(
+                'w', encoding='utf-8', dir=self._path.parent, delete=False,
+                prefix=self._path.name, suffix='.tmp',
+            ) as handle:
+                tmp_path = Path(handle.name)
+                json.dump(reservations, handle, indent=2, ensure_ascii=False)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(tmp_path, self._path)
+        except BaseException:
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
+            raise
+
+    def _reset_journal_locked(self) -> None:
+        t('reservations.queue.reservation_repository.ReservationRepository._reset_journal_locked')
+        self._close_journal_locked()
+        self._journal_path.unlink(missing_ok=True)
+        self._segment_path.unlink(missing_ok=True)
+        self._journal_entries = 0
+
+    def _close_journal_locked(self) -> None:
+        t('reservations.queue.reservation_repository.ReservationRepository._close_journal_locked')
+        if self._journal_handle is not None:
+            self._journal_handle.close()
+            self._journal_handle = None
@@ -26,10 +26,12 @@ from automation.browser.browser_pool_accessor import (
     proxy_attribute,
 )
 from automation.browser.health.types import HealthStatus
+from automation.executors.flows.prearm import get_prearm_registry, prearm_slot_page
 from botapp.booking.immediate_handler import ImmediateBookingHandler
 from automation.shared.booking_contracts import BookingRequest, BookingResult
 from botapp.booking.request_builder import booking_user_from_profile
 from reservations.queue.scheduler import (
+    HEALTH_CHECK_WINDOW_HOURS,
     BrowserLifecycle,
     DispatchJob,
     dispatch_to_executors,
@@ -44,6 +46,8 @@ from reservations.queue.scheduler.services import (
 )
 from reservations.queue.request_builder import ReservationRequestBuilder
 from reservations.queue.persistence import persist_queue_outcome
+from reservations.queue.queue_registry import register_queue
+from reservations.queue.reservation_queue import ReservationQueue
 from reservations.queue.court_utils import normalize_court_sequence
 from reservations.queue.reservation_tracker import ReservationTracker
 from botapp.notifications import (
@@ -51,11 +55,17 @@ from botapp.notifications import (
     send_failure_notification,
     send_success_notification,
 )
-from infrastructure.settings import get_test_mode
+from infrastructure.settings import get_settings, get_test_mode
+from infrastructure.tracing import booking_trace, format_summary, get_trace_exporter, span
 
 # Read production mode setting (opt-in; default is false for richer diagnostics)
 PRODUCTION_MODE = os.getenv("PRODUCTION_MODE", "false").lower() == "true"
 
+# Upper bound on a single idle sleep so wall-clock adjustments are picked up.
+MAX_IDLE_SECONDS = 300.0
+# Timers may fire a hair early; overshoot so the deadline has really passed.
+DEADLINE_SLACK_SECONDS = 0.01
+
 
 def _booking_result_to_dict(result: BookingResult) -> Dict[str, Any]:
     """Normalize a `BookingResult` into the legacy dict structure used by the scheduler."""
@@ -76,6 +86,7 @@ def _booking_result_to_dict(result: BookingResult) -> Dict[str, Any]:
         "message": result.message,
         "error": error_message,
         "errors": list(result.errors),
+        "uncertain_court": (result.metadata or {}).get("uncertain_court"),
         "booking_result": result,
     }
 
@@ -151,14 +162,14 @@ class ReservationScheduler:
         if bot_handler:
             self.bot = bot_handler
             self.config = bot_handler.config
-            self.queue = bot_handler.queue
+            self.queue = self._shared_queue(bot_handler.queue)
             self.user_db = bot_handler.user_db
             self.notification_callback = bot_handler.send_notification
         else:
             # Old style initialization
             self.bot = None
             self.config = config
-            self.queue = queue
+            self.queue = self._shared_queue(queue)
             self.user_db = user_manager
             self.notification_callback = notification_callback
 
@@ -169,6 +180,8 @@ class ReservationScheduler:
         # Thread control
         self.running = False
         self.scheduler_thread = None
+        self._wake_event: Optional[asyncio.Event] = None
+        self._wake_loop: Optional[asyncio.AbstractEventLoop] = None
 
         # Dynamic booking orchestrator
         self.orchestrator = DynamicBookingOrchestrator()
@@ -213,11 +226,14 @@ class ReservationScheduler:
             on_failure=self._update_reservation_failed,
             builder=self.request_builder,
         )
+        self.prearm_window_seconds = max(0.0, get_settings().queue_prearm_seconds)
+        self.prearm_registry = get_prearm_registry()
         self.pipeline = SchedulerPipeline(
             logger=self.logger,
             hydrator=self.hydrator,
             health_check=self._perform_pre_execution_health_check,
             executor=self._execute_reservation_group,
+            prearm=self._prearm_reservation_group if self.prearm_window_seconds else None,
         )
         self.outcome_recorder = OutcomeRecorder(
             scheduler=self,
@@ -350,11 +366,20 @@ class ReservationScheduler:
         # Check for existing reservations and attempt to book ready ones
         await self._check_startup_reservations()
 
+    @staticmethod
+    def _shared_queue(queue):
+        """Register an injected queue so persistence helpers resolve the same instance."""
+        t("reservations.queue.reservation_scheduler.ReservationScheduler._shared_queue")
+        if isinstance(queue, ReservationQueue):
+            return register_queue(queue)
+        return queue
+
     async def stop(self):
         """Stop the scheduler"""
         t("reservations.queue.reservation_scheduler.ReservationScheduler.stop")
         self.logger.info("Stopping reservation scheduler")
         self.running = False
+        self._wake_scheduler()
 
         # Note: Browser pool is managed by main app, don't stop it here
         # to avoid interfering with other components
@@ -371,18 +396,120 @@ class ReservationScheduler:
             "reservations.queue.reservation_scheduler.ReservationScheduler._scheduler_loop"
         )
         poll_interval = self._poll_interval_seconds()
-        while self.running:
-            try:
-                now = datetime.now(pytz.timezone(self.config.timezone))
-                evaluation = self._evaluate_queue(now)
-                await self.pipeline.process(evaluation)
-                await asyncio.sleep(poll_interval)
-            except Exception as exc:  # pragma: no cover - defensive guard
-                self.logger.error("Scheduler error: %s", exc)
-                await asyncio.sleep(max(poll_interval * 2, 30))
+        timezone = pytz.timezone(self.config.timezone)
+        self._wake_event = asyncio.Event()
+        self._wake_loop = asyncio.get_running_loop()
+        add_listener = getattr(self.queue, "add_deadline_listener", None)
+        if add_listener:
+            add_listener(self._wake_scheduler)
+        try:
+            while self.running:
+                try:
+                    # Clear before evaluating so wake-ups raised mid-pass are kept.
+                    self._wake_event.clear()
+                    evaluation = self._evaluate_queue(datetime.now(timezone))
+                    await self.pipeline.process(evaluation)
+                    delay = self._seconds_until_next_wake(
+                        datetime.now(timezone), poll_interval
+                    )
+                    await self._sleep_until_woken(delay)
+                except Exception as exc:  # pragma: no cover - defensive guard
+                    self.logger.error("Scheduler error: %s", exc)
+                    await asyncio.sleep(max(poll_interval * 2, 30))
+        finally:
+            remove_listener = getattr(self.queue, "remove_deadline_listener", None)
+            if remove_listener:
+                remove_listener(self._wake_scheduler)
+            self._wake_event = None
+            self._wake_loop = None
+
+    def _seconds_until_next_wake(self, now: datetime, poll_interval: float) -> float:
+        """Return how long to sleep before the next health check, pre-arm or execution.
+
+        Queues without a deadline index fall back to polling every
+        ``poll_interval``. The wait targets the earliest deadline still in the
+        future. While reservations are already due but still pending (e.g.
+        awaiting a retry), it is also capped at ``poll_interval`` so they are
+        re-checked at that cadence.
+        """
+
+        t(
+            "reservations.queue.reservation_scheduler.ReservationScheduler._seconds_until_next_wake"
+        )
+        next_deadline = getattr(self.queue, "next_deadline", None)
+        if next_deadline is None:
+            return poll_interval
+        earliest = next_deadline()
+        if earliest is None:
+            return MAX_IDLE_SECONDS
+
+        overdue = self._localize_deadline(earliest, now) <= now
+        upcoming = next_deadline(now) if overdue else earliest
+        if upcoming is None:
+            delay = MAX_IDLE_SECONDS
+        else:
+            delay = self._seconds_until_stage(
+                (self._localize_deadline(upcoming, now) - now).total_seconds()
+            )
+        return min(delay, poll_interval) if overdue else delay
+
+    def _seconds_until_stage(self, remaining: float) -> float:
+        """Seconds until a deadline ``remaining`` seconds away needs its next stage."""
+
+        t(
+            "reservations.queue.reservation_scheduler.ReservationScheduler._seconds_until_stage"
+        )
+        until_health_check = remaining - HEALTH_CHECK_WINDOW_HOURS * 3600
+        if until_health_check > 0:
+            return min(until_health_check + DEADLINE_SLACK_SECONDS, MAX_IDLE_SECONDS)
+        until_prearm = remaining - self.prearm_window_seconds
+        if until_prearm > 0:
+            return min(until_prearm + DEADLINE_SLACK_SECONDS, MAX_IDLE_SECONDS)
+        return min(remaining + DEADLINE_SLACK_SECONDS, MAX_IDLE_SECONDS)
+
+    @staticmethod
+    def _localize_deadline(deadline: datetime, now: datetime) -> datetime:
+        """Read a naive ``deadline`` in ``now``'s timezone."""
+
+        t(
+            "reservations.queue.reservation_scheduler.ReservationScheduler._localize_deadline"
+        )
+        if deadline.tzinfo is not None:
+            return deadline
+        localize = getattr(now.tzinfo, "localize", None)
+        return localize(deadline) if localize else deadline.replace(tzinfo=now.tzinfo)
+
+    async def _sleep_until_woken(self, delay: float) -> None:
+        """Sleep for ``delay`` seconds unless the queue signals a new deadline."""
+
+        t(
+            "reservations.queue.reservation_scheduler.ReservationScheduler._sleep_until_woken"
+        )
+        event = self._wake_event
+        if event is None:
+            await asyncio.sleep(delay)
+            return
+        try:
+            await asyncio.wait_for(event.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+
+    def _wake_scheduler(self) -> None:
+        """Interrupt the current sleep; safe to call from any thread."""
+
+        t(
+            "reservations.queue.reservation_scheduler.ReservationScheduler._wake_scheduler"
+        )
+        loop, event = self._wake_loop, self._wake_event
+        if loop is None or event is None:
+            return
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:  # pragma: no cover - loop already closed
+            pass
 
     def _poll_interval_seconds(self) -> float:
-        """Return the interval between scheduler iterations."""
+        """Return the re-check interval for due reservations still pending."""
 
         t(
             "reservations.queue.reservation_scheduler.ReservationScheduler._poll_interval_seconds"
@@ -399,7 +526,54 @@ class ReservationScheduler:
             self.queue,
             now=now,
             logger=self.logger,
+            prearm_window_seconds=self.prearm_window_seconds,
+        )
+
+    async def _prearm_reservation_group(self, reservations: List[Any]) -> List[int]:
+        """Park the preferred courts' pages on the group's slot ahead of release.
+
+        Courts already armed for the slot are left alone, so repeated passes
+        inside the pre-arm window do not reload parked pages. Returns the
+        courts armed by this call.
+        """
+
+        t(
+            "reservations.queue.reservation_scheduler.ReservationScheduler._prearm_reservation_group"
+        )
+        if not reservations or not self.browser_pool:
+            return []
+        pages = getattr(self.browser_pool, "pages", None) or {}
+        target_date, time_slot = self._extract_time_slot(reservations)
+        preferred = [
+            court
+            for reservation in reservations
+            for court in self._get_reservation_field(reservation, "court_preferences", []) or []
+        ]
+        courts = [
+            court
+            for court in normalize_court_sequence(preferred, allowed=pages.keys())
+            if not self.prearm_registry.is_armed(court, target_date, time_slot)
+        ]
+        if not courts:
+            return []
+
+        self.logger.info(
+            "🎯 PRE-ARMING courts %s on %s %s", courts, target_date.isoformat(), time_slot
+        )
+        armed = await asyncio.gather(
+            *(
+                prearm_slot_page(
+                    pages[court],
+                    court,
+                    target_date,
+                    time_slot,
+                    registry=self.prearm_registry,
+                    log=self.logger,
+                )
+                for court in courts
+            )
         )
+        return [slot.court for slot in armed if slot is not None]
 
     async def _execute_reservation_group(
         self,
@@ -416,10 +590,13 @@ class ReservationScheduler:
         )
         if not reservations:
             return
-        if not await self._refresh_browser_pool():
+        target_date, time_slot = self._extract_time_slot(reservations)
+        armed_courts = self.prearm_registry.armed_courts(target_date, time_slot)
+        with span("refresh"):
+            refreshed = await self._refresh_browser_pool(skip_courts=armed_courts)
+        if not refreshed:
             return
 
-        target_date, time_slot = self._extract_time_slot(reservations)
         self.logger.info(
             """🎯 EXECUTING RESERVATION GROUP
         Time slot: %s %s
@@ -432,12 +609,13 @@ class ReservationScheduler:
             [r.get("id", "unknown")[:8] + "..." for r in reservations],
         )
 
-        enriched_reservations = self._enrich_reservations(reservations)
-        booking_plan = self.orchestrator.create_booking_plan(
-            enriched_reservations,
-            time_slot,
-            self.user_db,
-        )
+        with span("plan"):
+            enriched_reservations = self._enrich_reservations(reservations)
+            booking_plan = self.orchestrator.create_booking_plan(
+                enriched_reservations,
+                time_slot,
+                self.user_db,
+            )
 
         self.logger.info(
             """BOOKING PLAN CREATED
@@ -464,8 +642,12 @@ class ReservationScheduler:
                 time_slot,
             )
 
-    async def _refresh_browser_pool(self) -> bool:
-        """Ensure the browser pool is available and refreshed before booking."""
+    async def _refresh_browser_pool(self, skip_courts: Optional[List[int]] = None) -> bool:
+        """Ensure the browser pool is available and refreshed before booking.
+
+        Pages in ``skip_courts`` are pre-armed on the target slot and are not
+        navigated back to the court calendar.
+        """
 
         t(
             "reservations.queue.reservation_scheduler.ReservationScheduler._refresh_browser_pool"
@@ -483,7 +665,20 @@ class ReservationScheduler:
             refresh_start_time = time.time()
 
             if hasattr(self.browser_pool, "refresh_browser_pages"):
-                refresh_results = await self.browser_pool.refresh_browser_pages()
+                if skip_courts:
+                    self.logger.info(
+                        "🔄 Keeping pre-armed courts %s parked on the target slot", skip_courts
+                    )
+                    courts = [
+                        court
+                        for court in getattr(self.browser_pool, "courts", [])
+                        if court not in skip_courts
+                    ]
+                    refresh_results = await self.browser_pool.refresh_browser_pages(
+                        courts=courts
+                    )
+                else:
+                    refresh_results = await self.browser_pool.refresh_browser_pages()
                 refresh_duration = time.time() - refresh_start_time
                 successful_refreshes = sum(
                     1 for success in refresh_results.values() if success
@@ -789,6 +984,9 @@ class ReservationScheduler:
             "queue_attempt": attempt_number,
             "assigned_browser": assignment.get("browser_id"),
         }
+        race_courts = list(getattr(attempt, "race_courts", None) or [])
+        if race_courts:
+            base_metadata["race_courts"] = [attempt.target_court, *race_courts]
 
         try:
             if prebuilt_request is not None:
@@ -1077,13 +1275,14 @@ class ReservationScheduler:
         else:
             target_date = datetime.fromisoformat(str(raw_date)).date()
 
-        result = await self._execute_single_booking(
-            assignment,
-            reservation,
-            index=1,
-            total=1,
-            target_date=target_date,
-        )
+        with booking_trace(reservation_id, stage="fallback", court=fallback_court):
+            result = await self._execute_single_booking(
+                assignment,
+                reservation,
+                index=1,
+                total=1,
+                target_date=target_date,
+            )
 
         if not isinstance(result, dict):
             return
@@ -1407,6 +1606,10 @@ class ReservationScheduler:
             except Exception as exc:  # pragma: no cover - best effort stats
                 self.logger.debug(f"Could not get browser pool stats: {exc}")
 
+        latency = get_trace_exporter().summary()
+        if latency:
+            sections.append(f"\n⏱️ **Booking Phase Latency**\n```\n{format_summary(latency)}\n```")
+
         return "\n".join([section for section in sections if section])
 
     async def _check_startup_reservations(self):
@@ -0,0 +1,170 @@
+"""Indexed in-memory storage for reservation queue records."""
+
+from __future__ import annotations
+
+from itertools import count
+from typing import Any, Dict, Hashable, Iterable, Iterator, List, Optional, Tuple
+
+from tracking import t
+
+SlotKey = Tuple[Any, Any]
+_IndexKeys = Tuple[Hashable, SlotKey, Optional[str]]
+
+
+def slot_key(record: Dict[str, Any]) -> SlotKey:
+    """Return the ``(target_date, target_time)`` key used for slot lookups."""
+
+    t('reservations.queue.reservation_store.slot_key')
+    return (
+        record.get('target_date'),
+        record.get('time') or record.get('target_time'),
+    )
+
+
+class ReservationStore:
+    """Hold reservation dicts with secondary indexes kept in sync on mutation.
+
+    Records are stored by ``id`` in insertion order. Secondary indexes map
+    ``user_id``, ``(target_date, target_time)`` and ``status`` to the ids in each
+    bucket. Records are returned by reference, so callers that mutate a record
+    must call :meth:`reindex` (or :meth:`replace`) afterwards.
+    """
+
+    def __init__(self, records: Iterable[Dict[str, Any]] = ()) -> None:
+        t('reservations.queue.reservation_store.ReservationStore.__init__')
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._sequence: Dict[str, int] = {}
+        self._keys: Dict[str, _IndexKeys] = {}
+        self._by_user: Dict[Hashable, Dict[str, None]] = {}
+        self._by_slot: Dict[SlotKey, Dict[str, None]] = {}
+        self._by_status: Dict[Optional[str], Dict[str, None]] = {}
+        self._counter = count()
+        for record in records:
+            self.add(record)
+
+    def __len__(self) -> int:
+        t('reservations.queue.reservation_store.ReservationStore.__len__')
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        t('reservations.queue.reservation_store.ReservationStore.__iter__')
+        return iter(list(self._records.values()))
+
+    def __contains__(self, reservation_id: object) -> bool:
+        t('reservations.queue.reservation_store.ReservationStore.__contains__')
+        return reservation_id in self._records
+
+    def values(self) -> List[Dict[str, Any]]:
+        """Return every record in insertion order."""
+
+        t('reservations.queue.reservation_store.ReservationStore.values')
+        return list(self._records.values())
+
+    def get(self, reservation_id: str) -> Optional[Dict[str, Any]]:
+        t('reservations.queue.reservation_store.ReservationStore.get')
+        return self._records.get(reservation_id)
+
+    def add(self, record: Dict[str, Any]) -> None:
+        """Insert ``record``; its ``id`` must not already be stored."""
+
+        t('reservations.queue.reservation_store.ReservationStore.add')
+        reservation_id = record['id']
+        if reservation_id in self._records:
+            raise KeyError(f"Reservation {reservation_id} already stored")
+        self._records[reservation_id] = record
+        self._sequence[reservation_id] = next(self._counter)
+        self._index(reservation_id, record)
+
+    def replace(self, reservation_id: str, record: Dict[str, Any]) -> bool:
+        """Swap the stored record for ``record`` keeping its queue position."""
+
+        t('reservations.queue.reservation_store.ReservationStore.replace')
+        if reservation_id not in self._records:
+            return False
+        self._records[reservation_id] = record
+        self.reindex(reservation_id)
+        return True
+
+    def remove(self, reservation_id: str) -> Optional[Dict[str, Any]]:
+        t('reservations.queue.reservation_store.ReservationStore.remove')
+        record = self._records.pop(reservation_id, None)
+        if record is None:
+            return None
+        self._sequence.pop(reservation_id, None)
+        self._unindex(reservation_id)
+        return record
+
+    def reindex(self, reservation_id: str) -> None:
+        """Refresh index entries after the record was mutated in place."""
+
+        t('reservations.queue.reservation_store.ReservationStore.reindex')
+        record = self._records.get(reservation_id)
+        if record is None:
+            return
+        if self._keys.get(reservation_id) == self._keys_for(record):
+            return
+        self._unindex(reservation_id)
+        self._index(reservation_id, record)
+
+    def by_user(self, user_id: Hashable) -> List[Dict[str, Any]]:
+        t('reservations.queue.reservation_store.ReservationStore.by_user')
+        return self._resolve(self._by_user.get(user_id, {}))
+
+    def by_slot(self, target_date: Any, target_time: Any) -> List[Dict[str, Any]]:
+        t('reservations.queue.reservation_store.ReservationStore.by_slot')
+        return self._resolve(self._by_slot.get((target_date, target_time), {}))
+
+    def by_status(self, *statuses: Optional[str]) -> List[Dict[str, Any]]:
+        t('reservations.queue.reservation_store.ReservationStore.by_status')
+        ids: Dict[str, None] = {}
+        for status in statuses:
+            ids.update(self._by_status.get(status, {}))
+        return self._resolve(ids)
+
+    def status_counts(self) -> Dict[str, int]:
+        t('reservations.queue.reservation_store.ReservationStore.status_counts')
+        return {
+            ('unknown' if status is None else status): len(ids)
+            for status, ids in self._by_status.items()
+            if ids
+        }
+
+    def _resolve(self, ids: Dict[str, None]) -> List[Dict[str, Any]]:
+        t('reservations.queue.reservation_store.ReservationStore._resolve')
+        ordered = sorted(ids, key=self._sequence.__getitem__)
+        return [self._records[reservation_id] for reservation_id in ordered]
+
+    @staticmethod
+    def _keys_for(record: Dict[str, Any]) -> _IndexKeys:
+        t('reservations.queue.reservation_store.ReservationStore._keys_for')
+        user_id = record.get('user_id')
+        if not isinstance(user_id, Hashable):
+            user_id = repr(user_id)
+        return user_id, slot_key(record), record.get('status')
+
+    def _index(self, reservation_id: str, record: Dict[str, Any]) -> None:
+        t('reservations.queue.reservation_store.ReservationStore._index')
+        keys = self._keys_for(record)
+        user_key, slot, status = keys
+        self._by_user.setdefault(user_key, {})[reservation_id] = None
+        self._by_slot.setdefault(slot, {})[reservation_id] = None
+        self._by_status.setdefault(status, {})[reservation_id] = None
+        self._keys[reservation_id] = keys
+
+    def _unindex(self, reservation_id: str) -> None:
+        t('reservations.queue.reservation_store.ReservationStore._unindex')
+        keys = self._keys.pop(reservation_id, None)
+        if keys is None:
+            return
+        user_key, slot, status = keys
+        for index, key in (
+            (self._by_user, user_key),
+            (self._by_slot, slot),
+            (self._by_status, status),
+        ):
+            bucket = index.get(key)
+            if bucket is None:
+                continue
+            bucket.pop(reservation_id, None)
+            if not bucket:
+                del index[key]
@@ -5,32 +5,78 @@ Tracks all reservations including:
 - Queued reservations (from ReservationQueue)
 - Immediate reservations made within 48h window
 - Completed reservations with confirmation IDs
+
+Each record's play time is parsed once, when it is stored. Per-user and
+per-date indexes keep lookups proportional to the matching records.
+Records whose play time ended more than ``ARCHIVE_GRACE`` ago move out of
+the hot file into compact monthly JSON-lines archives next to it
+(``all_reservations.2030-01.jsonl`` under ``archive/``). This happens on
+load and at most every ``ARCHIVE_INTERVAL`` after that, so the hot file
+only holds current bookings. Archiving appends before rewriting the hot
+file, so a crash in between can duplicate an archived line but never
+loses one.
 """
 from tracking import t
 
 import json
 import logging
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+import os
+from tempfile import NamedTemporaryFile
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from datetime import date, datetime, timedelta
 from pathlib import Path
 
+ACTIVE_STATUSES = ('confirmed', 'active', 'pending')
+ARCHIVE_GRACE = timedelta(hours=2)
+ARCHIVE_INTERVAL = timedelta(hours=1)
+
+
+def parse_play_time(record: Dict[str, Any]) -> Optional[datetime]:
+    """Return the naive local start of a tracked booking, or ``None`` if unparsable."""
+    t('reservations.queue.reservation_tracker.parse_play_time')
+    try:
+        play_date = datetime.fromisoformat(str(record.get('date') or '')).date()
+        play_time = datetime.strptime(str(record.get('time') or '00:00'), '%H:%M').time()
+    except (TypeError, ValueError):
+        return None
+    return datetime.combine(play_date, play_time)
+
 
 class ReservationTracker:
     """
     Unified tracker for all types of reservations
     """
     
-    def __init__(self, file_path: str = 'data/all_reservations.json'):
+    def __init__(
+        self,
+        file_path: str = 'data/all_reservations.json',
+        *,
+        archive_dir: Optional[str] = None,
+        clock: Callable[[], datetime] = datetime.now,
+    ):
         """
         Initialize the reservation tracker
         
         Args:
             file_path: Path to JSON file for persistence
+            archive_dir: Directory for archived records; defaults to
+                ``archive/`` next to ``file_path``
+            clock: Source of the current local time
         """
         t('reservations.queue.reservation_tracker.ReservationTracker.__init__')
         self.file_path = file_path
+        self.archive_dir = Path(archive_dir) if archive_dir else Path(file_path).parent / 'archive'
         self.logger = logging.getLogger('ReservationTracker')
-        self.reservations = self._load_reservations()
+        self._clock = clock
+        self._play_at: Dict[str, Optional[datetime]] = {}
+        self._by_user: Dict[Any, Dict[str, None]] = {}
+        self._by_date: Dict[Optional[date], Dict[str, None]] = {}
+        self._last_archived: Optional[datetime] = None
+        self.reservations: Dict[str, Dict[str, Any]] = {}
+        for reservation_id, record in self._load_reservations().items():
+            self._store(reservation_id, record)
+        if self.archive_expired():
+            self._save_reservations()
         
     def add_immediate_reservation(self, user_id: int, reservation_data: Dict[str, Any]) -> str:
         """
@@ -51,11 +97,11 @@ class ReservationTracker:
             'user_id': user_id,
             'type': 'immediate',
             'status': 'confirmed',
-            'created_at': datetime.now().isoformat(),
+            'created_at': self._clock().isoformat(),
             **reservation_data
         }
         
-        self.reservations[reservation_id] = reservation
+        self._store(reservation_id, reservation)
         self._save_reservations()
         
         self.logger.info(f"Added immediate reservation {reservation_id} for user {user_id}")
@@ -80,7 +126,7 @@ class ReservationTracker:
             'user_id': user_id,
             'type': 'completed',
             'status': 'active',
-            'created_at': datetime.now().isoformat(),
+            'created_at': self._clock().isoformat(),
             'confirmation_id': booking_result.get('confirmation_id'),
             'confirmation_url': booking_result.get('confirmation_url'),
             'court': booking_result.get('court'),
@@ -90,7 +136,7 @@ class ReservationTracker:
             'can_modify': True,  # Acuity allows modification
         }
         
-        self.reservations[reservation_id] = reservation
+        self._store(reservation_id, reservation)
         self._save_reservations()
         
         self.logger.info(f"Added completed booking {reservation_id} for user {user_id}")
@@ -107,23 +153,33 @@ class ReservationTracker:
             List of active reservations
         """
         t('reservations.queue.reservation_tracker.ReservationTracker.get_user_active_reservations')
-        user_reservations = []
-        
-        # Get reservations from this tracker
-        for res_id, res_data in self.reservations.items():
-            if res_data.get('user_id') == user_id and res_data.get('status') in ['confirmed', 'active', 'pending']:
-                # Check if reservation is still in the future
-                try:
-                    res_date = datetime.fromisoformat(res_data.get('date', ''))
-                    res_time = datetime.strptime(res_data.get('time', '00:00'), '%H:%M').time()
-                    res_datetime = datetime.combine(res_date.date(), res_time)
-                    
-                    if res_datetime > datetime.now():
-                        user_reservations.append(res_data)
-                except Exception as e:
-                    self.logger.warning(f"Error parsing date/time for reservation {res_id}: {e}")
-        
-        return sorted(user_reservations, key=lambda x: (x.get('date', ''), x.get('time', '')))
+        now = self._clock()
+        upcoming = []
+        for res_id in self._by_user.get(user_id, ()):
+            res_data = self.reservations[res_id]
+            play_at = self._play_at[res_id]
+            if res_data.get('status') in ACTIVE_STATUSES and play_at is not None and play_at > now:
+                upcoming.append((play_at, res_data))
+
+        upcoming.sort(key=lambda item: item[0])
+        return [res_data for _, res_data in upcoming]
+
+    def get_reservations_on(self, play_date: date) -> List[Dict[str, Any]]:
+        """
+        Get every tracked reservation for one play date, earliest first
+        
+        Args:
+            play_date: Date the bookings are played on
+            
+        Returns:
+            List of reservations in any status
+        """
+        t('reservations.queue.reservation_tracker.ReservationTracker.get_reservations_on')
+        ids = self._by_date.get(play_date, {})
+        return [
+            self.reservations[res_id]
+            for res_id in sorted(ids, key=lambda res_id: self._play_at[res_id])
+        ]
     
     def cancel_reservation(self, reservation_id: str) -> bool:
         """
@@ -138,7 +194,7 @@ class ReservationTracker:
         t('reservations.queue.reservation_tracker.ReservationTracker.cancel_reservation')
         if reservation_id in self.reservations:
             self.reservations[reservation_id]['status'] = 'cancelled'
-            self.reservations[reservation_id]['cancelled_at'] = datetime.now().isoformat()
+            self.reservations[reservation_id]['cancelled_at'] = self._clock().isoformat()
             self._save_reservations()
             self.logger.info(f"Cancelled reservation {reservation_id}")
             return True
@@ -170,8 +226,10 @@ class ReservationTracker:
         """
         t('reservations.queue.reservation_tracker.ReservationTracker.update_reservation')
         if reservation_id in self.reservations:
-            self.reservations[reservation_id].update(updates)
-            self.reservations[reservation_id]['updated_at'] = datetime.now().isoformat()
+            record = self.reservations[reservation_id]
+            record.update(updates)
+            record['updated_at'] = self._clock().isoformat()
+            self._store(reservation_id, record)
             self._save_reservations()
             return True
         return False
@@ -184,7 +242,7 @@ class ReservationTracker:
             days_to_keep: Number of days to keep past reservations
         """
         t('reservations.queue.reservation_tracker.ReservationTracker.cleanup_old_reservations')
-        cutoff_date = datetime.now() - timedelta(days=days_to_keep)
+        cutoff_date = self._clock() - timedelta(days=days_to_keep)
         removed_count = 0
         
         for res_id in list(self.reservations.keys()):
@@ -192,7 +250,7 @@ class ReservationTracker:
             try:
                 created_at = datetime.fromisoformat(res_data.get('created_at', ''))
                 if created_at < cutoff_date:
-                    del self.reservations[res_id]
+                    self._discard(res_id)
                     removed_count += 1
             except Exception as e:
                 self.logger.warning(f"Error checking reservation age for {res_id}: {e}")
@@ -201,14 +259,123 @@ class ReservationTracker:
             self._save_reservations()
             self.logger.info(f"Cleaned up {removed_count} old reservations")
     
+    def archive_expired(self, now: Optional[datetime] = None) -> int:
+        """
+        Move records whose play time has passed into the monthly archives
+        
+        Args:
+            now: Current local time; defaults to the tracker clock
+            
+        Returns:
+            Number of records archived. The caller saves the hot file.
+        """
+        t('reservations.queue.reservation_tracker.ReservationTracker.archive_expired')
+        now = now or self._clock()
+        self._last_archived = now
+        cutoff = now - ARCHIVE_GRACE
+        expired: Dict[str, List[Tuple[str, Dict[str, Any]]]] = {}
+        for play_date in [d for d in self._by_date if d is not None and d <= cutoff.date()]:
+            for res_id in list(self._by_date[play_date]):
+                if self._play_at[res_id] <= cutoff:
+                    expired.setdefault(play_date.strftime('%Y-%m'), []).append((res_id, self.reservations[res_id]))
+        if not expired:
+            return 0
+
+        archived = 0
+        for month, entries in sorted(expired.items()):
+            try:
+                self._append_archive(month, [record for _, record in entries])
+            except OSError as e:
+                self.logger.error(f"Failed to archive reservations for {month}: {e}")
+                continue
+            for res_id, _ in entries:
+                self._discard(res_id)
+            archived += len(entries)
+        if archived:
+            self.logger.info(f"Archived {archived} past reservations to {self.archive_dir}")
+        return archived
+
+    def iter_archived(self, month: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate archived reservations, oldest archive first
+        
+        Args:
+            month: Restrict to one ``YYYY-MM`` archive
+        """
+        t('reservations.queue.reservation_tracker.ReservationTracker.iter_archived')
+        pattern = f"{Path(self.file_path).stem}.{month or '*'}.jsonl"
+        for path in sorted(self.archive_dir.glob(pattern)):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+    def _append_archive(self, month: str, records: List[Dict[str, Any]]) -> None:
+        t('reservations.queue.reservation_tracker.ReservationTracker._append_archive')
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        path = self.archive_dir / f"{Path(self.file_path).stem}.{month}.jsonl"
+        lines = ''.join(
+            json.dumps(record, ensure_ascii=False, separators=(',', ':'), default=str) + '\n'
+            for record in records
+        )
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _store(self, reservation_id: str, record: Dict[str, Any]) -> None:
+        """Insert or refresh a record and its index entries."""
+        t('reservations.queue.reservation_tracker.ReservationTracker._store')
+        if reservation_id in self.reservations:
+            self._unindex(reservation_id)
+        self.reservations[reservation_id] = record
+        play_at = parse_play_time(record)
+        if play_at is None and record.get('date'):
+            self.logger.warning(f"Unparsable date/time for reservation {reservation_id}")
+        self._play_at[reservation_id] = play_at
+        self._by_user.setdefault(record.get('user_id'), {})[reservation_id] = None
+        self._by_date.setdefault(play_at.date() if play_at else None, {})[reservation_id] = None
+
+    def _discard(self, reservation_id: str) -> None:
+        t('reservations.queue.reservation_tracker.ReservationTracker._discard')
+        if reservation_id in self.reservations:
+            self._unindex(reservation_id)
+            del self.reservations[reservation_id]
+
+    def _unindex(self, reservation_id: str) -> None:
+        t('reservations.queue.reservation_tracker.ReservationTracker._unindex')
+        record = self.reservations[reservation_id]
+        play_at = self._play_at.pop(reservation_id, None)
+        for index, key in (
+            (self._by_user, record.get('user_id')),
+            (self._by_date, play_at.date() if play_at else None),
+        ):
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(reservation_id, None)
+                if not bucket:
+                    del index[key]
+
     def _save_reservations(self):
-        """Save reservations to JSON file"""
+        """Save reservations to JSON file, archiving past ones when due"""
         t('reservations.queue.reservation_tracker.ReservationTracker._save_reservations')
+        now = self._clock()
+        if self._last_archived is None or now - self._last_archived >= ARCHIVE_INTERVAL:
+            self.archive_expired(now)
+        path = Path(self.file_path)
+        tmp_path: Optional[Path] = None
         try:
-            Path(self.file_path).parent.mkdir(parents=True, exist_ok=True)
-            with open(self.file_path, 'w', encoding='utf-8') as f:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with NamedTemporaryFile(
+                'w', encoding='utf-8', dir=path.parent, delete=False,
+                prefix=path.name, suffix='.tmp',
+            ) as f:
+                tmp_path = Path(f.name)
                 json.dump(self.reservations, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, path)
         except Exception as e:
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
             self.logger.error(f"Failed to save reservations: {e}")
     
     def _load_reservations(self) -> Dict[str, Dict[str, Any]]:
@@ -1,6 +1,8 @@
 """Scheduler pipeline helpers for reservation queue."""
 
 from .pipeline import (
+    HEALTH_CHECK_WINDOW_HOURS,
+    PREARM_WINDOW_SECONDS,
     HydratedBatch,
     HydrationFailure,
     PipelineEvaluation,
@@ -14,6 +16,8 @@ from .outcome import record_outcome
 from .browser_lifecycle import BrowserLifecycle
 
 __all__ = [
+    "HEALTH_CHECK_WINDOW_HOURS",
+    "PREARM_WINDOW_SECONDS",
     "HydratedBatch",
     "HydrationFailure",
     "PipelineEvaluation",
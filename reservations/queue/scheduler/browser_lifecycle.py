@@ -10,6 +10,7 @@ from tracking import t
 from automation.browser.pools import SpecializedBrowserPool
 from automation.browser.browser_health_checker import BrowserHealthChecker
 from automation.browser.browser_pool_recovery import BrowserPoolRecoveryService
+from infrastructure.court_topology import get_court_topology
 
 
 @dataclass
@@ -109,7 +110,7 @@ class BrowserLifecycle:
             self.logger.info("=" * 60)
 
             browser_pool = SpecializedBrowserPool(
-                courts_needed=[1, 2, 3],
+                courts_needed=get_court_topology().numbers,
                 headless=True,
                 booking_url=self.config.booking_url,
                 low_resource_mode=self.config.low_resource_mode,
@@ -1,4 +1,8 @@
-"""Helpers for dispatching queued booking assignments to executors."""
+"""Helpers for dispatching queued booking assignments to executors.
+
+Each job runs inside its own booking trace (:mod:`infrastructure.tracing`),
+so spans emitted by the booking flows are attributed to that reservation.
+"""
 
 from __future__ import annotations
 from tracking import t
@@ -9,6 +13,7 @@ from dataclasses import dataclass
 from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
 
 from automation.shared.booking_contracts import BookingRequest
+from infrastructure.tracing import annotate, booking_trace
 
 
 @dataclass
@@ -23,6 +28,32 @@ class DispatchJob:
     prebuilt_request: Optional[BookingRequest] = None
 
 
+async def _run_traced(
+    job: DispatchJob,
+    execute_single: Callable[..., Awaitable[Dict[str, Any]]],
+) -> Dict[str, Any]:
+    """Run one job inside a booking trace tagged with its outcome."""
+
+    t('reservations.queue.scheduler.dispatch._run_traced')
+    attempt = job.assignment.get("attempt")
+    with booking_trace(
+        job.reservation_id,
+        stage="booking",
+        court=getattr(attempt, "target_court", None),
+        browser=job.assignment.get("browser_id"),
+    ):
+        result = await execute_single(
+            job.assignment,
+            job.reservation,
+            job.index,
+            job.total,
+            prebuilt_request=job.prebuilt_request,
+        )
+        if isinstance(result, dict):
+            annotate(success=bool(result.get("success")), court_reserved=result.get("court"))
+        return result
+
+
 async def dispatch_to_executors(
     jobs: List[DispatchJob],
     *,
@@ -46,13 +77,7 @@ async def dispatch_to_executors(
 
     for job in jobs:
         task = asyncio.create_task(
-            execute_single(
-                job.assignment,
-                job.reservation,
-                job.index,
-                job.total,
-                prebuilt_request=job.prebuilt_request,
-            ),
+            _run_traced(job, execute_single),
             name=f"booking-{job.reservation_id[:8]}",
         )
         task_map[task] = job
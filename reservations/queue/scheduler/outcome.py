@@ -21,6 +21,8 @@ def record_outcome(
         reservation_id,
         success=bool(result.get("success")),
         court_booked=result.get("court"),
+        # A submit with an unknown outcome may have booked; never retry it elsewhere.
+        allow_fallback=not result.get("uncertain_court"),
     )
 
     if result.get("success"):
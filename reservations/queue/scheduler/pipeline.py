@@ -9,11 +9,15 @@ from typing import Any, Dict, List, Optional
 from tracking import t
 
 from automation.shared.booking_contracts import BookingRequest
+from reservations.queue.deadline_index import parse_scheduled_execution
 from reservations.queue.request_builder import (
     DEFAULT_BUILDER,
     ReservationRequestBuilder,
 )
 
+HEALTH_CHECK_WINDOW_HOURS = 0.1
+PREARM_WINDOW_SECONDS = 20.0
+
 
 @dataclass
 class ReservationBatch:
@@ -31,6 +35,7 @@ class PipelineEvaluation:
 
     ready_for_execution: List[ReservationBatch] = field(default_factory=list)
     requires_health_check: List[ReservationBatch] = field(default_factory=list)
+    requires_prearm: List[ReservationBatch] = field(default_factory=list)
     evaluated: List[Dict[str, Any]] = field(default_factory=list)
 
 
@@ -56,12 +61,18 @@ def pull_ready_reservations(
     *,
     now: datetime,
     logger: Optional[Any] = None,
+    prearm_window_seconds: float = PREARM_WINDOW_SECONDS,
 ) -> PipelineEvaluation:
-    """Group pending reservations by execution readiness and time slot."""
+    """Group pending reservations by execution readiness and time slot.
+
+    Reservations executing within ``prearm_window_seconds`` are bucketed for
+    pre-arming instead of a health check; ``0`` disables the pre-arm stage.
+    """
 
     t("reservations.queue.scheduler.pipeline.pull_ready_reservations")
 
     pending: List[Dict[str, Any]] = queue_service.get_pending_reservations()
+    cached_execution = getattr(queue_service, "scheduled_execution_for", None)
     evaluation = PipelineEvaluation(evaluated=pending)
 
     if logger and pending:
@@ -73,13 +84,16 @@ def pull_ready_reservations(
 
     execution_groups: Dict[str, List[Dict[str, Any]]] = {}
     health_check_groups: Dict[str, List[Dict[str, Any]]] = {}
+    prearm_groups: Dict[str, List[Dict[str, Any]]] = {}
 
     for reservation in pending:
         status = reservation.get("status")
         if status not in {"pending", "scheduled", "attempting"}:
             continue
 
-        exec_time = _coerce_scheduled_datetime(reservation.get("scheduled_execution"))
+        exec_time = cached_execution(reservation) if cached_execution else None
+        if exec_time is None:
+            exec_time = _coerce_scheduled_datetime(reservation.get("scheduled_execution"))
         if exec_time is None:
             if logger:
                 logger.warning(
@@ -141,7 +155,15 @@ def pull_ready_reservations(
                     _reservation_id_prefix(reservation),
                 )
             execution_groups.setdefault(key, []).append(reservation)
-        elif hours_until <= 0.1:
+        elif time_until.total_seconds() <= prearm_window_seconds:
+            if logger:
+                logger.info(
+                    "🎯 PRE-ARM - Reservation %s will execute in %.1f seconds",
+                    _reservation_id_prefix(reservation),
+                    time_until.total_seconds(),
+                )
+            prearm_groups.setdefault(key, []).append(reservation)
+        elif hours_until <= HEALTH_CHECK_WINDOW_HOURS:
             if logger:
                 logger.info(
                     "🎯 PRE-EXECUTION HEALTH CHECK - Reservation %s will execute in %.1f minutes",
@@ -152,6 +174,7 @@ def pull_ready_reservations(
 
     evaluation.ready_for_execution = _build_batches(execution_groups)
     evaluation.requires_health_check = _build_batches(health_check_groups)
+    evaluation.requires_prearm = _build_batches(prearm_groups)
     return evaluation
 
 
@@ -225,11 +248,4 @@ def _stringified_date(value: Any) -> str:
 
 def _coerce_scheduled_datetime(value: Any) -> Optional[datetime]:
     t('reservations.queue.scheduler.pipeline._coerce_scheduled_datetime')
-    if isinstance(value, datetime):
-        return value
-    if isinstance(value, str):
-        try:
-            return datetime.fromisoformat(value)
-        except ValueError:
-            return None
-    return None
+    return parse_scheduled_execution(value)
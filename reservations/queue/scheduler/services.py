@@ -17,6 +17,7 @@ from reservations.queue.scheduler.pipeline import (
 )
 from reservations.queue.request_builder import ReservationRequestBuilder, DEFAULT_BUILDER
 from reservations.queue.scheduler import outcome as outcome_module
+from infrastructure.tracing import booking_trace, span
 from tracking import t
 
 
@@ -115,7 +116,7 @@ class ReservationHydrator:
 
 
 class SchedulerPipeline:
-    """Coordinates scheduler stages (health checks, hydration, execution)."""
+    """Coordinates scheduler stages (health checks, hydration, execution, pre-arm)."""
 
     def __init__(
         self,
@@ -124,19 +125,26 @@ class SchedulerPipeline:
         hydrator: ReservationHydrator,
         health_check: Callable[[List[Dict[str, Any]]], Awaitable[bool]],
         executor: Callable[..., Awaitable[None]],
+        prearm: Optional[Callable[[List[Dict[str, Any]]], Awaitable[Any]]] = None,
     ) -> None:
         t('reservations.queue.scheduler.services.SchedulerPipeline.__init__')
         self._logger = logger
         self._hydrator = hydrator
         self._health_check = health_check
         self._executor = executor
+        self._prearm = prearm
 
     async def process(self, evaluation) -> None:
-        """Process scheduler evaluation buckets."""
+        """Process scheduler evaluation buckets.
+
+        Due batches execute before any pre-arm starts, so a slow slot-page
+        navigation for an upcoming slot never delays a booking.
+        """
 
         t('reservations.queue.scheduler.services.SchedulerPipeline.process')
         await self._run_health_checks(evaluation.requires_health_check)
         await self._execute_batches(evaluation.ready_for_execution)
+        await self._run_prearm(getattr(evaluation, 'requires_prearm', ()))
 
     async def _run_health_checks(self, batches: Iterable[ReservationBatch]) -> None:
         t('reservations.queue.scheduler.services.SchedulerPipeline._run_health_checks')
@@ -146,18 +154,35 @@ class SchedulerPipeline:
                 continue
             await self._health_check(reservations)
 
+    async def _run_prearm(self, batches: Iterable[ReservationBatch]) -> None:
+        t('reservations.queue.scheduler.services.SchedulerPipeline._run_prearm')
+        if self._prearm is None:
+            return
+        for batch in batches:
+            reservations = list(getattr(batch, 'reservations', []) or [])
+            if not reservations:
+                continue
+            try:
+                with booking_trace(batch.time_key, stage='prearm'), span('prearm'):
+                    await self._prearm(reservations)
+            except Exception as exc:  # pragma: no cover - defensive logging
+                self._logger.warning("Pre-arm stage failed for %s: %s", batch.time_key, exc)
+
     async def _execute_batches(self, batches: Iterable[ReservationBatch]) -> None:
         t('reservations.queue.scheduler.services.SchedulerPipeline._execute_batches')
         for batch in batches:
             reservations = getattr(batch, 'reservations', None)
             if not reservations:
                 continue
-            hydrated = self._hydrator.hydrate(batch)
-            if hydrated.reservations:
-                await self._executor(
-                    hydrated.reservations,
-                    prepared_requests=hydrated.prepared_requests,
-                )
+            # Booking traces opened during execution inherit this batch's spans.
+            with booking_trace(batch.time_key, stage='batch', slot=batch.time_key):
+                with span('hydrate'):
+                    hydrated = self._hydrator.hydrate(batch)
+                if hydrated.reservations:
+                    await self._executor(
+                        hydrated.reservations,
+                        prepared_requests=hydrated.prepared_requests,
+                    )
 
 
 class OutcomeRecorder:
@@ -0,0 +1,333 @@
+"""Warm headless contexts that run reservation cancellations from a work queue.
+
+A cancellation used to start Playwright and launch a fresh Chromium every
+time. :class:`CancellationBrowserPool` launches one headless browser on first
+use. It opens ``CANCELLATION_POOL_SIZE`` contexts, one per worker, and every
+worker pulls cancel URLs from a shared :class:`asyncio.Queue`. A batch
+therefore pays for one launch, not one per reservation.
+
+The pool is kept apart from the court pool, so court pages stay parked on
+their booking grids. It shuts its browser down after
+``CANCELLATION_IDLE_SECONDS`` without work and relaunches on the next
+request. Compare cold and pooled latency with
+``python -m scripts.benchmarks cancellation``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+from tracking import t
+
+from infrastructure.settings import get_settings
+
+CANCEL_BUTTON_SELECTOR = 'button:has-text("Cancelar"), button:has-text("CANCELAR"), button:has-text("Cancel")'
+SUCCESS_INDICATORS = ("cancelada", "cancelled", "canceled", "eliminada", "removed")
+ERROR_INDICATORS = ("error", "problema", "no se pudo")
+NAVIGATION_TIMEOUT_MS = 15000
+BUTTON_TIMEOUT_MS = 10000
+OUTCOME_TIMEOUT_MS = 10000
+
+_PAGE_HAS_TEXT = """(tokens) => {
+    const text = ((document.body && document.body.innerText) || '').toLowerCase();
+    return tokens.some((token) => text.includes(token));
+}"""
+
+Launcher = Callable[[], Awaitable[Tuple[Any, Callable[[], Awaitable[None]]]]]
+
+
+async def launch_headless_browser() -> Tuple[Any, Callable[[], Awaitable[None]]]:
+    """Launch headless Chromium; return the browser and a coroutine that tears it down."""
+
+    t('reservations.services.cancellation_pool.launch_headless_browser')
+    from playwright.async_api import async_playwright
+
+    playwright = await async_playwright().start()
+    try:
+        browser = await playwright.chromium.launch(headless=True)
+    except Exception:
+        await playwright.stop()
+        raise
+
+    async def close() -> None:
+        t('reservations.services.cancellation_pool.launch_headless_browser.close')
+        try:
+            await browser.close()
+        finally:
+            await playwright.stop()
+
+    return browser, close
+
+
+async def cancel_on_page(page: Any, cancel_url: str, logger: logging.Logger) -> Dict[str, Any]:
+    """Open ``cancel_url`` on ``page``, click CANCELAR and read the outcome.
+
+    Returns a dict with ``success`` (bool), ``message`` (str) and, on
+    failure, ``error`` (str).
+    """
+
+    t('reservations.services.cancellation_pool.cancel_on_page')
+    logger.info("Navigating to confirmation page...")
+    await page.goto(cancel_url, wait_until="domcontentloaded", timeout=NAVIGATION_TIMEOUT_MS)
+
+    logger.info("Looking for CANCELAR button...")
+    try:
+        cancel_button = await page.wait_for_selector(
+            CANCEL_BUTTON_SELECTOR, state="visible", timeout=BUTTON_TIMEOUT_MS
+        )
+    except Exception:
+        cancel_button = None
+    if not cancel_button:
+        logger.warning("CANCELAR button not found on page")
+        return {
+            "success": False,
+            "message": "Could not find cancel button on confirmation page",
+            "error": "CANCELAR button not found",
+        }
+
+    logger.info("Clicking CANCELAR button...")
+    await cancel_button.click()
+
+    # Resolve as soon as the page shows an outcome instead of sleeping a fixed time.
+    try:
+        await page.wait_for_function(
+            _PAGE_HAS_TEXT, arg=list(SUCCESS_INDICATORS + ERROR_INDICATORS), timeout=OUTCOME_TIMEOUT_MS
+        )
+    except Exception:
+        pass
+    page_text = (await page.text_content("body") or "").lower()
+
+    if any(indicator in page_text for indicator in SUCCESS_INDICATORS):
+        logger.info("✅ Reservation cancelled successfully")
+        return {"success": True, "message": "Reservation cancelled successfully"}
+    if any(indicator in page_text for indicator in ERROR_INDICATORS):
+        logger.warning("Cancellation may have failed - error message detected")
+        return {
+            "success": False,
+            "message": "Could not cancel reservation - an error occurred",
+            "error": "Error message detected on page",
+        }
+    logger.warning("Unclear cancellation result - no success or error message found")
+    return {
+        "success": False,
+        "message": "Could not confirm cancellation - please check manually",
+        "error": "No confirmation message found",
+    }
+
+
+def _failure(exc: BaseException) -> Dict[str, Any]:
+    t('reservations.services.cancellation_pool._failure')
+    return {"success": False, "message": f"Cancellation failed: {exc}", "error": str(exc)}
+
+
+class CancellationBrowserPool:
+    """A small pool of warm browser contexts serving a cancellation work queue."""
+
+    def __init__(
+        self,
+        size: Optional[int] = None,
+        *,
+        idle_timeout: Optional[float] = None,
+        launcher: Launcher = launch_headless_browser,
+        logger: Optional[logging.Logger] = None,
+    ) -> None:
+        t('reservations.services.cancellation_pool.CancellationBrowserPool.__init__')
+        settings = get_settings()
+        self.size = max(1, settings.cancellation_pool_size if size is None else size)
+        self.idle_timeout = settings.cancellation_idle_seconds if idle_timeout is None else idle_timeout
+        self.logger = logger or logging.getLogger(self.__class__.__name__)
+        self.launches = 0
+        self._launcher = launcher
+        self._queue: Optional[asyncio.Queue] = None
+        self._workers: List[asyncio.Task] = []
+        self._close_browser: Optional[Callable[[], Awaitable[None]]] = None
+        self._idle_task: Optional[asyncio.Task] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._in_flight = 0
+        self._last_used = time.monotonic()
+
+    @property
+    def running(self) -> bool:
+        t('reservations.services.cancellation_pool.CancellationBrowserPool.running')
+        return self._close_browser is not None
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    async def cancel(self, cancel_url: str) -> Dict[str, Any]:
+        """Queue one cancellation and wait for its result."""
+
+        t('reservations.services.cancellation_pool.CancellationBrowserPool.cancel')
+        (result,) = await self.cancel_many([cancel_url])
+        return result
+
+    async def cancel_many(self, cancel_urls: Sequence[str]) -> List[Dict[str, Any]]:
+        """Queue several cancellations at once; results come back in input order."""
+
+        t('reservations.services.cancellation_pool.CancellationBrowserPool.cancel_many')
+        if not cancel_urls:
+            return []
+        try:
+            await self.start()
+        except Exception as exc:
+            self.logger.error("Could not launch cancellation browser: %s", exc, exc_info=True)
+            return [_failure(exc) for _ in cancel_urls]
+
+        loop = asyncio.get_running_loop()
+        queue = self._queue
+        futures = []
+        self._in_flight += len(cancel_urls)
+        for url in cancel_urls:
+            future = loop.create_future()
+            futures.append(future)
+            queue.put_nowait((url, future))
+        try:
+            return list(await asyncio.gather(*futures))
+        finally:
+            self._in_flight -= len(cancel_urls)
+            self._last_used = time.monotonic()
+
+    async def start(self) -> None:
+        """Launch the browser and its worker contexts unless already running."""
+
+        t('reservations.services.cancellation_pool.CancellationBrowserPool.start')
+        if self._start_lock is None:
+            self._start_lock = asyncio.Lock()
+        async with self._start_lock:
+            if self.running:
+                return
+            started = time.perf_counter()
+            browser, close = await self._launcher()
+            self.launches += 1
+            self._close_browser = close
+            self._queue = asyncio.Queue()
+            self._last_used = time.monotonic()
+            self._workers = [
+                asyncio.create_task(
+                    self._worker(browser, self._queue, index), name=f"cancellation-worker-{index}"
+                )
+                for index in range(self.size)
+            ]
+            if self.idle_timeout and self.idle_timeout > 0:
+                self._idle_task = asyncio.create_task(self._close_when_idle(), name="cancellation-idle")
+            self.logger.info(
+                "Cancellation pool ready: %s context(s) in %.0fms",
+                self.size,
+                (time.perf_counter() - started) * 1000,
+            )
+
+    async def stop(self) -> None:
+        """Close the workers and the browser; queued cancellations fail."""
+
+        t('reservations.services.cancellation_pool.CancellationBrowserPool.stop')
+        # Detach everything first so a concurrent start() launches a fresh pool.
+        idle_task, self._idle_task = self._idle_task, None
+        workers, self._workers = self._workers, []
+        queue, self._queue = self._queue, None
+        close, self._close_browser = self._close_browser, None
+
+        if idle_task is not None and idle_task is not asyncio.current_task():
+            idle_task.cancel()
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+        while queue is not None and not queue.empty():
+            _, future = queue.get_nowait()
+            if not future.done():
+                future.set_result(_failure(RuntimeError("cancellation pool stopped")))
+
+        if close is not None:
+            try:
+                await close()
+            except Exception as exc:  # pragma: no cover - defensive guard
+                self.logger.warning("Error closing cancellation browser: %s", exc)
+            self.logger.info("Cancellation pool stopped")
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+    async def _worker(self, browser: Any, queue: asyncio.Queue, index: int) -> None:
+        t('reservations.services.cancellation_pool.CancellationBrowserPool._worker')
+        context = page = None
+        try:
+            while True:
+                url, future = await queue.get()
+                try:
+                    if page is None:
+                        context = await browser.new_context()
+                        page = await context.new_page()
+                    self.logger.info("Worker %s cancelling reservation: %s", index, url[:80])
+                    result = await cancel_on_page(page, url, self.logger)
+                except asyncio.CancelledError:
+                    if not future.done():
+                        future.set_result(_failure(RuntimeError("cancellation pool stopped")))
+                    raise
+                except Exception as exc:
+                    self.logger.error("Failed to cancel reservation: %s", exc, exc_info=True)
+                    result = _failure(exc)
+                    # The page may be wedged; the next job gets a fresh context.
+                    await self._close_quietly(context)
+                    context = page = None
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            await self._close_quietly(context)
+
+    @staticmethod
+    async def _close_quietly(context: Any) -> None:
+        t('reservations.services.cancellation_pool.CancellationBrowserPool._close_quietly')
+        if context is None:
+            return
+        try:
+            await context.close()
+        except Exception:
+            pass
+
+    async def _close_when_idle(self) -> None:
+        t('reservations.services.cancellation_pool.CancellationBrowserPool._close_when_idle')
+        while True:
+            remaining = self._last_used + self.idle_timeout - time.monotonic()
+            if remaining <= 0 and self._in_flight == 0:
+                self.logger.info("Cancellation pool idle for %.0fs; closing browser", self.idle_timeout)
+                await self.stop()
+                return
+            await asyncio.sleep(max(remaining, min(1.0, self.idle_timeout)))
+
+
+_LOCK = threading.Lock()
+_POOL: Optional[CancellationBrowserPool] = None
+
+
+def get_cancellation_pool() -> CancellationBrowserPool:
+    """Return the process-wide cancellation pool (launched on first use)."""
+
+    t('reservations.services.cancellation_pool.get_cancellation_pool')
+    global _POOL
+    with _LOCK:
+        if _POOL is None:
+            _POOL = CancellationBrowserPool()
+        return _POOL
+
+
+def set_cancellation_pool(pool: Optional[CancellationBrowserPool]) -> Optional[CancellationBrowserPool]:
+    """Install ``pool`` process-wide (``None`` rebuilds on next use); return the previous one."""
+
+    t('reservations.services.cancellation_pool.set_cancellation_pool')
+    global _POOL
+    with _LOCK:
+        previous, _POOL = _POOL, pool
+        return previous
+
+
+__all__ = [
+    'CancellationBrowserPool',
+    'cancel_on_page',
+    'get_cancellation_pool',
+    'launch_headless_browser',
+    'set_cancellation_pool',
+]
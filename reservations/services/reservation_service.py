@@ -9,6 +9,7 @@ from typing import Iterable, List, Optional
 
 from reservations.models import ReservationRequest, UserProfile
 from reservations.queue import ReservationQueue, ReservationScheduler
+from reservations.queue.queue_registry import get_queue, register_queue
 from reservations.queue.reservation_tracker import ReservationTracker
 from users.manager import UserManager
 from automation.executors import AsyncExecutorConfig
@@ -31,7 +32,9 @@ class ReservationService:
     ) -> None:
         t('reservations.services.reservation_service.ReservationService.__init__')
         self.logger = logging.getLogger(self.__class__.__name__)
-        self.queue = queue or ReservationQueue()
+        # An injected queue becomes the shared instance for its file, so the
+        # scheduler and persistence helpers write to the same records.
+        self.queue = register_queue(queue) if queue is not None else get_queue()
         self.reservation_tracker = reservation_tracker or ReservationTracker()
         self.user_manager = user_manager
         self.scheduler = scheduler or ReservationScheduler(
@@ -0,0 +1,622 @@
+"""Micro-benchmarks for performance-sensitive LVBot components.
+
+Run from the project root, for example::
+
+    python -m scripts.benchmarks tracking
+    python -m scripts.benchmarks queue --sizes 10000 100000
+    python -m scripts.benchmarks resources --court 1 --reloads 10
+    python -m scripts.benchmarks pool-modes --modes headed headless
+    python -m scripts.benchmarks topology --clubs 2 --courts-per-club 12
+    python -m scripts.benchmarks fast-start --courts 1 2 3
+    python -m scripts.benchmarks cancellation --cancels 5
+"""
+
+from __future__ import annotations
+from tracking import t
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import statistics
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Sequence
+
+from tracking import runtime as tracking_runtime
+
+
+def _per_call_ns(func: Callable[[], None], iterations: int) -> float:
+    """Return the mean wall-clock cost of ``func`` in nanoseconds."""
+
+    t('scripts.benchmarks._per_call_ns')
+    start = time.perf_counter_ns()
+    for _ in range(iterations):
+        func()
+    return (time.perf_counter_ns() - start) / iterations
+
+
+@contextmanager
+def _isolated_tracking(mode: str) -> Iterator[Path]:
+    """Point the tracking runtime at a scratch file for the duration of a run."""
+
+    t('scripts.benchmarks._isolated_tracking')
+    saved: Dict[str, object] = {
+        name: getattr(tracking_runtime, name)
+        for name in ("_TRACKING_FILE", "_COUNTS", "_BUFFERS", "_LAST_PERSISTED", "_LOCAL", "_MODE")
+    }
+    tracking_runtime.flush()
+    with tempfile.TemporaryDirectory() as scratch:
+        counts_file = Path(scratch) / "function_call_counts.json"
+        tracking_runtime._TRACKING_FILE = counts_file
+        tracking_runtime._COUNTS = {}
+        tracking_runtime._BUFFERS = []
+        tracking_runtime._LOCAL = threading.local()
+        tracking_runtime._LAST_PERSISTED = {}
+        tracking_runtime._MODE = mode
+        try:
+            yield counts_file
+        finally:
+            for name, value in saved.items():
+                setattr(tracking_runtime, name, value)
+
+
+def bench_tracking(iterations: int) -> None:
+    """Compare per-call overhead of buffered and immediate ``tracking.t``."""
+
+    t('scripts.benchmarks.bench_tracking')
+    name = "scripts.benchmarks.hot_loop"
+
+    with _isolated_tracking(tracking_runtime.MODE_BUFFERED):
+        buffered_ns = _per_call_ns(lambda: tracking_runtime.t(name), iterations)
+        flush_start = time.perf_counter()
+        tracking_runtime.flush()
+        flush_ms = (time.perf_counter() - flush_start) * 1000
+
+    # Immediate mode rewrites the counts file per call; keep the sample small.
+    immediate_iterations = max(iterations // 1000, 100)
+    with _isolated_tracking(tracking_runtime.MODE_IMMEDIATE):
+        immediate_ns = _per_call_ns(lambda: tracking_runtime.t(name), immediate_iterations)
+
+    print(f"buffered : {buffered_ns:10.1f} ns/call ({iterations} calls, flush {flush_ms:.2f} ms)")
+    print(f"immediate: {immediate_ns:10.1f} ns/call ({immediate_iterations} calls)")
+    print(f"speed-up : {immediate_ns / buffered_ns:10.1f}x")
+
+
+def _synthetic_reservations(size: int) -> List[Dict[str, Any]]:
+    """Build ``size`` queued reservations spread over users and slots."""
+
+    t('scripts.benchmarks._synthetic_reservations')
+    rng = random.Random(size)
+    statuses = ["scheduled"] * 6 + ["confirmed", "waitlisted", "success", "failed"]
+    hours = [f"{hour:02d}:00" for hour in range(6, 22)]
+    records = []
+    for index in range(size):
+        target_date = f"2030-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        target_time = rng.choice(hours)
+        records.append({
+            "id": f"bench-{index:06d}",
+            "user_id": rng.randint(1, max(size // 20, 1)),
+            "target_date": target_date,
+            "target_time": target_time,
+            "court_preferences": [rng.randint(1, 3)],
+            "status": rng.choice(statuses),
+            "waitlist_position": rng.randint(1, 5),
+            "scheduled_execution": f"{target_date}T{target_time}:00-06:00",
+        })
+    return records
+
+
+def _linear_lookups(records: Sequence[Dict[str, Any]]) -> Dict[str, Callable[[Dict[str, Any]], Any]]:
+    """Return the pre-index list-scan implementations for comparison."""
+
+    t('scripts.benchmarks._linear_lookups')
+
+    def by_id(probe):
+        t('scripts.benchmarks._linear_lookups.by_id')
+        return next((r for r in records if r.get("id") == probe["id"]), None)
+
+    def by_user(probe):
+        t('scripts.benchmarks._linear_lookups.by_user')
+        return [r for r in records if r.get("user_id") == probe["user_id"]]
+
+    def by_slot(probe):
+        t('scripts.benchmarks._linear_lookups.by_slot')
+        return [
+            r for r in records
+            if r.get("target_date") == probe["target_date"]
+            and (r.get("time") or r.get("target_time")) == probe["target_time"]
+        ]
+
+    def waitlist(probe):
+        t('scripts.benchmarks._linear_lookups.waitlist')
+        return sorted(
+            (r for r in by_slot(probe) if r.get("status") == "waitlisted"),
+            key=lambda r: r.get("waitlist_position", float("inf")),
+        )
+
+    return {
+        "get_reservation": by_id,
+        "get_user_reservations": by_user,
+        "get_reservations_by_time_slot": by_slot,
+        "get_waitlist_for_slot": waitlist,
+    }
+
+
+def bench_queue(sizes: Sequence[int], probes: int) -> None:
+    """Compare indexed ``ReservationQueue`` lookups with full list scans."""
+
+    t('scripts.benchmarks.bench_queue')
+    from reservations.queue.reservation_queue import ReservationQueue
+
+    logging.getLogger("ReservationQueue").setLevel(logging.WARNING)
+
+    for size in sizes:
+        records = _synthetic_reservations(size)
+        with tempfile.TemporaryDirectory() as scratch:
+            queue_file = Path(scratch) / "queue.json"
+            queue_file.write_text(json.dumps(records), encoding="utf-8")
+            load_start = time.perf_counter()
+            queue = ReservationQueue(file_path=str(queue_file), journal=True)
+            load_ms = (time.perf_counter() - load_start) * 1000
+            _bench_queue_size(queue, size, probes, load_ms)
+            queue.repository.close()
+
+
+def _bench_queue_size(queue, size: int, probes: int, load_ms: float) -> None:
+    """Print lookup and persistence timings for one populated queue."""
+
+    t('scripts.benchmarks._bench_queue_size')
+    from reservations.queue.reservation_repository import ReservationRepository
+
+    snapshot = queue.queue
+    rng = random.Random(0)
+    sample = [rng.choice(snapshot) for _ in range(probes)]
+    linear = _linear_lookups(snapshot)
+    indexed = {
+        "get_reservation": lambda r: queue.get_reservation(r["id"]),
+        "get_user_reservations": lambda r: queue.get_user_reservations(r["user_id"]),
+        "get_reservations_by_time_slot": lambda r: queue.get_reservations_by_time_slot(
+            r["target_date"], r["target_time"]
+        ),
+        "get_waitlist_for_slot": lambda r: queue.get_waitlist_for_slot(
+            r["target_date"], r["target_time"]
+        ),
+    }
+
+    print(f"\n{size} reservations (load {load_ms:.0f} ms, {probes} probes)")
+    print(f"{'operation':32} {'linear µs':>12} {'indexed µs':>12}")
+    for name, indexed_op in indexed.items():
+        linear_op = linear[name]
+        iterator = iter(sample * 2)
+        linear_us = _per_call_ns(lambda: linear_op(next(iterator)), probes) / 1000
+        iterator = iter(sample * 2)
+        indexed_us = _per_call_ns(lambda: indexed_op(next(iterator)), probes) / 1000
+        print(f"{name:32} {linear_us:12.1f} {indexed_us:12.1f}")
+
+    statuses = iter(["scheduled", "confirmed"] * probes * 2)
+    iterator = iter(sample)
+    journal_us = _per_call_ns(
+        lambda: queue.update_reservation_status(next(iterator)["id"], next(statuses)),
+        probes,
+    ) / 1000
+    queue.repository.wait_for_compaction()
+    queue.repository.close()
+
+    # Full rewrites are slow at this scale; a handful of samples is enough.
+    rewrite_probes = max(probes // 40, 3)
+    queue.repository = ReservationRepository(queue.file_path, logger=queue.logger, journal=False)
+    iterator = iter(sample)
+    rewrite_us = _per_call_ns(
+        lambda: queue.update_reservation_status(next(iterator)["id"], next(statuses)),
+        rewrite_probes,
+    ) / 1000
+    print(f"\n{'update_reservation_status':32} {'rewrite µs':>12} {'journal µs':>12}")
+    print(f"{'':32} {rewrite_us:12.1f} {journal_us:12.1f}")
+
+
+async def _reload_to_slots_ms(page: Any) -> float:
+    """Reload ``page`` and return milliseconds until a slot button is visible."""
+
+    t('scripts.benchmarks._reload_to_slots_ms')
+    start = time.perf_counter()
+    await page.reload(wait_until="commit")
+    await page.wait_for_selector("button.time-selection", state="visible", timeout=30000)
+    return (time.perf_counter() - start) * 1000
+
+
+async def _reload_latencies(court: int, reloads: int, profile: Any, headless: bool) -> Dict[str, Any]:
+    """Reload a court page ``reloads`` times and time until a slot button is visible."""
+
+    t('scripts.benchmarks._reload_latencies')
+    from playwright.async_api import async_playwright
+
+    from infrastructure.constants import COURT_CONFIG
+
+    url = COURT_CONFIG[court]["direct_url"]
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=headless, args=["--no-sandbox"])
+        try:
+            context = await browser.new_context(locale="es-GT", timezone_id="America/Guatemala")
+            stats = await profile.apply(context) if profile is not None else None
+            page = await context.new_page()
+            await page.goto(url, wait_until="domcontentloaded")
+            await page.wait_for_selector("button.time-selection", state="visible", timeout=30000)
+
+            samples = [await _reload_to_slots_ms(page) for _ in range(reloads)]
+        finally:
+            await browser.close()
+
+    return {
+        "samples": samples,
+        "blocked": stats.blocked if stats is not None else 0,
+        "allowed": stats.allowed if stats is not None else 0,
+    }
+
+
+def bench_resources(court: int, reloads: int, headless: bool) -> None:
+    """Compare reload-to-``button.time-selection`` latency with and without blocking."""
+
+    t('scripts.benchmarks.bench_resources')
+    from automation.browser.resource_blocking import DEFAULT_RESOURCE_PROFILE
+
+    print(f"court {court}, {reloads} reloads, headless={headless}")
+    print(f"{'profile':10} {'median ms':>10} {'p95 ms':>10} {'max ms':>10} {'blocked':>8} {'allowed':>8}")
+    for label, profile in (("full", None), ("blocking", DEFAULT_RESOURCE_PROFILE)):
+        result = asyncio.run(_reload_latencies(court, reloads, profile, headless))
+        samples = sorted(result["samples"])
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        print(
+            f"{label:10} {statistics.median(samples):10.0f} {p95:10.0f} {samples[-1]:10.0f} "
+            f"{result['blocked']:8d} {result['allowed']:8d}"
+        )
+
+
+async def _measure_pool_mode(mode: str, courts: Sequence[int], reloads: int) -> Dict[str, Any]:
+    """Start an ``AsyncBrowserPool`` in ``mode`` and sample memory and reload latency."""
+
+    t('scripts.benchmarks._measure_pool_mode')
+    from automation.browser.async_browser_pool import AsyncBrowserPool
+
+    pool = AsyncBrowserPool(courts=list(courts), mode=mode)
+    pool.WARMUP_DELAY = 0.0
+    start = time.perf_counter()
+    await pool.start()
+    startup_s = time.perf_counter() - start
+    try:
+        memory = await pool.get_memory_stats()
+        samples = []
+        for page in pool.pages.values():
+            samples.extend([await _reload_to_slots_ms(page) for _ in range(reloads)])
+        memory_after = await pool.get_memory_stats()
+    finally:
+        await pool.stop()
+    return {
+        "startup_s": startup_s,
+        "memory": memory,
+        "memory_after": memory_after,
+        "samples": sorted(samples),
+    }
+
+
+def bench_pool_modes(modes: Sequence[str], courts: Sequence[int], reloads: int) -> None:
+    """Compare Chromium RSS, per-context heap and reload latency across pool modes."""
+
+    t('scripts.benchmarks.bench_pool_modes')
+    logging.getLogger("automation").setLevel(logging.WARNING)
+
+    print(f"courts {list(courts)}, {reloads} reloads per court")
+    print(
+        f"{'mode':10} {'start s':>8} {'rss MB':>8} {'rss after':>10} "
+        f"{'heap/ctx MB':>12} {'median ms':>10} {'p95 ms':>8}"
+    )
+    for mode in modes:
+        result = asyncio.run(_measure_pool_mode(mode, courts, reloads))
+        contexts = [
+            stats["js_heap_used_mb"]
+            for stats in result["memory_after"]["contexts"].values()
+            if "js_heap_used_mb" in stats
+        ]
+        samples = result["samples"] or [float("nan")]
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        rss = result["memory"]["browser_rss_mb"]
+        rss_after = result["memory_after"]["browser_rss_mb"]
+        heap = statistics.mean(contexts) if contexts else float("nan")
+        print(
+            f"{mode:10} {result['startup_s']:8.1f} {rss if rss is not None else float('nan'):8.1f} "
+            f"{rss_after if rss_after is not None else float('nan'):10.1f} {heap:12.1f} "
+            f"{statistics.median(samples):10.0f} {p95:8.0f}"
+        )
+
+
+async def _time_to_ready(courts: Sequence[int], profiles_dir: str | None) -> Dict[str, Any]:
+    """Start a pool (fast start when ``profiles_dir`` is set) and return its startup report."""
+
+    t('scripts.benchmarks._time_to_ready')
+    from automation.browser.async_browser_pool import AsyncBrowserPool
+
+    pool = AsyncBrowserPool(courts=list(courts), mode="headless")
+    if profiles_dir:
+        pool.enable_fast_start(profiles_dir=profiles_dir)
+    await pool.start()
+    try:
+        await pool.wait_until_ready(timeout=120)
+        return dict(pool.startup_report)
+    finally:
+        await pool.stop()
+
+
+def bench_fast_start(courts: Sequence[int]) -> None:
+    """Compare time-to-ready for a standard start and cold/warm persistent-profile starts."""
+
+    t('scripts.benchmarks.bench_fast_start')
+    logging.getLogger("automation").setLevel(logging.WARNING)
+
+    print(f"courts {list(courts)}")
+    print(f"{'start':10} {'kind':6} {'ready s':>8} {'all courts s':>13}")
+    with tempfile.TemporaryDirectory() as scratch:
+        runs = [("standard", None), ("profile 1", scratch), ("profile 2", scratch)]
+        for label, profiles_dir in runs:
+            report = asyncio.run(_time_to_ready(courts, profiles_dir))
+            print(
+                f"{label:10} {report.get('kind', '?'):6} "
+                f"{report.get('time_to_ready_s', float('nan')):8.2f} "
+                f"{report.get('all_courts_ready_s', float('nan')):13.2f}"
+            )
+
+
+_FAKE_CONFIRMATION_PAGE = b"""<!doctype html><html><body>
+<h1>Detalles de su cita</h1>
+<button onclick="setTimeout(() => { document.body.innerText = 'Su cita ha sido cancelada'; }, 200)">
+Cancelar</button>
+</body></html>"""
+
+
+@contextmanager
+def _fake_confirmation_server() -> Iterator[str]:
+    """Serve a stand-in Acuity confirmation page on localhost; yield its URL."""
+
+    t('scripts.benchmarks._fake_confirmation_server')
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            t('scripts.benchmarks._fake_confirmation_server.Handler.do_GET')
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.end_headers()
+            self.wfile.write(_FAKE_CONFIRMATION_PAGE)
+
+        def log_message(self, *args):
+            t('scripts.benchmarks._fake_confirmation_server.Handler.log_message')
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}/schedule/confirmation"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+async def _cancellation_latencies(url: str, cancels: int, size: int) -> Dict[str, Any]:
+    """Time ``cancels`` cancellations with a fresh browser each vs one warm pool."""
+
+    t('scripts.benchmarks._cancellation_latencies')
+    from reservations.services.cancellation_pool import CancellationBrowserPool
+
+    async def timed(pool: CancellationBrowserPool, index: int) -> float:
+        t('scripts.benchmarks._cancellation_latencies.timed')
+        start = time.perf_counter()
+        result = await pool.cancel(f"{url}/{index}")
+        if not result["success"]:
+            raise RuntimeError(result["message"])
+        return (time.perf_counter() - start) * 1000
+
+    cold = []
+    for index in range(cancels):
+        pool = CancellationBrowserPool(1, idle_timeout=0)
+        try:
+            cold.append(await timed(pool, index))
+        finally:
+            await pool.stop()
+
+    pool = CancellationBrowserPool(size, idle_timeout=0)
+    try:
+        await pool.start()
+        pooled = [await timed(pool, index) for index in range(cancels)]
+        start = time.perf_counter()
+        await pool.cancel_many([f"{url}/batch-{index}" for index in range(cancels)])
+        batch_ms = (time.perf_counter() - start) * 1000
+    finally:
+        await pool.stop()
+    return {"cold": sorted(cold), "pooled": sorted(pooled), "batch_ms": batch_ms}
+
+
+def bench_cancellation(cancels: int, size: int) -> None:
+    """Compare per-cancel latency with a browser launch per cancel vs the warm pool."""
+
+    t('scripts.benchmarks.bench_cancellation')
+    logging.getLogger("CancellationBrowserPool").setLevel(logging.WARNING)
+
+    with _fake_confirmation_server() as url:
+        result = asyncio.run(_cancellation_latencies(url, cancels, size))
+    print(f"{cancels} cancellations against a local confirmation page, pool size {size}")
+    print(f"{'mode':8} {'median ms':>10} {'max ms':>10}")
+    for label in ("cold", "pooled"):
+        samples = result[label]
+        print(f"{label:8} {statistics.median(samples):10.0f} {samples[-1]:10.0f}")
+    print(f"batch of {cancels} on the warm pool: {result['batch_ms']:.0f} ms wall")
+
+
+def _synthetic_topology(clubs: int, courts_per_club: int):
+    """Build ``clubs`` fake Acuity hosts with ``courts_per_club`` courts each."""
+
+    t('scripts.benchmarks._synthetic_topology')
+    from infrastructure.court_topology import CourtTopology, build_court
+
+    return CourtTopology(
+        build_court(
+            club_index * courts_per_club + offset + 1,
+            f"{club_index}{offset:04d}",
+            f"9{club_index}{offset:04d}",
+            base_url=f"https://club{club_index}.as.me",
+            schedule_id="bench",
+            club=f"club{club_index}",
+        )
+        for club_index in range(clubs)
+        for offset in range(courts_per_club)
+    )
+
+
+async def _dispatch_plan(plan: Dict[str, Any], topology: Any, per_host: int, booking_s: float):
+    """Dispatch ``plan`` with fake executors bounded per host; return wall time and peaks."""
+
+    t('scripts.benchmarks._dispatch_plan')
+    from reservations.queue.scheduler.dispatch import DispatchJob, dispatch_to_executors
+
+    semaphores = {host: asyncio.Semaphore(per_host) for host in topology.courts_by_host()}
+    active: Dict[str, int] = {host: 0 for host in semaphores}
+    peaks: Dict[str, int] = dict(active)
+
+    async def execute_single(assignment, reservation, index, total, *, prebuilt_request=None):
+        t('scripts.benchmarks._dispatch_plan.execute_single')
+        host = topology.host_for(assignment["attempt"].target_court)
+        async with semaphores[host]:
+            active[host] += 1
+            peaks[host] = max(peaks[host], active[host])
+            await asyncio.sleep(booking_s)
+            active[host] -= 1
+        return {"success": True, "court": assignment["attempt"].target_court}
+
+    assignments = plan["browser_assignments"]
+    jobs = [
+        DispatchJob(
+            reservation_id=assignment["attempt"].reservation_id,
+            assignment=assignment,
+            reservation={"id": assignment["attempt"].reservation_id},
+            index=index,
+            total=len(assignments),
+        )
+        for index, assignment in enumerate(assignments, start=1)
+    ]
+    start = time.perf_counter()
+    results, _ = await dispatch_to_executors(jobs, execute_single=execute_single)
+    return time.perf_counter() - start, peaks, results
+
+
+def bench_topology(clubs: int, courts_per_club: int, per_host: int, booking_ms: float) -> None:
+    """Plan and dispatch one reservation per court over a synthetic multi-club topology."""
+
+    t('scripts.benchmarks.bench_topology')
+    from datetime import datetime, timedelta
+    from types import SimpleNamespace
+
+    from automation.executors.booking_orchestrator import DynamicBookingOrchestrator
+    from infrastructure.court_topology import set_court_topology
+
+    logging.getLogger("BookingOrchestrator").setLevel(logging.WARNING)
+    topology = _synthetic_topology(clubs, courts_per_club)
+    previous = set_court_topology(topology)
+    try:
+        base = datetime(2030, 1, 1)
+        reservations = [
+            SimpleNamespace(
+                id=f"res-{court.number}",
+                user_id=court.number,
+                priority=2,
+                created_at=base + timedelta(seconds=court.number),
+                courts=[court.number],
+            )
+            for court in topology
+        ]
+        orchestrator = DynamicBookingOrchestrator(racing=False)
+        start = time.perf_counter()
+        plan = orchestrator.create_booking_plan(reservations, "08:00")
+        plan_ms = (time.perf_counter() - start) * 1000
+        wall_s, peaks, results = asyncio.run(
+            _dispatch_plan(plan, topology, per_host, booking_ms / 1000)
+        )
+    finally:
+        set_court_topology(previous)
+
+    print(f"{len(topology)} courts over {clubs} clubs, {per_host} pages per host")
+    print(f"plan: {plan_ms:.2f} ms for {plan['initial_attempts']} attempts")
+    print(
+        f"dispatch: {wall_s:.2f} s wall for {len(results)} bookings of {booking_ms:.0f} ms "
+        f"(serial {len(results) * booking_ms / 1000:.2f} s)"
+    )
+    for host, peak in peaks.items():
+        print(f"  {host:24} peak concurrency {peak}")
+
+
+def main() -> None:
+    t('scripts.benchmarks.main')
+    parser = argparse.ArgumentParser(description="LVBot micro-benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    tracking_parser = subparsers.add_parser("tracking", help="tracking.t() per-call overhead")
+    tracking_parser.add_argument("--iterations", type=int, default=1_000_000)
+
+    queue_parser = subparsers.add_parser("queue", help="ReservationQueue lookups at scale")
+    queue_parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    queue_parser.add_argument("--probes", type=int, default=200)
+
+    resources_parser = subparsers.add_parser(
+        "resources", help="court page reload latency with/without resource blocking"
+    )
+    resources_parser.add_argument("--court", type=int, default=1)
+    resources_parser.add_argument("--reloads", type=int, default=10)
+    resources_parser.add_argument("--headed", action="store_true", help="run Chromium headed")
+
+    modes_parser = subparsers.add_parser(
+        "pool-modes", help="AsyncBrowserPool memory and reload latency per launch mode"
+    )
+    modes_parser.add_argument("--modes", nargs="+", default=["headed", "headless"])
+    modes_parser.add_argument("--courts", type=int, nargs="+", default=[1, 2, 3])
+    modes_parser.add_argument("--reloads", type=int, default=5)
+
+    topology_parser = subparsers.add_parser(
+        "topology", help="orchestrator planning and per-host dispatch over N courts"
+    )
+    topology_parser.add_argument("--clubs", type=int, default=2)
+    topology_parser.add_argument("--courts-per-club", type=int, default=12)
+    topology_parser.add_argument("--per-host", type=int, default=3)
+    topology_parser.add_argument("--booking-ms", type=float, default=200.0)
+
+    fast_start_parser = subparsers.add_parser(
+        "fast-start", help="cold vs warm pool time-to-ready with persistent court profiles"
+    )
+    fast_start_parser.add_argument("--courts", type=int, nargs="+", default=[1, 2, 3])
+
+    cancellation_parser = subparsers.add_parser(
+        "cancellation", help="per-cancel latency with a fresh browser vs the warm cancellation pool"
+    )
+    cancellation_parser.add_argument("--cancels", type=int, default=5)
+    cancellation_parser.add_argument("--size", type=int, default=2)
+
+    args = parser.parse_args()
+
+    if args.command == "tracking":
+        bench_tracking(args.iterations)
+    elif args.command == "queue":
+        bench_queue(args.sizes, args.probes)
+    elif args.command == "resources":
+        bench_resources(args.court, args.reloads, headless=not args.headed)
+    elif args.command == "pool-modes":
+        bench_pool_modes(args.modes, args.courts, args.reloads)
+    elif args.command == "topology":
+        bench_topology(args.clubs, args.courts_per_club, args.per_host, args.booking_ms)
+    elif args.command == "fast-start":
+        bench_fast_start(args.courts)
+    elif args.command == "cancellation":
+        bench_cancellation(args.cancels, args.size)
+
+
+if __name__ == "__main__":
+    main()
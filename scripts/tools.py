@@ -7,6 +7,8 @@ from __future__ import annotations
 from tracking import t
 
 import argparse
+from infrastructure.settings import get_settings
+from infrastructure.tracing import format_summary, load_traces, summarize_traces
 from users.manager import UserManager
 from reservations.services import ReservationService
 
@@ -37,14 +39,30 @@ def list_queue() -> None:
         )
 
 
+def trace_summary(path: str | None = None) -> None:
+    """Print per-phase p50/p95 booking latency from a trace JSONL file."""
+
+    t('scripts.tools.trace_summary')
+    path = path or get_settings().booking_trace_file
+    if not path:
+        print("No trace file given and BOOKING_TRACE_FILE is not set.")
+        return
+    records = load_traces(path)
+    print(f"{len(records)} booking trace(s) from {path}")
+    print(format_summary(summarize_traces(records)))
+
+
 def main() -> None:
     t('scripts.tools.main')
     parser = argparse.ArgumentParser(description="LVBot utility helpers")
-    parser.add_argument("command", choices=["list-queue"], help="Command to execute")
+    parser.add_argument("command", choices=["list-queue", "trace-summary"], help="Command to execute")
+    parser.add_argument("path", nargs="?", help="Trace file for trace-summary (default BOOKING_TRACE_FILE)")
     args = parser.parse_args()
 
     if args.command == "list-queue":
         list_queue()
+    elif args.command == "trace-summary":
+        trace_summary(args.path)
 
 
 if __name__ == "__main__":
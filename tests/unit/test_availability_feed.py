@@ -0,0 +1,123 @@
+from tracking import t
+import asyncio
+import logging
+import random
+from datetime import datetime
+
+import pytest
+
+from monitoring.availability_feed import CLOSED, OPENED, AvailabilityFeed, IntervalIndex
+from monitoring.availability_poller import AvailabilityPoller
+from monitoring.court_monitor import CourtMonitor
+
+LOGGER = logging.getLogger("test_availability_feed")
+DAY = "2030-01-01"
+
+
+class StubFetcher:
+    def __init__(self, snapshots):
+        t('tests.unit.test_availability_feed.StubFetcher.__init__')
+        self.snapshots = snapshots
+        self.calls = 0
+
+    async def fetch(self):
+        t('tests.unit.test_availability_feed.StubFetcher.fetch')
+        snapshot = self.snapshots[min(self.calls, len(self.snapshots) - 1)]
+        self.calls += 1
+        await asyncio.sleep(0)
+        return snapshot
+
+
+def test_interval_index_matches_brute_force_stabbing():
+    t('tests.unit.test_availability_feed.test_interval_index_matches_brute_force_stabbing')
+    rng = random.Random(7)
+    index = IntervalIndex()
+    intervals = {}
+    for key in range(60):
+        low = rng.randrange(0, 1440)
+        intervals[key] = (low, min(1439, low + rng.randrange(0, 240)))
+        index.add(key, *intervals[key])
+    for key in range(0, 60, 3):
+        index.remove(key)
+        del intervals[key]
+
+    for point in range(0, 1440, 7):
+        expected = [key for key, (low, high) in intervals.items() if low <= point <= high]
+        assert index.stab(point) == expected
+    assert index.stab(-1) == [] and index.stab(5000) == []
+    with pytest.raises(ValueError):
+        index.add("bad", 10, 9)
+
+
+@pytest.mark.asyncio
+async def test_feed_delivers_events_only_to_matching_subscribers():
+    t('tests.unit.test_availability_feed.test_feed_delivers_events_only_to_matching_subscribers')
+    fetcher = StubFetcher([
+        {1: {DAY: ["08:00"]}, 2: {DAY: []}},
+        {1: {DAY: ["09:00", "18:00"]}, 2: {DAY: ["09:30"], "2030-01-02": ["09:00"]}},
+    ])
+    feed = AvailabilityFeed(AvailabilityPoller(fetcher.fetch, logger=LOGGER), logger=LOGGER)
+    received = {}
+
+    def collector(name):
+        def callback(event):
+            received.setdefault(name, []).append((event.court, event.date, event.time, event.kind))
+        return callback
+
+    async def async_collector(event):
+        await asyncio.sleep(0)
+        collector("async")(event)
+
+    def broken(event):
+        raise RuntimeError("subscriber bug")
+
+    feed.subscribe(collector("morning"), play_date=DAY, start_time="08:00", end_time="10:00")
+    feed.subscribe(collector("court2"), play_date=DAY, courts=[2])
+    feed.subscribe(collector("closed"), play_date=DAY, kinds=[CLOSED])
+    feed.subscribe(broken, play_date=DAY, start_time="09:00", end_time="09:00")
+    feed.subscribe(async_collector, play_date="2030-01-02")
+    once = feed.subscribe(collector("once"), play_date=DAY, start_time="07:00", end_time="23:00", once=True)
+
+    await feed.poll()
+    assert received == {"morning": [(1, DAY, "08:00", OPENED)], "once": [(1, DAY, "08:00", OPENED)]}
+    assert feed.unsubscribe(once) is False and len(feed) == 5
+
+    received.clear()
+    await feed.poll()
+    assert received == {
+        "morning": [(1, DAY, "09:00", OPENED), (2, DAY, "09:30", OPENED)],
+        "court2": [(2, DAY, "09:30", OPENED)],
+        "closed": [(1, DAY, "08:00", CLOSED)],
+        "async": [(2, "2030-01-02", "09:00", OPENED)],
+    }
+    court1 = feed.subscribe(lambda event: None, play_date=DAY, courts=[1])
+    assert [event.time for event in feed.current(court1)] == ["09:00", "18:00"]
+    assert feed.prune("2030-01-02") == 5 and len(feed) == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_slot_monitors_share_one_poll_loop():
+    t('tests.unit.test_availability_feed.test_concurrent_slot_monitors_share_one_poll_loop')
+    fetcher = StubFetcher([
+        {1: {DAY: []}, 2: {DAY: []}, 3: {DAY: []}},
+        {1: {DAY: ["09:00"]}, 2: {DAY: []}, 3: {DAY: []}},
+        {1: {DAY: ["09:00"]}, 2: {DAY: ["09:00"]}, 3: {DAY: []}},
+    ])
+    monitor = CourtMonitor(poll_interval=0.01, logger=LOGGER)
+    monitor.poller = AvailabilityPoller(fetcher.fetch, logger=LOGGER)
+    monitor.feed = AvailabilityFeed(monitor.poller, logger=LOGGER)
+    monitor._started = True
+    target = monitor.timezone.localize(datetime(2030, 1, 1, 9, 0))
+
+    court1, court2, court3 = await asyncio.gather(
+        monitor.monitor_slot(1, target, timeout_seconds=1),
+        monitor.monitor_slot(2, target, timeout_seconds=1),
+        monitor.monitor_slot(3, target, timeout_seconds=0.1),
+    )
+    polls = fetcher.calls
+    await asyncio.sleep(0.05)
+
+    assert (court1["status"], court2["status"], court3["status"]) == ("available", "available", "timeout")
+    # Three monitors, one fetch per interval; the loop stops once nobody is subscribed.
+    assert polls <= 0.1 / 0.01 + 2
+    assert fetcher.calls == polls and not monitor.feed.polling and len(monitor.feed) == 0
@@ -0,0 +1,165 @@
+from tracking import t
+import asyncio
+import json
+from datetime import date, datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+from automation.availability import checker as checker_module
+from automation.availability.api import fetch_available_slots
+from automation.availability.checker import AvailabilityChecker
+from automation.availability.network_extraction import (
+    AvailabilityResponseListener,
+    parse_availability_payload,
+)
+
+FIXTURES = json.loads(
+    (Path(__file__).parent / "fixtures" / "acuity_availability.json").read_text(encoding="utf-8")
+)
+
+
+class RecordedResponse:
+    def __init__(self, url, payload):
+        t('tests.unit.test_availability_network_extraction.RecordedResponse.__init__')
+        self.url = url
+        self._payload = payload
+
+    async def json(self):
+        t('tests.unit.test_availability_network_extraction.RecordedResponse.json')
+        await asyncio.sleep(0)
+        return self._payload
+
+
+class RecordedFrame:
+    def __init__(self, dom):
+        t('tests.unit.test_availability_network_extraction.RecordedFrame.__init__')
+        self._dom = dom
+
+    async def evaluate(self, script):
+        t('tests.unit.test_availability_network_extraction.RecordedFrame.evaluate')
+        if "button.time-selection" in script:
+            return self._dom["buttons"]
+        return self._dom["text"]
+
+
+class RecordedPage:
+    """Replays a recorded calendar: DOM snapshot plus the XHRs fired on reload."""
+
+    def __init__(self, scenario, *, replay_network=True):
+        t('tests.unit.test_availability_network_extraction.RecordedPage.__init__')
+        self.main_frame = RecordedFrame(scenario["dom"])
+        self._responses = scenario["responses"] if replay_network else []
+        self._listeners = []
+
+    def on(self, event, handler):
+        t('tests.unit.test_availability_network_extraction.RecordedPage.on')
+        self._listeners.append(handler)
+
+    def remove_listener(self, event, handler):
+        t('tests.unit.test_availability_network_extraction.RecordedPage.remove_listener')
+        self._listeners.remove(handler)
+
+    async def reload(self, **kwargs):
+        t('tests.unit.test_availability_network_extraction.RecordedPage.reload')
+        for recorded in self._responses:
+            for handler in list(self._listeners):
+                handler(RecordedResponse(recorded["url"], recorded["json"]))
+
+    async def query_selector(self, selector):
+        t('tests.unit.test_availability_network_extraction.RecordedPage.query_selector')
+        return None
+
+
+async def extract_both_paths(scenario):
+    t('tests.unit.test_availability_network_extraction.extract_both_paths')
+    reference_date = date.fromisoformat(scenario["reference_date"])
+    current_time = datetime.fromisoformat(scenario["current_time"])
+    page = RecordedPage(scenario)
+
+    async with AvailabilityResponseListener(page) as listener:
+        await page.reload()
+        network_slots = await listener.collect(timeout=0.5)
+
+    network = await fetch_available_slots(
+        page,
+        reference_date=reference_date,
+        current_time=current_time,
+        network_slots=network_slots,
+    )
+    dom = await fetch_available_slots(
+        page, reference_date=reference_date, current_time=current_time,
+    )
+    return network, dom
+
+
+def test_parse_payload_skips_full_slots_and_foreign_keys():
+    t('tests.unit.test_availability_network_extraction.test_parse_payload_skips_full_slots_and_foreign_keys')
+    payload = FIXTURES["aligned"]["responses"][1]["json"]
+    assert parse_availability_payload(payload) == {
+        "2025-08-11": ["15:00", "18:00", "19:00"],
+        "2025-08-12": ["07:00", "08:00"],
+    }
+    assert parse_availability_payload({"2025-08-11": True}) == {}
+    assert parse_availability_payload(["2025-08-13T06:30:00-0600"]) == {"2025-08-13": ["06:30"]}
+    assert parse_availability_payload("not json") == {}
+
+
+@pytest.mark.asyncio
+async def test_network_and_dom_paths_agree_on_recorded_calendar():
+    t('tests.unit.test_availability_network_extraction.test_network_and_dom_paths_agree_on_recorded_calendar')
+    scenario = FIXTURES["aligned"]
+    network, dom = await extract_both_paths(scenario)
+
+    assert network == scenario["expected"]
+    assert dom == network
+
+
+@pytest.mark.asyncio
+async def test_network_path_resolves_day_boundary_the_dom_heuristic_misses():
+    t(
+        'tests.unit.test_availability_network_extraction'
+        '.test_network_path_resolves_day_boundary_the_dom_heuristic_misses'
+    )
+    scenario = FIXTURES["ambiguous_day_boundary"]
+    network, dom = await extract_both_paths(scenario)
+
+    assert network == scenario["expected"]
+    # 07:00 -> 09:00 never "wraps", so order-based grouping keeps every slot on today.
+    assert dom == {"2025-08-11": ["07:00", "09:00", "20:00"], "2025-08-12": []}
+
+
+@pytest.mark.asyncio
+async def test_checker_falls_back_to_dom_without_payload(monkeypatch):
+    t('tests.unit.test_availability_network_extraction.test_checker_falls_back_to_dom_without_payload')
+    scenario = FIXTURES["aligned"]
+    pages = {
+        1: RecordedPage(scenario),
+        2: RecordedPage(scenario, replay_network=False),
+    }
+    monkeypatch.setattr(
+        checker_module.AvailabilityResponseListener,
+        "collect",
+        _fast_collect(AvailabilityResponseListener.collect),
+    )
+    checker = AvailabilityChecker(SimpleNamespace(pages=pages), use_cache=False)
+
+    reference_date = date.fromisoformat(scenario["reference_date"])
+    current_time = datetime.fromisoformat(scenario["current_time"])
+    results = await checker.check_availability(
+        [1, 2], reference_date=reference_date, current_time=current_time,
+    )
+
+    assert results[1] == scenario["expected"]
+    assert results[2] == scenario["expected"]
+    assert pages[1]._listeners == [] and pages[2]._listeners == []
+
+
+def _fast_collect(collect):
+    t('tests.unit.test_availability_network_extraction._fast_collect')
+
+    async def fast(self, timeout=1.0):
+        return await collect(self, timeout=0.05)
+
+    return fast
@@ -0,0 +1,118 @@
+from tracking import t
+import asyncio
+from datetime import datetime
+
+import pytest
+
+from automation.availability.checker import AvailabilityChecker
+from automation.availability.snapshot_cache import AvailabilitySnapshotCache
+
+
+class FakeClock:
+    def __init__(self):
+        t('tests.unit.test_availability_snapshot_cache.FakeClock.__init__')
+        self.now = 0.0
+
+    def __call__(self):
+        t('tests.unit.test_availability_snapshot_cache.FakeClock.__call__')
+        return self.now
+
+
+def counting_loader(calls, slots, delay=0.01):
+    t('tests.unit.test_availability_snapshot_cache.counting_loader')
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(delay)
+        return {"2030-01-01": list(slots)}
+
+    return load
+
+
+@pytest.mark.asyncio
+async def test_concurrent_users_trigger_one_reload_per_court(monkeypatch):
+    t('tests.unit.test_availability_snapshot_cache.test_concurrent_users_trigger_one_reload_per_court')
+    reloads = {}
+
+    async def fake_single_court(self, court_num, **kwargs):
+        reloads[court_num] = reloads.get(court_num, 0) + 1
+        await asyncio.sleep(0.02)
+        return {"2030-01-01": ["08:00", "09:00"]}
+
+    monkeypatch.setattr(AvailabilityChecker, "check_single_court", fake_single_court)
+    cache = AvailabilitySnapshotCache(ttl=30)
+    checkers = [AvailabilityChecker(browser_pool=None, cache=cache) for _ in range(20)]
+
+    results = await asyncio.gather(*(checker.check_availability() for checker in checkers))
+
+    assert reloads == {1: 1, 2: 1, 3: 1}
+    assert all(result[2] == {"2030-01-01": ["08:00", "09:00"]} for result in results)
+    assert cache.stats["reloads"] == 3
+    assert cache.stats["coalesced"] == 57
+
+    # Callers get independent copies of the shared snapshot.
+    results[0][1]["2030-01-01"].clear()
+    assert (await checkers[1].check_availability([1]))[1]["2030-01-01"] == ["08:00", "09:00"]
+    assert reloads[1] == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_entries_are_served_while_revalidating():
+    t('tests.unit.test_availability_snapshot_cache.test_stale_entries_are_served_while_revalidating')
+    clock = FakeClock()
+    cache = AvailabilitySnapshotCache(ttl=10, stale_seconds=20, clock=clock)
+    calls = []
+
+    assert await cache.get(1, counting_loader(calls, ["08:00"])) == {"2030-01-01": ["08:00"]}
+    clock.now = 5
+    assert await cache.get(1, counting_loader(calls, ["09:00"])) == {"2030-01-01": ["08:00"]}
+    assert len(calls) == 1
+
+    clock.now = 15
+    stale = await cache.get(1, counting_loader(calls, ["09:00"]))
+    assert stale == {"2030-01-01": ["08:00"]}
+    await asyncio.sleep(0.05)
+    assert len(calls) == 2
+    assert await cache.get(1, counting_loader(calls, ["10:00"])) == {"2030-01-01": ["09:00"]}
+
+    clock.now = 100
+    assert await cache.get(1, counting_loader(calls, ["11:00"])) == {"2030-01-01": ["11:00"]}
+    assert cache.stats == {"hits": 2, "stale_hits": 1, "misses": 2, "coalesced": 0, "reloads": 3}
+
+
+@pytest.mark.asyncio
+async def test_failed_reload_reaches_every_waiter_and_is_not_cached():
+    t('tests.unit.test_availability_snapshot_cache.test_failed_reload_reaches_every_waiter_and_is_not_cached')
+    cache = AvailabilitySnapshotCache(ttl=30)
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise RuntimeError("page crashed")
+
+    results = await asyncio.gather(*(cache.get(2, failing) for _ in range(5)), return_exceptions=True)
+    assert len(calls) == 1
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+    assert await cache.get(2, counting_loader(calls, ["08:00"])) == {"2030-01-01": ["08:00"]}
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_cached_today_slots_are_refiltered_for_the_caller(monkeypatch):
+    t('tests.unit.test_availability_snapshot_cache.test_cached_today_slots_are_refiltered_for_the_caller')
+    today = datetime.now().date().isoformat()
+
+    async def fake_single_court(self, court_num, **kwargs):
+        return {today: ["07:00", "12:00", "20:00"]}
+
+    monkeypatch.setattr(AvailabilityChecker, "check_single_court", fake_single_court)
+    checker = AvailabilityChecker(browser_pool=None, cache=AvailabilitySnapshotCache(ttl=30))
+
+    morning = datetime.combine(datetime.now().date(), datetime.min.time()).replace(hour=6)
+    evening = morning.replace(hour=13)
+    assert (await checker.check_availability([1], current_time=morning))[1][today] == [
+        "07:00", "12:00", "20:00",
+    ]
+    assert (await checker.check_availability([1], current_time=evening))[1][today] == ["20:00"]
@@ -0,0 +1,126 @@
+from tracking import t
+import asyncio
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from automation.forms.submission import PhaseTimer
+from infrastructure.tracing import (
+    TraceExporter,
+    booking_trace,
+    current_trace,
+    load_traces,
+    set_trace_exporter,
+    span,
+    summarize_traces,
+)
+from reservations.queue.scheduler.dispatch import DispatchJob, dispatch_to_executors
+from reservations.queue.scheduler.pipeline import ReservationBatch
+from reservations.queue.scheduler.services import HydratedReservations, SchedulerPipeline
+
+
+@pytest.fixture
+def exporter(tmp_path):
+    t('tests.unit.test_booking_tracing.exporter')
+    installed = TraceExporter(str(tmp_path / "traces.jsonl"))
+    previous = set_trace_exporter(installed)
+    yield installed
+    set_trace_exporter(previous)
+
+
+def _job(reservation_id, court):
+    t('tests.unit.test_booking_tracing._job')
+    attempt = SimpleNamespace(reservation_id=reservation_id, target_court=court)
+    return DispatchJob(
+        reservation_id=reservation_id,
+        assignment={"attempt": attempt, "browser_id": f"court_{court}"},
+        reservation={"id": reservation_id},
+        index=court,
+        total=2,
+    )
+
+
+@pytest.mark.asyncio
+async def test_pipeline_exports_one_trace_per_booking_with_batch_and_flow_phases(exporter):
+    t('tests.unit.test_booking_tracing.test_pipeline_exports_one_trace_per_booking_with_batch_and_flow_phases')
+
+    async def execute_single(assignment, reservation, index, total, *, prebuilt_request=None):
+        timer = PhaseTimer()
+        for phase in ("slot_visible", "click", "form_visible", "fill", "submit", "confirm"):
+            with timer.phase(phase):
+                await asyncio.sleep(0)
+        return {"success": index == 1, "court": assignment["attempt"].target_court}
+
+    async def executor(reservations, **kwargs):
+        with span("refresh"):
+            await asyncio.sleep(0)
+        with span("plan"):
+            jobs = [_job(r["id"], court) for court, r in enumerate(reservations, start=1)]
+        await dispatch_to_executors(jobs, execute_single=execute_single, timeout_seconds=5)
+
+    async def prearm(reservations):
+        assert current_trace() is not None
+
+    pipeline = SchedulerPipeline(
+        logger=SimpleNamespace(),
+        hydrator=SimpleNamespace(hydrate=lambda batch: HydratedReservations(batch.reservations, {})),
+        health_check=lambda reservations: None,
+        executor=executor,
+        prearm=prearm,
+    )
+    batch = ReservationBatch(
+        time_key="2030-01-05_08:00",
+        target_date="2030-01-05",
+        target_time="08:00",
+        reservations=[{"id": "res-a"}, {"id": "res-b"}],
+    )
+
+    await pipeline.process(
+        SimpleNamespace(requires_health_check=[], requires_prearm=[batch], ready_for_execution=[batch])
+    )
+
+    records = load_traces(str(exporter.path))
+    assert [r["attributes"]["stage"] for r in records[-1:]] == ["prearm"]
+    bookings = {r["trace_id"]: r for r in records if r["attributes"]["stage"] == "booking"}
+    assert sorted(bookings) == ["res-a", "res-b"] and len(records) == 3
+    booking = bookings["res-a"]
+    assert list(booking["phases"]) == [
+        "hydrate", "refresh", "plan", "slot_visible", "click", "form_visible", "fill", "submit", "confirm",
+    ]
+    assert booking["attributes"]["court"] == 1 and booking["attributes"]["success"] is True
+    assert bookings["res-b"]["attributes"]["success"] is False
+    assert [s["name"] for s in booking["spans"] if s.get("shared")] == ["hydrate", "refresh", "plan"]
+    assert booking["duration_ms"] >= booking["spans"][-1]["offset_ms"]
+
+    summary = exporter.summary()
+    assert summary["prearm"]["count"] == 1 and summary["fill"]["count"] == 2
+    assert summary["total"]["count"] == 2
+
+
+def test_span_is_noop_outside_trace_and_records_errors(exporter):
+    t('tests.unit.test_booking_tracing.test_span_is_noop_outside_trace_and_records_errors')
+    with span("fill"):
+        pass
+    assert current_trace() is None and list(exporter.recent) == []
+
+    with pytest.raises(RuntimeError):
+        with booking_trace("res-x"):
+            with span("submit"):
+                raise RuntimeError("boom")
+
+    (record,) = exporter.recent
+    assert record["spans"][0]["error"] == "RuntimeError"
+    assert json.loads(exporter.path.read_text().strip())["trace_id"] == "res-x"
+
+
+def test_summary_reports_nearest_rank_percentiles():
+    t('tests.unit.test_booking_tracing.test_summary_reports_nearest_rank_percentiles')
+    records = [{"duration_ms": 100.0 + i, "phases": {"fill": float(i)}} for i in range(1, 21)]
+    records.append({"duration_ms": 999.0, "attributes": {"stage": "batch"}, "phases": {"hydrate": 3.0}})
+
+    summary = summarize_traces(records)
+
+    assert list(summary) == ["hydrate", "fill", "total"]
+    assert summary["fill"] == {"count": 20, "p50_ms": 11.0, "p95_ms": 20.0}
+    assert summary["total"]["count"] == 20 and summary["total"]["p95_ms"] == 120.0
@@ -0,0 +1,116 @@
+from tracking import t
+from types import SimpleNamespace
+
+import pytest
+
+from automation.browser.async_browser_pool import AsyncBrowserPool
+from automation.browser.pool import manager as manager_module
+from automation.browser.pool.modes import get_launch_profile
+
+
+class FakeChromium:
+    def __init__(self):
+        t('tests.unit.test_browser_pool_modes.FakeChromium.__init__')
+        self.launches = []
+
+    async def launch(self, **kwargs):
+        t('tests.unit.test_browser_pool_modes.FakeChromium.launch')
+        self.launches.append(kwargs)
+        return SimpleNamespace()
+
+
+class FakeCDPSession:
+    def __init__(self, heap_bytes):
+        t('tests.unit.test_browser_pool_modes.FakeCDPSession.__init__')
+        self.heap_bytes = heap_bytes
+        self.detached = False
+
+    async def send(self, method):
+        t('tests.unit.test_browser_pool_modes.FakeCDPSession.send')
+        if method != "Performance.getMetrics":
+            return {}
+        return {"metrics": [
+            {"name": "JSHeapUsedSize", "value": self.heap_bytes},
+            {"name": "JSHeapTotalSize", "value": self.heap_bytes * 2},
+            {"name": "Nodes", "value": 812},
+            {"name": "Documents", "value": 3},
+        ]}
+
+    async def detach(self):
+        t('tests.unit.test_browser_pool_modes.FakeCDPSession.detach')
+        self.detached = True
+
+
+def fake_page(heap_bytes=None):
+    t('tests.unit.test_browser_pool_modes.fake_page')
+    sessions = []
+
+    async def new_cdp_session(page):
+        if heap_bytes is None:
+            raise RuntimeError("Target closed")
+        sessions.append(FakeCDPSession(heap_bytes))
+        return sessions[-1]
+
+    return SimpleNamespace(context=SimpleNamespace(new_cdp_session=new_cdp_session), sessions=sessions)
+
+
+def test_launch_profiles_share_one_process_layout():
+    t('tests.unit.test_browser_pool_modes.test_launch_profiles_share_one_process_layout')
+    headed = get_launch_profile("headed")
+    headless = get_launch_profile(" Headless ")
+
+    assert (headed.headless, headless.headless) == (False, True)
+    assert "--start-maximized" in headed.args
+    assert "--start-maximized" not in headless.args
+    assert "--disable-gpu" in headless.args
+    assert get_launch_profile("bogus") is headed
+    assert get_launch_profile(None) is headed
+
+
+@pytest.mark.asyncio
+async def test_start_pool_launches_single_browser_for_selected_mode(monkeypatch):
+    t('tests.unit.test_browser_pool_modes.test_start_pool_launches_single_browser_for_selected_mode')
+    chromium = FakeChromium()
+
+    class FakePlaywrightStarter:
+        async def start(self):
+            return SimpleNamespace(chromium=chromium)
+
+    async def fake_court_page(self, court, delay):
+        self.pool.pages[court] = object()
+        return True
+
+    monkeypatch.setattr(manager_module, "async_playwright", FakePlaywrightStarter)
+    monkeypatch.setattr(
+        manager_module.BrowserPoolManager,
+        "create_and_navigate_court_page_with_stagger",
+        fake_court_page,
+    )
+
+    pool = AsyncBrowserPool(courts=[1, 2, 3], mode="headless")
+    await pool.start()
+
+    assert pool.mode == "headless"
+    assert len(chromium.launches) == 1
+    assert chromium.launches[0]["headless"] is True
+    assert sorted(pool.pages) == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_memory_stats_report_each_context():
+    t('tests.unit.test_browser_pool_modes.test_memory_stats_report_each_context')
+    pool = AsyncBrowserPool(courts=[1, 2], mode="headless")
+    pool.pages = {1: fake_page(heap_bytes=8 * 1_048_576), 2: fake_page()}
+
+    stats = await pool.get_memory_stats()
+
+    assert stats["mode"] == "headless"
+    assert stats["contexts"][1] == {
+        "js_heap_used_mb": 8.0,
+        "js_heap_total_mb": 16.0,
+        "dom_nodes": 812,
+        "documents": 3,
+    }
+    assert stats["contexts"][2] == {"error": "Target closed"}
+    assert pool.pages[1].sessions[0].detached
+    assert stats["browser_rss_mb"] is None or stats["browser_rss_mb"] >= 0
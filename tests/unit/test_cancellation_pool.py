@@ -0,0 +1,175 @@
+from tracking import t
+import asyncio
+import logging
+
+import pytest
+
+from reservations.services.cancellation_pool import CancellationBrowserPool
+from reservations.services.cancellation_service import ReservationCancellationService
+
+
+class FakeButton:
+    def __init__(self, page):
+        t('tests.unit.test_cancellation_pool.FakeButton.__init__')
+        self.page = page
+
+    async def click(self):
+        t('tests.unit.test_cancellation_pool.FakeButton.click')
+        await asyncio.sleep(0)
+        self.page.body = "Su cita ha sido cancelada" if "ok" in self.page.url else "No se pudo cancelar"
+
+
+class FakePage:
+    def __init__(self, browser):
+        t('tests.unit.test_cancellation_pool.FakePage.__init__')
+        self.browser = browser
+        self.url = ""
+        self.body = ""
+
+    async def goto(self, url, **kwargs):
+        t('tests.unit.test_cancellation_pool.FakePage.goto')
+        self.browser.active += 1
+        self.browser.peak = max(self.browser.peak, self.browser.active)
+        try:
+            await asyncio.sleep(0.01)
+        finally:
+            self.browser.active -= 1
+        if "crash" in url:
+            raise RuntimeError("Target page crashed")
+        self.url = url
+        self.body = "Detalles de su cita"
+
+    async def wait_for_selector(self, selector, **kwargs):
+        t('tests.unit.test_cancellation_pool.FakePage.wait_for_selector')
+        if "missing" in self.url:
+            raise TimeoutError("no button")
+        return FakeButton(self)
+
+    async def wait_for_function(self, script, **kwargs):
+        t('tests.unit.test_cancellation_pool.FakePage.wait_for_function')
+
+    async def text_content(self, selector):
+        t('tests.unit.test_cancellation_pool.FakePage.text_content')
+        return self.body
+
+
+class FakeContext:
+    def __init__(self, browser):
+        t('tests.unit.test_cancellation_pool.FakeContext.__init__')
+        self.browser = browser
+        self.closed = False
+
+    async def new_page(self):
+        t('tests.unit.test_cancellation_pool.FakeContext.new_page')
+        return FakePage(self.browser)
+
+    async def close(self):
+        t('tests.unit.test_cancellation_pool.FakeContext.close')
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        t('tests.unit.test_cancellation_pool.FakeBrowser.__init__')
+        self.contexts = []
+        self.active = 0
+        self.peak = 0
+        self.closed = False
+
+    async def new_context(self):
+        t('tests.unit.test_cancellation_pool.FakeBrowser.new_context')
+        context = FakeContext(self)
+        self.contexts.append(context)
+        return context
+
+
+@pytest.fixture
+def browsers():
+    t('tests.unit.test_cancellation_pool.browsers')
+    return []
+
+
+def _pool(browsers, **kwargs):
+    t('tests.unit.test_cancellation_pool._pool')
+
+    async def launcher():
+        browser = FakeBrowser()
+        browsers.append(browser)
+
+        async def close():
+            browser.closed = True
+
+        return browser, close
+
+    kwargs.setdefault("idle_timeout", 0)
+    return CancellationBrowserPool(launcher=launcher, logger=logging.getLogger("test_cancellation"), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_on_one_launch_with_bounded_warm_contexts(browsers):
+    t('tests.unit.test_cancellation_pool.test_batch_runs_on_one_launch_with_bounded_warm_contexts')
+    pool = _pool(browsers, size=2)
+    service = ReservationCancellationService(pool)
+    urls = [f"https://club.as.me/confirmation/ok-{i}" for i in range(5)] + ["https://club.as.me/confirmation/bad"]
+
+    results = await service.cancel_reservations(urls)
+    single = await service.cancel_reservation("https://club.as.me/confirmation/ok-late")
+    await pool.stop()
+
+    assert [r["success"] for r in results] == [True] * 5 + [False]
+    assert results[-1]["error"] == "Error message detected on page"
+    assert single["success"] is True
+    assert pool.launches == 1 and len(browsers[0].contexts) == 2
+    assert browsers[0].peak == 2
+    assert browsers[0].closed and all(context.closed for context in browsers[0].contexts)
+
+
+@pytest.mark.asyncio
+async def test_crashed_page_is_replaced_and_missing_button_reported(browsers):
+    t('tests.unit.test_cancellation_pool.test_crashed_page_is_replaced_and_missing_button_reported')
+    pool = _pool(browsers, size=1)
+
+    crashed, missing, ok = await pool.cancel_many(
+        ["https://club.as.me/crash", "https://club.as.me/missing", "https://club.as.me/ok"]
+    )
+    await pool.stop()
+
+    assert crashed == {
+        "success": False,
+        "message": "Cancellation failed: Target page crashed",
+        "error": "Target page crashed",
+    }
+    assert missing["error"] == "CANCELAR button not found"
+    assert ok["success"] is True
+    assert len(browsers[0].contexts) == 2 and browsers[0].contexts[0].closed
+
+
+@pytest.mark.asyncio
+async def test_idle_pool_closes_browser_and_relaunches_on_demand(browsers):
+    t('tests.unit.test_cancellation_pool.test_idle_pool_closes_browser_and_relaunches_on_demand')
+    pool = _pool(browsers, size=1, idle_timeout=0.01)
+
+    assert (await pool.cancel("https://club.as.me/ok-1"))["success"]
+    for _ in range(100):
+        if browsers[0].closed:
+            break
+        await asyncio.sleep(0.01)
+    assert not pool.running and browsers[0].closed
+
+    assert (await pool.cancel("https://club.as.me/ok-2"))["success"]
+    assert pool.launches == 2
+    await pool.stop()
+
+
+@pytest.mark.asyncio
+async def test_launch_failure_fails_every_request():
+    t('tests.unit.test_cancellation_pool.test_launch_failure_fails_every_request')
+
+    async def launcher():
+        raise RuntimeError("Executable doesn't exist")
+
+    pool = CancellationBrowserPool(launcher=launcher, idle_timeout=0)
+    results = await pool.cancel_many(["https://club.as.me/a", "https://club.as.me/b"])
+
+    assert [r["error"] for r in results] == ["Executable doesn't exist"] * 2
+    assert not pool.running
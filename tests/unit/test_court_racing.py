@@ -0,0 +1,300 @@
+from tracking import t
+import asyncio
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+
+from automation.executors.booking import AsyncBookingExecutor
+from automation.executors.booking_orchestrator import DynamicBookingOrchestrator
+from automation.executors.core import ExecutionResult
+from automation.executors.flows import fast_flow as fast_flow_module
+from automation.executors.flows import natural_flow as natural_flow_module
+from automation.executors.racing import RACE_LOST_MESSAGE, CommitGuard
+from automation.shared.booking_contracts import BookingRequest, BookingUser
+from botapp.booking import immediate_handler as handler_module
+from botapp.booking.immediate_handler import ImmediateBookingHandler
+from reservations.queue.reservation_scheduler import _booking_result_to_dict
+from reservations.queue.scheduler.outcome import record_outcome
+from tests.helpers import DummyLogger
+
+
+@pytest.mark.asyncio
+async def test_commit_guard_hands_off_after_failure_and_closes_after_win():
+    t('tests.unit.test_court_racing.test_commit_guard_hands_off_after_failure_and_closes_after_win')
+    guard = CommitGuard()
+
+    assert await guard.acquire(1)
+    waiter = asyncio.create_task(guard.acquire(2))
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    guard.settle(3, True)  # not the holder: ignored
+    guard.settle(1, False)
+    assert await waiter
+    guard.settle(2, True)
+
+    assert guard.winner == 2
+    assert not await guard.acquire(3)
+
+
+@pytest.mark.asyncio
+async def test_race_books_once_and_cancels_siblings_before_submit():
+    t('tests.unit.test_court_racing.test_race_books_once_and_cancels_siblings_before_submit')
+    executor = AsyncBookingExecutor(browser_pool=object(), use_natural_flow=True)
+    submitted = []
+    reached_form = {1: 0.01, 2: 0.02, 3: 5.0}
+    slot_free = {1: False, 2: True, 3: True}
+
+    async def fake_execute_booking(court, target_date, time_slot, user_info, *, commit_guard):
+        await asyncio.sleep(reached_form[court])
+        result = None
+        try:
+            if not await commit_guard.acquire(court):
+                result = ExecutionResult(success=False, error_message=RACE_LOST_MESSAGE, court_number=court)
+                return result
+            submitted.append(court)
+            await asyncio.sleep(0.01)
+            result = ExecutionResult(success=slot_free[court], court_number=court)
+            return result
+        finally:
+            commit_guard.settle(court, bool(result and result.success))
+
+    executor._flow_executor = SimpleNamespace(execute_booking=fake_execute_booking)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    race = await executor.execute_parallel_booking([1, 2, 3], "08:00", {}, date(2030, 1, 5))
+
+    assert loop.time() - start < 1.0
+    assert race["success"] and race["successful_court"] == 2
+    assert submitted == [1, 2]
+    assert race["results"][1].success is False
+    assert race["results"][3].error_message == RACE_LOST_MESSAGE
+
+
+def _reservation(user_id, courts):
+    t('tests.unit.test_court_racing._reservation')
+    return SimpleNamespace(
+        id=f"r{user_id}",
+        user_id=user_id,
+        priority=2,
+        created_at=datetime(2030, 1, 1, user_id),
+        courts=courts,
+    )
+
+
+def test_racing_plan_hands_idle_courts_to_top_priority_attempt():
+    t('tests.unit.test_court_racing.test_racing_plan_hands_idle_courts_to_top_priority_attempt')
+    orchestrator = DynamicBookingOrchestrator(racing=True)
+
+    solo = orchestrator.create_booking_plan([_reservation(1, [2])], "08:00")
+    attempt = solo["browser_assignments"][0]["attempt"]
+    assert (attempt.target_court, attempt.race_courts, attempt.fallback_courts) == (2, [1, 3], [])
+
+    orchestrator.reset()
+    pair = orchestrator.create_booking_plan([_reservation(1, [1, 3]), _reservation(2, [1, 2])], "08:00")
+    first, second = (a["attempt"] for a in pair["browser_assignments"])
+    assert (first.target_court, first.race_courts) == (1, [3])
+    assert (second.target_court, second.race_courts) == (2, [])
+
+    orchestrator.handle_booking_result("r1", True, court_booked=3)
+    assert orchestrator.court_status == {1: "available", 2: "attempting", 3: "booked"}
+
+    orchestrator.reset()
+    orchestrator.racing_enabled = False
+    plain = orchestrator.create_booking_plan([_reservation(1, [2])], "08:00")
+    assert plain["browser_assignments"][0]["attempt"].race_courts == []
+
+
+@pytest.mark.asyncio
+async def test_commit_guard_keeps_race_after_unconfirmed_submit():
+    t('tests.unit.test_court_racing.test_commit_guard_keeps_race_after_unconfirmed_submit')
+    guard = CommitGuard()
+
+    assert await guard.acquire(1)
+    guard.mark_submitted(1)
+    guard.record_outcome(1, "rejected")
+    guard.settle(1, False)
+    assert not guard.decided
+
+    assert await guard.acquire(2)
+    guard.mark_submitted(2)
+    guard.record_outcome(2, "timeout")
+    guard.settle(2, False)
+
+    assert (guard.winner, guard.uncertain) == (2, True)
+    assert not await guard.acquire(3)
+
+
+@pytest.mark.asyncio
+async def test_race_stops_after_uncertain_submit_and_races_every_court():
+    t('tests.unit.test_court_racing.test_race_stops_after_uncertain_submit_and_races_every_court')
+    executor = AsyncBookingExecutor(browser_pool=object(), use_natural_flow=True)
+    submitted = []
+
+    async def fake_execute_booking(court, target_date, time_slot, user_info, *, commit_guard):
+        await asyncio.sleep(0.01 * court)
+        if not await commit_guard.acquire(court):
+            return ExecutionResult(success=False, error_message=RACE_LOST_MESSAGE, court_number=court)
+        submitted.append(court)
+        commit_guard.mark_submitted(court)
+        commit_guard.settle(court, False)
+        return ExecutionResult(success=False, error_message="No confirmation", court_number=court)
+
+    executor._flow_executor = SimpleNamespace(execute_booking=fake_execute_booking)
+
+    race = await executor.execute_parallel_booking([1, 2, 3, 4], "08:00", {}, date(2030, 1, 5))
+
+    assert submitted == [1]
+    assert not race["success"] and race["uncertain_court"] == 1
+    assert race["courts_attempted"] == [1, 2, 3, 4]
+    assert all(race["results"][court].error_message == RACE_LOST_MESSAGE for court in (2, 3, 4))
+
+
+@pytest.mark.asyncio
+async def test_uncertain_race_is_reported_and_never_retried_on_a_fallback(monkeypatch):
+    t('tests.unit.test_court_racing.test_uncertain_race_is_reported_and_never_retried_on_a_fallback')
+
+    class UncertainRaceExecutor:
+        def __init__(self, pool, config=None):
+            t(
+                'tests.unit.test_court_racing.test_uncertain_race_is_reported_and_never_retried_on_a_fallback'
+                '.UncertainRaceExecutor.__init__'
+            )
+
+        async def execute_parallel_booking(self, court_numbers, time_slot, user_info, target_date):
+            t(
+                'tests.unit.test_court_racing.test_uncertain_race_is_reported_and_never_retried_on_a_fallback'
+                '.UncertainRaceExecutor.execute_parallel_booking'
+            )
+            return {
+                "success": False,
+                "successful_court": None,
+                "uncertain_court": 3,
+                "results": {
+                    1: ExecutionResult(success=False, error_message=RACE_LOST_MESSAGE, court_number=1),
+                    3: ExecutionResult(success=False, error_message="No confirmation", court_number=3),
+                },
+                "courts_attempted": court_numbers,
+            }
+
+    monkeypatch.setattr(handler_module, "UnifiedAsyncBookingExecutor", UncertainRaceExecutor)
+    handler = ImmediateBookingHandler(user_manager=None, browser_pool="pool")
+    request = BookingRequest.from_reservation_record(
+        request_id="r1",
+        user=BookingUser(user_id=1, first_name="Ada", last_name="L", email="a@b.c", phone="1"),
+        target_date=date(2030, 1, 5),
+        target_time="08:00",
+        courts=[1, 2],
+        metadata={"race_courts": [1, 3]},
+    )
+
+    booking = await handler._attempt_natural_flow(request, {})
+    assert booking.success is False
+    assert booking.metadata["uncertain_court"] == 3
+    assert "No confirmation" in booking.message
+
+    orchestrator = DynamicBookingOrchestrator(racing=False)
+    plan = orchestrator.create_booking_plan([_reservation(1, [1, 2])], "08:00")
+    assert plan["browser_assignments"][0]["attempt"].fallback_courts == [2, 3]
+    calls = []
+    scheduler = SimpleNamespace(
+        orchestrator=orchestrator,
+        _update_reservation_failed=lambda rid, error: calls.append(("failed", rid, error)),
+        schedule_fallback_retry=lambda rid, fallback: calls.append(("retry", rid)),
+    )
+
+    record_outcome(scheduler, "r1", _booking_result_to_dict(booking))
+    assert calls == [("failed", "r1", booking.message)]
+    assert orchestrator.court_status == {1: "available", 2: "available", 3: "available"}
+
+
+class NoSubmitPage:
+    """Booking form stub whose submit button never renders."""
+
+    def on(self, event, handler):
+        t('tests.unit.test_court_racing.NoSubmitPage.on')
+
+    def remove_listener(self, event, handler):
+        t('tests.unit.test_court_racing.NoSubmitPage.remove_listener')
+
+    async def query_selector(self, selector):
+        t('tests.unit.test_court_racing.NoSubmitPage.query_selector')
+        return None
+
+    async def wait_for_function(self, *args, **kwargs):
+        t('tests.unit.test_court_racing.NoSubmitPage.wait_for_function')
+        raise AssertionError("no outcome wait without a submit click")
+
+
+async def _noop(*args, **kwargs):
+    t('tests.unit.test_court_racing._noop')
+    return SimpleNamespace(click=_noop)
+
+
+@pytest.mark.asyncio
+async def test_fast_flow_without_submit_button_passes_the_guard(monkeypatch):
+    t('tests.unit.test_court_racing.test_fast_flow_without_submit_button_passes_the_guard')
+    monkeypatch.setattr(fast_flow_module, "minimal_mouse_movement", _noop)
+    monkeypatch.setattr(fast_flow_module, "find_time_slot_with_refresh", _noop)
+    monkeypatch.setattr(fast_flow_module, "fill_form", _noop)
+    guard = CommitGuard()
+
+    result = await fast_flow_module.execute_fast_flow(
+        NoSubmitPage(), 1, datetime(2030, 1, 5), "08:00", {}, logger=DummyLogger(), commit_guard=guard
+    )
+
+    assert not result.success and result.error_message == "Submit button not found"
+    assert not guard.decided
+    assert await guard.acquire(2)
+
+
+class RejectingPage(NoSubmitPage):
+    """Booking form whose submit renders a rejection only after the click settles."""
+
+    async def query_selector(self, selector):
+        t('tests.unit.test_court_racing.RejectingPage.query_selector')
+        return SimpleNamespace(click=_noop)
+
+    async def wait_for_function(self, *args, **kwargs):
+        t('tests.unit.test_court_racing.RejectingPage.wait_for_function')
+        await asyncio.sleep(0.01)
+        return SimpleNamespace(json_value=lambda: _resolved("rejected"))
+
+
+async def _resolved(value):
+    t('tests.unit.test_court_racing._resolved')
+    return value
+
+
+@pytest.mark.asyncio
+async def test_standard_natural_flow_hands_guard_on_after_late_rejection(monkeypatch):
+    t('tests.unit.test_court_racing.test_standard_natural_flow_hands_guard_on_after_late_rejection')
+
+    async def no_confirmation(page, court, time_slot, user_info, **kwargs):
+        t('tests.unit.test_court_racing.test_standard_natural_flow_hands_guard_on_after_late_rejection.no_confirmation')
+        return ExecutionResult(success=False, error_message="No confirmation", court_number=court)
+
+    monkeypatch.setattr(natural_flow_module, "confirmation_result", no_confirmation)
+    guard = CommitGuard()
+    steps = natural_flow_module.NaturalFlowSteps(RejectingPage(), DummyLogger(), commit_guard=guard)
+    steps.actions = SimpleNamespace(
+        pause=_noop,
+        reading_pause=_noop,
+        scroll_naturally=_noop,
+        move_mouse_random=_noop,
+        click_with_hesitation=_noop,
+    )
+    steps.debug_logger = SimpleNamespace(capture_state=_noop, save_logs=lambda: None, print_summary=lambda: None)
+    steps._wait_for_time_slot = _noop
+    steps._commit_time_selection = _noop
+    steps._ensure_booking_form_visible = _noop
+    steps.fill_user_form = _noop
+
+    result = await steps.execute(1, datetime(2030, 1, 5), "08:00", {}, initial_delay_range=(0, 0))
+
+    assert not result.success
+    assert "outcome" in result.details["phase_timings"]
+    assert not guard.decided
+    assert await guard.acquire(2)
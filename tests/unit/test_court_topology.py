@@ -0,0 +1,119 @@
+from tracking import t
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from automation.browser.settings import BrowserSettings, load_browser_settings
+from automation.executors.booking_orchestrator import DynamicBookingOrchestrator
+from automation.executors.flows.helpers import build_direct_slot_url
+from infrastructure.constants import COURT_CONFIG
+from infrastructure.court_topology import (
+    CourtTopology,
+    build_court,
+    load_court_topology,
+    set_court_topology,
+)
+
+CLUBS = {
+    "clubs": [
+        {
+            "name": "lavilla",
+            "base_url": "https://clublavilla.as.me",
+            "schedule_id": "7d558012",
+            "courts": [
+                {"number": n, "appointment_id": f"10{n}", "calendar_id": f"20{n}"}
+                for n in (1, 2, 3)
+            ],
+        },
+        {
+            "name": "norte",
+            "base_url": "https://clubnorte.as.me/",
+            "schedule_id": "abc123",
+            "courts": [
+                {"number": n, "appointment_id": f"30{n}", "calendar_id": f"40{n}"}
+                for n in (4, 5, 6)
+            ],
+        },
+    ]
+}
+
+
+@pytest.fixture
+def six_courts(tmp_path):
+    t('tests.unit.test_court_topology.six_courts')
+    path = tmp_path / "courts.json"
+    path.write_text(json.dumps(CLUBS), encoding="utf-8")
+    topology = load_court_topology(str(path))
+    previous = set_court_topology(topology)
+    yield topology
+    set_court_topology(previous)
+
+
+def test_load_clubs_layout_derives_urls_and_groups_by_host(six_courts):
+    t('tests.unit.test_court_topology.test_load_clubs_layout_derives_urls_and_groups_by_host')
+    court = six_courts.get(5)
+
+    assert six_courts.numbers == [1, 2, 3, 4, 5, 6]
+    assert court.club == "norte"
+    assert court.direct_url == "https://clubnorte.as.me/?appointmentType=305"
+    assert court.full_url == "https://clubnorte.as.me/schedule/abc123/appointment/305/calendar/405"
+    assert six_courts.courts_by_host([6, 1, 4]) == {
+        "clubnorte.as.me": [6, 4],
+        "clublavilla.as.me": [1],
+    }
+    assert 7 not in six_courts and six_courts.host_for(7) == ""
+
+
+def test_default_topology_matches_builtin_config_and_rejects_duplicates():
+    t('tests.unit.test_court_topology.test_default_topology_matches_builtin_config_and_rejects_duplicates')
+    default = load_court_topology("")
+    assert {n: {k: v for k, v in c.items() if k != "club"} for n, c in default.as_config().items()} == {
+        n: {k: entry[k] for k in ("appointment_id", "calendar_id", "direct_url", "full_url")}
+        for n, entry in COURT_CONFIG.items()
+    }
+
+    court = build_court(1, "1", "1", base_url="https://a.as.me", schedule_id="s")
+    with pytest.raises(ValueError):
+        CourtTopology([court, court])
+    with pytest.raises(ValueError):
+        CourtTopology([])
+
+
+def test_orchestrator_plans_every_court_and_keeps_fallbacks_within_club(six_courts):
+    t('tests.unit.test_court_topology.test_orchestrator_plans_every_court_and_keeps_fallbacks_within_club')
+    orchestrator = DynamicBookingOrchestrator(racing=False)
+    reservations = [
+        SimpleNamespace(
+            id=f"r{n}", user_id=n, priority=2, created_at=datetime(2030, 1, 1, n), courts=[n]
+        )
+        for n in six_courts.numbers
+    ]
+
+    plan = orchestrator.create_booking_plan(reservations, "08:00")
+
+    attempts = {a["attempt"].reservation_id: a["attempt"] for a in plan["browser_assignments"]}
+    assert len(attempts) == 6 and plan["waitlisted_users"] == []
+    assert sorted(orchestrator.court_status) == [1, 2, 3, 4, 5, 6]
+    assert attempts["r2"].fallback_courts == [1, 3]
+    assert attempts["r5"].fallback_courts == [4, 6]
+
+
+def test_direct_slot_url_uses_installed_topology(six_courts):
+    t('tests.unit.test_court_topology.test_direct_slot_url_uses_installed_topology')
+    url = build_direct_slot_url(4, datetime(2030, 1, 5), "08:00")
+
+    assert url.startswith(
+        "https://clubnorte.as.me/schedule/abc123/appointment/304/calendar/404/datetime/2030-01-05T08%3A00%3A00"
+    )
+    assert url.endswith("appointmentTypeIds%5B%5D=304")
+    with pytest.raises(ValueError):
+        build_direct_slot_url(9, datetime(2030, 1, 5), "08:00")
+
+
+def test_browser_settings_default_to_topology_courts(six_courts):
+    t('tests.unit.test_court_topology.test_browser_settings_default_to_topology_courts')
+
+    assert BrowserSettings().courts == [1, 2, 3, 4, 5, 6]
+    assert load_browser_settings().courts == [1, 2, 3, 4, 5, 6]
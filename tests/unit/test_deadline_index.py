@@ -0,0 +1,215 @@
+from tracking import t
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+import pytz
+
+from reservations.queue import reservation_scheduler as scheduler_module
+from reservations.queue.deadline_index import DeadlineIndex
+from reservations.queue.reservation_queue import ReservationQueue, ReservationStatus
+from reservations.queue.reservation_scheduler import ReservationScheduler
+
+TZ = pytz.timezone("America/Guatemala")
+
+
+def make_record(reservation_id, scheduled, status="scheduled"):
+    t('tests.unit.test_deadline_index.make_record')
+    return {"id": reservation_id, "status": status, "scheduled_execution": scheduled}
+
+
+def test_index_orders_deadlines_and_invalidates_lazily():
+    t('tests.unit.test_deadline_index.test_index_orders_deadlines_and_invalidates_lazily')
+    index = DeadlineIndex(
+        [
+            make_record("a", "2030-01-01T08:00:00-06:00"),
+            make_record("b", "2030-01-01T07:00:00-06:00"),
+            make_record("c", "2030-01-01T06:00:00-06:00", status="success"),
+            make_record("d", "not-a-date"),
+        ],
+        timezone=TZ,
+    )
+
+    assert len(index) == 2
+    assert index.next_deadline().hour == 7
+
+    index.update(make_record("b", "2030-01-01T09:00:00-06:00"))
+    assert index.next_deadline().hour == 8
+    assert index.get("b", "2030-01-01T07:00:00-06:00") is None
+
+    index.update(make_record("a", "2030-01-01T08:00:00-06:00", status="failed"))
+    assert index.next_deadline().hour == 9
+    index.discard("b")
+    assert index.next_deadline() is None
+
+
+def test_index_compares_naive_deadlines_in_queue_timezone():
+    t('tests.unit.test_deadline_index.test_index_compares_naive_deadlines_in_queue_timezone')
+    index = DeadlineIndex(
+        [
+            make_record("aware", "2030-01-01T08:00:00+00:00"),
+            make_record("naive", "2030-01-01T07:00:00"),
+        ],
+        timezone=TZ,
+    )
+
+    # 08:00 UTC is 02:00 in Guatemala, earlier than 07:00 local.
+    assert index.next_deadline().isoformat() == "2030-01-01T08:00:00+00:00"
+
+
+def test_queue_notifies_listeners_when_deadline_moves_earlier(tmp_path):
+    t('tests.unit.test_deadline_index.test_queue_notifies_listeners_when_deadline_moves_earlier')
+    queue = ReservationQueue(file_path=str(tmp_path / "queue.json"))
+    calls = []
+    queue.add_deadline_listener(lambda: calls.append(queue.next_deadline()))
+
+    late = queue.add_reservation(
+        {"user_id": 1, "target_date": "2031-01-10", "target_time": "08:00", "court_preferences": [1]}
+    )
+    early = queue.add_reservation(
+        {"user_id": 2, "target_date": "2031-01-05", "target_time": "08:00", "court_preferences": [1]}
+    )
+    queue.add_reservation(
+        {"user_id": 3, "target_date": "2031-01-20", "target_time": "08:00", "court_preferences": [1]}
+    )
+    assert len(calls) == 2
+    assert calls[-1] == queue.scheduled_execution_for(queue.get_reservation(early))
+
+    moved = dict(queue.get_reservation(late))
+    moved["scheduled_execution"] = "2031-01-01T07:59:30-06:00"
+    assert queue.update_reservation(late, moved)
+    assert len(calls) == 3
+    assert calls[-1].isoformat() == "2031-01-01T07:59:30-06:00"
+
+    assert queue.update_reservation_status(late, ReservationStatus.SUCCESS.value)
+    assert queue.next_deadline() == calls[1]
+
+
+def test_index_returns_earliest_deadline_after_a_moment():
+    t('tests.unit.test_deadline_index.test_index_returns_earliest_deadline_after_a_moment')
+    start = TZ.localize(datetime(2030, 1, 1, 6, 0))
+    deadlines = {f"r{i}": start + timedelta(minutes=(i * 37) % 240) for i in range(40)}
+    index = DeadlineIndex(
+        [make_record(rid, when.isoformat()) for rid, when in deadlines.items()], timezone=TZ
+    )
+    for rid in ("r3", "r4", "r5"):
+        moved = deadlines[rid] + timedelta(hours=5)
+        index.update(make_record(rid, moved.isoformat()))
+        deadlines[rid] = moved
+
+    for minutes in range(-10, 600, 13):
+        moment = start + timedelta(minutes=minutes)
+        later = [when for when in deadlines.values() if when > moment]
+        assert index.next_deadline(moment) == (min(later) if later else None)
+    assert index.next_deadline(moment.replace(tzinfo=None)) is None
+
+
+def test_queue_wakes_listeners_when_a_status_change_makes_a_reservation_runnable(tmp_path):
+    t('tests.unit.test_deadline_index.test_queue_wakes_listeners_when_a_status_change_makes_a_reservation_runnable')
+    queue = ReservationQueue(file_path=str(tmp_path / "queue.json"))
+    early = queue.add_reservation(
+        {"user_id": 1, "target_date": "2031-01-05", "target_time": "08:00", "court_preferences": [1]}
+    )
+    queue.add_reservation(
+        {"user_id": 2, "target_date": "2031-01-10", "target_time": "08:00", "court_preferences": [1]}
+    )
+    calls = []
+    queue.add_deadline_listener(lambda: calls.append(queue.next_deadline()))
+
+    assert queue.add_to_waitlist(early, 1)
+    assert calls == []
+    assert queue.update_reservation_status(early, ReservationStatus.SCHEDULED.value)
+    assert calls == [queue.scheduled_execution_for(queue.get_reservation(early))]
+
+    assert queue.update_reservation_status(early, ReservationStatus.FAILED.value)
+    assert queue.update_reservation_status(early, ReservationStatus.PENDING.value)
+    assert len(calls) == 2
+
+
+class FakeQueue:
+    def __init__(self, deadline):
+        t('tests.unit.test_deadline_index.FakeQueue.__init__')
+        self.deadline = deadline
+        self.later = None
+
+    def next_deadline(self, after=None):
+        t('tests.unit.test_deadline_index.FakeQueue.next_deadline')
+        return self.deadline if after is None else self.later
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    t('tests.unit.test_deadline_index.scheduler')
+    monkeypatch.setattr(scheduler_module, "BrowserManager", lambda pool: SimpleNamespace(pool=pool))
+    return ReservationScheduler(
+        config=SimpleNamespace(timezone="America/Guatemala"),
+        queue=FakeQueue(None),
+        notification_callback=lambda *a, **k: None,
+    )
+
+
+def test_wake_delay_targets_health_check_then_deadline(scheduler):
+    t('tests.unit.test_deadline_index.test_wake_delay_targets_health_check_then_deadline')
+    now = TZ.localize(datetime(2030, 1, 1, 8, 0))
+    slack = scheduler_module.DEADLINE_SLACK_SECONDS
+
+    assert scheduler._seconds_until_next_wake(now, 15) == scheduler_module.MAX_IDLE_SECONDS
+
+    scheduler.queue.deadline = now + timedelta(minutes=10)
+    assert scheduler._seconds_until_next_wake(now, 15) == pytest.approx(240 + slack)
+
+    scheduler.prearm_window_seconds = 20
+    scheduler.queue.deadline = (now + timedelta(minutes=2)).replace(tzinfo=None)
+    assert scheduler._seconds_until_next_wake(now, 15) == pytest.approx(100 + slack)
+
+    scheduler.queue.deadline = now + timedelta(seconds=12)
+    assert scheduler._seconds_until_next_wake(now, 15) == pytest.approx(12 + slack)
+
+    scheduler.queue.deadline = now - timedelta(seconds=1)
+    assert scheduler._seconds_until_next_wake(now, 15) == 15
+
+    # Overdue work caps the wait, but an earlier future deadline still wins.
+    scheduler.queue.later = now + timedelta(seconds=4)
+    assert scheduler._seconds_until_next_wake(now, 15) == pytest.approx(4 + slack)
+    scheduler.queue.later = now + timedelta(minutes=10)
+    assert scheduler._seconds_until_next_wake(now, 15) == 15
+    scheduler.queue.later = None
+
+    scheduler.queue.deadline = now + timedelta(days=1)
+    assert scheduler._seconds_until_next_wake(now, 15) == scheduler_module.MAX_IDLE_SECONDS
+
+
+@pytest.mark.asyncio
+async def test_scheduler_loop_wakes_early_on_new_deadline(scheduler, tmp_path):
+    t('tests.unit.test_deadline_index.test_scheduler_loop_wakes_early_on_new_deadline')
+    scheduler.queue = ReservationQueue(file_path=str(tmp_path / "queue.json"))
+    passes = []
+
+    async def record_pass(evaluation):
+        passes.append(evaluation)
+
+    scheduler.pipeline = SimpleNamespace(process=record_pass)
+    scheduler.running = True
+    loop_task = asyncio.create_task(scheduler._scheduler_loop())
+    try:
+        for _ in range(100):
+            if passes:
+                break
+            await asyncio.sleep(0.01)
+        assert len(passes) == 1
+
+        # The idle loop is parked for MAX_IDLE_SECONDS; a write from another
+        # thread must cut that short.
+        await asyncio.to_thread(
+            scheduler.queue.add_reservation,
+            {"user_id": 1, "target_date": "2031-01-05", "target_time": "08:00", "court_preferences": [1]},
+        )
+        for _ in range(100):
+            if len(passes) > 1:
+                break
+            await asyncio.sleep(0.01)
+        assert len(passes) == 2
+    finally:
+        await scheduler.stop()
+        await asyncio.wait_for(loop_task, timeout=1)
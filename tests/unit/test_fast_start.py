@@ -0,0 +1,112 @@
+from tracking import t
+import pytest
+
+from automation.browser.async_browser_pool import AsyncBrowserPool
+from automation.browser.pool import manager as manager_module
+
+
+class FakePage:
+    def __init__(self):
+        t('tests.unit.test_fast_start.FakePage.__init__')
+        self.url = "about:blank"
+        self.closed = False
+
+    async def add_init_script(self, script):
+        t('tests.unit.test_fast_start.FakePage.add_init_script')
+
+    async def goto(self, url, **kwargs):
+        t('tests.unit.test_fast_start.FakePage.goto')
+        self.url = url
+
+    async def wait_for_selector(self, selector, timeout=None):
+        t('tests.unit.test_fast_start.FakePage.wait_for_selector')
+        return object()
+
+    def is_closed(self):
+        t('tests.unit.test_fast_start.FakePage.is_closed')
+        return self.closed
+
+    async def close(self):
+        t('tests.unit.test_fast_start.FakePage.close')
+        self.closed = True
+
+
+class FakePersistentContext:
+    def __init__(self, user_data_dir):
+        t('tests.unit.test_fast_start.FakePersistentContext.__init__')
+        self.user_data_dir = user_data_dir
+        self.pages = [FakePage()]
+
+    async def close(self):
+        t('tests.unit.test_fast_start.FakePersistentContext.close')
+        # Chromium leaves the profile behind on disk
+        (self.user_data_dir / "Local State").write_text("{}")
+
+
+class FakeChromium:
+    def __init__(self):
+        t('tests.unit.test_fast_start.FakeChromium.__init__')
+        self.persistent_launches = []
+
+    async def launch_persistent_context(self, user_data_dir, **kwargs):
+        t('tests.unit.test_fast_start.FakeChromium.launch_persistent_context')
+        self.persistent_launches.append((user_data_dir, kwargs))
+        return FakePersistentContext(manager_module.Path(user_data_dir))
+
+
+class FakePlaywright:
+    def __init__(self, chromium):
+        t('tests.unit.test_fast_start.FakePlaywright.__init__')
+        self.chromium = chromium
+
+    async def stop(self):
+        t('tests.unit.test_fast_start.FakePlaywright.stop')
+
+
+async def _start(tmp_path, chromium, delays):
+    t('tests.unit.test_fast_start._start')
+    pool = AsyncBrowserPool(courts=[1, 2], mode="headless")
+    pool.WARMUP_DELAY = 0.2
+    pool.enable_fast_start(profiles_dir=str(tmp_path / "profiles"))
+    original = pool.manager.create_and_navigate_court_page_with_stagger
+
+    async def record_delay(court, delay):
+        delays[court] = delay
+        return await original(court, 0.0)
+
+    pool.manager.create_and_navigate_court_page_with_stagger = record_delay
+    await pool.start()
+    assert await pool.wait_until_ready(timeout=1)
+    report = dict(pool.startup_report)
+    await pool.stop()
+    return report
+
+
+@pytest.mark.asyncio
+async def test_fast_start_reuses_profiles_and_reports_cold_then_warm(tmp_path, monkeypatch):
+    t('tests.unit.test_fast_start.test_fast_start_reuses_profiles_and_reports_cold_then_warm')
+    chromium = FakeChromium()
+
+    class Starter:
+        async def start(self):
+            return FakePlaywright(chromium)
+
+    monkeypatch.setattr(manager_module, "async_playwright", Starter)
+    monkeypatch.setattr(manager_module, "BROWSER_STATES_DIR", tmp_path / "states")
+
+    cold_delays, warm_delays = {}, {}
+    cold = await _start(tmp_path, chromium, cold_delays)
+    warm = await _start(tmp_path, chromium, warm_delays)
+
+    assert cold["kind"] == "cold" and cold["cold_courts"] == [1, 2]
+    assert cold_delays == {1: 0.0, 2: 1.5}
+    assert warm["kind"] == "warm" and warm["warm_courts"] == [1, 2]
+    assert warm_delays == {1: 0.0, 2: 0.0}
+    # Warm courts skip the returning-user warm-up entirely
+    assert cold["time_to_ready_s"] >= 0.2 > warm["time_to_ready_s"]
+    assert warm["all_courts_ready_s"] < 0.2
+
+    directories = [launch[0] for launch in chromium.persistent_launches]
+    assert sorted(directories[:2]) == sorted(directories[2:])
+    assert all("storage_state" not in kwargs and kwargs["headless"] for _, kwargs in chromium.persistent_launches)
+    assert not (tmp_path / "states").exists()
@@ -84,6 +84,15 @@ class DummyPage:
             self._single_result = result
         self.evaluate_calls = []
         self.context = DummyContext()
+        self.listeners = {}
+
+    def on(self, event, handler):
+        t('tests.unit.test_form_actions.DummyPage.on')
+        self.listeners.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event, handler):
+        t('tests.unit.test_form_actions.DummyPage.remove_listener')
+        self.listeners[event].remove(handler)
 
     async def evaluate(self, script, *args):  # pragma: no cover - simple stub
         t('tests.unit.test_form_actions.DummyPage.evaluate')
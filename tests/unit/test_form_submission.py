@@ -0,0 +1,146 @@
+from tracking import t
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from automation.forms.actions import AcuityFormService
+from automation.forms.submission import PhaseTimer, SubmissionWatcher
+from tests.helpers import DummyLogger
+
+BOOKING_POST_URL = "https://clublavilla.as.me/api/scheduling/v1/appointments"
+USER = {
+    'client.firstName': 'Ana',
+    'client.lastName': 'Perez',
+    'client.phone': '123',
+    'client.email': 'ana@example.com',
+}
+
+
+class SubmitPage:
+    """Fires the events Acuity produces ``delay`` seconds after the submit click."""
+
+    def __init__(self, *, events=(), dom_outcome=None, delay=0.02, evaluate_results=()):
+        t('tests.unit.test_form_submission.SubmitPage.__init__')
+        self.listeners = {}
+        self.events = list(events)
+        self.dom_outcome = dom_outcome
+        self.delay = delay
+        self.evaluate_results = list(evaluate_results)
+        self.context = SimpleNamespace()
+
+    def on(self, event, handler):
+        t('tests.unit.test_form_submission.SubmitPage.on')
+        self.listeners.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event, handler):
+        t('tests.unit.test_form_submission.SubmitPage.remove_listener')
+        self.listeners[event].remove(handler)
+
+    def click_submit(self):
+        t('tests.unit.test_form_submission.SubmitPage.click_submit')
+        asyncio.get_running_loop().call_later(self.delay, self._fire)
+
+    def _fire(self):
+        t('tests.unit.test_form_submission.SubmitPage._fire')
+        for event, payload in self.events:
+            for handler in list(self.listeners.get(event, [])):
+                handler(payload)
+
+    async def wait_for_function(self, script, polling=None, timeout=None):
+        t('tests.unit.test_form_submission.SubmitPage.wait_for_function')
+        assert polling == "mutation"
+        if self.dom_outcome is None:
+            await asyncio.sleep(timeout / 1000)
+            raise TimeoutError("wait_for_function timed out")
+        await asyncio.sleep(self.delay)
+        outcome = self.dom_outcome
+        return SimpleNamespace(json_value=lambda: _resolved(outcome))
+
+    async def evaluate(self, script, *args):
+        t('tests.unit.test_form_submission.SubmitPage.evaluate')
+        result = self.evaluate_results.pop(0)
+        if isinstance(result, dict) and result.get('buttonText'):
+            self.click_submit()
+        return result
+
+
+async def _resolved(value):
+    t('tests.unit.test_form_submission._resolved')
+    return value
+
+
+def booking_response(status):
+    t('tests.unit.test_form_submission.booking_response')
+    return SimpleNamespace(url=BOOKING_POST_URL, status=status, request=SimpleNamespace(method="POST"))
+
+
+@pytest.mark.asyncio
+async def test_watcher_resolves_on_confirmation_navigation():
+    t('tests.unit.test_form_submission.test_watcher_resolves_on_confirmation_navigation')
+    page = SubmitPage(events=[
+        ("response", booking_response(200)),
+        ("response", SimpleNamespace(url=BOOKING_POST_URL, status=200, request=SimpleNamespace(method="GET"))),
+        ("framenavigated", SimpleNamespace(url="https://clublavilla.as.me/schedule/abc/confirmation/f00d")),
+    ])
+
+    start = time.perf_counter()
+    async with SubmissionWatcher(page) as watcher:
+        page.click_submit()
+        signal = await watcher.wait(timeout=5)
+
+    assert (signal.kind, signal.status) == ("confirmed", 200)
+    assert time.perf_counter() - start < 0.5
+    assert page.listeners == {"response": [], "framenavigated": []}
+
+
+@pytest.mark.asyncio
+async def test_watcher_reports_rejected_booking_post_and_dom_errors():
+    t('tests.unit.test_form_submission.test_watcher_reports_rejected_booking_post_and_dom_errors')
+    rejected = SubmitPage(events=[("response", booking_response(409))])
+    async with SubmissionWatcher(rejected) as watcher:
+        rejected.click_submit()
+        signal = await watcher.wait(timeout=5)
+    assert (signal.kind, signal.status) == ("rejected", 409)
+
+    errored = SubmitPage(dom_outcome="error")
+    async with SubmissionWatcher(errored) as watcher:
+        signal = await watcher.wait(timeout=5)
+    assert (signal.kind, signal.detail) == ("error", "dom")
+
+
+@pytest.mark.asyncio
+async def test_watcher_times_out_with_recorded_post_status():
+    t('tests.unit.test_form_submission.test_watcher_times_out_with_recorded_post_status')
+    page = SubmitPage(events=[("response", booking_response(201))])
+    async with SubmissionWatcher(page) as watcher:
+        page.click_submit()
+        signal = await watcher.wait(timeout=0.1)
+
+    assert (signal.kind, signal.status) == ("timeout", 201)
+
+
+@pytest.mark.asyncio
+async def test_fill_and_submit_waits_on_events_and_reports_phase_timings():
+    t('tests.unit.test_form_submission.test_fill_and_submit_waits_on_events_and_reports_phase_timings')
+    page = SubmitPage(
+        events=[("framenavigated", SimpleNamespace(url="https://x.as.me/confirmation/abc"))],
+        evaluate_results=[
+            {'filled': 4, 'messages': ()},
+            {'hasErrors': False, 'errors': ()},
+            {'success': True, 'buttonText': 'Confirmar'},
+            {'success': True, 'message': 'Reserva confirmada'},
+        ],
+    )
+    service = AcuityFormService(logger=DummyLogger(), enable_tracing=False)
+    timer = PhaseTimer()
+
+    start = time.perf_counter()
+    success, message = await service.fill_and_submit(page, USER, timer=timer)
+
+    assert (success, message) == (True, 'Reserva confirmada')
+    assert time.perf_counter() - start < 1.0
+    assert list(service.last_timings) == ['fill', 'validate', 'submit', 'outcome', 'confirm']
+    assert timer.phases['outcome'] >= 15
+    assert any("timings" in str(args[0]) for _, args, _ in service.logger.records)
@@ -0,0 +1,139 @@
+from tracking import t
+import asyncio
+import itertools
+import logging
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from automation.browser.async_browser_pool import AsyncBrowserPool
+from automation.browser.pool import health as pool_health
+from automation.browser.recovery.strategies.base import RecoveryContext
+from automation.browser.recovery.strategies.partial_pool import PartialPoolRecovery
+
+
+class FakePage:
+    _ids = itertools.count(1)
+
+    def __init__(self, *, fail_goto=False):
+        t('tests.unit.test_hot_standby.FakePage.__init__')
+        self.id = next(self._ids)
+        self.fail_goto = fail_goto
+        self.closed = False
+        self.gotos = []
+
+    @property
+    def url(self):
+        t('tests.unit.test_hot_standby.FakePage.url')
+        if self.closed:
+            raise RuntimeError("Target closed")
+        return "https://clublavilla.as.me/?appointmentType=1"
+
+    def is_closed(self):
+        t('tests.unit.test_hot_standby.FakePage.is_closed')
+        return self.closed
+
+    async def goto(self, url, **kwargs):
+        t('tests.unit.test_hot_standby.FakePage.goto')
+        self.gotos.append(url)
+        if self.fail_goto:
+            raise RuntimeError("Navigation failed")
+
+    async def close(self):
+        t('tests.unit.test_hot_standby.FakePage.close')
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self):
+        t('tests.unit.test_hot_standby.FakeContext.__init__')
+        self.closed = False
+
+    async def close(self):
+        t('tests.unit.test_hot_standby.FakeContext.close')
+        self.closed = True
+
+
+def _standby_pool(monkeypatch, courts=(1, 2)):
+    t('tests.unit.test_hot_standby._standby_pool')
+    pool = AsyncBrowserPool(courts=list(courts))
+    pool.browser = SimpleNamespace(is_connected=lambda: True)
+    for court in courts:
+        pool.manager.install_court_page(court, FakeContext(), FakePage())
+    pool.enable_hot_standby()
+    opened = []
+
+    async def open_court_context(court):
+        await asyncio.sleep(0)
+        opened.append(court)
+        return FakeContext(), FakePage(), None
+
+    monkeypatch.setattr(pool.manager, "open_court_context", open_court_context)
+    return pool, opened
+
+
+async def _settle(pool):
+    t('tests.unit.test_hot_standby._settle')
+    standby = pool.manager.standby
+    for _ in range(10):
+        pending = list(standby._warming.values()) + list(standby._draining)
+        if not pending:
+            return
+        await asyncio.gather(*pending, return_exceptions=True)
+
+
+@pytest.mark.asyncio
+async def test_refresh_swaps_in_standby_for_failed_and_aged_pages(monkeypatch):
+    t('tests.unit.test_hot_standby.test_refresh_swaps_in_standby_for_failed_and_aged_pages')
+    pool, opened = _standby_pool(monkeypatch)
+    standby = pool.manager.standby
+    standby.replenish(pool.courts)
+    await _settle(pool)
+    assert sorted(opened) == [1, 2] and standby.has_spare(1) and standby.has_spare(2)
+
+    broken, aged = pool.pages[1], pool.pages[2]
+    broken.fail_goto = True
+    pool.manager.page_opened_at[2] = time.monotonic() - standby.max_age_seconds - 1
+    spare_1, spare_2 = standby.spares[1].page, standby.spares[2].page
+
+    results = await pool.refresh_browser_pages()
+    await _settle(pool)
+
+    assert results == {1: True, 2: True}
+    assert pool.pages[1] is spare_1 and pool.pages[2] is spare_2
+    assert aged.gotos == [] and broken.closed and aged.closed
+    assert standby.promotions == 2
+    assert sorted(opened) == [1, 1, 2, 2]
+    assert standby.has_spare(1) and standby.has_spare(2)
+
+
+@pytest.mark.asyncio
+async def test_dead_page_lookup_and_partial_recovery_prefer_standby(monkeypatch):
+    t('tests.unit.test_hot_standby.test_dead_page_lookup_and_partial_recovery_prefer_standby')
+    pool, _ = _standby_pool(monkeypatch, courts=(1, 2, 3))
+    standby = pool.manager.standby
+    standby.replenish([1, 2])
+    await _settle(pool)
+
+    pool.pages[1].closed = True
+    page = await pool_health.get_page(pool, 1)
+    assert page is pool.pages[1] and not page.closed
+
+    relaunched = []
+
+    async def relaunch(court, delay):
+        relaunched.append(court)
+        pool.manager.install_court_page(court, FakeContext(), FakePage())
+        return True
+
+    monkeypatch.setattr(pool, "_create_and_navigate_court_page_with_stagger", relaunch)
+    await _settle(pool)
+    service = SimpleNamespace(browser_pool=pool, logger=logging.getLogger("test"))
+
+    result = await PartialPoolRecovery().execute(RecoveryContext(service, [2, 3], "stale"))
+
+    assert result.success and sorted(result.courts_recovered) == [2, 3]
+    assert relaunched == [3]
+    await standby.close()
+    assert standby.spares == {}
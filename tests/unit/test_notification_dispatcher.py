@@ -0,0 +1,193 @@
+from tracking import t
+import asyncio
+import logging
+import time
+
+import pytest
+from telegram.error import Forbidden, RetryAfter, TimedOut
+
+from botapp.messages import outbound
+from botapp.messages.outbound import NotificationDispatcher, NotificationPriority
+from botapp.notifications import queue_notification_with_menu
+from users.manager import UserTier
+
+LOGGER = logging.getLogger("test_notification_dispatcher")
+
+
+class Recorder:
+    def __init__(self, failures=None):
+        t('tests.unit.test_notification_dispatcher.Recorder.__init__')
+        self.sent = []
+        self.failures = dict(failures or {})
+
+    async def __call__(self, chat_id, text, parse_mode, reply_markup):
+        t('tests.unit.test_notification_dispatcher.Recorder.__call__')
+        planned = self.failures.get(text)
+        if planned:
+            raise planned.pop(0)
+        self.sent.append((chat_id, text, time.monotonic()))
+
+
+async def _wait_for(predicate, timeout=2.0):
+    t('tests.unit.test_notification_dispatcher._wait_for')
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out waiting for dispatcher"
+        await asyncio.sleep(0.005)
+
+
+@pytest.mark.asyncio
+async def test_booking_results_jump_ahead_of_queued_info_messages():
+    t('tests.unit.test_notification_dispatcher.test_booking_results_jump_ahead_of_queued_info_messages')
+    send = Recorder()
+    dispatcher = NotificationDispatcher(send, chat_interval=0, global_rate=0, concurrency=1, logger=LOGGER)
+
+    dispatcher.enqueue(1, "menu", priority=NotificationPriority.MENU)
+    dispatcher.enqueue(2, "waitlist #1")
+    dispatcher.enqueue(3, "waitlist #2")
+    dispatcher.enqueue(4, "booked", priority=NotificationPriority.BOOKING)
+    assert dispatcher.stats()["depth_by_priority"] == {"booking": 1, "info": 2, "menu": 1}
+
+    await _wait_for(lambda: len(send.sent) == 4)
+    await dispatcher.stop()
+
+    assert [text for _, text, _ in send.sent] == ["booked", "waitlist #1", "waitlist #2", "menu"]
+    stats = dispatcher.stats()
+    assert stats["depth"] == 0 and stats["sent"] == 4
+    assert stats["latency_max"] >= stats["latency_p95"] >= stats["latency_p50"] >= 0
+
+
+@pytest.mark.asyncio
+async def test_chat_messages_stay_in_order_with_one_send_in_flight(monkeypatch):
+    t('tests.unit.test_notification_dispatcher.test_chat_messages_stay_in_order_with_one_send_in_flight')
+    in_flight = {}
+    overlaps = []
+    send = Recorder({"attempting": [TimedOut()]})
+
+    async def slow_send(chat_id, text, parse_mode, reply_markup):
+        t('tests.unit.test_notification_dispatcher.test_chat_messages_stay_in_order_with_one_send_in_flight.slow_send')
+        if in_flight.get(chat_id):
+            overlaps.append(chat_id)
+        in_flight[chat_id] = True
+        try:
+            await asyncio.sleep(0.01)
+            await send(chat_id, text, parse_mode, reply_markup)
+        finally:
+            in_flight[chat_id] = False
+
+    monkeypatch.setattr(outbound, "RETRY_BACKOFF_SECONDS", 0.01)
+    dispatcher = NotificationDispatcher(slow_send, chat_interval=0, global_rate=0, logger=LOGGER)
+    dispatcher.enqueue(2, "waitlist")
+    dispatcher.enqueue(1, "attempting")
+    dispatcher.enqueue(1, "booked", priority=NotificationPriority.BOOKING)
+    dispatcher.enqueue(1, "details")
+    await _wait_for(lambda: len(send.sent) == 4)
+    await dispatcher.stop()
+
+    texts = [text for _, text, _ in send.sent]
+    # The booking result pulls chat 1 ahead of chat 2 but never overtakes the
+    # chat's earlier message, even while that message is being retried.
+    assert [text for text in texts if text != "waitlist"] == ["attempting", "booked", "details"]
+    assert overlaps == []
+
+
+@pytest.mark.asyncio
+async def test_per_chat_bucket_spaces_one_chat_without_blocking_others():
+    t('tests.unit.test_notification_dispatcher.test_per_chat_bucket_spaces_one_chat_without_blocking_others')
+    send = Recorder()
+    dispatcher = NotificationDispatcher(send, chat_interval=0.05, global_rate=0, logger=LOGGER)
+
+    for index in range(5):
+        dispatcher.enqueue(1, f"chat1-{index}")
+    dispatcher.enqueue(2, "chat2")
+
+    await _wait_for(lambda: len(send.sent) == 6)
+    await dispatcher.stop()
+
+    texts = [text for _, text, _ in send.sent]
+    chat1 = [sent_at for chat_id, _, sent_at in send.sent if chat_id == 1]
+    # Three-message burst, then one per interval; chat 2 is not held behind chat 1.
+    assert texts.index("chat2") < texts.index("chat1-3")
+    assert chat1[3] - chat1[0] >= 0.04
+    assert chat1[4] - chat1[3] >= 0.04
+
+
+@pytest.mark.asyncio
+async def test_retry_after_pauses_sends_and_rejections_are_dropped(monkeypatch):
+    t('tests.unit.test_notification_dispatcher.test_retry_after_pauses_sends_and_rejections_are_dropped')
+    monkeypatch.setattr(outbound, "RETRY_PADDING_SECONDS", 0.05)
+    monkeypatch.setattr(outbound, "RETRY_BACKOFF_SECONDS", 0.01)
+    send = Recorder({
+        "flooded": [RetryAfter(0)],
+        "flaky": [TimedOut(), TimedOut()],
+        "blocked": [Forbidden("bot was blocked by the user")],
+    })
+    dispatcher = NotificationDispatcher(send, chat_interval=0, global_rate=0, concurrency=1, logger=LOGGER)
+
+    started = time.monotonic()
+    dispatcher.enqueue(1, "flooded", priority=NotificationPriority.BOOKING)
+    dispatcher.enqueue(2, "flaky")
+    dispatcher.enqueue(3, "blocked")
+    await _wait_for(lambda: len(send.sent) == 2 and dispatcher.stats()["dropped"] == 1)
+    await dispatcher.stop()
+
+    assert {text for _, text, _ in send.sent} == {"flooded", "flaky"}
+    assert min(sent_at for _, _, sent_at in send.sent) - started >= 0.05
+    stats = dispatcher.stats()
+    assert (stats["sent"], stats["retried"], stats["dropped"], stats["flood_waits"]) == (2, 3, 1, 1)
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_pending_messages_and_drops_delayed_menus():
+    t('tests.unit.test_notification_dispatcher.test_stop_drains_pending_messages_and_drops_delayed_menus')
+    send = Recorder()
+    dispatcher = NotificationDispatcher(send, chat_interval=0, global_rate=0, logger=LOGGER)
+
+    dispatcher.enqueue(1, "result", priority=NotificationPriority.BOOKING)
+    dispatcher.enqueue(1, "menu", priority=NotificationPriority.MENU, delay=60)
+    await dispatcher.stop(timeout=1.0)
+
+    assert [text for _, text, _ in send.sent] == ["result"]
+    assert dispatcher.stats()["dropped"] == 1 and not dispatcher.running
+
+
+class FakeDispatcher:
+    def __init__(self):
+        t('tests.unit.test_notification_dispatcher.FakeDispatcher.__init__')
+        self.queued = []
+
+    def enqueue(self, chat_id, text, **kwargs):
+        t('tests.unit.test_notification_dispatcher.FakeDispatcher.enqueue')
+        self.queued.append((chat_id, text, kwargs))
+
+
+class FakeUsers:
+    def is_admin(self, user_id):
+        t('tests.unit.test_notification_dispatcher.FakeUsers.is_admin')
+        return False
+
+    def get_user_tier(self, user_id):
+        t('tests.unit.test_notification_dispatcher.FakeUsers.get_user_tier')
+        return UserTier.REGULAR
+
+
+def test_queue_notification_classifies_priority_and_chains_menu_follow_up():
+    t('tests.unit.test_notification_dispatcher.test_queue_notification_classifies_priority_and_chains_menu_follow_up')
+    dispatcher = FakeDispatcher()
+    users = FakeUsers()
+
+    queue_notification_with_menu(dispatcher, users, 7, "📋 Added to Waitlist", logger=LOGGER)
+    queue_notification_with_menu(
+        dispatcher, users, 7, {"message": "Reserva lista", "priority": NotificationPriority.BOOKING}, logger=LOGGER
+    )
+    queue_notification_with_menu(dispatcher, users, 7, "✅ **Reservation Successful!**", logger=LOGGER)
+    assert not queue_notification_with_menu(dispatcher, users, 7, {"message": ""}, logger=LOGGER)
+
+    priorities = [kwargs["priority"] for _, _, kwargs in dispatcher.queued]
+    assert priorities == [NotificationPriority.INFO, NotificationPriority.BOOKING, NotificationPriority.BOOKING]
+    assert [kwargs["on_sent"] is None for _, _, kwargs in dispatcher.queued] == [True, True, False]
+
+    dispatcher.queued[-1][2]["on_sent"]()
+    chat_id, text, kwargs = dispatcher.queued[-1]
+    assert chat_id == 7 and text.startswith("🎾 What would you like to do next?")
+    assert kwargs["priority"] == NotificationPriority.MENU and kwargs["delay"] == 7
@@ -0,0 +1,208 @@
+from tracking import t
+from datetime import date, datetime
+from types import SimpleNamespace
+
+import pytest
+
+from automation.executors.core import ExecutionResult
+from automation.executors.flows import natural_flow as natural_flow_module
+from automation.executors.flows.prearm import PreArmRegistry, prearm_slot_page
+from automation.executors.racing import CommitGuard
+from reservations.queue import reservation_scheduler as scheduler_module
+from reservations.queue.reservation_scheduler import ReservationScheduler
+from tests.helpers import DummyLogger
+
+CONFIRMATION_URL = "https://clublavilla.as.me/schedule/abc/confirmation/f00d"
+USER = {"first_name": "Ana", "last_name": "Perez", "email": "ana@example.com", "phone": "123"}
+
+
+class FakeElement:
+    def __init__(self, page, selector):
+        t('tests.unit.test_prearm.FakeElement.__init__')
+        self.page = page
+        self.selector = selector
+
+    async def click(self):
+        t('tests.unit.test_prearm.FakeElement.click')
+        self.page.actions.append(("click", self.selector))
+        if "Confirmar" in self.selector:
+            for handler in list(self.page.listeners.get("framenavigated", [])):
+                handler(SimpleNamespace(url=CONFIRMATION_URL))
+
+    async def fill(self, value):
+        t('tests.unit.test_prearm.FakeElement.fill')
+        self.page.actions.append(("fill", self.selector, value))
+
+    async def get_attribute(self, name):
+        t('tests.unit.test_prearm.FakeElement.get_attribute')
+        return "GT"
+
+
+class SlotPage:
+    """Acuity page stub that renders the booking form on the direct slot URL."""
+
+    def __init__(self, *, form_on_load=True, submit_on_load=True):
+        t('tests.unit.test_prearm.SlotPage.__init__')
+        self.url = "about:blank"
+        self.form_on_load = form_on_load
+        self.submit_on_load = submit_on_load
+        self.listeners = {}
+        self.actions = []
+
+    def on(self, event, handler):
+        t('tests.unit.test_prearm.SlotPage.on')
+        self.listeners.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event, handler):
+        t('tests.unit.test_prearm.SlotPage.remove_listener')
+        self.listeners[event].remove(handler)
+
+    async def goto(self, url, **kwargs):
+        t('tests.unit.test_prearm.SlotPage.goto')
+        self.actions.append(("goto", url))
+        self.url = url
+
+    async def reload(self, **kwargs):
+        t('tests.unit.test_prearm.SlotPage.reload')
+        self.actions.append(("reload",))
+        return None
+
+    async def query_selector(self, selector):
+        t('tests.unit.test_prearm.SlotPage.query_selector')
+        if selector.startswith("button:has-text") and "Confirm\"" in selector:
+            return None
+        if not self.submit_on_load and "Confirmar" in selector:
+            return None
+        if not self.form_on_load and ("form" == selector or "client." in selector):
+            return None
+        return FakeElement(self, selector)
+
+    async def wait_for_selector(self, selector, timeout=None):
+        t('tests.unit.test_prearm.SlotPage.wait_for_selector')
+        element = await self.query_selector(selector)
+        if element is None:
+            raise TimeoutError(selector)
+        return element
+
+    async def wait_for_function(self, script, polling=None, timeout=None):
+        t('tests.unit.test_prearm.SlotPage.wait_for_function')
+        raise RuntimeError("Execution context was destroyed")
+
+
+@pytest.mark.asyncio
+async def test_prearm_registers_slot_and_take_requires_parked_page():
+    t('tests.unit.test_prearm.test_prearm_registers_slot_and_take_requires_parked_page')
+    registry = PreArmRegistry()
+    page = SlotPage()
+
+    slot = await prearm_slot_page(page, 1, date(2030, 1, 5), "08:00", registry=registry)
+
+    assert slot is not None and slot.form_ready and slot.mode == "direct_slot"
+    assert page.actions[0] == ("goto", slot.url)
+    assert registry.armed_courts("2030-01-05", "08:00") == [1]
+    assert not registry.is_armed(1, date(2030, 1, 5), "09:00")
+
+    page.url = "https://clublavilla.as.me/schedule/abc/appointment/1"
+    assert registry.take(1, datetime(2030, 1, 5, 8), "08:00", page) is None
+    assert registry.armed_courts("2030-01-05", "08:00") == []
+
+    await prearm_slot_page(page, 2, date(2030, 1, 5), "08:00", registry=registry)
+    assert registry.take(2, "2030-01-05", "08:00", page).court == 2
+
+
+@pytest.mark.asyncio
+async def test_prearmed_natural_flow_skips_calendar_and_reports_phases(monkeypatch):
+    t('tests.unit.test_prearm.test_prearmed_natural_flow_skips_calendar_and_reports_phases')
+    registry = PreArmRegistry()
+    page = SlotPage()
+    await prearm_slot_page(page, 1, date(2020, 1, 5), "08:00", registry=registry)
+
+    async def fake_confirmation(page, court, time_slot, user_info, **kwargs):
+        return ExecutionResult(success=True, court_number=court)
+
+    monkeypatch.setattr(natural_flow_module, "get_prearm_registry", lambda: registry)
+    monkeypatch.setattr(natural_flow_module, "confirmation_result", fake_confirmation)
+
+    logger = DummyLogger()
+    steps = natural_flow_module.NaturalFlowSteps(page, logger)
+    result = await steps.execute(
+        1, datetime(2020, 1, 5), "08:00", USER, initial_delay_range=(30, 60)
+    )
+
+    assert result.success
+    assert result.details["flow_path"] == "pre-armed"
+    assert list(result.details["phase_timings"]) == [
+        "wait_release", "refresh", "form_visible", "fill", "submit", "outcome", "confirm",
+    ]
+    assert ("reload",) in page.actions
+    assert ("click", 'button:has-text("Confirmar")') in page.actions
+    assert [a for a in page.actions if a[0] == "goto"][1:] == []
+    assert registry.armed_courts("2020-01-05", "08:00") == []
+
+
+@pytest.mark.asyncio
+async def test_prearmed_flow_without_submit_button_releases_guard_without_waiting(monkeypatch):
+    t('tests.unit.test_prearm.test_prearmed_flow_without_submit_button_releases_guard_without_waiting')
+    registry = PreArmRegistry()
+    page = SlotPage(submit_on_load=False)
+    await prearm_slot_page(page, 1, date(2020, 1, 5), "08:00", registry=registry)
+
+    async def no_outcome_wait(script, polling=None, timeout=None):
+        raise AssertionError("no outcome wait without a submit click")
+
+    page.wait_for_function = no_outcome_wait
+    monkeypatch.setattr(natural_flow_module, "get_prearm_registry", lambda: registry)
+    guard = CommitGuard()
+
+    steps = natural_flow_module.NaturalFlowSteps(page, DummyLogger(), commit_guard=guard)
+    result = await steps.execute(
+        1, datetime(2020, 1, 5), "08:00", USER, initial_delay_range=(30, 60)
+    )
+
+    assert not result.success and result.error_message == "Submit button not found"
+    assert "outcome" not in result.details["phase_timings"]
+    assert not guard.decided
+    assert await guard.acquire(2)
+
+
+class FakePool:
+    def __init__(self, courts):
+        t('tests.unit.test_prearm.FakePool.__init__')
+        self.courts = list(courts)
+        self.pages = {court: SlotPage() for court in courts}
+        self.refreshed = None
+
+    async def refresh_browser_pages(self, courts=None):
+        t('tests.unit.test_prearm.FakePool.refresh_browser_pages')
+        self.refreshed = list(self.courts if courts is None else courts)
+        return {court: True for court in self.refreshed}
+
+
+@pytest.mark.asyncio
+async def test_scheduler_prearms_preferred_courts_and_keeps_them_parked(monkeypatch):
+    t('tests.unit.test_prearm.test_scheduler_prearms_preferred_courts_and_keeps_them_parked')
+    monkeypatch.setattr(scheduler_module, "BrowserManager", lambda pool: SimpleNamespace(pool=pool))
+    scheduler = ReservationScheduler(
+        config=SimpleNamespace(timezone="America/Guatemala"),
+        queue=SimpleNamespace(),
+        notification_callback=lambda *a, **k: None,
+    )
+    scheduler.prearm_registry = PreArmRegistry()
+    pool = FakePool([1, 2, 3])
+    scheduler.browser_pool = pool
+
+    async def ensure_pool():
+        return pool
+
+    scheduler.browser_lifecycle.ensure_browser_pool = ensure_pool
+    reservations = [
+        {"id": "a", "target_date": "2030-01-05", "target_time": "08:00", "court_preferences": [3, 1]},
+        {"id": "b", "target_date": "2030-01-05", "target_time": "08:00", "court_preferences": [1, 9]},
+    ]
+
+    assert await scheduler._prearm_reservation_group(reservations) == [3, 1]
+    assert await scheduler._prearm_reservation_group(reservations) == []
+
+    armed = scheduler.prearm_registry.armed_courts(date(2030, 1, 5), "08:00")
+    assert await scheduler._refresh_browser_pool(skip_courts=armed)
+    assert pool.refreshed == [2]
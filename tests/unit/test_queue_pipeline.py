@@ -91,3 +91,17 @@ def test_hydrate_reservation_batch_collects_failures(sample_reservations):
 
     assert not hydrated.requests
     assert len(hydrated.failures) == 1
+
+
+def test_pull_ready_reservations_buckets_prearm_window(sample_reservations):
+    t('tests.unit.test_queue_pipeline.test_pull_ready_reservations_buckets_prearm_window')
+    queue = DummyQueue(sample_reservations)
+    now = dt.datetime.fromisoformat("2024-01-03T08:08:45")
+
+    evaluation = pull_ready_reservations(queue, now=now, logger=None, prearm_window_seconds=20)
+    assert [b.reservations[0]["id"] for b in evaluation.requires_prearm] == ["def456"]
+    assert evaluation.requires_health_check == []
+
+    disabled = pull_ready_reservations(queue, now=now, logger=None, prearm_window_seconds=0)
+    assert disabled.requires_prearm == []
+    assert [b.reservations[0]["id"] for b in disabled.requires_health_check] == ["def456"]
@@ -0,0 +1,133 @@
+from tracking import t
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+from automation.shared.booking_contracts import BookingResult, BookingUser
+from reservations.queue import queue_registry
+from reservations.queue.persistence import persist_queue_cancellation, persist_queue_outcome
+from reservations.queue.reservation_queue import ReservationQueue
+from reservations.queue.reservation_tracker import ReservationTracker
+from reservations.services.reservation_service import ReservationService
+
+
+@pytest.fixture
+def shared_queue(tmp_path, monkeypatch):
+    t('tests.unit.test_queue_registry.shared_queue')
+    queue_file = tmp_path / "queue.json"
+    monkeypatch.setattr(
+        queue_registry, "get_settings", lambda: SimpleNamespace(queue_file=str(queue_file))
+    )
+    queue_registry.reset_queues()
+    yield queue_registry.get_queue()
+    queue_registry.reset_queues()
+
+
+def _seed(queue, count):
+    t('tests.unit.test_queue_registry._seed')
+    return [
+        queue.add_reservation(
+            {
+                "user_id": index,
+                "target_date": "2030-01-01",
+                "target_time": "08:00",
+                "court_preferences": [1],
+            }
+        )
+        for index in range(count)
+    ]
+
+
+def _success(reservation_id):
+    t('tests.unit.test_queue_registry._success')
+    user = BookingUser(
+        user_id=1, first_name="Jane", last_name="Doe", email="jane@example.com", phone="555",
+    )
+    return BookingResult.success_result(user, reservation_id, 1, "08:00", confirmation_code="OK")
+
+
+def test_registry_returns_one_instance_per_file(shared_queue, tmp_path):
+    t('tests.unit.test_queue_registry.test_registry_returns_one_instance_per_file')
+    assert queue_registry.get_queue(str(tmp_path / "queue.json")) is shared_queue
+    assert queue_registry.get_queue(str(tmp_path / "other.json")) is not shared_queue
+
+    assert queue_registry.register_queue(shared_queue) is shared_queue
+    stray = ReservationQueue(str(tmp_path / "queue.json"))
+    try:
+        with pytest.raises(ValueError, match="already registered"):
+            queue_registry.register_queue(stray)
+    finally:
+        stray.repository.close()
+    assert queue_registry.get_queue() is shared_queue
+
+
+def test_persist_outcome_updates_shared_instance_in_place(shared_queue):
+    t('tests.unit.test_queue_registry.test_persist_outcome_updates_shared_instance_in_place')
+    reservation_id = _seed(shared_queue, 1)[0]
+
+    assert persist_queue_outcome(reservation_id, _success(reservation_id))
+    assert shared_queue.get_reservation(reservation_id)["status"] == "success"
+
+    assert persist_queue_cancellation(reservation_id, metadata={"reason": "user"})
+    record = shared_queue.get_reservation(reservation_id)
+    assert record["status"] == "cancelled"
+    assert record["reason"] == "user"
+
+
+def test_concurrent_writers_do_not_lose_updates(shared_queue):
+    t('tests.unit.test_queue_registry.test_concurrent_writers_do_not_lose_updates')
+    reservation_ids = _seed(shared_queue, 40)
+    halves = [reservation_ids[::2], reservation_ids[1::2]]
+    barrier = threading.Barrier(len(halves))
+
+    def outcome_writer(ids):
+        barrier.wait()
+        for reservation_id in ids:
+            persist_queue_outcome(reservation_id, _success(reservation_id))
+
+    def cancellation_writer(ids):
+        barrier.wait()
+        for reservation_id in ids:
+            persist_queue_cancellation(reservation_id, metadata={"reason": "user"})
+
+    threads = [
+        threading.Thread(target=outcome_writer, args=(halves[0],)),
+        threading.Thread(target=cancellation_writer, args=(halves[1],)),
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    shared_queue.repository.close()
+
+    reloaded = ReservationQueue(shared_queue.file_path)
+    statuses = {r["id"]: r["status"] for r in reloaded.queue}
+    assert all(statuses[reservation_id] == "success" for reservation_id in halves[0])
+    assert all(statuses[reservation_id] == "cancelled" for reservation_id in halves[1])
+
+
+def test_injected_queue_becomes_the_shared_instance(tmp_path, monkeypatch):
+    t('tests.unit.test_queue_registry.test_injected_queue_becomes_the_shared_instance')
+    queue_file = tmp_path / "queue.json"
+    monkeypatch.setattr(
+        queue_registry, "get_settings", lambda: SimpleNamespace(queue_file=str(queue_file))
+    )
+    queue_registry.reset_queues()
+    injected = ReservationQueue(str(queue_file))
+    try:
+        service = ReservationService(
+            config=SimpleNamespace(timezone="America/Guatemala"),
+            notification_callback=lambda *a, **k: None,
+            queue=injected,
+            reservation_tracker=ReservationTracker(str(tmp_path / "all_reservations.json")),
+        )
+        assert service.queue is injected and service.scheduler.queue is injected
+        assert queue_registry.get_queue() is injected
+
+        # Persistence helpers that resolve the queue themselves see the injected records.
+        reservation_id = _seed(injected, 1)[0]
+        assert persist_queue_outcome(reservation_id, _success(reservation_id))
+        assert injected.get_reservation(reservation_id)["status"] == "success"
+    finally:
+        queue_registry.reset_queues()
@@ -0,0 +1,151 @@
+from tracking import t
+from types import SimpleNamespace
+
+import pytest
+
+from automation.browser.refresh_control import (
+    DETECTION_COOLDOWN,
+    RefreshRateController,
+    set_refresh_controller,
+)
+from automation.executors.flows import fast_flow
+
+HOST = "example.as.me"
+
+
+class FakeClock:
+    def __init__(self):
+        t('tests.unit.test_refresh_control.FakeClock.__init__')
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        t('tests.unit.test_refresh_control.FakeClock.monotonic')
+        return self.now
+
+    async def sleep(self, seconds):
+        t('tests.unit.test_refresh_control.FakeClock.sleep')
+        self.sleeps.append(round(seconds, 3))
+        self.now += seconds
+
+
+class FakePage:
+    def __init__(self, clock, *, latency=0.1, statuses=()):
+        t('tests.unit.test_refresh_control.FakePage.__init__')
+        self.url = f"https://{HOST}/schedule.php?owner=1"
+        self.clock = clock
+        self.latency = latency
+        self.statuses = list(statuses)
+        self.reloads = 0
+
+    async def reload(self, **kwargs):
+        t('tests.unit.test_refresh_control.FakePage.reload')
+        self.reloads += 1
+        self.clock.now += self.latency
+        return SimpleNamespace(status=self.statuses.pop(0) if self.statuses else 200)
+
+    async def query_selector(self, selector):
+        t('tests.unit.test_refresh_control.FakePage.query_selector')
+        return None
+
+
+def _controller(clock, **kwargs):
+    t('tests.unit.test_refresh_control._controller')
+    kwargs.setdefault("global_rate", 0)
+    return RefreshRateController(monotonic=clock.monotonic, sleep=clock.sleep, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_throttling_backs_off_multiplicatively_and_recovers_additively():
+    t('tests.unit.test_refresh_control.test_throttling_backs_off_multiplicatively_and_recovers_additively')
+    clock = FakeClock()
+    controller = _controller(clock, min_interval=0.3)
+    page = FakePage(clock, statuses=[200, 503, 429])
+
+    for _ in range(3):
+        await controller.reload(page, 1)
+
+    assert clock.sleeps == [0.2, 0.5]
+    assert controller.stats()[HOST]["interval"] == pytest.approx(1.2)
+    assert controller.stats()[HOST]["throttled"] == 2
+
+    for _ in range(4):
+        await controller.reload(page, 1)
+    assert controller.interval_for(HOST) == pytest.approx(1.0)
+    assert clock.sleeps[-1] == pytest.approx(0.95)
+
+    # Another court on the same host is paced by the host interval, but not by court 1's last reload.
+    assert await controller.acquire(HOST, 2) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_interval_follows_slow_reloads_and_caller_floor():
+    t('tests.unit.test_refresh_control.test_interval_follows_slow_reloads_and_caller_floor')
+    clock = FakeClock()
+    controller = _controller(clock, min_interval=0.1)
+    controller.record(HOST, 1.0)
+
+    assert controller.interval_for(HOST) == pytest.approx(1.5)
+    assert controller.interval_for(HOST, floor=2.0) == pytest.approx(2.0)
+
+    controller.record(HOST, 5.0)
+    assert controller.interval_for(HOST) == pytest.approx(3.3)
+    assert controller.stats()[HOST]["throttled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_detection_pauses_host_and_global_budget_spaces_all_pages():
+    t('tests.unit.test_refresh_control.test_detection_pauses_host_and_global_budget_spaces_all_pages')
+    clock = FakeClock()
+    controller = _controller(clock, min_interval=0.3, global_rate=2, burst=2)
+
+    waits = [await controller.acquire(HOST, court) for court in (1, 2, 3, 4)]
+    assert waits == [0.0, 0.0, 0.5, 0.5]
+
+    controller.report_detection(HOST)
+    assert controller.interval_for(HOST) == pytest.approx(1.2)
+    wait = await controller.acquire(HOST, 5)
+    assert wait == pytest.approx(DETECTION_COOLDOWN)
+    assert await controller.acquire("other.host", 1) == 0.0
+    assert await controller.acquire("other.host", 2) == pytest.approx(0.5)
+
+
+@pytest.mark.asyncio
+async def test_failed_reload_counts_as_back_pressure():
+    t('tests.unit.test_refresh_control.test_failed_reload_counts_as_back_pressure')
+    clock = FakeClock()
+    controller = _controller(clock, min_interval=0.3)
+
+    class BrokenPage(FakePage):
+        async def reload(self, **kwargs):
+            t('tests.unit.test_refresh_control.BrokenPage.reload')
+            raise TimeoutError("navigation timeout")
+
+    with pytest.raises(TimeoutError):
+        await controller.reload(BrokenPage(clock), 1)
+    assert controller.interval_for(HOST) == pytest.approx(0.6)
+
+
+@pytest.mark.asyncio
+async def test_fast_flow_refreshes_through_controller(monkeypatch):
+    t('tests.unit.test_refresh_control.test_fast_flow_refreshes_through_controller')
+    monkeypatch.setattr(fast_flow, "PRODUCTION_MODE", True)
+    clock = FakeClock()
+    controller = _controller(clock, min_interval=0.3)
+    previous = set_refresh_controller(controller)
+    page = FakePage(clock, latency=0.2, statuses=[503, 503])
+    try:
+        button = await fast_flow.find_time_slot_with_refresh(
+            page,
+            "08:00",
+            3,
+            max_attempts=3,
+            refresh_delay=0.6,
+            log=SimpleNamespace(info=lambda *a, **k: None, debug=lambda *a, **k: None),
+        )
+    finally:
+        set_refresh_controller(previous)
+
+    assert button is None and page.reloads == 3
+    assert clock.sleeps == [0.4, 1.0]
+    assert controller.stats()[HOST]["throttled"] == 2
@@ -0,0 +1,116 @@
+from tracking import t
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from types import SimpleNamespace
+
+import pytest
+
+from automation.executors.booking_orchestrator import DynamicBookingOrchestrator
+from automation.executors.release_clock import ReleaseClock
+from automation.executors.release_timing import ReleaseTimingModel
+
+
+class FakeTime:
+    def __init__(self, wall=1_900_000_000.0):
+        t('tests.unit.test_release_clock.FakeTime.__init__')
+        self.wall = wall
+        self.mono = 100.0
+        self.sleeps = []
+
+    def monotonic(self):
+        t('tests.unit.test_release_clock.FakeTime.monotonic')
+        return self.mono
+
+    async def sleep(self, seconds):
+        t('tests.unit.test_release_clock.FakeTime.sleep')
+        self.sleeps.append(seconds)
+        self.mono += seconds
+
+
+class FakePage:
+    """Serves reloads whose Date header comes from a server ``skew`` seconds ahead."""
+
+    def __init__(self, fake, skew, latency):
+        t('tests.unit.test_release_clock.FakePage.__init__')
+        self.fake = fake
+        self.skew = skew
+        self.latency = latency
+
+    async def reload(self, **kwargs):
+        t('tests.unit.test_release_clock.FakePage.reload')
+        self.fake.mono += self.latency / 2
+        server_now = self.fake.wall + self.fake.mono - 100.0 + self.skew
+        stamped = datetime.fromtimestamp(int(server_now), timezone.utc)
+        self.fake.mono += self.latency / 2
+        return SimpleNamespace(headers={"date": format_datetime(stamped, usegmt=True)})
+
+
+def make_clock(fake):
+    t('tests.unit.test_release_clock.make_clock')
+    return ReleaseClock(wall=lambda: fake.wall, monotonic=fake.monotonic, sleep=fake.sleep)
+
+
+@pytest.mark.asyncio
+async def test_offset_converges_below_date_header_resolution():
+    t('tests.unit.test_release_clock.test_offset_converges_below_date_header_resolution')
+    fake = FakeTime()
+    clock = make_clock(fake)
+    page = FakePage(fake, skew=1.37, latency=0.08)
+
+    assert not clock.calibrated
+    assert clock.offset == 0.0
+
+    for _ in range(12):
+        await clock.reload(page, wait_until="domcontentloaded")
+        fake.mono += 0.173  # reloads land at varied sub-second phases
+
+    stats = clock.stats()
+    assert stats["samples"] == 12
+    assert clock.offset == pytest.approx(1.37, abs=0.1)
+    assert stats["uncertainty"] < 0.2
+    assert stats["min_delay"] == pytest.approx(0.08)
+    assert stats["jitter"] > 0
+
+
+def test_disjoint_sample_drops_stale_history():
+    t('tests.unit.test_release_clock.test_disjoint_sample_drops_stale_history')
+    clock = make_clock(FakeTime())
+
+    clock.add_sample(1010.0, 1000.0, 1000.2)
+    clock.add_sample(1010.1, 1000.1, 1000.2)
+    assert clock.offset == pytest.approx(9.95, abs=0.05)
+
+    # The server stepped 5s forward; the estimate follows the newest sample.
+    clock.add_sample(1015.0, 1000.3, 1000.4)
+    assert clock.offset == pytest.approx(14.65)
+
+
+@pytest.mark.asyncio
+async def test_wait_until_targets_server_time_on_monotonic_clock():
+    t('tests.unit.test_release_clock.test_wait_until_targets_server_time_on_monotonic_clock')
+    fake = FakeTime()
+    clock = make_clock(fake)
+    clock.add_sample(fake.wall + 2.0, fake.wall, fake.wall)
+
+    release = clock.now(timezone.utc) + timedelta(seconds=2.5)
+    # A wall-clock step on the host must not move the wake-up.
+    fake.wall += 3600
+    lateness = await clock.wait_until(release)
+
+    assert lateness == pytest.approx(0.0, abs=1e-6)
+    assert sum(fake.sleeps) == pytest.approx(2.5)
+    assert max(fake.sleeps) <= 1.0
+    assert await clock.wait_until(release - timedelta(seconds=1)) == 0.0
+
+
+def test_precision_refresh_uses_measured_offset():
+    t('tests.unit.test_release_clock.test_precision_refresh_uses_measured_offset')
+    fake = FakeTime()
+    clock = make_clock(fake)
+    orchestrator = DynamicBookingOrchestrator(release_clock=clock, release_model=ReleaseTimingModel())
+    target = datetime(2030, 1, 1, 8, 0, 0)
+
+    assert orchestrator.get_precision_refresh_moment(target) == target - timedelta(seconds=2.4)
+
+    clock.add_sample(fake.wall + 0.75, fake.wall, fake.wall)
+    assert orchestrator.get_precision_refresh_moment(target) == target - timedelta(seconds=1.75)
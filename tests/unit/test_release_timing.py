@@ -0,0 +1,187 @@
+from tracking import t
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+
+from automation.executors.booking_orchestrator import DynamicBookingOrchestrator
+from automation.executors.flows import natural_flow as natural_flow_module
+from automation.executors.release_timing import (
+    ReleaseTimingModel,
+    expected_release_window,
+    set_release_timing_model,
+)
+from monitoring.availability_poller import AvailabilityPoller
+
+TZ = pytz.timezone("America/Guatemala")
+SLOT = TZ.localize(datetime(2030, 1, 7, 8, 0))
+RELEASE = SLOT - timedelta(hours=48)
+
+
+def _observe(model, court, low, high, slot=SLOT):
+    t('tests.unit.test_release_timing._observe')
+    release_ts = (slot - timedelta(hours=48)).timestamp()
+    return model.observe(court, slot, absent_at=release_ts + low, present_at=release_ts + high)
+
+
+@pytest.mark.asyncio
+async def test_poller_records_release_interval_between_fetches(tmp_path):
+    t('tests.unit.test_release_timing.test_poller_records_release_interval_between_fetches')
+    path = tmp_path / "release_timing.json"
+    model = ReleaseTimingModel(str(path), window_hours=48)
+    release_ts = RELEASE.timestamp()
+    clock = iter([release_ts - 3.0, release_ts - 2.6, release_ts - 1.0, release_ts - 0.5])
+    snapshots = iter([{1: {"2030-01-07": ["07:00"]}}, {1: {"2030-01-07": ["07:00", "08:00"]}}])
+
+    async def fetch():
+        await asyncio.sleep(0)
+        return next(snapshots)
+
+    poller = AvailabilityPoller(
+        fetch, logger=logging.getLogger("test_poller"), release_model=model, wall=lambda: next(clock)
+    )
+    await poller.poll()
+    second = await poller.poll()
+
+    assert second.changes[1].added == {"2030-01-07": ["08:00"]}
+    stored = json.loads(path.read_text())["buckets"]
+    assert stored == {f"1|{RELEASE.weekday()}|8": [[-3.0, -0.5]]}
+    assert ReleaseTimingModel(str(path), window_hours=48).sample_count() == 1
+
+
+def test_model_rejects_coarse_or_off_release_observations_and_backs_off_scopes():
+    t('tests.unit.test_release_timing.test_model_rejects_coarse_or_off_release_observations_and_backs_off_scopes')
+    model = ReleaseTimingModel(window_hours=48, min_samples=3)
+
+    assert _observe(model, 1, -20.0, 5.0) is None  # polls too far apart
+    assert _observe(model, 1, 3600.0, 3605.0) is None  # a cancellation, not a release
+    for low, high in ((-2.0, -1.0), (-1.8, -1.2), (-1.6, -0.6)):
+        assert _observe(model, 1, low, high) is not None
+    _observe(model, 2, 0.0, 1.0, slot=SLOT + timedelta(hours=3))
+
+    local = RELEASE.replace(tzinfo=None)
+    court_one = model.estimate(local, court=1)
+    assert (court_one.scope, court_one.samples) == ("court+weekday+hour", 3)
+    assert court_one.offset == pytest.approx(-1.5)
+    assert (court_one.early, court_one.late) == (-2.0, -0.6)
+
+    assert model.estimate(local, court=3).scope == "weekday+hour"
+    assert model.estimate(local + timedelta(hours=5)).scope == "all"
+    assert ReleaseTimingModel(window_hours=48).estimate(local) is None
+
+
+def test_orchestrator_times_refreshes_from_learned_offsets():
+    t('tests.unit.test_release_timing.test_orchestrator_times_refreshes_from_learned_offsets')
+    model = ReleaseTimingModel(window_hours=48, min_samples=3)
+    for low, high in ((-4.0, -3.0), (-3.8, -3.2), (-3.6, -2.6)):
+        _observe(model, 1, low, high)
+    orchestrator = DynamicBookingOrchestrator(racing=False, release_model=model)
+    target = RELEASE.replace(tzinfo=None)
+
+    assert orchestrator.get_precision_refresh_moment(target, court=1) == target - timedelta(seconds=4.5)
+
+    windows = orchestrator.get_refresh_windows(target, court=1)
+    assert (windows["critical_start"], windows["critical_end"]) == (-4.5, -2.1)
+    interval = orchestrator.get_smart_refresh_interval
+    assert interval(target, target - timedelta(seconds=4)) == 0.1
+    assert interval(target, target - timedelta(seconds=5)) == 0.2
+    assert interval(target, target - timedelta(seconds=10)) == 0.5
+    assert interval(target, target - timedelta(seconds=60)) == 2.0
+    assert interval(target, target + timedelta(seconds=0.5)) == 0.2
+    assert interval(target, target + timedelta(seconds=1)) == 2.0
+
+    untrained = DynamicBookingOrchestrator(racing=False, release_model=ReleaseTimingModel(window_hours=48))
+    assert untrained.get_smart_refresh_interval(target, target - timedelta(seconds=1)) == 0.1
+    assert untrained.get_smart_refresh_interval(target, target - timedelta(seconds=10)) == 0.5
+
+
+class SteppingClock:
+    offset = 0.5
+
+    def __init__(self, now):
+        t('tests.unit.test_release_timing.SteppingClock.__init__')
+        self.current = now
+        self.waits = []
+
+    def now(self, tz=None):
+        t('tests.unit.test_release_timing.SteppingClock.now')
+        return self.current
+
+    async def wait_until(self, moment):
+        t('tests.unit.test_release_timing.SteppingClock.wait_until')
+        self.waits.append(moment)
+        self.current = max(self.current, moment)
+        return 0.0
+
+    def stats(self):
+        t('tests.unit.test_release_timing.SteppingClock.stats')
+        return {"offset": self.offset, "jitter": 0.0, "samples": 1}
+
+
+class SteppingRefresher:
+    def __init__(self, clock):
+        t('tests.unit.test_release_timing.SteppingRefresher.__init__')
+        self.clock = clock
+        self.reloads = 0
+
+    async def reload(self, page, court, **kwargs):
+        t('tests.unit.test_release_timing.SteppingRefresher.reload')
+        self.reloads += 1
+        self.clock.current += timedelta(seconds=1)
+
+
+@pytest.mark.asyncio
+async def test_natural_flow_waits_and_bursts_on_learned_release_window():
+    t('tests.unit.test_release_timing.test_natural_flow_waits_and_bursts_on_learned_release_window')
+    model = ReleaseTimingModel(window_hours=48, min_samples=3)
+    for low, high in ((-4.0, -3.0), (-3.8, -3.2), (-3.6, -2.6)):
+        _observe(model, 1, low, high)
+    assert expected_release_window(RELEASE, 1, model=model) == (
+        RELEASE - timedelta(seconds=4.0), RELEASE - timedelta(seconds=2.6)
+    )
+    assert expected_release_window(RELEASE, 1, model=ReleaseTimingModel(window_hours=48)) is None
+
+    clock = SteppingClock(RELEASE - timedelta(seconds=60))
+    refresher = SteppingRefresher(clock)
+    pauses = []
+
+    async def pause(*args):
+        t('tests.unit.test_release_timing.test_natural_flow_waits_and_bursts_on_learned_release_window.pause')
+        pauses.append(clock.current)
+
+    async def capture_state(*args):
+        t('tests.unit.test_release_timing.test_natural_flow_waits_and_bursts_on_learned_release_window.capture_state')
+        return None
+
+    async def select_time_button(time_slot):
+        t(
+            'tests.unit.test_release_timing.test_natural_flow_waits_and_bursts_on_learned_release_window'
+            '.select_time_button'
+        )
+        return "button" if refresher.reloads == 3 else None
+
+    steps = object.__new__(natural_flow_module.NaturalFlowSteps)
+    steps.page = None
+    steps.logger = logging.getLogger("test_release_timing")
+    steps.clock = clock
+    steps.refresher = refresher
+    steps.actions = type("Actions", (), {"pause": staticmethod(pause)})()
+    steps.debug_logger = type("Debug", (), {"capture_state": staticmethod(capture_state)})()
+    steps.select_time_button = select_time_button
+
+    previous = set_release_timing_model(model)
+    try:
+        button = await steps._wait_for_time_slot(
+            "08:00", 1, target_datetime=SLOT, release_datetime=RELEASE
+        )
+    finally:
+        set_release_timing_model(previous)
+
+    assert button == "button"
+    # Woken at the learned early bound (plus the server offset), not the nominal release.
+    assert clock.waits == [RELEASE - timedelta(seconds=3.5)]
+    # Reloads inside the learned window skip the natural pause; the last one is past it.
+    assert pauses == [RELEASE - timedelta(seconds=0.5)]
@@ -1,4 +1,5 @@
 from tracking import t
+import json
 from pathlib import Path
 
 from reservations.queue.reservation_repository import ReservationRepository
@@ -21,3 +22,58 @@ def test_repository_round_trip(tmp_path):
 
     reloaded = ReservationRepository(str(repo_path), logger=DummyLogger()).load()
     assert reloaded == data
+
+
+def test_journal_replays_mutations_on_load(tmp_path):
+    t('tests.unit.test_reservation_repository.test_journal_replays_mutations_on_load')
+    repo_path = tmp_path / "queue.json"
+    repository = ReservationRepository(str(repo_path), logger=DummyLogger(), journal=True)
+    repository.save([{"id": "abc", "status": "pending"}])
+
+    repository.record_upsert({"id": "abc", "status": "scheduled"})
+    repository.record_upsert({"id": "def", "status": "pending"})
+    repository.record_removal("abc")
+    repository.close()
+
+    # The snapshot is untouched until compaction; the journal holds the deltas.
+    assert json.loads(repo_path.read_text(encoding="utf-8")) == [{"id": "abc", "status": "pending"}]
+
+    reloaded = ReservationRepository(str(repo_path), logger=DummyLogger(), journal=True).load()
+    assert reloaded == [{"id": "def", "status": "pending"}]
+    assert not (tmp_path / "queue.json.journal").exists()
+
+
+def test_journal_ignores_torn_trailing_line(tmp_path):
+    t('tests.unit.test_reservation_repository.test_journal_ignores_torn_trailing_line')
+    repo_path = tmp_path / "queue.json"
+    repository = ReservationRepository(str(repo_path), logger=DummyLogger(), journal=True)
+    repository.record_upsert({"id": "abc", "status": "pending"})
+    repository.close()
+    with (tmp_path / "queue.json.journal").open("a", encoding="utf-8") as handle:
+        handle.write('{"op":"put","record":{"id":"de')
+
+    logger = DummyLogger()
+    reloaded = ReservationRepository(str(repo_path), logger=logger, journal=True).load()
+    assert reloaded == [{"id": "abc", "status": "pending"}]
+    assert logger.last("warning") is not None
+
+
+def test_journal_compacts_in_background(tmp_path):
+    t('tests.unit.test_reservation_repository.test_journal_compacts_in_background')
+    repo_path = tmp_path / "queue.json"
+    repository = ReservationRepository(
+        str(repo_path), logger=DummyLogger(), journal=True, compact_threshold=3,
+    )
+    for index in range(3):
+        repository.record_upsert({"id": str(index), "status": "pending"})
+    repository.wait_for_compaction(timeout=5)
+    repository.record_upsert({"id": "0", "status": "success"})
+    repository.close()
+
+    snapshot = json.loads(repo_path.read_text(encoding="utf-8"))
+    assert [record["id"] for record in snapshot] == ["0", "1", "2"]
+    assert not (tmp_path / "queue.json.journal.compacting").exists()
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["queue.json", "queue.json.journal"]
+
+    reloaded = ReservationRepository(str(repo_path), logger=DummyLogger(), journal=True).load()
+    assert reloaded[0] == {"id": "0", "status": "success"}
@@ -0,0 +1,67 @@
+from tracking import t
+
+from reservations.queue.reservation_queue import ReservationQueue, ReservationStatus
+from reservations.queue.reservation_store import ReservationStore
+
+
+def make_record(reservation_id, user_id=1, status="scheduled", target_time="08:00"):
+    t('tests.unit.test_reservation_store.make_record')
+    return {
+        "id": reservation_id,
+        "user_id": user_id,
+        "target_date": "2030-01-01",
+        "target_time": target_time,
+        "status": status,
+    }
+
+
+def test_store_indexes_follow_in_place_mutations():
+    t('tests.unit.test_reservation_store.test_store_indexes_follow_in_place_mutations')
+    store = ReservationStore([make_record("a"), make_record("b", user_id=2)])
+
+    record = store.get("a")
+    record["status"] = "waitlisted"
+    record["target_time"] = "09:00"
+    store.reindex("a")
+
+    assert store.by_status("scheduled") == [store.get("b")]
+    assert store.by_status("waitlisted") == [record]
+    assert store.by_slot("2030-01-01", "08:00") == [store.get("b")]
+    assert store.by_slot("2030-01-01", "09:00") == [record]
+    assert store.status_counts() == {"scheduled": 1, "waitlisted": 1}
+
+
+def test_store_preserves_queue_order_across_replace_and_remove():
+    t('tests.unit.test_reservation_store.test_store_preserves_queue_order_across_replace_and_remove')
+    store = ReservationStore([make_record(str(i)) for i in range(4)])
+
+    store.replace("0", make_record("0", status="confirmed"))
+    store.remove("2")
+
+    assert [r["id"] for r in store.values()] == ["0", "1", "3"]
+    assert [r["id"] for r in store.by_status("scheduled", "confirmed")] == ["0", "1", "3"]
+    assert [r["id"] for r in store.by_user(1)] == ["0", "1", "3"]
+    assert "2" not in store
+
+
+def test_queue_lookups_use_indexes(tmp_path):
+    t('tests.unit.test_reservation_store.test_queue_lookups_use_indexes')
+    queue = ReservationQueue(file_path=str(tmp_path / "queue.json"))
+    first = queue.add_reservation(
+        {"user_id": 7, "target_date": "2030-01-01", "target_time": "08:00", "court_preferences": [1]}
+    )
+    second = queue.add_reservation(
+        {"user_id": 8, "target_date": "2030-01-01", "target_time": "08:00", "court_preferences": [1]}
+    )
+
+    assert queue.add_to_waitlist(second, 1)
+    assert [r["id"] for r in queue.get_waitlist_for_slot("2030-01-01", "08:00")] == [second]
+    assert [r["id"] for r in queue.get_pending_reservations()] == [first]
+
+    assert queue.update_reservation_status(first, ReservationStatus.SUCCESS.value)
+    assert queue.get_pending_reservations() == []
+    assert queue._get_status_counts() == {"success": 1, "waitlisted": 1}
+
+    assert queue.remove_reservation(first)
+    assert queue.get_user_reservations(7) == []
+    assert [r["id"] for r in queue.get_reservations_by_time_slot("2030-01-01", "08:00")] == [second]
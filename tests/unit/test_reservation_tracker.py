@@ -0,0 +1,91 @@
+from tracking import t
+import json
+from datetime import date, datetime
+
+from reservations.queue.reservation_tracker import ReservationTracker
+
+
+class FakeClock:
+    def __init__(self, now):
+        t('tests.unit.test_reservation_tracker.FakeClock.__init__')
+        self.now = now
+
+    def __call__(self):
+        t('tests.unit.test_reservation_tracker.FakeClock.__call__')
+        return self.now
+
+
+def _booking(confirmation_id, play_date, play_time, court=1):
+    t('tests.unit.test_reservation_tracker._booking')
+    return {
+        "confirmation_id": confirmation_id,
+        "court": court,
+        "date": play_date,
+        "time": play_time,
+    }
+
+
+def test_active_lookup_uses_indexes_and_follows_updates(tmp_path):
+    t('tests.unit.test_reservation_tracker.test_active_lookup_uses_indexes_and_follows_updates')
+    clock = FakeClock(datetime(2030, 1, 10, 12, 0))
+    tracker = ReservationTracker(str(tmp_path / "all_reservations.json"), clock=clock)
+    late = tracker.add_completed_booking(7, _booking("b", "2030-01-11", "18:00"))
+    early = tracker.add_completed_booking(7, _booking("a", "2030-01-11", "09:00", court=2))
+    tracker.add_completed_booking(7, _booking("past", "2030-01-10", "11:00"))
+    tracker.add_completed_booking(8, _booking("other", "2030-01-11", "10:00"))
+
+    assert [r["id"] for r in tracker.get_user_active_reservations(7)] == [early, late]
+    assert [r["confirmation_id"] for r in tracker.get_reservations_on(date(2030, 1, 11))] == ["a", "other", "b"]
+
+    tracker.update_reservation(late, {"date": "2030-01-12"})
+    tracker.cancel_reservation(early)
+    assert [r["id"] for r in tracker.get_user_active_reservations(7)] == [late]
+    assert [r["confirmation_id"] for r in tracker.get_reservations_on(date(2030, 1, 11))] == ["a", "other"]
+    assert tracker.get_reservations_on(date(2030, 1, 12)) == [tracker.get_reservation(late)]
+
+
+def test_past_bookings_move_to_monthly_archives(tmp_path):
+    t('tests.unit.test_reservation_tracker.test_past_bookings_move_to_monthly_archives')
+    hot_file = tmp_path / "all_reservations.json"
+    clock = FakeClock(datetime(2030, 1, 30, 8, 0))
+    tracker = ReservationTracker(str(hot_file), clock=clock)
+    january = tracker.add_completed_booking(7, _booking("jan", "2030-01-31", "07:00"))
+    february = tracker.add_completed_booking(7, _booking("feb", "2030-02-01", "09:00"))
+    undated = tracker.add_immediate_reservation(7, {"court": 3})
+
+    # Still inside the grace period after play time.
+    clock.now = datetime(2030, 1, 31, 8, 30)
+    assert tracker.archive_expired() == 0
+
+    clock.now = datetime(2030, 2, 1, 12, 0)
+    assert tracker.archive_expired() == 2
+    assert tracker.get_reservation(january) is None and tracker.get_reservation(february) is None
+    assert tracker.get_reservations_on(date(2030, 1, 31)) == []
+    assert tracker.get_reservation(undated) is not None
+
+    assert [r["id"] for r in tracker.iter_archived()] == [january, february]
+    assert [r["id"] for r in tracker.iter_archived("2030-02")] == [february]
+    assert (tmp_path / "archive" / "all_reservations.2030-01.jsonl").exists()
+
+    tracker.cancel_reservation(undated)
+    assert list(json.loads(hot_file.read_text())) == [undated]
+
+
+def test_load_archives_expired_records_from_hot_file(tmp_path):
+    t('tests.unit.test_reservation_tracker.test_load_archives_expired_records_from_hot_file')
+    hot_file = tmp_path / "all_reservations.json"
+    records = {
+        "conf_old": {"id": "conf_old", "user_id": 7, "status": "active", "date": "2029-12-01", "time": "09:00"},
+        "conf_new": {"id": "conf_new", "user_id": 7, "status": "active", "date": "2030-01-02", "time": "09:00"},
+        # Legacy records whose stored id is missing or differs from their key.
+        "conf_legacy": {"user_id": 7, "status": "active", "date": "2029-12-02", "time": "09:00"},
+        "conf_renamed": {"id": "conf_stale", "user_id": 7, "status": "active", "date": "2029-12-03", "time": "09:00"},
+    }
+    hot_file.write_text(json.dumps(records))
+
+    tracker = ReservationTracker(str(hot_file), clock=FakeClock(datetime(2030, 1, 1, 9, 0)))
+
+    assert list(tracker.reservations) == ["conf_new"]
+    assert list(json.loads(hot_file.read_text())) == ["conf_new"]
+    assert [r.get("id") for r in tracker.iter_archived()] == ["conf_old", None, "conf_stale"]
+    assert [r["id"] for r in tracker.get_user_active_reservations(7)] == ["conf_new"]
@@ -0,0 +1,109 @@
+from tracking import t
+from types import SimpleNamespace
+
+import pytest
+
+from automation.browser.pool.manager import BrowserPoolManager
+from automation.browser.resource_blocking import ResourceBlockingProfile
+
+
+class FakeRoute:
+    def __init__(self, url, resource_type):
+        t('tests.unit.test_resource_blocking.FakeRoute.__init__')
+        self.request = SimpleNamespace(url=url, resource_type=resource_type)
+        self.outcome = None
+
+    async def abort(self, reason=None):
+        t('tests.unit.test_resource_blocking.FakeRoute.abort')
+        self.outcome = "abort"
+
+    async def continue_(self):
+        t('tests.unit.test_resource_blocking.FakeRoute.continue_')
+        self.outcome = "continue"
+
+
+class FakeContext:
+    def __init__(self):
+        t('tests.unit.test_resource_blocking.FakeContext.__init__')
+        self.routes = []
+
+    async def route(self, pattern, handler):
+        t('tests.unit.test_resource_blocking.FakeContext.route')
+        self.routes.append((pattern, handler))
+
+    async def new_page(self):
+        t('tests.unit.test_resource_blocking.FakeContext.new_page')
+        return SimpleNamespace(add_init_script=_noop)
+
+
+async def _noop(*args, **kwargs):
+    t('tests.unit.test_resource_blocking._noop')
+
+
+@pytest.mark.parametrize(
+    "url, resource_type, blocked",
+    [
+        ("https://clublavilla.as.me/?appointmentType=15970897", "document", False),
+        ("https://app.acuityscheduling.com/api/scheduling/v1/availability/times", "xhr", False),
+        ("https://embed.acuityscheduling.com/js/embed.js", "script", False),
+        ("https://www.google.com/recaptcha/api.js", "script", False),
+        ("https://js.stripe.com/v3/", "script", False),
+        ("https://fonts.googleapis.com/css?family=Roboto", "stylesheet", False),
+        ("https://clublavilla.as.me/logo.png", "image", False),
+        ("https://www.gstatic.com/recaptcha/api2/payload?p=tile", "image", False),
+        ("https://images.squarespace-cdn.example/hero.jpg", "image", True),
+        ("https://use.typekit.net/af/roboto.woff2", "font", True),
+        ("https://www.googletagmanager.com/gtm.js", "script", True),
+        ("https://www.google-analytics.com/collect", "xhr", True),
+        ("https://cdn.example-widgets.com/chat.js", "script", True),
+        ("data:image/png;base64,AAAA", "image", False),
+    ],
+)
+def test_default_profile_keeps_scheduling_assets(url, resource_type, blocked):
+    t('tests.unit.test_resource_blocking.test_default_profile_keeps_scheduling_assets')
+    assert ResourceBlockingProfile().should_block(url, resource_type) is blocked
+
+
+@pytest.mark.asyncio
+async def test_route_handler_aborts_and_counts_blocked_requests():
+    t('tests.unit.test_resource_blocking.test_route_handler_aborts_and_counts_blocked_requests')
+    context = FakeContext()
+    stats = await ResourceBlockingProfile().apply(context)
+    (pattern, handler), = context.routes
+
+    image = FakeRoute("https://images.squarespace-cdn.example/hero.jpg", "image")
+    calendar = FakeRoute("https://clublavilla.as.me/schedule.php", "document")
+    await handler(image)
+    await handler(calendar)
+
+    assert pattern == "**/*"
+    assert (image.outcome, calendar.outcome) == ("abort", "continue")
+    assert (stats.blocked, stats.allowed, stats.blocked_by_type) == (1, 1, {"image": 1})
+
+
+@pytest.mark.asyncio
+async def test_manager_applies_profile_only_when_enabled(tmp_path, monkeypatch):
+    t('tests.unit.test_resource_blocking.test_manager_applies_profile_only_when_enabled')
+    monkeypatch.setattr("automation.browser.pool.manager.BROWSER_STATES_DIR", tmp_path)
+    contexts = []
+
+    async def new_context(**kwargs):
+        contexts.append(FakeContext())
+        return contexts[-1]
+
+    pool = SimpleNamespace(
+        browser=SimpleNamespace(new_context=new_context),
+        pages={},
+        contexts={},
+        DIRECT_COURT_URLS={},
+        production_mode=True,
+    )
+    manager = BrowserPoolManager(pool)
+    manager.resource_profile = None
+
+    await manager.create_and_navigate_court_page_safe(1)
+    manager.enable_resource_blocking(True)
+    await manager.create_and_navigate_court_page_safe(2)
+
+    assert [len(context.routes) for context in contexts] == [0, 1]
+    assert list(manager.route_stats) == [2]
@@ -49,6 +49,46 @@ async def test_scheduler_pipeline_runs_health_and_execution(monkeypatch):
     assert isinstance(calls[-1][2], dict)
 
 
+@pytest.mark.asyncio
+async def test_scheduler_pipeline_executes_due_batches_before_prearm():
+    t('tests.unit.test_scheduler_services.test_scheduler_pipeline_executes_due_batches_before_prearm')
+    calls = []
+
+    async def health_check(reservations):
+        calls.append("health")
+
+    async def prearm(reservations):
+        calls.append(("prearm", [r["id"] for r in reservations]))
+
+    async def executor(reservations, **kwargs):
+        calls.append("execute")
+
+    pipeline = SchedulerPipeline(
+        logger=SimpleNamespace(),
+        hydrator=SimpleNamespace(hydrate=lambda batch: HydratedReservations(batch.reservations, {})),
+        health_check=health_check,
+        executor=executor,
+        prearm=prearm,
+    )
+    batch = ReservationBatch(
+        time_key="2025-01-01_07:00",
+        target_date="2025-01-01",
+        target_time="07:00",
+        reservations=[{"id": "1"}],
+    )
+    upcoming = ReservationBatch(
+        time_key="2025-01-01_08:00",
+        target_date="2025-01-01",
+        target_time="08:00",
+        reservations=[{"id": "2"}],
+    )
+    evaluation = SimpleNamespace(requires_health_check=[batch], requires_prearm=[upcoming], ready_for_execution=[batch])
+
+    await pipeline.process(evaluation)
+
+    assert calls == ["health", "execute", ("prearm", ["2"])]
+
+
 def test_reservation_hydrator_filters_failures(monkeypatch):
     t('tests.unit.test_scheduler_services.test_reservation_hydrator_filters_failures')
     recorded = {
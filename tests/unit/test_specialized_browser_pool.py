@@ -1,5 +1,9 @@
 from tracking import t
-from automation.browser.pools.specialized import SpecializedBrowserPool
+import asyncio
+
+import pytest
+
+from automation.browser.pools.specialized import SpecializedBrowser, SpecializedBrowserPool
 
 
 class RecordingLogger:
@@ -51,3 +55,109 @@ def test_finalize_form_result_failure_logs_warning():
     assert success is False
     assert message == "Form error: Validation error"
     assert ('warning', 'Form submission failed on court 3: Validation error') in pool.logger.records
+
+
+class FakeClosable:
+    def __init__(self, delay=0.0):
+        t('tests.unit.test_specialized_browser_pool.FakeClosable.__init__')
+        self.delay = delay
+        self.closed = False
+
+    def is_closed(self):
+        t('tests.unit.test_specialized_browser_pool.FakeClosable.is_closed')
+        return self.closed
+
+    async def close(self):
+        t('tests.unit.test_specialized_browser_pool.FakeClosable.close')
+        await asyncio.sleep(self.delay)
+        self.closed = True
+
+
+def _fake_browser(court, *, close_delay=0.0):
+    t('tests.unit.test_specialized_browser_pool._fake_browser')
+    return SpecializedBrowser(
+        browser=FakeClosable(close_delay),
+        context=FakeClosable(),
+        page=FakeClosable(),
+        court_number=court,
+        court_index=court - 1,
+        id=f"court{court}_{id(object())}",
+    )
+
+
+async def _max_loop_lag(stop, interval=0.005):
+    t('tests.unit.test_specialized_browser_pool._max_loop_lag')
+    loop = asyncio.get_running_loop()
+    worst = 0.0
+    while not stop.is_set():
+        before = loop.time()
+        await asyncio.sleep(interval)
+        worst = max(worst, loop.time() - before - interval)
+    return worst
+
+
+@pytest.mark.asyncio
+async def test_recycling_does_not_stall_event_loop_or_concurrent_bookings(monkeypatch):
+    t('tests.unit.test_specialized_browser_pool.test_recycling_does_not_stall_event_loop_or_concurrent_bookings')
+    pool = SpecializedBrowserPool(courts_needed=[1, 2], max_browsers=2)
+    old = _fake_browser(1, close_delay=0.2)
+    other = _fake_browser(2)
+    for browser in (old, other):
+        await pool._register_browser(browser, browser.court_number)
+
+    events = []
+
+    async def slow_create(court_number):
+        events.append(("launch", court_number))
+        await asyncio.sleep(0.2)
+        return _fake_browser(court_number)
+
+    monkeypatch.setattr(pool, "_create_and_position_browser", slow_create)
+
+    async def booking(browser, label, duration):
+        async with browser.lock:
+            await asyncio.sleep(duration)
+        events.append(("booked", label))
+
+    stop = asyncio.Event()
+    lag = asyncio.create_task(_max_loop_lag(stop))
+    in_flight = asyncio.create_task(booking(old, "in-flight", 0.05))
+    await asyncio.sleep(0)
+    recycle = asyncio.create_task(pool._recycle_browser(old.id))
+    await asyncio.sleep(0.01)
+
+    # Mid-recycle: the pool stays readable and other courts keep booking
+    assert pool.get_browser_count() == 1
+    assert old.retiring and pool.court_manager.get_browser_for_court(1) is None
+    await asyncio.wait_for(booking(other, "concurrent", 0.01), timeout=0.1)
+    assert not recycle.done()
+
+    await asyncio.wait_for(asyncio.gather(recycle, in_flight), timeout=2)
+    stop.set()
+    worst_lag = await lag
+
+    assert worst_lag < 0.05
+    assert events.index(("booked", "in-flight")) < events.index(("launch", 1))
+    assert old.browser.closed and old.page.closed
+    replacement = pool.browsers[pool.court_manager.get_browser_for_court(1)]
+    assert replacement is not old and pool.get_browser_count() == 2
+    assert pool.stats["browsers_recycled"] == 1
+
+
+@pytest.mark.asyncio
+async def test_coverage_repair_launches_one_browser_per_uncovered_court(monkeypatch):
+    t('tests.unit.test_specialized_browser_pool.test_coverage_repair_launches_one_browser_per_uncovered_court')
+    pool = SpecializedBrowserPool(courts_needed=[1, 2], max_browsers=2)
+    launches = []
+
+    async def slow_create(court_number):
+        launches.append(court_number)
+        await asyncio.sleep(0.05)
+        return _fake_browser(court_number)
+
+    monkeypatch.setattr(pool, "_create_and_position_browser", slow_create)
+
+    await asyncio.gather(pool._ensure_browser_coverage(), pool._ensure_browser_coverage())
+
+    assert sorted(launches) == [1, 2]
+    assert pool.get_browser_count() == 2
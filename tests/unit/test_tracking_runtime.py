@@ -0,0 +1,92 @@
+from tracking import t
+import json
+import threading
+
+import pytest
+
+from tracking import runtime
+
+
+@pytest.fixture
+def isolated_runtime(tmp_path, monkeypatch):
+    t('tests.unit.test_tracking_runtime.isolated_runtime')
+    counts_file = tmp_path / "function_call_counts.json"
+    monkeypatch.setattr(runtime, "_TRACKING_FILE", counts_file)
+    monkeypatch.setattr(runtime, "_COUNTS", {})
+    monkeypatch.setattr(runtime, "_BUFFERS", [])
+    monkeypatch.setattr(runtime, "_LAST_PERSISTED", {})
+    monkeypatch.setattr(runtime, "_LOCAL", threading.local())
+    monkeypatch.setattr(runtime, "_MODE", runtime.MODE_BUFFERED)
+    return counts_file
+
+
+def _run_in_threads(func, count):
+    t('tests.unit.test_tracking_runtime._run_in_threads')
+    threads = [threading.Thread(target=func) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+def test_buffered_counts_are_merged_on_flush(isolated_runtime):
+    t('tests.unit.test_tracking_runtime.test_buffered_counts_are_merged_on_flush')
+
+    def worker():
+        for _ in range(100):
+            runtime.t("module.func")
+        runtime.t("module.other")
+
+    _run_in_threads(worker, 4)
+    assert not isolated_runtime.exists()
+
+    assert runtime.flush() is True
+    persisted = json.loads(isolated_runtime.read_text(encoding="utf-8"))
+    assert persisted["module.func"] == 400
+    assert persisted["module.other"] == 4
+    # Finished threads are folded into the base totals and released.
+    assert all(thread.is_alive() for thread, _ in runtime._BUFFERS)
+    assert runtime.flush() is False
+
+
+def test_live_buffers_keep_accumulating_between_flushes(isolated_runtime):
+    t('tests.unit.test_tracking_runtime.test_live_buffers_keep_accumulating_between_flushes')
+    started = threading.Event()
+    release = threading.Event()
+
+    def worker():
+        runtime.t("module.loop")
+        started.set()
+        release.wait()
+        runtime.t("module.loop")
+
+    thread = threading.Thread(target=worker, daemon=True)
+    thread.start()
+    try:
+        started.wait()
+        runtime.flush()
+        assert runtime.snapshot()["module.loop"] == 1
+    finally:
+        release.set()
+        thread.join()
+
+    runtime.flush()
+    persisted = json.loads(isolated_runtime.read_text(encoding="utf-8"))
+    assert persisted["module.loop"] == 2
+
+
+def test_immediate_mode_persists_every_call(isolated_runtime, monkeypatch):
+    t('tests.unit.test_tracking_runtime.test_immediate_mode_persists_every_call')
+    monkeypatch.setattr(runtime, "_MODE", runtime.MODE_IMMEDIATE)
+
+    runtime.t("module.func")
+    runtime.t("module.func")
+
+    persisted = json.loads(isolated_runtime.read_text(encoding="utf-8"))
+    assert persisted["module.func"] == 2
+
+
+def test_configure_rejects_unknown_mode():
+    t('tests.unit.test_tracking_runtime.test_configure_rejects_unknown_mode')
+    with pytest.raises(ValueError):
+        runtime.configure(mode="sometimes")
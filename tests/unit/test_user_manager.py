@@ -1,6 +1,9 @@
 """Unit tests for user onboarding helpers in UserManager."""
 from tracking import t
 
+import json
+import threading
+import time
 from types import SimpleNamespace
 
 from users.manager import REQUIRED_PROFILE_FIELDS, UserManager
@@ -73,3 +76,152 @@ def test_get_missing_profile_fields(tmp_path):
 
     missing_when_none = manager.get_missing_profile_fields(None)
     assert missing_when_none == list(REQUIRED_PROFILE_FIELDS)
+
+
+def _profile(user_id, first, last, *, phone='', email='', active=False, admin=False, created='2030-01-01'):
+    t('tests.unit.test_user_manager._profile')
+    return {
+        'user_id': user_id,
+        'first_name': first,
+        'last_name': last,
+        'phone': phone,
+        'email': email,
+        'is_active': active,
+        'is_admin': admin,
+        'created_at': created,
+    }
+
+
+def test_debounced_saves_coalesce_into_one_atomic_write(tmp_path):
+    t('tests.unit.test_user_manager.test_debounced_saves_coalesce_into_one_atomic_write')
+    manager = UserManager(str(tmp_path / 'users.json'), save_debounce=60)
+    for user_id in range(1, 4):
+        manager.save_user(_profile(user_id, 'User', str(user_id)))
+    manager.set_user_language(2, 'en')
+
+    assert manager.writes == 0 and not (tmp_path / 'users.json').exists()
+    assert manager.flush() is True and manager.flush() is False
+    assert manager.writes == 1
+    assert list(tmp_path.iterdir()) == [tmp_path / 'users.json']
+
+    manager.set_user_language(2, 'en')  # unchanged: no write scheduled
+    assert manager.flush() is False
+
+    reloaded = UserManager(str(tmp_path / 'users.json'), save_debounce=0)
+    assert sorted(reloaded.get_all_users()) == [1, 2, 3]
+    assert reloaded.get_user_language(2) == 'en'
+    reloaded.set_user_language(3, 'en')
+    assert reloaded.writes == 1
+
+
+def test_counters_and_search_index_follow_profile_updates(tmp_path):
+    t('tests.unit.test_user_manager.test_counters_and_search_index_follow_profile_updates')
+    manager = UserManager(str(tmp_path / 'users.json'), save_debounce=60)
+    manager.save_user(_profile(1, 'José', 'López', phone='+502 5555-1234', email='jose@club.gt', active=True))
+    manager.save_user(_profile(2, 'Maria', 'Lopez', phone='4444 9876', email='maria@mail.com', created='2030-02-01'))
+    manager.save_user(_profile(3, 'Ana', 'Admin', email='ana@club.gt', admin=True, created='2030-03-01'))
+    manager.save_user(_profile(4, 'Luis', 'Perez', phone='1234', email='luis@mail.com', created='2030-04-01'))
+
+    assert manager.get_user_counts() == {'total': 4, 'active': 1, 'pending': 2, 'admin': 1}
+    assert [p['user_id'] for p in manager.get_pending_users()] == [4, 2]
+
+    def ids(query):
+        return [p['user_id'] for p in manager.search_users(query)]
+
+    assert ids('lopez') == [1, 2]
+    assert ids('jose lop') == [1]
+    assert ids('1234') == [1, 4]
+    assert ids('5555-1234') == [1]
+    assert ids('club.gt') == [1, 3]
+    assert ids('ana@club.gt') == [3]
+    assert ids('ez') == [] and ids('  ') == []
+
+    profile = manager.get_user(2)
+    profile['is_active'] = True
+    profile['last_name'] = 'Garcia'
+    manager.save_user(profile)
+
+    assert manager.get_user_counts() == {'total': 4, 'active': 2, 'pending': 1, 'admin': 1}
+    assert ids('lopez') == [1] and ids('garcia') == [2]
+    assert manager.search_users('mail', limit=1)[0]['user_id'] == 2
+
+
+def test_background_writer_persists_after_debounce(tmp_path):
+    t('tests.unit.test_user_manager.test_background_writer_persists_after_debounce')
+    manager = UserManager(str(tmp_path / 'users.json'), save_debounce=0.05)
+    manager.save_user(_profile(7, 'Eva', 'Ruiz'))
+    manager.save_user(_profile(8, 'Leo', 'Ruiz'))
+
+    deadline = time.monotonic() + 5
+    while manager.writes == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert manager.writes == 1
+    assert sorted(json.loads((tmp_path / 'users.json').read_text())) == ['7', '8']
+
+
+def test_concurrent_flushes_never_write_an_older_snapshot_last(tmp_path):
+    t('tests.unit.test_user_manager.test_concurrent_flushes_never_write_an_older_snapshot_last')
+    manager = UserManager(str(tmp_path / 'users.json'), save_debounce=60)
+    save_users = manager._save_users
+    release = threading.Event()
+    writing = threading.Event()
+
+    def slow_first_write(payload):
+        if not writing.is_set():
+            writing.set()
+            release.wait(5)
+        save_users(payload)
+
+    manager._save_users = slow_first_write
+    manager.save_user(_profile(1, 'Eva', 'Ruiz'))
+    first = threading.Thread(target=manager.flush)
+    first.start()
+    assert writing.wait(5)
+
+    manager.save_user(_profile(2, 'Leo', 'Ruiz'))
+    second = threading.Thread(target=manager.flush)
+    second.start()
+    time.sleep(0.05)
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert manager.writes == 2
+    assert sorted(json.loads((tmp_path / 'users.json').read_text())) == ['1', '2']
+
+
+def test_background_writer_retries_a_failed_pass(tmp_path):
+    t('tests.unit.test_user_manager.test_background_writer_retries_a_failed_pass')
+    manager = UserManager(str(tmp_path / 'users.json'), save_debounce=0.05)
+    save_users = manager._save_users
+    attempts = []
+
+    def fail_once(payload):
+        attempts.append(payload)
+        if len(attempts) == 1:
+            raise OSError('disk full')
+        save_users(payload)
+
+    manager._save_users = fail_once
+    manager.save_user(_profile(7, 'Eva', 'Ruiz'))
+
+    deadline = time.monotonic() + 5
+    while manager.writes == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    assert len(attempts) == 2 and manager.writes == 1
+    assert sorted(json.loads((tmp_path / 'users.json').read_text())) == ['7']
+
+
+def test_get_user_returns_a_copy_with_default_language(tmp_path):
+    t('tests.unit.test_user_manager.test_get_user_returns_a_copy_with_default_language')
+    manager = UserManager(str(tmp_path / 'users.json'), save_debounce=60)
+    manager.save_user(_profile(7, 'Eva', 'Ruiz'))
+
+    profile = manager.get_user(7)
+    profile['first_name'] = 'Changed'
+
+    assert profile['language'] == 'es'
+    assert manager.get_user(7)['first_name'] == 'Eva'
+    assert 'language' not in manager.get_all_users()[7]
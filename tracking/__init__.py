@@ -2,6 +2,6 @@
 
 from __future__ import annotations
 
-from .runtime import t
+from .runtime import configure, flush, snapshot, t
 
-__all__ = ["t"]
+__all__ = ["configure", "flush", "snapshot", "t"]
@@ -1,17 +1,65 @@
-"""Runtime helpers for tracking how often functions execute in production."""
+"""Runtime helpers for tracking how often functions execute in production.
+
+Two counting modes are supported:
+
+``buffered`` (default)
+    Each thread increments a private counter dictionary without taking a
+    lock. A daemon thread merges every buffer into the persisted totals on a
+    fixed interval, and :func:`flush` performs the same merge on demand (the
+    bot calls it during shutdown; ``atexit`` covers everything else).
+
+``immediate``
+    Legacy behaviour: every call takes the global lock and rewrites
+    ``function_call_counts.json``.
+
+Select the mode with the ``TRACKING_MODE`` environment variable and the flush
+cadence (seconds) with ``TRACKING_FLUSH_INTERVAL``, or call :func:`configure`.
+"""
 
 from __future__ import annotations
 
+import atexit
 import json
+import os
 import threading
+import time
 from pathlib import Path
 from tempfile import NamedTemporaryFile
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
+
+MODE_BUFFERED = "buffered"
+MODE_IMMEDIATE = "immediate"
+_VALID_MODES = {MODE_BUFFERED, MODE_IMMEDIATE}
+_DEFAULT_FLUSH_INTERVAL = 5.0
 
 _LOCK = threading.RLock()
 _TRACKING_DIR = Path(__file__).resolve().parent
 _TRACKING_FILE = _TRACKING_DIR / "function_call_counts.json"
+# Totals already folded in from disk, immediate-mode calls, and finished threads.
 _COUNTS: Dict[str, int] = {}
+# Live per-thread buffers; each holds cumulative counts for its owning thread.
+_BUFFERS: List[Tuple[threading.Thread, Dict[str, int]]] = []
+_LOCAL = threading.local()
+_LAST_PERSISTED: Dict[str, int] = {}
+
+_FLUSHER: Optional[threading.Thread] = None
+
+
+def _env_mode() -> str:
+    mode = os.getenv("TRACKING_MODE", MODE_BUFFERED).strip().lower()
+    return mode if mode in _VALID_MODES else MODE_BUFFERED
+
+
+def _env_flush_interval() -> float:
+    try:
+        interval = float(os.getenv("TRACKING_FLUSH_INTERVAL", _DEFAULT_FLUSH_INTERVAL))
+    except (TypeError, ValueError):
+        return _DEFAULT_FLUSH_INTERVAL
+    return interval if interval > 0 else _DEFAULT_FLUSH_INTERVAL
+
+
+_MODE = _env_mode()
+_FLUSH_INTERVAL = _env_flush_interval()
 
 
 def _load_counts() -> None:
@@ -35,10 +83,11 @@ def _load_counts() -> None:
         except (TypeError, ValueError):
             continue
         _COUNTS[str(name)] = max(count, 0)
+    _LAST_PERSISTED.update(_COUNTS)
 
 
-def _persist_counts_locked() -> None:
-    """Persist the in-memory counts to disk. Caller must hold ``_LOCK``."""
+def _write_counts_locked(counts: Dict[str, int]) -> None:
+    """Atomically write ``counts`` to disk. Caller must hold ``_LOCK``."""
     _TRACKING_FILE.parent.mkdir(parents=True, exist_ok=True)
 
     tmp_path: Optional[Path] = None
@@ -46,7 +95,7 @@ def _persist_counts_locked() -> None:
         with NamedTemporaryFile(
             "w", encoding="utf-8", dir=_TRACKING_FILE.parent, delete=False
         ) as handle:
-            json.dump(_COUNTS, handle, sort_keys=True)
+            json.dump(counts, handle, sort_keys=True)
             handle.write("\n")
             handle.flush()
             tmp_path = Path(handle.name)
@@ -61,14 +110,113 @@ def _persist_counts_locked() -> None:
                 pass
 
 
+def _merge_buffers_locked() -> Dict[str, int]:
+    """Return base totals plus every thread buffer. Caller must hold ``_LOCK``.
+
+    Buffers owned by threads that have exited are folded into ``_COUNTS`` and
+    dropped so the registry does not grow with short-lived worker threads.
+    """
+    merged = dict(_COUNTS)
+    live: List[Tuple[threading.Thread, Dict[str, int]]] = []
+    for thread, buffer in _BUFFERS:
+        snapshot = buffer.copy()
+        for name, count in snapshot.items():
+            merged[name] = merged.get(name, 0) + count
+        if thread.is_alive():
+            live.append((thread, buffer))
+        else:
+            for name, count in snapshot.items():
+                _COUNTS[name] = _COUNTS.get(name, 0) + count
+    _BUFFERS[:] = live
+    return merged
+
+
+def _register_thread_buffer() -> Dict[str, int]:
+    buffer: Dict[str, int] = {}
+    with _LOCK:
+        _BUFFERS.append((threading.current_thread(), buffer))
+        _ensure_flusher_locked()
+    _LOCAL.counts = buffer
+    return buffer
+
+
+def _ensure_flusher_locked() -> None:
+    global _FLUSHER
+    if _FLUSHER is not None and _FLUSHER.is_alive():
+        return
+    _FLUSHER = threading.Thread(
+        target=_flush_loop,
+        name="tracking-flush",
+        daemon=True,
+    )
+    _FLUSHER.start()
+
+
+def _flush_loop() -> None:
+    while True:
+        time.sleep(_FLUSH_INTERVAL)
+        flush()
+
+
+def flush() -> bool:
+    """Merge buffered counts and persist them if anything changed.
+
+    Returns ``True`` when the counts file was rewritten.
+    """
+    global _LAST_PERSISTED
+
+    with _LOCK:
+        merged = _merge_buffers_locked()
+        if merged == _LAST_PERSISTED:
+            return False
+        _write_counts_locked(merged)
+        _LAST_PERSISTED = merged
+        return True
+
+
+def snapshot() -> Dict[str, int]:
+    """Return the current totals, including unflushed buffered counts."""
+    with _LOCK:
+        return _merge_buffers_locked()
+
+
+def configure(
+    *,
+    mode: Optional[str] = None,
+    flush_interval: Optional[float] = None,
+) -> None:
+    """Adjust the counting mode or flush interval at runtime."""
+    global _MODE, _FLUSH_INTERVAL
+
+    if mode is not None:
+        if mode not in _VALID_MODES:
+            raise ValueError(f"Unknown tracking mode: {mode!r}")
+        if mode != _MODE:
+            flush()
+        _MODE = mode
+    if flush_interval is not None:
+        if flush_interval <= 0:
+            raise ValueError("flush_interval must be positive")
+        _FLUSH_INTERVAL = float(flush_interval)
+
+
 def t(func_name: str) -> None:
     """Record the provided function name each time it runs."""
     if not func_name:
         return
 
+    if _MODE == MODE_BUFFERED:
+        try:
+            counts = _LOCAL.counts
+        except AttributeError:
+            counts = _register_thread_buffer()
+        counts[func_name] = counts.get(func_name, 0) + 1
+        return
+
     with _LOCK:
         _COUNTS[func_name] = _COUNTS.get(func_name, 0) + 1
-        _persist_counts_locked()
+        flush()
 
 
 _load_counts()
+atexit.register(flush)
@@ -1,5 +1,6 @@
 """User management utilities."""
 
 from .manager import UserManager, UserTier
+from .store import UserStore
 
-__all__ = ["UserManager", "UserTier"]
+__all__ = ["UserManager", "UserStore", "UserTier"]
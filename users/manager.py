@@ -1,16 +1,35 @@
 """
 User Management System for Tennis Bot
 Handles persistent storage and retrieval of user profiles
+
+Profiles live in an indexed :class:`~users.store.UserStore`. Saving a profile
+marks the store dirty. A background thread then writes the whole file
+atomically once ``USERS_SAVE_DEBOUNCE_SECONDS`` have passed, so a burst of
+edits costs one write. Saves that change nothing are skipped entirely.
+:meth:`UserManager.flush` writes pending changes immediately; the bot calls
+it on shutdown and ``atexit`` covers everything else.
 """
 from tracking import t
 
+import atexit
 import json
 import logging
+import os
+import threading
+import time
 from datetime import datetime
-from typing import Dict, Any, List, Optional, Sequence, Tuple
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Optional, Sequence, Tuple
 from pathlib import Path
 from enum import Enum
+from tempfile import NamedTemporaryFile
 from infrastructure.constants import HARDCODED_VIP_USERS, HARDCODED_ADMIN_USERS
+from infrastructure.settings import get_settings
+
+from .store import UserStore
+
+# Audit stamps that change on every save and do not count as a modification.
+_VOLATILE_FIELDS = frozenset({'updated_at'})
 
 
 class UserTier(Enum):
@@ -36,21 +55,42 @@ class UserManager:
     with automatic persistence to a JSON file for data durability.
     """
     
-    def __init__(self, file_path: str = 'users.json') -> None:
+    def __init__(self, file_path: str = 'users.json', save_debounce: Optional[float] = None) -> None:
         """
         Initialize the UserManager with persistent storage
         
         Args:
             file_path: Path to the JSON file for storing user data
+            save_debounce: Seconds to coalesce writes for; 0 writes on every
+                save. Defaults to ``USERS_SAVE_DEBOUNCE_SECONDS``.
             
         Sets up logging and loads existing user data from file
         """
         t('users.manager.UserManager.__init__')
         self.file_path = Path(file_path)
         self.logger = logging.getLogger('UserManager')
-        self.users: Dict[int, Dict[str, Any]] = self._load_users()
+        self.save_debounce = (
+            get_settings().users_save_debounce_seconds if save_debounce is None else save_debounce
+        )
+        self._lock = threading.RLock()
+        # Held from snapshot to rename, so writes land in snapshot order.
+        self._write_lock = threading.Lock()
+        self._store = UserStore(self._load_users().items())
+        self._fingerprints: Dict[int, int] = {
+            user_id: self._fingerprint(profile) for user_id, profile in self._store.profiles.items()
+        }
+        self._dirty = False
+        self._wake = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self.writes = 0
         
-        self.logger.info(f"UserManager initialized with {len(self.users)} users from {file_path}")
+        self.logger.info(f"UserManager initialized with {len(self._store)} users from {file_path}")
+
+    @property
+    def users(self) -> Mapping[int, Dict[str, Any]]:
+        """Read-only view of every profile keyed by user ID."""
+        t('users.manager.UserManager.users')
+        return MappingProxyType(self._store.profiles)
     
     def get_user(self, user_id: int) -> Optional[Dict[str, Any]]:
         """
@@ -60,14 +100,16 @@ class UserManager:
             user_id: Telegram user ID to lookup
 
         Returns:
-            Dict containing user profile data if found, None otherwise
+            Copy of the user profile if found, None otherwise. Changes
+            only take effect through save_user
         """
         t('users.manager.UserManager.get_user')
-        user_profile = self.users.get(user_id)
+        with self._lock:
+            stored = self._store.get(user_id)
+            user_profile = stored.copy() if stored else None
         if user_profile:
             # Ensure language field exists with default value
-            if 'language' not in user_profile:
-                user_profile['language'] = 'es'  # Default to Spanish
+            user_profile.setdefault('language', 'es')  # Default to Spanish
             self.logger.debug(f"Retrieved user profile for user_id: {user_id}")
         else:
             self.logger.debug(f"No profile found for user_id: {user_id}")
@@ -77,6 +119,9 @@ class UserManager:
     def save_user(self, user_profile: Dict[str, Any]) -> None:
         """
         Save or update a user profile
+
+        The profile is indexed immediately and written to disk after the
+        debounce window. A save that changes nothing is a no-op.
         
         Args:
             user_profile: Dictionary containing user profile data
@@ -90,31 +135,80 @@ class UserManager:
             raise ValueError("User profile must contain 'user_id' key")
         
         user_id = user_profile['user_id']
-        
-        # Stamp audit fields
-        now_iso = datetime.utcnow().isoformat()
-        if 'created_at' not in user_profile:
-            user_profile['created_at'] = now_iso
-        user_profile['updated_at'] = now_iso
-
-        # Update or create user profile
-        self.users[user_id] = user_profile.copy()
-        
+
+        with self._lock:
+            fingerprint = self._fingerprint(user_profile)
+            if user_id in self._store and self._fingerprints.get(user_id) == fingerprint:
+                self.logger.debug(f"User profile for user_id {user_id} unchanged; nothing to save")
+                return
+
+            # Stamp audit fields
+            now_iso = datetime.utcnow().isoformat()
+            if 'created_at' not in user_profile:
+                user_profile['created_at'] = now_iso
+                fingerprint = self._fingerprint(user_profile)
+            user_profile['updated_at'] = now_iso
+
+            # Update or create user profile
+            self._store.put(user_id, user_profile.copy())
+            self._fingerprints[user_id] = fingerprint
+            self._dirty = True
+
         # Persist changes to file
-        self._save_users()
+        self._schedule_save()
         
         self.logger.info(f"Saved user profile for user_id: {user_id}")
     
-    def get_all_users(self) -> Dict[int, Dict[str, Any]]:
+    def get_all_users(self) -> Mapping[int, Dict[str, Any]]:
         """
         Retrieve all stored user profiles
 
         Returns:
-            Dictionary where keys are user_ids and values are user profile dictionaries
+            Read-only mapping where keys are user_ids and values are user
+            profile dictionaries (a live view, not a copy)
         """
         t('users.manager.UserManager.get_all_users')
-        self.logger.debug(f"Retrieved all users: {len(self.users)} profiles")
-        return self.users.copy()
+        self.logger.debug(f"Retrieved all users: {len(self._store)} profiles")
+        return self.users
+
+    def get_user_counts(self) -> Dict[str, int]:
+        """
+        Return maintained user counters
+
+        Returns:
+            Dict with 'total', 'active', 'pending' (inactive with phone and
+            email) and 'admin' (profile flag) counts
+        """
+        t('users.manager.UserManager.get_user_counts')
+        with self._lock:
+            return self._store.counts()
+
+    def get_pending_users(self) -> List[Dict[str, Any]]:
+        """
+        Return users waiting for approval, newest first
+        """
+        t('users.manager.UserManager.get_pending_users')
+        with self._lock:
+            return self._store.pending()
+
+    def search_users(self, query: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Search users by name, username, phone, email or user ID
+
+        Every word of the query must prefix a word of the profile; case
+        and accents are ignored, and phone numbers also match on their
+        trailing digits.
+
+        Args:
+            query: Free-text search such as "maria lop" or "5512"
+            limit: Maximum number of profiles to return
+
+        Returns:
+            Matching profiles in the order they were first saved
+        """
+        t('users.manager.UserManager.search_users')
+        with self._lock:
+            return self._store.search(query, limit=limit)
 
     def _has_role(self, user_id: int, hardcoded: set[int], profile_flag: str) -> bool:
         t('users.manager.UserManager._has_role')
@@ -292,7 +386,7 @@ class UserManager:
         }
 
         self.save_user(profile)
-        return self.users[user_id], True
+        return self._store.get(user_id), True
 
     def get_missing_profile_fields(
         self,
@@ -322,24 +416,96 @@ class UserManager:
             return 'es'
         return 'es'
     
-    def _save_users(self) -> None:
+    @staticmethod
+    def _fingerprint(profile: Dict[str, Any]) -> int:
+        t('users.manager.UserManager._fingerprint')
+        stable = {key: value for key, value in profile.items() if key not in _VOLATILE_FIELDS}
+        return hash(json.dumps(stable, sort_keys=True, ensure_ascii=False, default=str))
+
+    def _schedule_save(self) -> None:
+        """Write now when debouncing is off, otherwise wake the background writer."""
+        t('users.manager.UserManager._schedule_save')
+        if self.save_debounce <= 0:
+            self.flush()
+            return
+
+        with self._lock:
+            if self._flusher is None or not self._flusher.is_alive():
+                if self._flusher is None:
+                    atexit.register(self.flush)
+                self._flusher = threading.Thread(
+                    target=self._flush_loop,
+                    name='users-flush',
+                    daemon=True,
+                )
+                self._flusher.start()
+        self._wake.set()
+
+    def _flush_loop(self) -> None:
+        t('users.manager.UserManager._flush_loop')
+        while True:
+            self._wake.wait()
+            # Let a burst of edits accumulate, then write them together.
+            time.sleep(self.save_debounce)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                # The changes stay dirty; re-arm so the next pass retries them.
+                self.logger.error(f"Background users flush failed: {e}", exc_info=True)
+                self._wake.set()
+
+    def flush(self) -> bool:
+        """
+        Write pending profile changes to disk now
+
+        Returns:
+            True if the users file was rewritten, False if nothing was dirty
+        """
+        t('users.manager.UserManager.flush')
+        with self._write_lock:
+            with self._lock:
+                if not self._dirty:
+                    return False
+                payload = json.dumps(self._store.profiles, indent=2, ensure_ascii=False, default=str)
+                self._dirty = False
+            try:
+                self._save_users(payload)
+            except Exception:
+                with self._lock:
+                    self._dirty = True
+                raise
+        return True
+
+    def _save_users(self, payload: str) -> None:
         """
         Internal helper method to save user data to JSON file
         
-        Handles file operations with proper error handling and logging
+        Writes a temporary file and renames it into place, so the users file
+        is never left half-written
         """
         t('users.manager.UserManager._save_users')
+        tmp_path: Optional[Path] = None
         try:
             # Ensure parent directory exists
             self.file_path.parent.mkdir(parents=True, exist_ok=True)
             
-            # Write user data to JSON file with proper formatting
-            with open(self.file_path, 'w', encoding='utf-8') as f:
-                json.dump(self.users, f, indent=2, ensure_ascii=False, default=str)
+            with NamedTemporaryFile(
+                'w', encoding='utf-8', dir=self.file_path.parent, delete=False,
+                prefix=self.file_path.name, suffix='.tmp',
+            ) as handle:
+                tmp_path = Path(handle.name)
+                handle.write(payload)
+                handle.flush()
+                os.fsync(handle.fileno())
+            os.replace(tmp_path, self.file_path)
+            self.writes += 1
             
-            self.logger.debug(f"Successfully saved {len(self.users)} user profiles to {self.file_path}")
+            self.logger.debug(f"Successfully saved {len(self._store)} user profiles to {self.file_path}")
             
         except Exception as e:
+            if tmp_path is not None:
+                tmp_path.unlink(missing_ok=True)
             self.logger.error(f"Error saving users to {self.file_path}: {e}", exc_info=True)
             raise
     
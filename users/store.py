@@ -0,0 +1,240 @@
+"""Indexed in-memory storage for user profiles."""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from bisect import bisect_left
+from itertools import count
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
+
+from tracking import t
+
+_WORD_RE = re.compile(r'[^\W_]+')
+_NAME_FIELDS = ('first_name', 'last_name', 'username', 'telegram_username')
+_MIN_PHONE_SUFFIX = 4
+
+
+def normalize_text(value: Any) -> str:
+    """Lower-case ``value`` and strip accents so "José" matches "jose"."""
+
+    t('users.store.normalize_text')
+    decomposed = unicodedata.normalize('NFKD', str(value or '').lower())
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def search_terms(query: str) -> List[str]:
+    """Split a search query into the terms :meth:`UserStore.search` matches."""
+
+    t('users.store.search_terms')
+    return _WORD_RE.findall(normalize_text(query))
+
+
+def profile_tokens(user_id: int, profile: Dict[str, Any]) -> FrozenSet[str]:
+    """Return the search tokens for one profile.
+
+    Names and usernames contribute their words. Email contributes the whole
+    address and its words. Phone numbers contribute every digit suffix of at
+    least four digits, so a search for the last digits finds the user.
+    """
+
+    t('users.store.profile_tokens')
+    tokens: Set[str] = {str(user_id)}
+    for field in _NAME_FIELDS:
+        tokens.update(_WORD_RE.findall(normalize_text(profile.get(field))))
+    email = normalize_text(profile.get('email')).strip()
+    if email:
+        tokens.add(email)
+        tokens.update(_WORD_RE.findall(email))
+    digits = re.sub(r'\D', '', str(profile.get('phone') or ''))
+    if digits:
+        tokens.add(digits)
+        tokens.update(digits[i:] for i in range(len(digits) - _MIN_PHONE_SUFFIX + 1))
+    return frozenset(tokens)
+
+
+def is_active(profile: Dict[str, Any]) -> bool:
+    t('users.store.is_active')
+    return bool(profile.get('is_active', False))
+
+
+def is_pending(profile: Dict[str, Any]) -> bool:
+    """Inactive users who completed phone and email are waiting for approval."""
+
+    t('users.store.is_pending')
+    return not is_active(profile) and bool(profile.get('phone')) and bool(profile.get('email'))
+
+
+def is_admin_flagged(profile: Dict[str, Any]) -> bool:
+    t('users.store.is_admin_flagged')
+    return bool(profile.get('is_admin', False))
+
+
+class UserStore:
+    """Hold user profiles with status sets and a search index kept in sync on write.
+
+    Profiles are stored by ``user_id`` in insertion order. Sets of active,
+    pending and admin ids back the admin counters. An inverted index maps
+    each search token to the ids that carry it. Profiles are returned by
+    reference, so callers that mutate one must :meth:`put` it again to
+    refresh the indexes.
+    """
+
+    def __init__(self, profiles: Iterable[Tuple[int, Dict[str, Any]]] = ()) -> None:
+        t('users.store.UserStore.__init__')
+        self._profiles: Dict[int, Dict[str, Any]] = {}
+        self._sequence: Dict[int, int] = {}
+        self._tokens: Dict[int, FrozenSet[str]] = {}
+        self._postings: Dict[str, Set[int]] = {}
+        self._sorted_tokens: Optional[List[str]] = None
+        self._active: Set[int] = set()
+        self._pending: Set[int] = set()
+        self._admins: Set[int] = set()
+        self._counter = count()
+        for user_id, profile in profiles:
+            self.put(user_id, profile)
+
+    def __len__(self) -> int:
+        t('users.store.UserStore.__len__')
+        return len(self._profiles)
+
+    def __contains__(self, user_id: object) -> bool:
+        t('users.store.UserStore.__contains__')
+        return user_id in self._profiles
+
+    def __iter__(self) -> Iterator[int]:
+        t('users.store.UserStore.__iter__')
+        return iter(list(self._profiles))
+
+    @property
+    def profiles(self) -> Dict[int, Dict[str, Any]]:
+        """The backing ``user_id -> profile`` dict; treat it as read-only."""
+
+        t('users.store.UserStore.profiles')
+        return self._profiles
+
+    def get(self, user_id: int) -> Optional[Dict[str, Any]]:
+        t('users.store.UserStore.get')
+        return self._profiles.get(user_id)
+
+    def put(self, user_id: int, profile: Dict[str, Any]) -> None:
+        """Insert or replace ``profile`` and refresh every index entry for it."""
+
+        t('users.store.UserStore.put')
+        if user_id not in self._profiles:
+            self._sequence[user_id] = next(self._counter)
+        self._profiles[user_id] = profile
+        self._reindex(user_id, profile)
+
+    def remove(self, user_id: int) -> Optional[Dict[str, Any]]:
+        t('users.store.UserStore.remove')
+        profile = self._profiles.pop(user_id, None)
+        if profile is None:
+            return None
+        self._sequence.pop(user_id, None)
+        self._set_tokens(user_id, frozenset())
+        self._tokens.pop(user_id, None)
+        for members in (self._active, self._pending, self._admins):
+            members.discard(user_id)
+        return profile
+
+    # ------------------------------------------------------------------
+    # Counters and status views
+    # ------------------------------------------------------------------
+    def counts(self) -> Dict[str, int]:
+        t('users.store.UserStore.counts')
+        return {
+            'total': len(self._profiles),
+            'active': len(self._active),
+            'pending': len(self._pending),
+            'admin': len(self._admins),
+        }
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """Return pending profiles, newest ``created_at`` first."""
+
+        t('users.store.UserStore.pending')
+        profiles = [self._profiles[user_id] for user_id in self._pending]
+        profiles.sort(key=lambda profile: str(profile.get('created_at') or ''), reverse=True)
+        return profiles
+
+    # ------------------------------------------------------------------
+    # Search
+    # ------------------------------------------------------------------
+    def search(self, query: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Return profiles where every query term prefixes one of their tokens.
+
+        Results keep insertion order. An empty query matches nothing.
+        """
+
+        t('users.store.UserStore.search')
+        terms = search_terms(query)
+        if not terms:
+            return []
+        matched: Optional[Set[int]] = None
+        for term in sorted(set(terms), key=len, reverse=True):
+            ids = self._ids_with_prefix(term)
+            matched = ids if matched is None else matched & ids
+            if not matched:
+                return []
+        ordered = sorted(matched, key=self._sequence.__getitem__)
+        if limit is not None:
+            ordered = ordered[:limit]
+        return [self._profiles[user_id] for user_id in ordered]
+
+    def _ids_with_prefix(self, term: str) -> Set[int]:
+        t('users.store.UserStore._ids_with_prefix')
+        if self._sorted_tokens is None:
+            self._sorted_tokens = sorted(self._postings)
+        tokens = self._sorted_tokens
+        ids: Set[int] = set()
+        index = bisect_left(tokens, term)
+        while index < len(tokens) and tokens[index].startswith(term):
+            ids |= self._postings[tokens[index]]
+            index += 1
+        return ids
+
+    # ------------------------------------------------------------------
+    # Index maintenance
+    # ------------------------------------------------------------------
+    def _reindex(self, user_id: int, profile: Dict[str, Any]) -> None:
+        t('users.store.UserStore._reindex')
+        self._set_tokens(user_id, profile_tokens(user_id, profile))
+        for members, flagged in (
+            (self._active, is_active(profile)),
+            (self._pending, is_pending(profile)),
+            (self._admins, is_admin_flagged(profile)),
+        ):
+            if flagged:
+                members.add(user_id)
+            else:
+                members.discard(user_id)
+
+    def _set_tokens(self, user_id: int, tokens: FrozenSet[str]) -> None:
+        t('users.store.UserStore._set_tokens')
+        previous = self._tokens.get(user_id, frozenset())
+        if tokens == previous:
+            return
+        for token in previous - tokens:
+            holders = self._postings.get(token)
+            if holders is not None:
+                holders.discard(user_id)
+                if not holders:
+                    del self._postings[token]
+                    self._sorted_tokens = None
+        for token in tokens - previous:
+            holders = self._postings.get(token)
+            if holders is None:
+                holders = self._postings[token] = set()
+                self._sorted_tokens = None
+            holders.add(user_id)
+        self._tokens[user_id] = tokens
+
+
+__all__ = [
+    'UserStore',
+    'is_pending',
+    'normalize_text',
+    'profile_tokens',
+    'search_terms',
+]